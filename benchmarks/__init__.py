@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the storage, delta and analysis hot paths.
+
+Run with ``python -m benchmarks``; see benchmarks/__main__.py for options.
+"""
@@ -0,0 +1,113 @@
+"""
+Run the benchmark suite or compare two result files.
+
+Usage:
+    python -m benchmarks --output benchmarks/results/HEAD.json
+    python -m benchmarks --scale large --only video_analyzer.get_video_statistics
+    python -m benchmarks compare benchmarks/results/base.json benchmarks/results/HEAD.json
+    python -m benchmarks importtime --modules src.app src.ui.data_analysis.main
+"""
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks.fixtures import DEFAULT_SEED, SCALES
+from benchmarks.harness import BENCHMARKS, compare_results, run_benchmarks, write_results
+
+
+def _run(args) -> int:
+    # Import here so 'compare' does not pay for loading the application
+    from benchmarks.suite import BenchmarkData
+
+    data = BenchmarkData(args.scale, args.seed)
+    try:
+        sizes = SCALES[args.scale]
+        print(f"Building {args.scale} fixtures: {sizes['videos']} videos, "
+              f"{sizes['videos'] * sizes['comments_per_video']} comments", file=sys.stderr)
+
+        def progress(name, result):
+            peak = result['peak_memory_bytes']
+            peak_text = f", peak {peak / 2 ** 20:.1f} MiB" if peak is not None else ''
+            print(f"{name}: median {result['median_s']:.4f}s over {result['repeat']} runs{peak_text}", file=sys.stderr)
+
+        results = run_benchmarks(
+            data, names=args.only, repeat=args.repeat, trace_memory=not args.no_memory,
+            meta={'scale': args.scale, 'seed': args.seed, **SCALES[args.scale]}, progress=progress
+        )
+    finally:
+        data.cleanup()
+
+    write_results(results, args.output)
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    if baseline['meta'].get('scale') != current['meta'].get('scale'):
+        print(f"Warning: comparing scale {baseline['meta'].get('scale')} with {current['meta'].get('scale')}", file=sys.stderr)
+    rows = compare_results(baseline, current, threshold=args.threshold)
+    for row in rows:
+        memory = f"{row['memory_ratio']:.2f}x" if row['memory_ratio'] else 'n/a'
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:45} {row['baseline_median_s']:.4f}s -> {row['current_median_s']:.4f}s "
+              f"({row['time_ratio']:.2f}x time, {memory} memory){flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def _importtime(args) -> int:
+    from benchmarks.importtime import run_importtime
+
+    report = run_importtime(args.modules, top=args.top)
+    for module, result in report['results'].items():
+        status = f"  ERROR: {result['error']}" if result['error'] else ''
+        packages = ', '.join(f"{row['package']} {row['self_us'] / 1000:.0f}ms" for row in result['packages'][:5])
+        print(f"{module:35} {result['wall_s']:.3f}s, {result['modules_imported']} modules ({packages}){status}")
+    write_results(report, args.output)
+    print(f"Report written to {args.output}", file=sys.stderr)
+    return 1 if any(result['error'] for result in report['results'].values()) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command')
+
+    compare = subparsers.add_parser('compare', help='Compare two result files')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative slowdown counted as a regression (default: 0.10)')
+
+    importtime = subparsers.add_parser('importtime', help='Profile cold imports with python -X importtime')
+    importtime.add_argument('--modules', nargs='+', metavar='MODULE',
+                            help='Modules to import (default: the app entry points and tab modules)')
+    importtime.add_argument('--top', type=int, default=15, help='Slowest modules kept per report (default: 15)')
+    importtime.add_argument('--output', default='benchmarks/results/importtime.json')
+
+    parser.add_argument('--scale', choices=sorted(SCALES), default='medium',
+                        help='Fixture size; large is 10k videos and 1M comments (default: medium)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS) or 'see benchmarks/suite.py'}")
+    parser.add_argument('--repeat', type=int, help='Override the number of timed repetitions')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc run')
+    parser.add_argument('--output', default='benchmarks/results/latest.json')
+
+    args = parser.parse_args(argv)
+    # The code under test logs heavily; keep the benchmark output readable
+    logging.disable(logging.WARNING)
+    if args.command == 'compare':
+        return _compare(args)
+    if args.command == 'importtime':
+        return _importtime(args)
+    return _run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Deterministic synthetic channels for the benchmark suite.
+
+Channels are built with YouTubeTestFactory from a fixed random seed and a
+fixed reference date, so the same scale and seed always produce the same
+data and results can be compared between commits.
+"""
+import copy
+import random
+import datetime
+from typing import Any, Dict
+
+from tests.utils.youtube_test_factory import YouTubeTestFactory
+
+# Videos per channel and comments per video of each scale
+SCALES = {
+    'tiny': {'videos': 5, 'comments_per_video': 4},
+    'small': {'videos': 200, 'comments_per_video': 10},
+    'medium': {'videos': 2000, 'comments_per_video': 50},
+    'large': {'videos': 10000, 'comments_per_video': 100},
+}
+
+DEFAULT_SEED = 20240501
+
+# Fixed "now" for publish dates, so fixtures do not change from day to day
+REFERENCE_DATE = datetime.datetime(2025, 1, 1)
+
+
+def _published_at(rng: random.Random, max_days: int) -> str:
+    """Deterministic ISO-8601 timestamp within max_days before REFERENCE_DATE."""
+    moment = REFERENCE_DATE - datetime.timedelta(days=rng.randint(0, max_days), seconds=rng.randint(0, 86399))
+    return moment.isoformat() + 'Z'
+
+
+def build_channel(scale: str = 'large', seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """
+    Build a channel in the collection format (videos under 'video_id').
+
+    Args:
+        scale: One of SCALES
+        seed: Random seed
+
+    Returns:
+        Dict with channel fields and a list of videos, each with its comments
+    """
+    sizes = SCALES[scale]
+    random.seed(seed)
+    rng = random.Random(seed)
+
+    channel_id = 'UCbenchmark' + YouTubeTestFactory._random_id(13)
+    channel = YouTubeTestFactory.create_channel(
+        channel_id=channel_id,
+        subscribers='2500000',
+        views='900000000',
+        videos=str(sizes['videos'])
+    )
+    channel['channel_name'] = f"Benchmark Channel ({scale})"
+    channel['channel_description'] = "Synthetic channel for benchmarks"
+    channel['published_at'] = '2010-01-01T00:00:00Z'
+
+    videos = []
+    for i in range(sizes['videos']):
+        video_id = f"v{i:010d}"
+        video = YouTubeTestFactory.create_video(video_id=video_id, title=f"Benchmark Video {i}")
+        video['published_at'] = _published_at(rng, 3650)
+        video['published_date'] = video['published_at'][:10]
+        video['comments'] = []
+        for j in range(sizes['comments_per_video']):
+            comment = YouTubeTestFactory.create_comment(comment_id=f"c{i:010d}_{j:05d}", video_id=video_id)
+            comment['comment_published_at'] = _published_at(rng, 365)
+            video['comments'].append(comment)
+        videos.append(video)
+    channel['video_id'] = videos
+    return channel
+
+
+def build_updated_channel(channel: Dict[str, Any], seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """
+    Build a later snapshot of a channel for delta calculations.
+
+    Statistics grow, a tenth of the videos get one new comment and a few
+    new videos are published.
+
+    Args:
+        channel: Channel from build_channel
+        seed: Random seed
+
+    Returns:
+        Dict in the same format as the input
+    """
+    random.seed(seed + 1)
+    rng = random.Random(seed + 1)
+    updated = copy.deepcopy(channel)
+    updated['subscribers'] = str(int(channel['subscribers']) + 1500)
+    updated['views'] = str(int(channel['views']) + 250000)
+
+    for i, video in enumerate(updated['video_id']):
+        video['views'] = str(int(video['views']) + rng.randint(0, 5000))
+        video['likes'] = str(int(video['likes']) + rng.randint(0, 200))
+        if i % 10 == 0:
+            comment = YouTubeTestFactory.create_comment(comment_id=f"c{i:010d}_new", video_id=video['video_id'])
+            comment['comment_published_at'] = REFERENCE_DATE.isoformat() + 'Z'
+            video['comments'].append(comment)
+            video['comment_count'] = str(int(video['comment_count']) + 1)
+
+    first_new = len(updated['video_id'])
+    for i in range(first_new, first_new + max(1, first_new // 100)):
+        video = YouTubeTestFactory.create_video(video_id=f"v{i:010d}", title=f"Benchmark Video {i}")
+        video['published_at'] = REFERENCE_DATE.isoformat() + 'Z'
+        video['published_date'] = video['published_at'][:10]
+        updated['video_id'].append(video)
+    updated['total_videos'] = str(len(updated['video_id']))
+    return updated
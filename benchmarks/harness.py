@@ -0,0 +1,197 @@
+"""
+Minimal benchmark harness: registration, timing, peak memory and JSON results.
+
+Each benchmark has an untimed setup that returns the arguments of one run,
+so every repetition starts from the same state. Wall time is measured over
+several repetitions; peak memory is measured in one extra run under
+tracemalloc, which would otherwise distort the timings.
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+    name: str
+    run: Callable[..., Any]
+    setup: Optional[Callable[[Any], Tuple]] = None
+    repeat: int = 5
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, setup: Optional[Callable[[Any], Tuple]] = None, repeat: int = 5):
+    """
+    Register a benchmark function.
+
+    Args:
+        name: Benchmark name used in the results
+        setup: Callable taking the fixture data and returning the run arguments
+        repeat: Number of timed repetitions
+    """
+    def decorator(func):
+        BENCHMARKS[name] = Benchmark(name=name, run=func, setup=setup, repeat=repeat)
+        return func
+    return decorator
+
+
+def measure(bench: Benchmark, data: Any, repeat: Optional[int] = None, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Time a benchmark and measure its peak memory.
+
+    Args:
+        bench: The benchmark
+        data: Fixture data passed to its setup
+        repeat: Override of the number of timed repetitions
+        trace_memory: Whether to add a tracemalloc run
+
+    Returns:
+        Dict with per-run timings, summary statistics and peak memory in bytes
+    """
+    timings = []
+    for _ in range(repeat or bench.repeat):
+        args = bench.setup(data) if bench.setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        bench.run(*args)
+        timings.append(time.perf_counter() - start)
+        del args
+
+    result = {
+        'repeat': len(timings),
+        'timings_s': timings,
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'mean_s': statistics.fmean(timings),
+        'max_s': max(timings),
+        'peak_memory_bytes': None
+    }
+
+    if trace_memory:
+        args = bench.setup(data) if bench.setup else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            bench.run(*args)
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(data: Any, names: Optional[List[str]] = None, repeat: Optional[int] = None,
+                   trace_memory: bool = True, meta: Optional[Dict[str, Any]] = None,
+                   progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run registered benchmarks.
+
+    Args:
+        data: Fixture data passed to every setup
+        names: Benchmarks to run; all when None
+        repeat: Override of the number of timed repetitions
+        trace_memory: Whether to measure peak memory
+        meta: Extra metadata stored with the results, e.g. the fixture scale
+        progress: Optional callback called with each benchmark's name and result
+
+    Returns:
+        Dict with 'meta' and per-benchmark 'results', ready to be written as JSON
+    """
+    unknown = set(names or []) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in names or list(BENCHMARKS):
+        results[name] = measure(BENCHMARKS[name], data, repeat=repeat, trace_memory=trace_memory)
+        if progress:
+            progress(name, results[name])
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            **(meta or {})
+        },
+        'results': results
+    }
+
+
+def write_results(results: Dict[str, Any], path: str) -> str:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        results: Output of run_benchmarks
+        path: Output file path
+
+    Returns:
+        str: The path written
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare two result files benchmark by benchmark.
+
+    Args:
+        baseline: Results of the reference commit
+        current: Results of the commit under test
+        threshold: Relative slowdown of the median (or growth of peak memory)
+            that counts as a regression
+
+    Returns:
+        List of per-benchmark comparisons with time and memory ratios
+    """
+    rows = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+        time_ratio = new['median_s'] / old['median_s'] if old['median_s'] else None
+        memory_ratio = (
+            new['peak_memory_bytes'] / old['peak_memory_bytes']
+            if old.get('peak_memory_bytes') and new.get('peak_memory_bytes') else None
+        )
+        rows.append({
+            'name': name,
+            'baseline_median_s': old['median_s'],
+            'current_median_s': new['median_s'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'regression': bool(
+                (time_ratio and time_ratio > 1 + threshold) or (memory_ratio and memory_ratio > 1 + threshold)
+            )
+        })
+    return rows
@@ -0,0 +1,127 @@
+"""
+Import-time profile of the application's entry modules.
+
+Each module is imported in a fresh interpreter started with ``-X importtime``,
+so the report shows what a cold start pays for: the wall time of the import
+the modules with the largest own import time and the same time summed per
+top-level package (e.g. all of pandas), which is what a lazy import saves. The report is plain
+JSON so that two commits can be compared the same way as the benchmark runs.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Entry points profiled when no modules are given
+DEFAULT_MODULES = (
+    'src.config',
+    'src.app',
+    'src.ui',
+    'src.ui.data_analysis.main',
+    'src.ui.data_collection.main',
+    'src.ui.bulk_import.render',
+    'src.ui.utilities',
+)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse the ``-X importtime`` output of an interpreter.
+
+    Args:
+        stderr: Standard error of the profiled interpreter
+
+    Returns:
+        List of dicts with module, self_us, cumulative_us and depth, in import order;
+        depth 0 marks the modules imported directly by the profiled statement or at startup
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            # The nesting is shown with two spaces per level after one separator space
+            'depth': max(len(indent) - 1, 0) // 2,
+        })
+    return entries
+
+
+def profile_import(module: str, top: int = 15, python: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter and summarize where the time went.
+
+    Args:
+        module: Dotted module name
+        top: Number of slowest modules to keep in the report
+        python: Interpreter to use; the running one by default
+
+    Returns:
+        Dict with wall_s (including interpreter startup), total_us (cumulative
+        time of the top-level imports, site included), the top packages and
+        modules by own (self) import time and an error message if the import failed
+    """
+    statement = f"import {module}"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [python or sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, cwd=_PROJECT_ROOT, env=env
+    )
+    wall = time.perf_counter() - start
+
+    entries = parse_importtime(completed.stderr)
+    slowest = sorted(entries, key=lambda entry: entry['self_us'], reverse=True)[:top]
+    packages: Dict[str, int] = {}
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0) + entry['self_us']
+    error = None
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'import failed'
+    return {
+        'module': module,
+        'wall_s': wall,
+        'total_us': sum(entry['cumulative_us'] for entry in entries if entry['depth'] == 0),
+        'modules_imported': len(entries),
+        'packages': [
+            {'package': package, 'self_us': self_us}
+            for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        'top': [
+            {key: entry[key] for key in ('module', 'self_us', 'cumulative_us')} for entry in slowest
+        ],
+        'error': error,
+    }
+
+
+def run_importtime(modules: Optional[List[str]] = None, top: int = 15) -> Dict[str, Any]:
+    """
+    Profile the import of several modules.
+
+    Args:
+        modules: Dotted module names; DEFAULT_MODULES when None
+        top: Number of slowest modules kept per report
+
+    Returns:
+        Dict with 'meta' and per-module 'results', ready to be written as JSON
+    """
+    results = {module: profile_import(module, top=top) for module in modules or DEFAULT_MODULES}
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results
+    }
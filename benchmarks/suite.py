@@ -0,0 +1,119 @@
+"""
+Benchmarks of the storage, delta and analysis hot paths.
+"""
+import copy
+import os
+import shutil
+import tempfile
+from functools import cached_property
+
+from benchmarks.fixtures import DEFAULT_SEED, build_channel, build_updated_channel
+from benchmarks.harness import benchmark
+from src.analysis.comment_analyzer import CommentAnalyzer
+from src.analysis.video_analyzer import VideoAnalyzer
+from src.database.channel_repository import ChannelRepository
+from src.database.sqlite import SQLiteDatabase
+from src.database.video_repository import VideoRepository
+from src.models.youtube import CommentBatch, VideoBatch
+from src.services.youtube.delta_service import DeltaService
+from src.utils.cache_utils import get_analysis_cache
+from src.utils.video_standardizer import standardize_video_data
+
+
+class BenchmarkData:
+    """
+    Fixture data shared by the benchmarks of one run, built on first use.
+
+    Databases are created in a temporary directory removed by cleanup().
+    """
+
+    def __init__(self, scale: str, seed: int = DEFAULT_SEED):
+        self.scale = scale
+        self.seed = seed
+        self.workdir = tempfile.mkdtemp(prefix='ytdatahub-bench-')
+        self._db_count = 0
+
+    @cached_property
+    def channel(self):
+        """Channel in the collection format."""
+        return build_channel(self.scale, self.seed)
+
+    @cached_property
+    def updated_channel(self):
+        """Later snapshot of the channel."""
+        return build_updated_channel(self.channel, self.seed)
+
+    def new_database(self) -> SQLiteDatabase:
+        """Create an empty database with the full schema."""
+        self._db_count += 1
+        return SQLiteDatabase(os.path.join(self.workdir, f'bench_{self._db_count}.db'))
+
+    @cached_property
+    def stored_db_path(self) -> str:
+        """Database holding the channel, shared by the read benchmarks."""
+        db = self.new_database()
+        db.store_channel_data(copy.deepcopy(self.channel))
+        return db.db_path
+
+    @cached_property
+    def analysis_channel_data(self):
+        """The channel in the shape the analysis layer consumes, videos under 'videos' keyed by 'id'."""
+        return {
+            'channel_id': self.channel['channel_id'],
+            'channel_info': {'title': self.channel['channel_name']},
+            'videos': [{**video, 'id': video['video_id']} for video in self.channel['video_id']]
+        }
+
+    def cleanup(self) -> None:
+        """Remove the temporary databases."""
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def _cold_analysis(data):
+    """Analyzer input with the process-wide analysis cache emptied."""
+    get_analysis_cache().clear()
+    return (data.analysis_channel_data,)
+
+
+@benchmark('sqlite.store_channel_data', setup=lambda data: (data.new_database(), copy.deepcopy(data.channel)), repeat=2)
+def bench_store_channel_data(db, channel):
+    db.store_channel_data(channel)
+
+
+@benchmark('channel_repository.get_channel_data',
+           setup=lambda data: (ChannelRepository(data.stored_db_path), data.channel['channel_id']))
+def bench_get_channel_data(repository, channel_id):
+    repository.get_channel_data(channel_id)
+
+
+@benchmark('video_repository.get_videos_page',
+           setup=lambda data: (VideoRepository(data.stored_db_path), data.channel['channel_id']))
+def bench_get_videos_page(repository, channel_id):
+    repository.get_videos_page(channel_id, sort_by='views', limit=25, offset=50)
+
+
+@benchmark('delta_service.calculate_deltas',
+           setup=lambda data: (DeltaService(), copy.deepcopy(data.updated_channel), data.channel))
+def bench_calculate_deltas(service, updated, original):
+    service.calculate_deltas(updated, original)
+
+
+@benchmark('video_analyzer.get_video_statistics', setup=_cold_analysis)
+def bench_video_statistics(channel_data):
+    VideoAnalyzer().get_video_statistics(channel_data)
+
+
+@benchmark('comment_analyzer.get_comment_analysis', setup=_cold_analysis)
+def bench_comment_analysis(channel_data):
+    CommentAnalyzer().get_comment_analysis(channel_data)
+
+
+@benchmark('standardize_video_data', setup=lambda data: (copy.deepcopy(data.channel['video_id']),))
+def bench_standardize_video_data(videos):
+    standardize_video_data(videos)
+
+
+@benchmark('video_batch.from_videos', setup=lambda data: (data.channel['video_id'],))
+def bench_video_batch(videos):
+    VideoBatch.from_videos(videos)
+    CommentBatch.from_videos(videos)
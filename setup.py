@@ -5,4 +5,9 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     python_requires='>=3.7',
-)
\ No newline at end of file
+    entry_points={
+        'console_scripts': [
+            'ytdatahub=src.cli:main',
+        ],
+    },
+)
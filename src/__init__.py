@@ -2,12 +2,18 @@
 YouTube Data Hub package initialization.
 
 This package contains all the core functionality for the YouTube Data Hub application.
+Subpackages are imported on first use so that importing a light module such as
+src.config does not load the API client, the services and the database layer.
 """
+import importlib
 
-# Import key modules to ensure they're available after initialization
-import src.utils
-import src.api
-import src.services
-import src.database
+_SUBPACKAGES = ('utils', 'api', 'services', 'database')
 
-__version__ = "1.0.0"
\ No newline at end of file
+__version__ = "1.0.0"
+
+
+def __getattr__(name):
+    # Keep 'import src' followed by src.utils, src.api, ... working
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
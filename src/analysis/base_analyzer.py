@@ -2,9 +2,11 @@
 Base class for all YouTube data analyzers.
 """
 from abc import ABC, abstractmethod
+import hashlib
 import pandas as pd
 import logging
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Callable, Iterable
+from src.utils.cache_utils import get_analysis_cache
 
 class BaseAnalyzer(ABC):
     """
@@ -92,6 +94,47 @@ class BaseAnalyzer(ABC):
             self.logger.warning(f"Error cleaning dates: {str(e)}")
             return df
     
+    @staticmethod
+    def frame_fingerprint(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> str:
+        """
+        Compute a content fingerprint for a DataFrame snapshot.
+        
+        Args:
+            df: DataFrame to fingerprint
+            columns: Subset of columns that identify the snapshot (all columns if None)
+            
+        Returns:
+            str: Hex digest that changes whenever the selected content changes
+        """
+        if df is None or df.empty:
+            return 'empty'
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        row_hashes = pd.util.hash_pandas_object(df, index=False).values
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def memoize_snapshot(self, name: str, fingerprint: str, builder: Callable[[], Any]) -> Any:
+        """
+        Return a structure derived from a data snapshot, building it only once.
+        
+        Structures live in the process-wide analysis cache, so they are shared
+        by all analyzer instances and sessions and count against its memory budget.
+        
+        Args:
+            name: Name of the derived structure (e.g. 'comment_threads')
+            fingerprint: Snapshot fingerprint, see frame_fingerprint
+            builder: Zero-argument callable that builds the structure
+            
+        Returns:
+            The cached or freshly built structure
+        """
+        # Content-keyed entries are never stale, so they are not tied to a channel
+        cache = get_analysis_cache()
+        key = cache.make_key(None, fingerprint, f"{self.__class__.__name__}.{name}")
+        return cache.get_or_compute(key, builder)
+    
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get analyzer metrics and statistics.
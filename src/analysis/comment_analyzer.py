@@ -1,10 +1,112 @@
 """
 Comment-specific analytics module.
 """
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from src.analysis.base_analyzer import BaseAnalyzer
 
+
+class CommentThreads:
+    """
+    Compact adjacency representation of comment threads.
+    
+    Threads are stored CSR-style: the replies of root ``i`` are the rows
+    ``reply_positions[offsets[i]:offsets[i + 1]]`` of the comment DataFrame.
+    All positions are integer row positions (``df.iloc``), so the structure
+    holds no copies of comment data.
+    """
+    
+    __slots__ = ('root_positions', 'offsets', 'reply_positions', 'reply_roots', 'root_ids')
+    
+    def __init__(self, root_positions, offsets, reply_positions, reply_roots, root_ids):
+        self.root_positions = root_positions
+        self.offsets = offsets
+        self.reply_positions = reply_positions
+        self.reply_roots = reply_roots
+        self.root_ids = root_ids
+    
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build the thread index from a processed comment DataFrame.
+        
+        Args:
+            df: DataFrame produced by CommentAnalyzer._process_comments_data
+            
+        Returns:
+            CommentThreads instance
+        """
+        is_reply = df['Is Reply'].to_numpy(dtype=bool) if 'Is Reply' in df.columns else np.zeros(len(df), dtype=bool)
+        positions = np.arange(len(df))
+        
+        # Roots keyed by comment ID (first occurrence wins for duplicated IDs)
+        roots = pd.DataFrame({
+            'Comment ID': df['Comment ID'].to_numpy()[~is_reply],
+            'root_pos': positions[~is_reply]
+        }).drop_duplicates('Comment ID')
+        root_positions = roots['root_pos'].to_numpy(dtype=np.int64)
+        root_index = pd.Index(roots['Comment ID'])
+        
+        # Attach every reply to its root through the Parent ID (a vectorized join)
+        if 'Parent ID' in df.columns and is_reply.any():
+            parent_ids = df['Parent ID'].to_numpy()[is_reply]
+            reply_roots = root_index.get_indexer(parent_ids)
+            reply_pos = positions[is_reply]
+            attached = reply_roots >= 0
+            reply_roots = reply_roots[attached]
+            reply_pos = reply_pos[attached]
+            order = np.argsort(reply_roots, kind='stable')
+            reply_roots = reply_roots[order].astype(np.int64)
+            reply_positions = reply_pos[order].astype(np.int64)
+        else:
+            reply_roots = np.empty(0, dtype=np.int64)
+            reply_positions = np.empty(0, dtype=np.int64)
+        
+        counts = np.bincount(reply_roots, minlength=len(root_positions))
+        offsets = np.zeros(len(root_positions) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        return cls(root_positions, offsets, reply_positions, reply_roots, root_index)
+    
+    def __len__(self):
+        return len(self.root_positions)
+    
+    @property
+    def reply_counts(self):
+        """Number of replies attached to each root, aligned with root_positions."""
+        return np.diff(self.offsets)
+    
+    def replies(self, thread):
+        """
+        Get the DataFrame row positions of the replies for one thread.
+        
+        Args:
+            thread: Index of the thread (position in root_positions)
+            
+        Returns:
+            numpy array of row positions
+        """
+        return self.reply_positions[self.offsets[thread]:self.offsets[thread + 1]]
+    
+    def match(self, row_mask):
+        """
+        Find threads where the root or any of its replies satisfies a row mask.
+        
+        Args:
+            row_mask: Boolean array aligned with the comment DataFrame rows
+            
+        Returns:
+            Boolean array aligned with root_positions
+        """
+        row_mask = np.asarray(row_mask, dtype=bool)
+        matched = row_mask[self.root_positions].copy()
+        if len(self.reply_positions):
+            reply_hits = self.reply_roots[row_mask[self.reply_positions]]
+            matched[np.unique(reply_hits)] = True
+        return matched
+
+
 class CommentAnalyzer(BaseAnalyzer):
     """Class for analyzing YouTube comment data."""
     
@@ -230,6 +332,8 @@ class CommentAnalyzer(BaseAnalyzer):
             df['Author'] = df['Author'].astype(str)
         if not df.empty and 'Text' in df.columns:
             df['Text'] = df['Text'].astype(str)
+            # Prebuilt lowercase text so searches never re-lowercase on rerun
+            df['Search Text'] = df['Text'].str.lower()
         return df
 
     def _analyze_temporal_data(self, df):
@@ -293,49 +397,30 @@ class CommentAnalyzer(BaseAnalyzer):
                 thread_counts = df[df['Parent ID'].notna()].groupby('Parent ID').size().reset_index(name='Reply Count')
                 thread_counts = thread_counts.sort_values('Reply Count', ascending=False)
                 
-                # Get the threads with the most replies
-                top_threads = thread_counts.head(10)
-                
-                # For each top thread, get the original comment
-                top_thread_data = []
-                for _, row in top_threads.iterrows():
-                    parent_id = row['Parent ID']
-                    parent_comment = df[df['Comment ID'] == parent_id]
-                    
-                    if not parent_comment.empty:
-                        thread_info = {
-                            'parent_id': parent_id,
-                            'reply_count': row['Reply Count'],
-                            'parent_text': parent_comment.iloc[0]['Text'],
-                            'parent_author': parent_comment.iloc[0]['Author'],
-                            'parent_likes': parent_comment.iloc[0]['Likes'],
-                            'video': parent_comment.iloc[0]['Video']
-                        }
-                        top_thread_data.append(thread_info)
-                
-                thread_data['top_threads'] = top_thread_data
-                thread_data['thread_counts'] = thread_counts
-                
-                # Build a complete thread structure for all comments
-                thread_structure = {}
-                root_comments = df[~df['Is Reply']].copy()
-                
-                # First collect all root comments
-                for _, root in root_comments.iterrows():
-                    thread_structure[root['Comment ID']] = {
-                        'comment': root.to_dict(),
-                        'replies': []
+                # Join the busiest threads with their original comment
+                parents = df[['Comment ID', 'Text', 'Author', 'Likes', 'Video']].drop_duplicates('Comment ID')
+                top_threads = thread_counts.head(10).merge(
+                    parents, left_on='Parent ID', right_on='Comment ID', how='inner', sort=False
+                )
+                thread_data['top_threads'] = [
+                    {
+                        'parent_id': row['Parent ID'],
+                        'reply_count': row['Reply Count'],
+                        'parent_text': row['Text'],
+                        'parent_author': row['Author'],
+                        'parent_likes': row['Likes'],
+                        'video': row['Video']
                     }
-                
-                # Then add all replies to their parents
-                reply_comments = df[df['Is Reply']].copy()
-                for _, reply in reply_comments.iterrows():
-                    parent_id = reply['Parent ID']
-                    if parent_id in thread_structure:
-                        thread_structure[parent_id]['replies'].append(reply.to_dict())
-                
-                thread_data['thread_structure'] = thread_structure
-                
+                    for row in top_threads.to_dict('records')
+                ]
+                thread_data['thread_counts'] = thread_counts
+            
+            # Compact thread index, built once per comment snapshot
+            fingerprint = self.frame_fingerprint(df, ['Comment ID', 'Parent ID', 'Is Reply'])
+            thread_data['thread_index'] = self.memoize_snapshot(
+                'comment_threads', fingerprint, lambda: CommentThreads.from_dataframe(df)
+            )
+            
             return thread_data
         except Exception:
             return {
@@ -1,11 +1,75 @@
 """
 Video-specific analytics module.
 """
+import hashlib
 import pandas as pd
 from src.analysis.base_analyzer import BaseAnalyzer
-from src.utils.duration_utils import duration_to_seconds, format_duration, format_duration_human_friendly
+from src.models.youtube import VideoBatch
+from src.utils.duration_utils import (
+    durations_to_seconds, format_duration, format_durations, format_duration_human_friendly
+)
 from src.utils.debug_utils import debug_log
 
+# Upper bounds (seconds) and labels used to bucket videos by duration
+DURATION_BINS = [-float('inf'), 60, 300, 600, 1200, 1800, 3600, float('inf')]
+DURATION_CATEGORIES = ['Under 1 min', '1-5 mins', '5-10 mins', '10-20 mins',
+                       '20-30 mins', '30-60 mins', 'Over 60 mins']
+
+# Columns of the canonical video frame and their dtypes
+VIDEO_FRAME_DTYPES = {
+    'Video ID': 'object',
+    'Title': 'object',
+    'Published': 'datetime64[ns]',
+    'Views': 'int64',
+    'Likes': 'int64',
+    'Comments': 'int64',
+    'Duration': 'object',
+    'Duration_Seconds': 'int64'
+}
+
+
+def _video_snapshot_fields(video):
+    """Project the fields of a raw video that the video frame depends on."""
+    snippet = video.get('snippet') if isinstance(video.get('snippet'), dict) else {}
+    content_details = video.get('contentDetails') if isinstance(video.get('contentDetails'), dict) else {}
+    return (
+        video.get('video_id'), video.get('youtube_id'), video.get('id'),
+        video.get('title'), video.get('published_at'),
+        snippet.get('title'), snippet.get('publishedAt'),
+        video.get('views'), video.get('likes'), video.get('comment_count'),
+        video.get('statistics'), video.get('duration'), content_details.get('duration')
+    )
+
+
+# VideoBatch columns the video frame is built from
+_FRAME_COLUMNS = ('video_id', 'title', 'published_at', 'views', 'likes', 'comment_count',
+                  'duration', 'duration_seconds')
+
+
+def videos_fingerprint(videos):
+    """
+    Compute a content hash for a list of videos.
+    
+    Only the fields used to build the video frame are hashed, so the hash is
+    cheap compared to standardizing the videos and stable across reruns.
+    
+    Args:
+        videos: List of video dictionaries in any supported format, or a VideoBatch
+        
+    Returns:
+        str: Hex digest of the video content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(videos, VideoBatch):
+        for name in _FRAME_COLUMNS:
+            digest.update(repr(list(videos.column(name))).encode('utf-8'))
+        return digest.hexdigest()
+    for video in videos:
+        if isinstance(video, dict):
+            digest.update(repr(_video_snapshot_fields(video)).encode('utf-8'))
+    return digest.hexdigest()
+
+
 class VideoAnalyzer(BaseAnalyzer):
     """Class for analyzing YouTube video data."""
     
@@ -40,6 +104,55 @@ class VideoAnalyzer(BaseAnalyzer):
         
         return results
     
+    def get_video_frame(self, channel_data):
+        """
+        Get the canonical, typed video DataFrame for a channel snapshot.
+        
+        The frame is built once per distinct video content and shared by every
+        VideoAnalyzer method. Callers must not modify it; use
+        get_video_statistics for a private copy.
+        
+        Args:
+            channel_data: Dictionary containing channel data; its videos may be a VideoBatch
+            
+        Returns:
+            DataFrame with the columns in VIDEO_FRAME_DTYPES, or None if there are no videos
+        """
+        if not self.validate_data(channel_data, ['videos']) or not len(channel_data['videos']):
+            return None
+        
+        videos = channel_data['videos']
+        if isinstance(videos, dict):
+            videos = [videos]
+        
+        return self.memoize_snapshot(
+            'video_frame', videos_fingerprint(videos), lambda: self._build_video_frame(videos)
+        )
+    
+    def _build_video_frame(self, videos):
+        """Convert videos into the canonical frame through the columns of a VideoBatch."""
+        # Only the record fields are needed, not the payloads; the caller's videos
+        # (and therefore their fingerprint) stay unchanged
+        batch = videos if isinstance(videos, VideoBatch) else VideoBatch.from_videos(videos, raw='none')
+        
+        debug_log(f"Building video frame for {len(batch)} videos")
+        
+        if not len(batch):
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in VIDEO_FRAME_DTYPES.items()})
+        
+        df = pd.DataFrame({'Video ID': batch.column('video_id'), 'Title': batch.column('title')})
+        published = pd.to_datetime(pd.Series(batch.column('published_at')), errors='coerce', utc=True)
+        df['Published'] = published.dt.tz_localize(None).dt.normalize().astype('datetime64[ns]')
+        for col, name in (('Views', 'views'), ('Likes', 'likes'), ('Comments', 'comment_count')):
+            df[col] = pd.Series(batch.column(name), dtype='int64')
+        # Seconds stored at ingestion need no parsing
+        durations = [duration if seconds is None else seconds
+                     for duration, seconds in zip(batch.column('duration'), batch.column('duration_seconds'))]
+        df['Duration_Seconds'] = durations_to_seconds(pd.Series(durations, dtype='object'))
+        df['Duration'] = format_durations(df['Duration_Seconds'])
+        
+        return df[list(VIDEO_FRAME_DTYPES)]
+    
     def get_video_statistics(self, channel_data):
         """
         Get detailed video statistics.
@@ -50,16 +163,9 @@ class VideoAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with video statistics and DataFrame
         """
-        if not self.validate_data(channel_data, ['videos']):
-            return {
-                'total_videos': 0,
-                'total_views': 0,
-                'avg_views': 0,
-                'df': None
-            }
-            
-        videos = channel_data['videos']
-        if not videos:
+        df = self.get_video_frame(channel_data)
+        
+        if df is None:
             return {
                 'total_videos': 0,
                 'total_views': 0,
@@ -67,83 +173,15 @@ class VideoAnalyzer(BaseAnalyzer):
                 'df': None
             }
         
-        # Use the standardizer to normalize video data format
-        from src.utils.video_standardizer import standardize_video_data
-        videos = standardize_video_data(videos)
-        
-        debug_log(f"Processing {len(videos)} videos in get_video_statistics")
-        
-        # Create pandas DataFrame from videos
-        data = []
-        for video in videos:
-            # Video data is now standardized
-            video_id = video.get('video_id', 'Unknown')
-            title = video.get('title', 'Unknown')
-            published = video.get('published_at', '')
-            
-            # Try to get statistics - handle different formats
-            views = 0
-            likes = 0
-            comments = 0
-            
-            # Option 1: Standard API format
-            if 'statistics' in video and isinstance(video['statistics'], dict):
-                views = self.safe_int_value(video['statistics'].get('viewCount', 0))
-                likes = self.safe_int_value(video['statistics'].get('likeCount', 0))
-                comments = self.safe_int_value(video['statistics'].get('commentCount', 0))
-            
-            # Option 2: Flattened format
-            else:
-                views = self.safe_int_value(video.get('views', 0))
-                likes = self.safe_int_value(video.get('likes', 0))
-                comments = self.safe_int_value(video.get('comment_count', 0))
-            
-            # Get duration
-            duration_str = ''
-            if 'contentDetails' in video and 'duration' in video['contentDetails']:
-                duration_str = video['contentDetails']['duration']
-            elif 'duration' in video:
-                duration_str = video['duration']
-                
-            # Calculate duration in seconds and formatted value
-            duration_seconds = duration_to_seconds(duration_str)
-            formatted_duration = format_duration(duration_seconds)
-            
-            # Record input data in debug log
-            debug_log(f"Video {video_id}: views={views}, likes={likes}, comments={comments}, title={title}")
-            
-            # Create row data
-            row = {
-                'Video ID': video_id,
-                'Title': title,
-                'Published': published,
-                'Views': views,
-                'Likes': likes,
-                'Comments': comments,
-                'Duration': formatted_duration,
-                'Duration_Seconds': duration_seconds
-            }
-            data.append(row)
-            
-        # Create DataFrame
-        df = pd.DataFrame(data)
-        
-        # Add date information (clean dates)
-        if 'Published' in df.columns:
-            try:
-                df['Published'] = pd.to_datetime(df['Published']).dt.date
-            except:
-                pass
-        
         # Calculate statistics
-        total_views = df['Views'].sum() if 'Views' in df.columns else 0
-        avg_views = int(df['Views'].mean()) if 'Views' in df.columns and len(df) > 0 else 0
+        total_views = df['Views'].sum()
+        avg_views = int(df['Views'].mean()) if len(df) > 0 else 0
         
         return {
-            'total_videos': len(videos),
+            'total_videos': len(df),
             'total_views': int(total_views),
             'avg_views': avg_views,
-            'df': df
+            'df': df.copy()
         }
     
     def get_top_videos(self, channel_data, n=10, by='Views'):
@@ -158,20 +196,17 @@ class VideoAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with top videos DataFrame
         """
-        # Get video statistics first
-        video_stats = self.get_video_statistics(channel_data)
+        df = self.get_video_frame(channel_data)
         
-        if video_stats['df'] is None:
+        if df is None:
             return {'df': None}
-            
-        df = video_stats['df']
         
         # Sort by the requested metric and get top n
         if by in df.columns:
-            top_df = df.sort_values(by=by, ascending=False).head(n).reset_index(drop=True)
+            top_df = df.sort_values(by=by, ascending=False, kind='stable').head(n).reset_index(drop=True)
             return {'df': top_df}
         else:
-            return {'df': df.head(n)}
+            return {'df': df.head(n).copy()}
     
     def get_publication_timeline(self, channel_data):
         """
@@ -183,40 +218,26 @@ class VideoAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with timeline DataFrames
         """
-        video_stats = self.get_video_statistics(channel_data)
+        df = self.get_video_frame(channel_data)
         
-        if video_stats['df'] is None:
+        if df is None:
             return {'monthly_df': None, 'yearly_df': None}
-            
-        df = video_stats['df']
         
-        if 'Published' not in df.columns:
-            return {'monthly_df': None, 'yearly_df': None}
-            
-        # Ensure date is in datetime format
-        try:
-            df['Published'] = pd.to_datetime(df['Published'])
-        except:
-            return {'monthly_df': None, 'yearly_df': None}
-        
-        # Extract year and month
-        df['Year'] = df['Published'].dt.year
-        df['Month'] = df['Published'].dt.month
-        df['Month-Year'] = df['Published'].dt.strftime('%b %Y')
+        published = df['Published'].dropna()
         
-        # Monthly analysis
-        monthly = df.groupby('Month-Year').size().reset_index(name='Count')
-        
-        # Make sure we're sorted chronologically by adding an actual date column
-        # Add a proper datetime column for sorting (1st of each month)
-        monthly['__date'] = pd.to_datetime(monthly['Month-Year'], format='%b %Y')
-        # Sort by this date column to ensure chronological order
-        monthly = monthly.sort_values('__date').reset_index(drop=True)
-        # Keep the __date column to ensure proper order in plotly
+        # Monthly analysis, sorted chronologically by the first day of each month
+        months = published.dt.to_period('M')
+        monthly = months.value_counts(sort=False).sort_index()
+        monthly = pd.DataFrame({
+            'Month-Year': monthly.index.strftime('%b %Y'),
+            'Count': monthly.values,
+            # Keep the __date column to ensure proper order in plotly
+            '__date': monthly.index.to_timestamp()
+        })
         
         # Yearly analysis
-        yearly = df.groupby('Year').size().reset_index(name='Videos')
-        yearly = yearly.sort_values('Year').reset_index(drop=True)
+        yearly = published.dt.year.value_counts(sort=False).sort_index()
+        yearly = pd.DataFrame({'Year': yearly.index.astype(int), 'Videos': yearly.values})
         
         return {
             'monthly_df': monthly,
@@ -233,41 +254,16 @@ class VideoAnalyzer(BaseAnalyzer):
         Returns:
             Dictionary with duration analysis
         """
-        video_stats = self.get_video_statistics(channel_data)
+        df = self.get_video_frame(channel_data)
         
-        if video_stats['df'] is None:
+        if df is None or df.empty:
             return {'category_df': None, 'stats': {}}
-            
-        df = video_stats['df']
         
-        if 'Duration_Seconds' not in df.columns:
-            return {'category_df': None, 'stats': {}}
-            
         # Categorize videos by duration
-        def categorize_duration(seconds):
-            if seconds < 60:
-                return 'Under 1 min'
-            elif seconds < 300:
-                return '1-5 mins'
-            elif seconds < 600:
-                return '5-10 mins'
-            elif seconds < 1200:
-                return '10-20 mins'
-            elif seconds < 1800:
-                return '20-30 mins'
-            elif seconds < 3600:
-                return '30-60 mins'
-            else:
-                return 'Over 60 mins'
-                
-        df['Duration Category'] = df['Duration_Seconds'].apply(categorize_duration)
-        
-        # Create category DataFrame
-        categories = ['Under 1 min', '1-5 mins', '5-10 mins', '10-20 mins', 
-                      '20-30 mins', '30-60 mins', 'Over 60 mins']
-        category_counts = df['Duration Category'].value_counts().reindex(categories).fillna(0).astype(int)
+        categories = pd.cut(df['Duration_Seconds'], bins=DURATION_BINS, labels=DURATION_CATEGORIES, right=False)
+        category_counts = categories.value_counts().reindex(DURATION_CATEGORIES).fillna(0).astype(int)
         category_df = pd.DataFrame({
-            'Duration Category': category_counts.index,
+            'Duration Category': category_counts.index.astype(str),
             'Count': category_counts.values
         })
         
@@ -1,20 +1,74 @@
 """
 Analytics functions for YouTube data.
 """
+import hashlib
 import pandas as pd
 from datetime import datetime
 import streamlit as st
 from src.utils.duration_utils import duration_to_seconds, format_duration
 from src.utils.debug_utils import debug_log
+from src.utils.cache_utils import get_analysis_cache
+from src.utils.metrics import timed
 
 """
 Main YouTube analysis facade that integrates all specialized analyzers.
 """
 from src.analysis.channel_analyzer import ChannelAnalyzer
-from src.analysis.video_analyzer import VideoAnalyzer
+from src.analysis.video_analyzer import VideoAnalyzer, videos_fingerprint
 from src.analysis.comment_analyzer import CommentAnalyzer
 from src.analysis.visualization.trend_line import add_trend_line
 
+def get_channel_cache_id(channel_data):
+    """
+    Get the identifier under which a channel's analysis results are cached.
+    
+    Prefers the YouTube channel ID (which the repositories use to invalidate
+    the cache on save) and falls back to the channel title.
+    """
+    channel_info = channel_data.get('channel_info') or {}
+    return (
+        channel_info.get('id') or
+        channel_info.get('channel_id') or
+        channel_data.get('channel_id') or
+        channel_info.get('title')
+    )
+
+def get_channel_data_version(channel_data):
+    """
+    Get a version string identifying the content of a channel snapshot.
+    
+    Uses the stored data version when the snapshot carries one, otherwise a
+    content hash of the channel statistics, videos and comment lists.
+    """
+    if channel_data.get('data_version') is not None:
+        return f"v{channel_data['data_version']}"
+    
+    channel_info = channel_data.get('channel_info') or {}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((channel_info.get('statistics'), channel_info.get('fetched_at'))).encode('utf-8'))
+    videos = channel_data.get('videos') or []
+    digest.update(videos_fingerprint(videos).encode('utf-8'))
+    
+    # Comment lists are summarized by size and boundary IDs instead of hashing every comment
+    def summarize(comments):
+        if not comments:
+            return (0,)
+        first, last = comments[0], comments[-1]
+        return (
+            len(comments),
+            first.get('comment_id', first.get('id')) if isinstance(first, dict) else first,
+            last.get('comment_id', last.get('id')) if isinstance(last, dict) else last
+        )
+    
+    for video in videos:
+        if isinstance(video, dict):
+            digest.update(repr(summarize(video.get('comments'))).encode('utf-8'))
+    comments = channel_data.get('comments')
+    if isinstance(comments, dict):
+        for video_id in sorted(comments):
+            digest.update(repr((video_id, summarize(comments[video_id]))).encode('utf-8'))
+    return digest.hexdigest()
+
 class YouTubeAnalysis:
     """
     Facade class that integrates all specialized analyzers.
@@ -26,6 +80,33 @@ class YouTubeAnalysis:
         self.channel_analyzer = ChannelAnalyzer()
         self.video_analyzer = VideoAnalyzer()
         self.comment_analyzer = CommentAnalyzer()
+        self.cache = get_analysis_cache()
+    
+    def _cached(self, function, channel_data, compute, params=(), refresh=False):
+        """
+        Run an analysis through the process-wide analysis cache.
+        
+        Args:
+            function: Name of the analysis, part of the cache key
+            channel_data: Dictionary containing channel data
+            compute: Zero-argument callable that performs the analysis
+            params: Extra parameters that distinguish results of the same analysis
+            refresh: Recompute and replace any cached result
+            
+        Returns:
+            The cached or freshly computed result
+        """
+        compute = timed('analysis_seconds', function=function)(compute)
+        if not channel_data or not st.session_state.get('use_data_cache', True):
+            return compute()
+        
+        channel_id = get_channel_cache_id(channel_data)
+        key = self.cache.make_key(channel_id, get_channel_data_version(channel_data), function, params)
+        if refresh:
+            result = compute()
+            self.cache.put(key, result)
+            return result
+        return self.cache.get_or_compute(key, compute)
     
     def get_channel_statistics(self, channel_data):
         """
@@ -37,27 +118,10 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with channel statistics
         """
-        # Define a cache key based on channel data
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_channel_stats_{channel_name}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached channel statistics for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute statistics
-            result = self.channel_analyzer.get_channel_statistics(channel_data)
-            
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached channel statistics for: {channel_name}")
-            
-            return result
-        else:
-            return self.channel_analyzer.get_channel_statistics(channel_data)
+        return self._cached(
+            'channel_statistics', channel_data,
+            lambda: self.channel_analyzer.get_channel_statistics(channel_data)
+        )
     
     def get_video_statistics(self, channel_data):
         """
@@ -69,28 +133,16 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with video statistics and DataFrame
         """
-        # Define a cache key based on channel data
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_video_stats_{channel_name}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached video statistics for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute statistics
-            result = self.video_analyzer.get_video_statistics(channel_data)
-            
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached video statistics for: {channel_name}")
-            
-            return result
-        else:
-            return self.video_analyzer.get_video_statistics(channel_data)
-    
+        result = self._cached(
+            'video_statistics', channel_data,
+            lambda: self.video_analyzer.get_video_statistics(channel_data)
+        )
+        # Callers often add columns to the frame, so every caller gets its own copy
+        if result.get('df') is not None:
+            result = dict(result, df=result['df'].copy())
+        return result
+
+
     def get_top_videos(self, channel_data, n=10, by='Views'):
         """
         Get top videos by a specific metric.
@@ -103,27 +155,11 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with top videos DataFrame
         """
-        # Define a cache key based on channel data and parameters
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_top_videos_{channel_name}_{n}_{by}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached top videos for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute top videos
-            result = self.video_analyzer.get_top_videos(channel_data, n, by)
-            
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached top videos for: {channel_name}")
-            
-            return result
-        else:
-            return self.video_analyzer.get_top_videos(channel_data, n, by)
+        return self._cached(
+            'top_videos', channel_data,
+            lambda: self.video_analyzer.get_top_videos(channel_data, n, by),
+            params=(n, by)
+        )
     
     def get_publication_timeline(self, channel_data):
         """
@@ -135,27 +171,10 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with timeline DataFrames
         """
-        # Define a cache key based on channel data
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_timeline_{channel_name}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached publication timeline for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute timeline
-            result = self.video_analyzer.get_publication_timeline(channel_data)
-            
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached publication timeline for: {channel_name}")
-            
-            return result
-        else:
-            return self.video_analyzer.get_publication_timeline(channel_data)
+        return self._cached(
+            'publication_timeline', channel_data,
+            lambda: self.video_analyzer.get_publication_timeline(channel_data)
+        )
     
     def get_duration_analysis(self, channel_data):
         """
@@ -167,27 +186,10 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with duration analysis
         """
-        # Define a cache key based on channel data
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_duration_{channel_name}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached duration analysis for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute duration analysis
-            result = self.video_analyzer.get_duration_analysis(channel_data)
-            
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached duration analysis for: {channel_name}")
-            
-            return result
-        else:
-            return self.video_analyzer.get_duration_analysis(channel_data)
+        return self._cached(
+            'duration_analysis', channel_data,
+            lambda: self.video_analyzer.get_duration_analysis(channel_data)
+        )
     
     def get_comment_analysis(self, channel_data):
         """
@@ -199,49 +201,143 @@ class YouTubeAnalysis:
         Returns:
             Dictionary with comment analysis
         """
-        # Define a cache key based on channel data
-        if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
-            channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_comments_{channel_name}"
-            
-            # Check if we have cached results
-            if cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached comment analysis for: {channel_name}")
-                return st.session_state[cache_key]
-            
-            # Compute comment analysis
-            result = self.comment_analyzer.get_comment_analysis(channel_data)
+        return self._cached(
+            'comment_analysis', channel_data,
+            lambda: self.comment_analyzer.get_comment_analysis(channel_data)
+        )
+    
+    def _coverage_recommendations(self, result):
+        """
+        Build update recommendations for a coverage result.
+        
+        Args:
+            result: Coverage dictionary as returned by get_data_coverage
             
-            # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
-                debug_log(f"Cached comment analysis for: {channel_name}")
+        Returns:
+            List of recommendation strings
+        """
+        recommendations = []
+        
+        # Missing videos recommendation
+        if result['total_videos_reported'] > result['total_videos_collected']:
+            missing_count = result['total_videos_reported'] - result['total_videos_collected']
+            if missing_count > 0:
+                if missing_count == 1:
+                    recommendations.append(f"Collect 1 missing video")
+                else:
+                    recommendations.append(f"Collect {missing_count} missing videos")
+        
+        # Missing comments recommendation
+        if result['videos_with_comments'] < result['total_videos_collected']:
+            missing_comments = result['total_videos_collected'] - result['videos_with_comments']
+            if missing_comments > 0:
+                if missing_comments == 1:
+                    recommendations.append(f"Collect comments for 1 video")
+                else:
+                    recommendations.append(f"Collect comments for {missing_comments} videos")
+        
+        # Data refresh recommendation if we have all videos but data is old
+        if result['is_complete'] and result['last_updated']:
+            days_since_update = (datetime.now() - result['last_updated']).days
+            if days_since_update > 30:  # If data is older than a month
+                recommendations.append(f"Refresh data (last updated {days_since_update} days ago)")
+        
+        # Historical data recommendation
+        if result['historical_completeness'] < 80 and not result['is_complete']:
+            recommendations.append("Collect more historical data to improve coverage")
+        
+        # Recent data recommendation (needs per-video dates, so not available from summaries)
+        temporal = result.get('temporal_coverage')
+        if temporal and temporal['last_month'] < 10 and temporal['last_6_months'] < 20:
+            recommendations.append("Collect more recent videos (last 6 months)")
+        
+        # Set final recommendations (or a "complete" message if everything is there)
+        if not recommendations and result['is_complete'] and result['comment_coverage_percent'] >= 99.0:
+            recommendations.append("Data collection is complete! ✅")
+        
+        return recommendations
+    
+    def coverage_from_summary(self, summary):
+        """
+        Build a coverage result from a precomputed channel_coverage row.
+        
+        Args:
+            summary: Row from the channel_coverage table
             
-            return result
-        else:
-            return self.comment_analyzer.get_comment_analysis(channel_data)
-
+        Returns:
+            Dictionary with the same coverage statistics as get_data_coverage
+        """
+        def parse_date(value):
+            if not value:
+                return None
+            try:
+                parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+                return parsed.replace(tzinfo=None)
+            except ValueError:
+                return None
+        
+        collected = int(summary.get('videos_collected') or 0)
+        reported = int(summary.get('videos_reported') or 0) or max(collected, 1)
+        result = {
+            'total_videos_reported': reported,
+            'total_videos_collected': collected,
+            'videos_with_details': int(summary.get('videos_with_details') or 0),
+            'videos_with_comments': int(summary.get('videos_with_comments') or 0),
+            'latest_video_date': parse_date(summary.get('latest_video_date')),
+            'oldest_video_date': parse_date(summary.get('oldest_video_date')),
+            'last_updated': parse_date(summary.get('channel_fetched_at')),
+            'update_recommendations': [],
+            'video_coverage_percent': min(100.0, collected / reported * 100),
+            'comment_coverage_percent': 0,
+            'historical_completeness': 0,
+            'is_complete': False,
+            'temporal_coverage': None
+        }
+        result['is_complete'] = collected >= reported or result['video_coverage_percent'] >= 99.0
+        if collected > 0:
+            result['comment_coverage_percent'] = min(100.0, result['videos_with_comments'] / collected * 100)
+        if result['latest_video_date'] and result['oldest_video_date']:
+            days_range = (result['latest_video_date'] - result['oldest_video_date']).days
+            channel_age_days = (datetime.now() - result['oldest_video_date']).days
+            if channel_age_days > 0:
+                result['historical_completeness'] = min(100.0, (days_range / channel_age_days) * 100)
+        result['update_recommendations'] = self._coverage_recommendations(result)
+        return result
+    
     def get_data_coverage(self, channel_data, db=None):
         """
         Calculate the data coverage for a channel - how complete the collected data is.
         
         Args:
             channel_data: Dictionary containing channel data
-            db: Database connection (optional)
+            db: Database connection (optional); when given, the precomputed
+                channel_coverage summary is used if the channel has one
             
         Returns:
             Dictionary with coverage statistics and metrics
         """
+        if db is not None and channel_data and 'channel_info' in channel_data:
+            channel_info = channel_data['channel_info']
+            channel_id = get_channel_cache_id(channel_data)
+            summaries = db.get_channel_coverage([channel_id], [channel_info.get('title')])
+            if summaries:
+                return self.coverage_from_summary(summaries[0])
+        
         # Define a cache key based on channel data
         if channel_data and 'channel_info' in channel_data and 'title' in channel_data['channel_info']:
             channel_name = channel_data['channel_info']['title']
-            cache_key = f"analysis_data_coverage_{channel_name}"
+            cache_key = self.cache.make_key(
+                get_channel_cache_id(channel_data), get_channel_data_version(channel_data), 'data_coverage'
+            )
+            use_cache = st.session_state.get('use_data_cache', True)
             
             # Check if we have cached results - but skip cache if explicitly told to
             skip_cache = st.session_state.get('skip_coverage_cache', False)
-            if not skip_cache and cache_key in st.session_state and st.session_state.get('use_data_cache', True):
-                debug_log(f"Using cached data coverage for: {channel_name}")
-                return st.session_state[cache_key]
+            if not skip_cache and use_cache:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    debug_log(f"Using cached data coverage for: {channel_name}")
+                    return cached
             
             # Calculate coverage metrics
             result = {
@@ -414,45 +510,7 @@ class YouTubeAnalysis:
                         }
                 
                 # Generate update recommendations
-                recommendations = []
-                
-                # Missing videos recommendation
-                if result['total_videos_reported'] > result['total_videos_collected']:
-                    missing_count = result['total_videos_reported'] - result['total_videos_collected']
-                    if missing_count > 0:
-                        if missing_count == 1:
-                            recommendations.append(f"Collect 1 missing video")
-                        else:
-                            recommendations.append(f"Collect {missing_count} missing videos")
-                
-                # Missing comments recommendation
-                if result['videos_with_comments'] < result['total_videos_collected']:
-                    missing_comments = result['total_videos_collected'] - result['videos_with_comments']
-                    if missing_comments > 0:
-                        if missing_comments == 1:
-                            recommendations.append(f"Collect comments for 1 video")
-                        else:
-                            recommendations.append(f"Collect comments for {missing_comments} videos")
-                
-                # Data refresh recommendation if we have all videos but data is old
-                if result['is_complete'] and result['last_updated']:
-                    days_since_update = (datetime.now() - result['last_updated']).days
-                    if days_since_update > 30:  # If data is older than a month
-                        recommendations.append(f"Refresh data (last updated {days_since_update} days ago)")
-                
-                # Historical data recommendation
-                if result['historical_completeness'] < 80 and not result['is_complete']:
-                    recommendations.append("Collect more historical data to improve coverage")
-                
-                # Recent data recommendation
-                if result['temporal_coverage']['last_month'] < 10 and result['temporal_coverage']['last_6_months'] < 20:
-                    recommendations.append("Collect more recent videos (last 6 months)")
-                
-                # Set final recommendations (or a "complete" message if everything is there)
-                if not recommendations and result['is_complete'] and result['comment_coverage_percent'] >= 99.0:
-                    recommendations.append("Data collection is complete! ✅")
-                
-                result['update_recommendations'] = recommendations
+                result['update_recommendations'] = self._coverage_recommendations(result)
                 
             except Exception as e:
                 import traceback
@@ -460,8 +518,8 @@ class YouTubeAnalysis:
                 debug_log(traceback.format_exc())
             
             # Cache the result
-            if st.session_state.get('use_data_cache', True):
-                st.session_state[cache_key] = result
+            if use_cache:
+                self.cache.put(cache_key, result)
                 debug_log(f"Cached data coverage for: {channel_name}")
             
             return result
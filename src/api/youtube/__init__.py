@@ -97,6 +97,10 @@ class YouTubeAPI:
         """Resolve a custom URL or handle (@username) to a channel ID"""
         return self.channel_client.resolver.resolve_custom_channel_url(custom_url_or_handle)
     
+    def resolve_channel_references(self, references, allow_search=True):
+        """Resolve several handles or channel URLs to channel IDs, sharing cache reads and writes"""
+        return self.channel_client.resolver.resolve_many(references, allow_search=allow_search)
+    
     def get_playlist_id_for_channel(self, channel_id: str) -> str:
         """
         Fetch the uploads playlist ID for a channel using the YouTube API.
@@ -161,6 +165,21 @@ class YouTubeAPI:
         """
         return self.video_client.get_channel_playlists(channel_id, max_results)
     
+    def expand_playlists(self, playlist_ids, known_video_ids=(), max_workers=8):
+        """
+        Walk several playlists concurrently and fetch details of the unseen videos once
+        
+        Args:
+            playlist_ids: YouTube playlist IDs
+            known_video_ids: Video IDs whose details are already stored, or a callable
+                returning which of the walked video IDs are
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Dict with playlist_items, videos and failed_playlists
+        """
+        return self.video_client.expand_playlists(playlist_ids, known_video_ids, max_workers)
+    
     def test_connection(self):
         """
         Test the API connection with a simple request
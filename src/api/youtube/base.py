@@ -8,27 +8,34 @@ import time
 import random
 import googleapiclient.discovery
 import googleapiclient.errors
+import googleapiclient.http
 from datetime import datetime
 from typing import Dict, Any, Optional, Union
 
-# Try to import streamlit but don't fail if it's not available
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except (ImportError, ModuleNotFoundError):
-    STREAMLIT_AVAILABLE = False
-    # Create a dummy st module with cache_resource decorator for compatibility
-    class DummySt:
-        def cache_resource(self, func):
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
-            
-    st = DummySt()
+# Streamlit is imported on first use, and never in headless runs
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 
 from src.utils.debug_utils import debug_log
 from src.utils.validation import validate_api_key as validate_api_key_format
 from src.config import ENABLE_VERBOSE_API_LOGGING
+from src.utils.metrics import get_metrics_registry
+from src.api.youtube.replay import get_build_options
+from src.api.youtube.rate_limit import get_api_rate_limiter
+
+class InstrumentedHttpRequest(googleapiclient.http.HttpRequest):
+    """HttpRequest that records the latency and quota cost of every API call"""
+
+    def execute(self, http=None, num_retries=0):
+        # Shared by every client and thread, so concurrent walks stay under one rate
+        get_api_rate_limiter().acquire()
+        start = time.perf_counter()
+        try:
+            response = super().execute(http=http, num_retries=num_retries)
+        except Exception:
+            get_metrics_registry().record_api_request(self.methodId or 'unknown', time.perf_counter() - start, error=True)
+            raise
+        get_metrics_registry().record_api_request(self.methodId or 'unknown', time.perf_counter() - start)
+        return response
 
 class YouTubeBaseClient:
     """Base class for YouTube API clients"""
@@ -73,7 +80,8 @@ class YouTubeBaseClient:
         try:
             # Build the YouTube API client
             self.youtube = googleapiclient.discovery.build(
-                "youtube", "v3", developerKey=self.api_key, cache_discovery=False
+                "youtube", "v3", developerKey=self.api_key, cache_discovery=False,
+                requestBuilder=InstrumentedHttpRequest, **get_build_options()
             )
             self._initialized = True
             # Only log success message once per session and if verbose logging is enabled
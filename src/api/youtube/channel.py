@@ -1,7 +1,7 @@
 """
 YouTube API client for channel-related operations.
 """
-import streamlit as st
+from src.utils.headless import st
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
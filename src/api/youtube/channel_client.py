@@ -2,7 +2,7 @@
 YouTube Channel API client implementation
 """
 import logging
-import streamlit as st
+from src.utils.headless import st
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
@@ -23,43 +23,8 @@ from src.api.youtube.base import YouTubeBaseClient
 from src.utils.debug_utils import debug_log
 from src.utils.websocket_utils import websocket_keepalive, ChunkedOperationManager, handle_websocket_error
 
-# Try to import streamlit but don't fail if it's not available
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except (ImportError, ModuleNotFoundError):
-    STREAMLIT_AVAILABLE = False
-    # Create a dummy st module for compatibility
-    class DummySt:
-        def progress(self, *args, **kwargs):
-            return DummyComponent()
-        
-        def empty(self, *args, **kwargs):
-            return DummyComponent()
-            
-        def warning(self, message):
-            print(f"WARNING: {message}")
-            
-        def error(self, message):
-            print(f"ERROR: {message}")
-            
-        def info(self, message):
-            print(f"INFO: {message}")
-            
-        @property
-        def session_state(self):
-            if not hasattr(self, '_session_state'):
-                self._session_state = {}
-            return self._session_state
-            
-    class DummyComponent:
-        def progress(self, *args, **kwargs):
-            pass
-            
-        def text(self, *args, **kwargs):
-            pass
-            
-    st = DummySt()
+# Streamlit is imported on first use, and never in headless runs
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 
 class CommentClient(YouTubeBaseClient):
     """YouTube Data API client focused on comment operations"""
@@ -98,7 +63,7 @@ class CommentClient(YouTubeBaseClient):
             
             try:
                 # QUOTA OPTIMIZATION: Single API call for up to 50 videos (1 quota unit total)
-                debug_log(f"COMMENT DEBUG: Batching statistics check for {len(video_ids)} videos in one API call")
+                debug_log(lambda: f"COMMENT DEBUG: Batching statistics check for {len(video_ids)} videos in one API call")
                 video_ids_str = ','.join(video_ids)
                 
                 video_details_request = self.youtube.videos().list(
@@ -115,7 +80,7 @@ class CommentClient(YouTubeBaseClient):
                     statistics = item.get('statistics', {})
                     stats_map[video_id] = statistics
                 
-                debug_log(f"COMMENT DEBUG: Retrieved statistics for {len(stats_map)} videos")
+                debug_log(lambda: f"COMMENT DEBUG: Retrieved statistics for {len(stats_map)} videos")
                 
                 # Update videos with statistics info
                 for video in batch_videos:
@@ -127,16 +92,16 @@ class CommentClient(YouTubeBaseClient):
                         if 'commentCount' not in statistics:
                             video['comments_disabled'] = True
                             video['comment_count'] = 0
-                            debug_log(f"COMMENT DEBUG: Video {vid_id} has comments disabled")
+                            debug_log(lambda: f"COMMENT DEBUG: Video {vid_id} has comments disabled")
                         else:
                             video['comments_disabled'] = False
                             video['comment_count'] = int(statistics['commentCount'])
-                            debug_log(f"COMMENT DEBUG: Video {vid_id} has {video['comment_count']} comments")
+                            debug_log(lambda: f"COMMENT DEBUG: Video {vid_id} has {video['comment_count']} comments")
                     else:
                         # Video not found in response, treat as error
                         video['comments_disabled'] = True
                         video['comment_count'] = 0
-                        debug_log(f"COMMENT DEBUG: Video {vid_id} not found in statistics response")
+                        debug_log(lambda: f"COMMENT DEBUG: Video {vid_id} not found in statistics response")
                     
                     updated_videos.append(video)
                 
@@ -146,7 +111,7 @@ class CommentClient(YouTubeBaseClient):
                     
             except googleapiclient.errors.HttpError as e:
                 error_text = str(e)
-                debug_log(f"COMMENT DEBUG: Error in batch statistics check: {error_text}")
+                debug_log(lambda: f"COMMENT DEBUG: Error in batch statistics check: {error_text}")
                 
                 # If batch fails, mark all videos in batch as having unknown comment status
                 for video in batch_videos:
@@ -196,7 +161,7 @@ class CommentClient(YouTubeBaseClient):
         
         # Diagnostic: print first 3 video dicts as seen by comment fetching
         for i, v in enumerate(videos[:3]):
-            debug_log(f"[COMMENT FETCH DIAG] Video {i+1}: keys={list(v.keys())}, video_id={v.get('video_id')}, id={v.get('id')}, sample={str(v)[:300]}")
+            debug_log(lambda: f"[COMMENT FETCH DIAG] Video {i+1}: keys={list(v.keys())}, video_id={v.get('video_id')}, id={v.get('id')}, sample={str(v)[:300]}")
         
         if not videos:
             print("WARNING: No videos found to fetch comments for.")
@@ -216,16 +181,8 @@ class CommentClient(YouTubeBaseClient):
         
         # Initialize caches
         self.ensure_api_cache()
-        if STREAMLIT_AVAILABLE:
-            if 'etag_cache' not in st.session_state:
-                st.session_state.etag_cache = {}
-        else:
-            # Use a dummy cache when Streamlit isn't available
-            if not hasattr(self, '_dummy_etag_cache'):
-                self._dummy_etag_cache = {}
-            # Attach to st for API compatibility in the rest of the code
-            st.session_state = getattr(st, 'session_state', {})
-            st.session_state.etag_cache = self._dummy_etag_cache
+        if 'etag_cache' not in st.session_state:
+            st.session_state.etag_cache = {}
         
         try:
             # Repair video_id for each video dict if missing
@@ -242,9 +199,9 @@ class CommentClient(YouTubeBaseClient):
                     )
                     if vid:
                         v['video_id'] = vid
-                        debug_log(f"[COMMENT FETCH REPAIR] Set video_id for video {i+1} from alternate field: {vid}")
+                        debug_log(lambda: f"[COMMENT FETCH REPAIR] Set video_id for video {i+1} from alternate field: {vid}")
                     else:
-                        debug_log(f"[COMMENT FETCH REPAIR] Skipping video {i+1} with no valid video_id. Keys: {list(v.keys())}")
+                        debug_log(lambda: f"[COMMENT FETCH REPAIR] Skipping video {i+1} with no valid video_id. Keys: {list(v.keys())}")
                         continue
                 repaired_videos.append(v)
             videos = repaired_videos
@@ -257,10 +214,10 @@ class CommentClient(YouTubeBaseClient):
             videos_to_fetch = []
             for video in videos:
                 if video.get('comments_disabled', False):
-                    debug_log(f"COMMENT DEBUG: Skipping video {video.get('video_id')} - comments disabled")
+                    debug_log(lambda: f"COMMENT DEBUG: Skipping video {video.get('video_id')} - comments disabled")
                     continue
                 if video.get('comment_count', -1) == 0:
-                    debug_log(f"COMMENT DEBUG: Skipping video {video.get('video_id')} - zero comments")
+                    debug_log(lambda: f"COMMENT DEBUG: Skipping video {video.get('video_id')} - zero comments")
                     # Initialize empty comments array
                     video['comments'] = []
                     continue
@@ -351,7 +308,7 @@ class CommentClient(YouTubeBaseClient):
                                     video['comments'].append(comment_data)
                                     fetched_count += 1
                                 except KeyError as ke:
-                                    debug_log(f"RAPID COMMENT: KeyError in comment structure: {ke}")
+                                    debug_log(lambda: f"RAPID COMMENT: KeyError in comment structure: {ke}")
                                     continue
                             
                             # Cache the results
@@ -374,7 +331,7 @@ class CommentClient(YouTubeBaseClient):
                         
                         # Progress update every 10 videos
                         if (i + 1) % 10 == 0:
-                            debug_log(f"RAPID PROGRESS: Processed {i + 1}/{len(videos_to_fetch)} videos, {total_api_calls} API calls made")
+                            debug_log(lambda: f"RAPID PROGRESS: Processed {i + 1}/{len(videos_to_fetch)} videos, {total_api_calls} API calls made")
                             print(f"⚡ [RAPID] {i + 1}/{len(videos_to_fetch)} videos processed ({total_api_calls} API calls)")
                     
                     # Update videos with rapid results
@@ -607,7 +564,7 @@ class CommentClient(YouTubeBaseClient):
                 if next_page_token:
                     request_params["pageToken"] = next_page_token
                 
-                debug_log(f"COMMENT DEBUG: QUOTA-OPTIMIZED REQUEST: {fetch_count} comments for video {vid_id} (needed: {remaining_needed}, max_per_video: {max_top_level_comments})")
+                debug_log(lambda: f"COMMENT DEBUG: QUOTA-OPTIMIZED REQUEST: {fetch_count} comments for video {vid_id} (needed: {remaining_needed}, max_per_video: {max_top_level_comments})")
                 comments_request = self.youtube.commentThreads().list(**request_params)
                 comments_response = comments_request.execute()
                 
@@ -624,7 +581,7 @@ class CommentClient(YouTubeBaseClient):
                     delay = 1.2  # Conservative delay for large requests
                     
                 time.sleep(delay)
-                debug_log(f"COMMENT DEBUG: Applied {delay}s rate limit delay for {fetch_count} comment request (max_per_video: {max_top_level_comments})")
+                debug_log(lambda: f"COMMENT DEBUG: Applied {delay}s rate limit delay for {fetch_count} comment request (max_per_video: {max_top_level_comments})")
                 
                 response_items = comments_response.get('items', [])
                 if not response_items:
@@ -634,7 +591,7 @@ class CommentClient(YouTubeBaseClient):
                     if top_level_fetched >= max_top_level_comments:
                         break
                     if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                        debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id}. Stopping fetch.")
+                        debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id}. Stopping fetch.")
                         break
                     try:
                         comment = item['snippet']['topLevelComment']['snippet']
@@ -648,7 +605,7 @@ class CommentClient(YouTubeBaseClient):
                             'updated_at': comment.get('updatedAt', comment.get('publishedAt', ''))
                         }
                         if max_comments_per_video > 0 and total_comments_fetched + 1 > max_comments_per_video:
-                            debug_log(f"[COMMENT CAP] Would exceed max_comments_per_video with top-level comment, skipping.")
+                            debug_log(lambda: f"[COMMENT CAP] Would exceed max_comments_per_video with top-level comment, skipping.")
                             break
                         video['comments'].append(comment_data)
                         top_level_fetched += 1
@@ -658,7 +615,7 @@ class CommentClient(YouTubeBaseClient):
                         replies = item.get('replies', {}).get('comments', [])
                         for reply in replies[:max_replies_per_comment]:
                             if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                                debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (in replies). Stopping fetch.")
+                                debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (in replies). Stopping fetch.")
                                 break
                             reply_snippet = reply['snippet']
                             reply_data = {
@@ -674,14 +631,14 @@ class CommentClient(YouTubeBaseClient):
                             video['comments'].append(reply_data)
                             total_comments_fetched += 1
                         if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                            debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (after replies). Stopping fetch.")
+                            debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (after replies). Stopping fetch.")
                             break
                     except KeyError as ke:
-                        debug_log(f"COMMENT DEBUG: KeyError accessing comment structure: {ke}. Item structure: {item}")
+                        debug_log(lambda: f"COMMENT DEBUG: KeyError accessing comment structure: {ke}. Item structure: {item}")
                         continue
                         
                 if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                    debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (end of page). Stopping fetch.")
+                    debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (end of page). Stopping fetch.")
                     break
                 if 'nextPageToken' in comments_response and top_level_fetched < max_top_level_comments:
                     next_page_token = comments_response['nextPageToken']
@@ -794,7 +751,7 @@ class CommentClient(YouTubeBaseClient):
                     if top_level_fetched >= max_top_level_comments:
                         break
                     if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                        debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id}. Stopping fetch.")
+                        debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id}. Stopping fetch.")
                         break
                     try:
                         comment = item['snippet']['topLevelComment']['snippet']
@@ -808,7 +765,7 @@ class CommentClient(YouTubeBaseClient):
                             'updated_at': comment.get('updatedAt', comment.get('publishedAt', ''))
                         }
                         if max_comments_per_video > 0 and total_comments_fetched + 1 > max_comments_per_video:
-                            debug_log(f"[COMMENT CAP] Would exceed max_comments_per_video with top-level comment, skipping.")
+                            debug_log(lambda: f"[COMMENT CAP] Would exceed max_comments_per_video with top-level comment, skipping.")
                             break
                         video['comments'].append(comment_data)
                         top_level_fetched += 1
@@ -817,7 +774,7 @@ class CommentClient(YouTubeBaseClient):
                         replies = item.get('replies', {}).get('comments', [])
                         for reply in replies[:max_replies_per_comment]:
                             if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                                debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (in replies). Stopping fetch.")
+                                debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (in replies). Stopping fetch.")
                                 break
                             reply_snippet = reply['snippet']
                             reply_data = {
@@ -833,13 +790,13 @@ class CommentClient(YouTubeBaseClient):
                             video['comments'].append(reply_data)
                             total_comments_fetched += 1
                         if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                            debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (after replies). Stopping fetch.")
+                            debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (after replies). Stopping fetch.")
                             break
                     except KeyError as ke:
-                        debug_log(f"COMMENT DEBUG: KeyError accessing comment structure: {ke}. Item structure: {item}")
+                        debug_log(lambda: f"COMMENT DEBUG: KeyError accessing comment structure: {ke}. Item structure: {item}")
                         continue
                 if max_comments_per_video > 0 and total_comments_fetched >= max_comments_per_video:
-                    debug_log(f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (end of page). Stopping fetch.")
+                    debug_log(lambda: f"[COMMENT CAP] Reached max_comments_per_video ({max_comments_per_video}) for video {vid_id} (end of page). Stopping fetch.")
                     break
                 if 'nextPageToken' in comments_response and top_level_fetched < max_top_level_comments:
                     next_page_token = comments_response['nextPageToken']
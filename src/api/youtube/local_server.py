@@ -0,0 +1,647 @@
+"""
+Local stand-in for the YouTube Data API v3.
+
+Serves channels, playlistItems, videos, commentThreads, comments and search
+list requests over HTTP from an in-memory dataset, so collection can be load
+tested without network access or quota. The dataset is either synthetic or
+built from the responses in a record/replay cassette. Latency, daily quota,
+per-second rate limits and randomly injected quota errors are configurable,
+and every list endpoint paginates like the real API.
+
+Run it and point the clients at it::
+
+    python -m src.api.youtube.local_server --port 8089 --videos 2000 --latency 0.05
+    YTDATAHUB_API_ENDPOINT=http://127.0.0.1:8089/ streamlit run youtube.py
+
+Any syntactically valid API key is accepted.
+"""
+import sys
+import json
+import time
+import base64
+import random
+import argparse
+import datetime
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.api.youtube.replay import load_cassette
+
+API_PREFIX = '/youtube/v3/'
+
+# Quota units per request; everything not listed costs 1
+QUOTA_COSTS = {'search': 100}
+
+# Default and maximum maxResults of the paginated endpoints
+PAGE_SIZES = {
+    'playlistItems': (5, 50),
+    'commentThreads': (20, 100),
+    'comments': (20, 100),
+    'search': (5, 50),
+}
+
+# Fields returned regardless of the requested parts
+_ALWAYS_RETURNED = ('kind', 'etag', 'id')
+
+
+def _error(code: int, reason: str, message: str, domain: str = 'youtube.api') -> Tuple[int, Dict[str, Any]]:
+    """Error response in the API's format, which googleapiclient turns into HttpError."""
+    return code, {'error': {
+        'code': code,
+        'message': message,
+        'errors': [{'message': message, 'domain': domain, 'reason': reason}]
+    }}
+
+
+def _encode_page_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode().rstrip('=')
+
+
+def _decode_page_token(token: str) -> Optional[int]:
+    try:
+        text = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        return int(text.split(':', 1)[1]) if text.startswith('offset:') else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _select_parts(resource: Dict[str, Any], part: Optional[str]) -> Dict[str, Any]:
+    """Keep only the requested parts of a resource."""
+    if not part:
+        return resource
+    wanted = set(part.split(',')) | set(_ALWAYS_RETURNED)
+    return {key: value for key, value in resource.items() if key in wanted}
+
+
+class LocalYouTubeDataset:
+    """
+    In-memory API resources served by LocalYouTubeServer.
+
+    Resources are stored in the API's own JSON format. Videos added with a
+    channel are appended to that channel's uploads playlist.
+    """
+
+    def __init__(self):
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self.playlist_items: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.comment_threads: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.replies: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        self.comments_disabled: set = set()
+
+    def add_channel(self, channel: Dict[str, Any]) -> None:
+        self.channels[channel['id']] = channel
+
+    def add_video(self, video: Dict[str, Any], add_to_uploads: bool = True) -> None:
+        """
+        Add a video and, optionally, a playlist item in its channel's uploads playlist.
+
+        Args:
+            video: Video resource
+            add_to_uploads: Whether to create the uploads playlist item
+        """
+        self.videos[video['id']] = video
+        channel = self.channels.get(video.get('snippet', {}).get('channelId'))
+        if add_to_uploads and channel:
+            uploads = channel['contentDetails']['relatedPlaylists']['uploads']
+            item_id = f"{uploads}.{video['id']}"
+            self.playlist_items[uploads][item_id] = {
+                'kind': 'youtube#playlistItem',
+                'etag': f"etag-{item_id}",
+                'id': item_id,
+                'snippet': {
+                    'publishedAt': video['snippet'].get('publishedAt'),
+                    'channelId': channel['id'],
+                    'title': video['snippet'].get('title'),
+                    'description': video['snippet'].get('description', ''),
+                    'channelTitle': channel['snippet'].get('title'),
+                    'playlistId': uploads,
+                    'position': len(self.playlist_items[uploads]),
+                    'resourceId': {'kind': 'youtube#video', 'videoId': video['id']}
+                },
+                'contentDetails': {'videoId': video['id'], 'videoPublishedAt': video['snippet'].get('publishedAt')}
+            }
+
+    def add_comment_thread(self, thread: Dict[str, Any]) -> None:
+        """Add a comment thread and the replies embedded in it."""
+        self.comment_threads[thread['snippet']['videoId']][thread['id']] = thread
+        for reply in thread.get('replies', {}).get('comments', []):
+            self.add_reply(reply)
+
+    def add_reply(self, comment: Dict[str, Any]) -> None:
+        self.replies[comment['snippet']['parentId']][comment['id']] = comment
+
+    def add_response(self, response: Dict[str, Any]) -> None:
+        """
+        Add every resource of a recorded list response.
+
+        Args:
+            response: Parsed API response body
+        """
+        for item in response.get('items', []):
+            kind = item.get('kind')
+            if kind == 'youtube#channel':
+                self.add_channel(item)
+            elif kind == 'youtube#video':
+                self.add_video(item, add_to_uploads=False)
+            elif kind == 'youtube#playlistItem':
+                self.playlist_items[item['snippet']['playlistId']][item['id']] = item
+            elif kind == 'youtube#commentThread':
+                self.add_comment_thread(item)
+            elif kind == 'youtube#comment' and item.get('snippet', {}).get('parentId'):
+                self.add_reply(item)
+
+    @classmethod
+    def from_cassette(cls, path: str) -> 'LocalYouTubeDataset':
+        """
+        Build a dataset from the successful responses of a cassette.
+
+        Args:
+            path: Cassette written in record mode
+
+        Returns:
+            LocalYouTubeDataset
+        """
+        dataset = cls()
+        for entry in load_cassette(path):
+            if entry['status'] == 200 and entry['content_type'].startswith('application/json'):
+                dataset.add_response(json.loads(entry['content']))
+        return dataset
+
+    @classmethod
+    def synthetic(cls, channels: int = 1, videos_per_channel: int = 50, comments_per_video: int = 20,
+                  replies_per_comment: int = 0, seed: int = 0) -> 'LocalYouTubeDataset':
+        """
+        Build a deterministic synthetic dataset.
+
+        Args:
+            channels: Number of channels
+            videos_per_channel: Videos in each channel
+            comments_per_video: Comment threads on each video
+            replies_per_comment: Replies in each comment thread
+            seed: Random seed for statistics and dates
+
+        Returns:
+            LocalYouTubeDataset
+        """
+        rng = random.Random(seed)
+        reference = datetime.datetime(2025, 1, 1)
+        dataset = cls()
+
+        def published(max_days):
+            moment = reference - datetime.timedelta(days=rng.randint(0, max_days), seconds=rng.randint(0, 86399))
+            return moment.isoformat() + 'Z'
+
+        for c in range(channels):
+            channel_id = f"UCstandin{c:015d}"
+            title = f"Stand-in Channel {c}"
+            dataset.add_channel({
+                'kind': 'youtube#channel',
+                'etag': f"etag-{channel_id}",
+                'id': channel_id,
+                'snippet': {
+                    'title': title,
+                    'description': f"Synthetic channel {c}",
+                    'customUrl': f"@standin{c}",
+                    'publishedAt': '2010-01-01T00:00:00Z',
+                    'thumbnails': {'default': {'url': f"https://example.invalid/{channel_id}.jpg"}},
+                    'country': 'US'
+                },
+                'contentDetails': {'relatedPlaylists': {'likes': '', 'uploads': 'UU' + channel_id[2:]}},
+                'statistics': {
+                    'viewCount': str(rng.randint(10 ** 6, 10 ** 9)),
+                    'subscriberCount': str(rng.randint(10 ** 3, 10 ** 7)),
+                    'hiddenSubscriberCount': False,
+                    'videoCount': str(videos_per_channel)
+                },
+                'status': {'privacyStatus': 'public', 'isLinked': True},
+                'brandingSettings': {'channel': {'title': title}}
+            })
+
+            for v in range(videos_per_channel):
+                video_id = f"{c:03d}v{v:07d}"
+                video_published = published(3650)
+                dataset.add_video({
+                    'kind': 'youtube#video',
+                    'etag': f"etag-{video_id}",
+                    'id': video_id,
+                    'snippet': {
+                        'publishedAt': video_published,
+                        'channelId': channel_id,
+                        'title': f"Stand-in Video {c}-{v}",
+                        'description': f"Synthetic video {v} of channel {c}",
+                        'thumbnails': {'default': {'url': f"https://example.invalid/{video_id}.jpg"}},
+                        'channelTitle': title,
+                        'tags': ['stand-in', f"channel-{c}"],
+                        'categoryId': '22',
+                        'liveBroadcastContent': 'none'
+                    },
+                    'contentDetails': {
+                        'duration': f"PT{rng.randint(0, 59)}M{rng.randint(1, 59)}S",
+                        'dimension': '2d',
+                        'definition': 'hd',
+                        'caption': 'false',
+                        'licensedContent': False
+                    },
+                    'statistics': {
+                        'viewCount': str(rng.randint(100, 10 ** 7)),
+                        'likeCount': str(rng.randint(0, 10 ** 5)),
+                        'favoriteCount': '0',
+                        'commentCount': str(comments_per_video)
+                    },
+                    'status': {'uploadStatus': 'processed', 'privacyStatus': 'public', 'embeddable': True}
+                })
+
+                for t in range(comments_per_video):
+                    thread_id = f"Ug{video_id}{t:06d}"
+                    replies = []
+                    for r in range(replies_per_comment):
+                        replies.append({
+                            'kind': 'youtube#comment',
+                            'etag': f"etag-{thread_id}.{r}",
+                            'id': f"{thread_id}.{r:04d}",
+                            'snippet': {
+                                'videoId': video_id,
+                                'textDisplay': f"Reply {r} to comment {t}",
+                                'textOriginal': f"Reply {r} to comment {t}",
+                                'parentId': thread_id,
+                                'authorDisplayName': f"Replier {rng.randint(1, 10 ** 6)}",
+                                'likeCount': rng.randint(0, 100),
+                                'publishedAt': published(365),
+                                'updatedAt': reference.isoformat() + 'Z'
+                            }
+                        })
+                    comment_published = published(365)
+                    dataset.add_comment_thread({
+                        'kind': 'youtube#commentThread',
+                        'etag': f"etag-{thread_id}",
+                        'id': thread_id,
+                        'snippet': {
+                            'channelId': channel_id,
+                            'videoId': video_id,
+                            'topLevelComment': {
+                                'kind': 'youtube#comment',
+                                'etag': f"etag-{thread_id}.top",
+                                'id': thread_id,
+                                'snippet': {
+                                    'channelId': channel_id,
+                                    'videoId': video_id,
+                                    'textDisplay': f"Comment {t} on video {video_id}",
+                                    'textOriginal': f"Comment {t} on video {video_id}",
+                                    'authorDisplayName': f"Viewer {rng.randint(1, 10 ** 6)}",
+                                    'likeCount': rng.randint(0, 1000),
+                                    'publishedAt': comment_published,
+                                    'updatedAt': comment_published
+                                }
+                            },
+                            'canReply': True,
+                            'totalReplyCount': replies_per_comment,
+                            'isPublic': True
+                        },
+                        'replies': {'comments': replies}
+                    })
+        return dataset
+
+
+class LocalYouTubeServer:
+    """
+    HTTP server answering YouTube Data API v3 list requests from a dataset.
+
+    Requests are served on worker threads, so concurrent clients see the
+    configured latency in parallel just as with the real API.
+    """
+
+    def __init__(self, dataset: Optional[LocalYouTubeDataset] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, daily_quota: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, quota_error_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            dataset: Resources to serve; a small synthetic dataset by default
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+            latency: Seconds added to every response
+            jitter: Upper bound of extra random latency in seconds
+            daily_quota: Quota units available before quotaExceeded errors, None for unlimited
+            requests_per_second: Requests accepted per second before rateLimitExceeded errors
+            quota_error_rate: Probability of answering any request with quotaExceeded
+            seed: Random seed for jitter and injected errors
+        """
+        self.dataset = dataset or LocalYouTubeDataset.synthetic()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.daily_quota = daily_quota
+        self.requests_per_second = requests_per_second
+        self.quota_error_rate = quota_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent_requests = deque()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as the API endpoint."""
+        return f"http://{self.host}:{self.port}/"
+
+    def reset_stats(self) -> None:
+        """Reset the request counters and the quota used."""
+        with self._lock:
+            self.quota_used = 0
+            self.requests = defaultdict(int)
+            self.errors = defaultdict(int)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get request and quota statistics.
+
+        Returns:
+            Dict with requests and errors per endpoint and the quota used
+        """
+        with self._lock:
+            return {'requests': dict(self.requests), 'errors': dict(self.errors), 'quota_used': self.quota_used}
+
+    def _admit(self, resource: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Apply rate limits, quota and injected errors; returns an error response or None."""
+        cost = QUOTA_COSTS.get(resource, 1)
+        with self._lock:
+            self.requests[resource] += 1
+            if self.requests_per_second:
+                now = time.monotonic()
+                while self._recent_requests and now - self._recent_requests[0] >= 1.0:
+                    self._recent_requests.popleft()
+                if len(self._recent_requests) >= self.requests_per_second:
+                    self.errors['rateLimitExceeded'] += 1
+                    return _error(403, 'rateLimitExceeded', 'The request rate limit has been exceeded.',
+                                  domain='usageLimits')
+                self._recent_requests.append(now)
+            if (self.quota_error_rate and self._rng.random() < self.quota_error_rate) or (
+                    self.daily_quota is not None and self.quota_used + cost > self.daily_quota):
+                self.errors['quotaExceeded'] += 1
+                return _error(403, 'quotaExceeded', 'The request cannot be completed because you have '
+                              'exceeded your <a href="/youtube/v3/getting-started#quota">quota</a>.',
+                              domain='youtube.quota')
+            self.quota_used += cost
+        return None
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Answer one API request.
+
+        Args:
+            method: HTTP method
+            path: Request path, e.g. /youtube/v3/channels
+            params: Query parameters
+
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        if not path.startswith(API_PREFIX):
+            return _error(404, 'notFound', f"Unknown path {path}")
+        resource = path[len(API_PREFIX):].strip('/')
+        handler = getattr(self, f"_list_{resource}", None)
+        if method != 'GET' or handler is None:
+            return _error(404, 'notFound', f"{method} {resource} is not supported by the local API")
+        if not params.get('key'):
+            return _error(403, 'forbidden', 'The request is missing a valid API key.', domain='global')
+        if 'part' not in params:
+            return _error(400, 'required', "No filter selected. Expected one of: part", domain='global')
+
+        rejected = self._admit(resource)
+        if rejected:
+            return rejected
+        return handler(params)
+
+    def _page(self, resource: str, kind: str, items: List[Dict[str, Any]], params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """Paginated list response."""
+        default_size, max_size = PAGE_SIZES[resource]
+        try:
+            size = max(1, min(int(params.get('maxResults', default_size)), max_size))
+        except ValueError:
+            return _error(400, 'invalidParameter', 'Invalid value for maxResults', domain='global')
+        offset = 0
+        if params.get('pageToken'):
+            offset = _decode_page_token(params['pageToken'])
+            if offset is None:
+                return _error(400, 'invalidPageToken', 'The request specifies an invalid page token.')
+
+        page = items[offset:offset + size]
+        body = {
+            'kind': kind,
+            'etag': f"etag-{resource}-{offset}",
+            'pageInfo': {'totalResults': len(items), 'resultsPerPage': size},
+            'items': [_select_parts(item, params['part']) for item in page]
+        }
+        if offset + size < len(items):
+            body['nextPageToken'] = _encode_page_token(offset + size)
+        if offset:
+            body['prevPageToken'] = _encode_page_token(max(0, offset - size))
+        return 200, body
+
+    @staticmethod
+    def _by_id(store: Dict[str, Dict[str, Any]], kind: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """Non-paginated response for a comma separated id list."""
+        ids = [item_id for item_id in params['id'].split(',') if item_id]
+        if len(ids) > 50:
+            return _error(400, 'invalidParameter', 'Too many ids, at most 50 are allowed', domain='global')
+        items = [_select_parts(store[item_id], params['part']) for item_id in ids if item_id in store]
+        return 200, {'kind': kind, 'etag': f"etag-{len(items)}",
+                     'pageInfo': {'totalResults': len(items), 'resultsPerPage': len(items)}, 'items': items}
+
+    def _list_channels(self, params):
+        kind = 'youtube#channelListResponse'
+        if 'id' in params:
+            return self._by_id(self.dataset.channels, kind, params)
+        handle = params.get('forHandle', '').lstrip('@').lower()
+        username = params.get('forUsername', '').lower()
+        if not (handle or username):
+            return _error(400, 'missingRequiredParameter', 'No filter selected. Expected one of: id, forHandle, forUsername')
+        matches = [
+            channel for channel in self.dataset.channels.values()
+            if (handle and channel['snippet'].get('customUrl', '').lstrip('@').lower() == handle)
+            or (username and channel['snippet'].get('title', '').replace(' ', '').lower() == username)
+        ]
+        return self._by_id({channel['id']: channel for channel in matches}, kind,
+                           {**params, 'id': ','.join(channel['id'] for channel in matches)})
+
+    def _list_videos(self, params):
+        if 'id' not in params:
+            return _error(400, 'missingRequiredParameter', 'No filter selected. Expected one of: id')
+        return self._by_id(self.dataset.videos, 'youtube#videoListResponse', params)
+
+    def _list_playlistItems(self, params):
+        playlist_id = params.get('playlistId')
+        if not playlist_id:
+            return _error(400, 'missingRequiredParameter', 'No filter selected. Expected one of: playlistId')
+        if playlist_id not in self.dataset.playlist_items:
+            return _error(404, 'playlistNotFound', 'The playlist identified with the request\'s playlistId parameter cannot be found.')
+        return self._page('playlistItems', 'youtube#playlistItemListResponse',
+                          list(self.dataset.playlist_items[playlist_id].values()), params)
+
+    def _list_commentThreads(self, params):
+        video_id = params.get('videoId')
+        if not video_id:
+            return _error(400, 'missingRequiredParameter', 'No filter selected. Expected one of: videoId')
+        if video_id in self.dataset.comments_disabled:
+            return _error(403, 'commentsDisabled', "The video identified by the videoId parameter has disabled comments.")
+        if video_id not in self.dataset.videos and video_id not in self.dataset.comment_threads:
+            return _error(404, 'videoNotFound', 'The video identified by the videoId parameter could not be found.')
+        return self._page('commentThreads', 'youtube#commentThreadListResponse',
+                          list(self.dataset.comment_threads.get(video_id, {}).values()), params)
+
+    def _list_comments(self, params):
+        parent_id = params.get('parentId')
+        if not parent_id:
+            return _error(400, 'missingRequiredParameter', 'No filter selected. Expected one of: parentId')
+        return self._page('comments', 'youtube#commentListResponse',
+                          list(self.dataset.replies.get(parent_id, {}).values()), params)
+
+    def _list_search(self, params):
+        query = params.get('q', '').lower()
+        result_type = params.get('type', 'video,channel')
+        channel_filter = params.get('channelId')
+        results = []
+        if 'channel' in result_type:
+            for channel in self.dataset.channels.values():
+                snippet = channel['snippet']
+                if query in snippet.get('title', '').lower() or query in snippet.get('customUrl', '').lower():
+                    results.append(self._search_result('youtube#channel', 'channelId', channel['id'], channel['id'], snippet))
+        if 'video' in result_type:
+            for video in self.dataset.videos.values():
+                snippet = video['snippet']
+                if channel_filter and snippet.get('channelId') != channel_filter:
+                    continue
+                if query in snippet.get('title', '').lower():
+                    results.append(self._search_result('youtube#video', 'videoId', video['id'], snippet.get('channelId'), snippet))
+        return self._page('search', 'youtube#searchListResponse', results, params)
+
+    @staticmethod
+    def _search_result(kind: str, id_field: str, resource_id: str, channel_id: str, snippet: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'kind': 'youtube#searchResult',
+            'etag': f"etag-search-{resource_id}",
+            'id': {'kind': kind, id_field: resource_id},
+            'snippet': {
+                'publishedAt': snippet.get('publishedAt'),
+                'channelId': channel_id,
+                'title': snippet.get('title'),
+                'description': snippet.get('description', ''),
+                'thumbnails': snippet.get('thumbnails', {}),
+                'channelTitle': snippet.get('channelTitle', snippet.get('title')),
+                'liveBroadcastContent': 'none'
+            }
+        }
+
+    def _sleep(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {name: values[-1] for name, values in parse_qs(parts.query, keep_blank_values=True).items()}
+                server._sleep()
+                status, body = server.handle('GET', parts.path, params)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> str:
+        """
+        Start serving on a background thread.
+
+        Returns:
+            str: The base URL of the server
+        """
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='local-youtube-api', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'LocalYouTubeServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.api.youtube.local_server',
+                                     description='Serve a local stand-in for the YouTube Data API v3')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--cassette', help='Serve the resources recorded in this cassette instead of synthetic data')
+    parser.add_argument('--channels', type=int, default=1)
+    parser.add_argument('--videos', type=int, default=50, help='Videos per channel')
+    parser.add_argument('--comments', type=int, default=20, help='Comment threads per video')
+    parser.add_argument('--replies', type=int, default=0, help='Replies per comment thread')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Maximum extra random latency in seconds')
+    parser.add_argument('--daily-quota', type=int, help='Quota units before quotaExceeded errors')
+    parser.add_argument('--requests-per-second', type=float, help='Rate limit before rateLimitExceeded errors')
+    parser.add_argument('--quota-error-rate', type=float, default=0.0, help='Probability of an injected quotaExceeded error')
+    args = parser.parse_args(argv)
+
+    if args.cassette:
+        dataset = LocalYouTubeDataset.from_cassette(args.cassette)
+    else:
+        dataset = LocalYouTubeDataset.synthetic(args.channels, args.videos, args.comments, args.replies, args.seed)
+    server = LocalYouTubeServer(
+        dataset, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        daily_quota=args.daily_quota, requests_per_second=args.requests_per_second,
+        quota_error_rate=args.quota_error_rate, seed=args.seed
+    )
+    url = server.start()
+    print(f"Local YouTube API serving {len(dataset.channels)} channels and {len(dataset.videos)} videos at {url}",
+          file=sys.stderr)
+    print(f"Point the app at it with YTDATAHUB_API_ENDPOINT={url}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"Served {sum(server.stats()['requests'].values())} requests, {server.stats()['quota_used']} quota units",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
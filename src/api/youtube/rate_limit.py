@@ -0,0 +1,121 @@
+"""
+Process-wide request rate limit for the YouTube API clients.
+
+Every request goes through InstrumentedHttpRequest.execute, which waits for a
+slot from the shared limiter, so threads walking playlists concurrently stay
+under one combined rate. The limit is off by default and is set with::
+
+    YTDATAHUB_API_RATE_LIMIT=10   # requests per second
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+import httplib2
+import googleapiclient.http
+
+from src.utils.debug_utils import debug_log
+
+# Environment variable read at import
+API_RATE_LIMIT_ENV = 'YTDATAHUB_API_RATE_LIMIT'
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing requests evenly at a maximum rate."""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_second: Maximum rate; None or 0 disables the limit
+        """
+        self.requests_per_second = requests_per_second or None
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """
+        Wait until the next request may be sent.
+
+        Returns:
+            float: Seconds waited
+        """
+        if not self.requests_per_second:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.requests_per_second
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+
+_rate_limiter = RateLimiter()
+_thread_http = threading.local()
+
+
+def configure_api_rate_limit(requests_per_second: Optional[float] = None) -> RateLimiter:
+    """
+    Replace the process-wide limiter.
+
+    Args:
+        requests_per_second: Maximum combined rate of all clients; None or 0 disables the limit
+
+    Returns:
+        RateLimiter: The new limiter
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(requests_per_second)
+    if requests_per_second:
+        debug_log(f"YouTube API rate limit: {requests_per_second} requests/second")
+    return _rate_limiter
+
+
+def set_api_rate_limiter(limiter: RateLimiter) -> RateLimiter:
+    """
+    Install a limiter built elsewhere, e.g. one shared by several processes.
+
+    Args:
+        limiter: Any object with an acquire() method like RateLimiter's
+
+    Returns:
+        RateLimiter: The limiter it replaced
+    """
+    global _rate_limiter
+    previous, _rate_limiter = _rate_limiter, limiter
+    return previous
+
+
+def get_api_rate_limiter() -> RateLimiter:
+    """Get the process-wide limiter."""
+    return _rate_limiter
+
+
+def get_thread_http(client_http=None):
+    """
+    Get an HTTP object that is safe to use from the calling thread.
+
+    httplib2.Http, used by the live transport, must not be shared between
+    threads, so each thread gets its own. The record and replay transports are
+    already thread-safe and are returned as they are.
+
+    Args:
+        client_http: The HTTP object the API service was built with
+
+    Returns:
+        The HTTP object to pass to HttpRequest.execute
+    """
+    if client_http is not None and not isinstance(client_http, httplib2.Http):
+        return client_http
+    http = getattr(_thread_http, 'http', None)
+    if http is None:
+        http = _thread_http.http = googleapiclient.http.build_http()
+    return http
+
+
+if os.getenv(API_RATE_LIMIT_ENV):
+    configure_api_rate_limit(float(os.getenv(API_RATE_LIMIT_ENV)))
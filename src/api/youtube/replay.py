@@ -0,0 +1,230 @@
+"""
+Record/replay transport for the YouTube API clients.
+
+YouTubeBaseClient builds its googleapiclient service with the options
+returned by get_build_options(). In the default 'live' mode these are empty
+and requests go to the real API. In 'record' mode every response is also
+appended to a JSON Lines cassette; in 'replay' mode responses are served from
+the cassette and nothing touches the network. An endpoint such as the local
+stand-in server can be combined with any mode.
+
+The transport is process-wide because the clients are created deep inside the
+services with only an API key, for example::
+
+    YTDATAHUB_API_MODE=replay YTDATAHUB_API_CASSETTE=tests/cassettes/channel.jsonl
+
+Cassette entries are keyed by HTTP method, path and query string without the
+API key, so recordings can be replayed against any endpoint and never store
+credentials.
+"""
+import os
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httplib2
+import googleapiclient.http
+
+from src.utils.debug_utils import debug_log
+
+API_MODES = ('live', 'record', 'replay')
+
+# Environment variables read at import
+API_MODE_ENV = 'YTDATAHUB_API_MODE'
+API_CASSETTE_ENV = 'YTDATAHUB_API_CASSETTE'
+API_ENDPOINT_ENV = 'YTDATAHUB_API_ENDPOINT'
+
+# Query parameters left out of cassette keys
+_IGNORED_PARAMS = {'key'}
+
+_transport_lock = threading.Lock()
+_transport: Dict[str, Any] = {'mode': 'live', 'cassette_path': None, 'endpoint': None, 'http': None}
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response"""
+
+
+def request_key(method: str, uri: str) -> str:
+    """
+    Build the cassette key of a request.
+
+    Args:
+        method: HTTP method
+        uri: Full request URI
+
+    Returns:
+        str: "METHOD /path?query" with the API key removed and parameters sorted
+    """
+    parts = urlsplit(uri)
+    params = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if name not in _IGNORED_PARAMS)
+    return f"{method.upper()} {parts.path}?{urlencode(params)}"
+
+
+def _response(status: int, content_type: str = 'application/json; charset=UTF-8') -> httplib2.Response:
+    return httplib2.Response({'status': str(status), 'content-type': content_type})
+
+
+class RecordingHttp:
+    """
+    httplib2-compatible transport that performs requests and appends each
+    response to a cassette.
+
+    googleapiclient requests may run on several threads, so every thread gets
+    its own underlying connection and cassette writes are serialized.
+    """
+
+    def __init__(self, cassette_path: str, http_factory=googleapiclient.http.build_http):
+        """
+        Args:
+            cassette_path: JSON Lines file to append to
+            http_factory: Callable creating the underlying httplib2.Http
+        """
+        self.cassette_path = cassette_path
+        self._http_factory = http_factory
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.recorded = 0
+        directory = os.path.dirname(cassette_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _http(self):
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = self._http_factory()
+        return http
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs) -> Tuple[httplib2.Response, bytes]:
+        response, content = self._http().request(uri, method, body=body, headers=headers, **kwargs)
+        entry = {
+            'key': request_key(method, uri),
+            'status': response.status,
+            'content_type': response.get('content-type', 'application/json; charset=UTF-8'),
+            'content': content.decode('utf-8') if isinstance(content, bytes) else content
+        }
+        with self._write_lock:
+            with open(self.cassette_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.recorded += 1
+        return response, content
+
+
+class ReplayHttp:
+    """
+    httplib2-compatible transport that serves responses from a cassette.
+
+    Responses recorded for the same request are returned in recording order;
+    once they run out the last one keeps being returned.
+    """
+
+    def __init__(self, cassette_path: Optional[str] = None, entries: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            cassette_path: JSON Lines cassette written by RecordingHttp
+            entries: Cassette entries, as an alternative to a file
+        """
+        self._responses: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        for entry in entries if entries is not None else load_cassette(cassette_path):
+            self._responses[entry['key']].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._responses.values())
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs) -> Tuple[httplib2.Response, bytes]:
+        key = request_key(method, uri)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                raise ReplayMissError(f"No recorded response for {key}")
+            entry = responses[min(self._served[key], len(responses) - 1)]
+            self._served[key] += 1
+        return _response(entry['status'], entry['content_type']), entry['content'].encode('utf-8')
+
+
+def load_cassette(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the entries of a cassette.
+
+    Args:
+        path: JSON Lines cassette file
+
+    Returns:
+        List of entries with key, status, content_type and content
+    """
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def configure_api_transport(mode: str = 'live', cassette_path: Optional[str] = None,
+                            endpoint: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Set the process-wide transport used by clients initialized afterwards.
+
+    Args:
+        mode: 'live', 'record' or 'replay'
+        cassette_path: Cassette file, required when recording or replaying
+        endpoint: Base URL replacing https://youtube.googleapis.com/, e.g. the
+            local stand-in server
+
+    Returns:
+        Dict[str, Any]: The active transport settings
+    """
+    if mode not in API_MODES:
+        raise ValueError(f"Unknown API mode '{mode}', expected one of {', '.join(API_MODES)}")
+    if mode != 'live' and not cassette_path:
+        raise ValueError(f"API mode '{mode}' needs a cassette path")
+
+    if mode == 'record':
+        http = RecordingHttp(cassette_path)
+    elif mode == 'replay':
+        http = ReplayHttp(cassette_path)
+    else:
+        http = None
+
+    if endpoint and not endpoint.endswith('/'):
+        endpoint += '/'
+
+    with _transport_lock:
+        _transport.update(mode=mode, cassette_path=cassette_path, endpoint=endpoint, http=http)
+    if mode != 'live' or endpoint:
+        debug_log(f"YouTube API transport: mode={mode}, cassette={cassette_path}, endpoint={endpoint or 'default'}")
+    return get_api_transport()
+
+
+def get_api_transport() -> Dict[str, Any]:
+    """
+    Get the active transport settings.
+
+    Returns:
+        Dict[str, Any]: mode, cassette_path, endpoint and the transport object
+    """
+    with _transport_lock:
+        return dict(_transport)
+
+
+def get_build_options() -> Dict[str, Any]:
+    """
+    Get the googleapiclient.discovery.build keyword arguments of the active transport.
+
+    Returns:
+        Dict[str, Any]: Empty in live mode against the real API
+    """
+    transport = get_api_transport()
+    options = {}
+    if transport['http'] is not None:
+        options['http'] = transport['http']
+    if transport['endpoint']:
+        options['client_options'] = {'api_endpoint': transport['endpoint']}
+    return options
+
+
+if os.getenv(API_MODE_ENV) or os.getenv(API_ENDPOINT_ENV):
+    configure_api_transport(
+        os.getenv(API_MODE_ENV, 'live'), os.getenv(API_CASSETTE_ENV), os.getenv(API_ENDPOINT_ENV)
+    )
@@ -1,142 +1,258 @@
 """
 YouTube channel URL and handle resolver module.
+
+Handles and legacy usernames resolve with channels.list(forHandle=...) or
+channels.list(forUsername=...), which cost 1 quota unit. search.list costs
+100 units and is only used when neither filter finds the channel. Every
+answer, including "no such channel", is kept in the persistent
+channel_handles cache so repeated and bulk lookups skip the API entirely.
 """
-import streamlit as st
-from typing import Optional
+from src.utils.headless import st
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
 import googleapiclient.errors
 
+from src.config import SQLITE_DB_PATH
 from src.utils.debug_utils import debug_log
 from src.api.youtube.base import YouTubeBaseClient
+from src.database.handle_repository import HandleRepository
+
+_CHANNEL_ID_RE = re.compile(r'^UC[\w-]{22}$')
+
+# API filters tried, in order, for each kind of reference before falling back to search
+_LOOKUP_FILTERS = {
+    'handle': ('forHandle',),
+    'username': ('forUsername', 'forHandle'),
+    'custom': ('forHandle', 'forUsername'),
+}
+
+
+def parse_channel_reference(custom_url_or_handle: str) -> Optional[Tuple[str, str]]:
+    """
+    Classify a channel reference.
+
+    Args:
+        custom_url_or_handle: A handle (@name), custom name, channel URL or
+            channel ID, optionally with the internal "resolve:" prefix
+
+    Returns:
+        Optional[Tuple[str, str]]: (kind, value) where kind is "id", "handle"
+        (value without the @), "username" (youtube.com/user/...) or "custom";
+        None for empty input
+    """
+    query = (custom_url_or_handle or '').strip()
+
+    # Remove 'resolve:' prefix if present (internal format)
+    if query.startswith('resolve:'):
+        query = query[8:].strip()
+    query = query.split('?')[0].split('#')[0]
+
+    if '/' in query:
+        parts = [part for part in query.split('/') if part]
+        for marker, kind in (('channel', 'id'), ('user', 'username'), ('c', 'custom')):
+            if marker in parts[:-1]:
+                return kind, parts[parts.index(marker) + 1]
+        handles = [part for part in parts if part.startswith('@')]
+        query = handles[0] if handles else (parts[-1] if parts else '')
+
+    if not query:
+        return None
+    if query.startswith('@'):
+        return 'handle', query[1:]
+    if _CHANNEL_ID_RE.match(query):
+        return 'id', query
+    return 'custom', query
+
+
+def _lookup_key(kind: str, value: str) -> str:
+    # Handles and usernames are case-insensitive
+    return f"{kind}:{value.lower()}"
+
 
 class ChannelResolver(YouTubeBaseClient):
     """Class for resolving YouTube channel handles and custom URLs to channel IDs"""
-    
+
+    def __init__(self, api_key: str = None, db_path: Optional[str] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            api_key: YouTube API key
+            db_path: SQLite database holding the handle cache; the configured database by default
+        """
+        super().__init__(api_key)
+        self.handle_cache = HandleRepository(str(db_path or SQLITE_DB_PATH))
+
     def resolve_custom_channel_url(self, custom_url_or_handle: str) -> Optional[str]:
         """
         Resolve a custom URL or handle (@username) to a channel ID.
-        
+
         Args:
             custom_url_or_handle (str): The custom URL, handle, or username to resolve
-            
+
         Returns:
             str or None: The resolved channel ID or None if resolution failed
         """
-        if not self.is_initialized():
-            st.error("YouTube API client not initialized. Please check your API key.")
-            return None
-            
-        debug_log(f"Resolving custom URL or handle: {custom_url_or_handle}")
-        
-        # Clean up input
-        query = custom_url_or_handle.strip()
-        
-        # Remove 'resolve:' prefix if present (internal format)
-        if query.startswith('resolve:'):
-            query = query[8:].strip()
-        
-        # Process based on URL format
-        if query.startswith('@'):
-            handle = query
-            debug_log(f"Processing as channel handle: {handle}")
-        elif '/' in query:
-            # Extract the last part of the URL
-            parts = query.strip('/').split('/')
-            handle = parts[-1]
-            if handle.startswith('@'):
-                debug_log(f"Extracted handle from URL: {handle}")
+        return self.resolve_many([custom_url_or_handle]).get(custom_url_or_handle)
+
+    def resolve_many(self, references: Iterable[str], allow_search: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Resolve several handles, custom URLs or usernames to channel IDs.
+
+        Duplicate references are looked up once, cached answers are read with a
+        single query and the new answers are cached in one transaction.
+
+        Args:
+            references: Handles, custom names or channel URLs
+            allow_search: Fall back to the 100-unit search.list when the
+                1-unit forHandle/forUsername lookups find nothing
+
+        Returns:
+            Dict[str, Optional[str]]: Channel ID (or None) for every input reference
+        """
+        references = list(references)
+        parsed = {reference: parse_channel_reference(reference) for reference in references}
+        keys = {reference: _lookup_key(*ref) for reference, ref in parsed.items() if ref and ref[0] != 'id'}
+
+        resolved = self.handle_cache.get_cached(keys.values())
+        pending = {}
+        for reference, key in keys.items():
+            if key not in resolved:
+                pending.setdefault(key, parsed[reference])
+        debug_log(f"Resolving {len(references)} channel references: {len(resolved)} cached, {len(pending)} to look up")
+
+        if pending:
+            if not self.is_initialized():
+                st.error("YouTube API client not initialized. Please check your API key.")
+            else:
+                answers = self._lookup_pending(pending, allow_search)
+                self.handle_cache.store_resolutions(answers)
+                resolved.update({key: channel_id for key, channel_id, _ in answers})
+
+        results = {}
+        for reference, ref in parsed.items():
+            if ref and ref[0] == 'id':
+                results[reference] = ref[1]
             else:
-                handle = '@' + handle
-                debug_log(f"Converted URL part to handle format: {handle}")
-        else:
-            # If it doesn't have @ or /, add @ to make it a handle format
-            handle = '@' + query
-            debug_log(f"Added @ prefix to make it a handle: {handle}")
-            
+                results[reference] = resolved.get(keys.get(reference))
+        return results
+
+    def _lookup_pending(self, pending: Dict[str, Tuple[str, str]],
+                        allow_search: bool) -> List[Tuple[str, Optional[str], str]]:
+        """
+        Look up uncached references, cheapest API call first.
+
+        Args:
+            pending: (kind, value) by lookup key
+            allow_search: Whether search.list may be used as a last resort
+
+        Returns:
+            List of (lookup_key, channel_id or None, source) for the cache; references
+            left unanswered by an API error are not included so they are retried later
+        """
+        answers = []
         try:
-            # Try to resolve handle or custom URL using search endpoint
-            search_request = self.youtube.search().list(
-                part="snippet",
-                q=handle,
-                type="channel",
-                maxResults=5
-            )
-            search_response = search_request.execute()
-            
-            # Check if we got any results
-            if not search_response.get('items'):
-                debug_log(f"No channels found for query: {handle}")
-                return None
-                
-            # Find the best match by comparing titles and custom URLs
-            best_match = None
-            
-            for item in search_response['items']:
-                channel_id = item['id']['channelId']
-                channel_title = item['snippet']['title']
-                
-                # Get more details about the channel to check custom URL
-                channel_request = self.youtube.channels().list(
-                    part="snippet",
-                    id=channel_id
-                )
-                channel_response = channel_request.execute()
-                
-                if not channel_response.get('items'):
+            for key, (kind, value) in pending.items():
+                channel_id, source = None, None
+                for api_filter in _LOOKUP_FILTERS[kind]:
+                    channel_id = self._lookup_by_filter(api_filter, value)
+                    if channel_id:
+                        source = api_filter
+                        break
+                if not channel_id and allow_search:
+                    channel_id, source = self._search_channel(value), 'search'
+                elif not channel_id:
+                    # Not cached: a later lookup may still search for it
+                    debug_log(f"No channel found for {key} without search")
                     continue
-                    
-                channel_data = channel_response['items'][0]
-                
-                # Check if this is an exact match for handle or custom URL
-                # CustomUrl field might not be available in all channel data
-                channel_custom_url = channel_data['snippet'].get('customUrl', '')
-                
-                debug_log(f"Checking channel: ID={channel_id}, title='{channel_title}', customUrl='{channel_custom_url}'")
-                
-                # Match priority:
-                # 1. Exact match on customUrl (without @)
-                # 2. If we're searching for a handle (@username), match on username
-                # 3. Exact match on title
-                # 4. First result if nothing else matches
-                
-                # Clean handle for comparison by removing @ if present
-                clean_handle = handle[1:] if handle.startswith('@') else handle
-                
-                if channel_custom_url and (
-                    channel_custom_url.lower() == clean_handle.lower() or 
-                    channel_custom_url.lower() == handle.lower()
-                ):
-                    debug_log(f"Found exact match on customUrl: {channel_custom_url}")
-                    best_match = channel_id
-                    break
-                elif handle.startswith('@') and clean_handle.lower() in channel_custom_url.lower():
-                    debug_log(f"Found handle match: @{clean_handle} in {channel_custom_url}")
-                    best_match = channel_id
-                    # Continue looking for exact matches
-                elif clean_handle.lower() in channel_title.lower():
-                    debug_log(f"Found channel with matching title for handle {handle}: {channel_id}")
-                    if not best_match:  # Only set if we don't have a better match
-                        best_match = channel_id
-                elif not best_match:
-                    debug_log(f"Setting initial match: {channel_title} ({channel_id})")
-                    best_match = channel_id
-            
-            # Return the best match if found
-            if best_match:
-                debug_log(f"Resolved {query} to channel ID: {best_match}")
-                return best_match
-            
-            # If we got items but didn't find a good match, use the first result
-            if search_response.get('items'):
-                first_result = search_response.get('items')[0]
-                channel_id = first_result['id']['channelId']
-                debug_log(f"No exact match found, using first search result for {handle}: {channel_id}")
-                return channel_id
-                
-            debug_log(f"Failed to find a good match for: {query}")
-            return None
-            
+                debug_log(f"Resolved {key} to channel ID: {channel_id} via {source}")
+                answers.append((key, channel_id, source))
         except Exception as e:
             self._handle_api_error(e, "resolve_custom_channel_url")
-            return None
\ No newline at end of file
+        return answers
+
+    def _lookup_by_filter(self, api_filter: str, value: str) -> Optional[str]:
+        """
+        Find a channel with a 1-unit channels.list filter.
+
+        Args:
+            api_filter: "forHandle" or "forUsername"
+            value: Handle or username without the @
+
+        Returns:
+            str or None: The channel ID if found
+        """
+        if api_filter == 'forHandle':
+            value = '@' + value
+        response = self.youtube.channels().list(part="id", **{api_filter: value}).execute()
+        items = response.get('items') or []
+        return items[0]['id'] if items else None
+
+    def _search_channel(self, value: str) -> Optional[str]:
+        """
+        Find a channel with search.list, checking the candidates' custom URLs in one channels.list call.
+
+        Args:
+            value: Handle or custom name without the @
+
+        Returns:
+            str or None: The best matching channel ID
+        """
+        handle = '@' + value
+        search_response = self.youtube.search().list(
+            part="snippet",
+            q=handle,
+            type="channel",
+            maxResults=5
+        ).execute()
+
+        items = search_response.get('items') or []
+        if not items:
+            debug_log(f"No channels found for query: {handle}")
+            return None
+
+        # One call for all candidates instead of one per search hit
+        candidate_ids = [item['id']['channelId'] for item in items]
+        channel_response = self.youtube.channels().list(
+            part="snippet",
+            id=','.join(candidate_ids)
+        ).execute()
+        custom_urls = {
+            channel['id']: channel.get('snippet', {}).get('customUrl', '')
+            for channel in channel_response.get('items') or []
+        }
+
+        # Match priority:
+        # 1. Exact match on customUrl (with or without @)
+        # 2. customUrl containing the handle
+        # 3. Title containing the handle
+        # 4. First result if nothing else matches
+        clean_handle = value.lower()
+        best_match = None
+        best_rank = 4
+        for item in items:
+            channel_id = item['id']['channelId']
+            if channel_id not in custom_urls:
+                continue
+            channel_custom_url = custom_urls[channel_id].lower()
+            channel_title = item['snippet'].get('title', '').lower()
+            debug_log(f"Checking channel: ID={channel_id}, title='{channel_title}', customUrl='{channel_custom_url}'")
+
+            if channel_custom_url and channel_custom_url.lstrip('@') == clean_handle:
+                return channel_id
+            elif clean_handle in channel_custom_url:
+                rank = 1
+            elif clean_handle in channel_title:
+                rank = 2
+            else:
+                rank = 3
+            if rank < best_rank:
+                best_match, best_rank = channel_id, rank
+
+        if best_match:
+            return best_match
+
+        # If we got items but didn't find a good match, use the first result
+        debug_log(f"No exact match found, using first search result for {handle}")
+        return candidate_ids[0]
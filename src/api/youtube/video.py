@@ -1,16 +1,21 @@
 """
 YouTube API client for video-related operations.
 """
-import streamlit as st
+from src.utils.headless import st
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import googleapiclient.errors
 
 from src.utils.debug_utils import debug_log
 from src.api.youtube.base import YouTubeBaseClient
+from src.api.youtube.rate_limit import get_thread_http
+
+# videos.list accepts at most 50 IDs per call
+VIDEOS_PER_DETAILS_REQUEST = 50
 
 class VideoClient(YouTubeBaseClient):
     """YouTube Data API client focused on video operations"""
@@ -100,13 +105,13 @@ class VideoClient(YouTubeBaseClient):
                 )
                 
                 playlist_response = playlist_request.execute()
-                debug_log(f"[DIAG] Raw playlistItems API response: {json.dumps(playlist_response)[:1000]}")
+                debug_log(lambda: f"[DIAG] Raw playlistItems API response: {json.dumps(playlist_response)[:1000]}")
                 if 'error' in playlist_response:
-                    debug_log(f"[DIAG] API error in playlistItems response: {playlist_response['error']}")
+                    debug_log(lambda: f"[DIAG] API error in playlistItems response: {playlist_response['error']}")
                     channel_info['error_videos'] = f"YouTube API error: {playlist_response['error']}"
                     return channel_info
                 if not playlist_response.get('items'):
-                    debug_log(f"[DIAG] No items returned in playlistItems response for playlist_id {playlist_id}")
+                    debug_log(lambda: f"[DIAG] No items returned in playlistItems response for playlist_id {playlist_id}")
                     channel_info['error_videos'] = f"No videos found in playlist {playlist_id}. API response: {json.dumps(playlist_response)[:500]}"
                     return channel_info
                 
@@ -154,7 +159,7 @@ class VideoClient(YouTubeBaseClient):
                 videos_returned = len(video_response.get('items', []))
                 if videos_expected > videos_returned:
                     total_videos_unavailable += (videos_expected - videos_returned)
-                    debug_log(f"Warning: {videos_expected - videos_returned} videos were unavailable.")
+                    debug_log(lambda: f"Warning: {videos_expected - videos_returned} videos were unavailable.")
                 
                 # Process each video
                 for video in video_response.get('items', []):
@@ -169,7 +174,7 @@ class VideoClient(YouTubeBaseClient):
                     expected_fields = ['snippet', 'contentDetails', 'statistics', 'status', 'player', 'topicDetails', 'liveStreamingDetails', 'localizations']
                     for field in expected_fields:
                         if field not in video:
-                            debug_log(f"[VIDEO FETCH] Field '{field}' missing in video {video_id} API response.")
+                            debug_log(lambda: f"[VIDEO FETCH] Field '{field}' missing in video {video_id} API response.")
                     channel_info['video_id'].append(video_data)
                     total_videos_fetched += 1
                     new_videos += 1
@@ -335,6 +340,114 @@ class VideoClient(YouTubeBaseClient):
             debug_log(f"[API][ERROR] Exception in get_playlist_items: {str(e)}")
             return []
     
+    def expand_playlists(self, playlist_ids: List[str], known_video_ids=(), max_workers: int = 8) -> Dict[str, Any]:
+        """
+        Walk several playlists concurrently and fetch details of the videos not seen before.
+        
+        Playlists are walked in parallel under the shared API rate limit. Video IDs
+        are then deduplicated across all playlists and known_video_ids, so every
+        unseen video is sent to videos.list exactly once, 50 IDs per call.
+        
+        Args:
+            playlist_ids: YouTube playlist IDs
+            known_video_ids: Video IDs whose details are already stored, or a callable
+                returning which of the walked video IDs are, so only those are looked up
+            max_workers: Maximum number of concurrent requests
+            
+        Returns:
+            Dict with 'playlist_items' (items with video_id, position and added_at
+            by playlist ID, for completely walked playlists), 'videos' (video resources
+            of the unseen videos) and 'failed_playlists' (playlist IDs that could not be walked)
+        """
+        result = {'playlist_items': {}, 'videos': [], 'failed_playlists': []}
+        playlist_ids = list(dict.fromkeys(playlist_ids))
+        if not playlist_ids:
+            return result
+        if not self.is_initialized():
+            debug_log("YouTube API client not initialized. Cannot expand playlists.")
+            result['failed_playlists'] = playlist_ids
+            return result
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(playlist_ids)))) as executor:
+            walks = {playlist_id: executor.submit(self._walk_playlist, playlist_id) for playlist_id in playlist_ids}
+            for playlist_id, walk in walks.items():
+                try:
+                    result['playlist_items'][playlist_id] = walk.result()
+                except Exception as e:
+                    debug_log(f"[API][ERROR] Could not walk playlist {playlist_id}: {str(e)}")
+                    result['failed_playlists'].append(playlist_id)
+            
+            # Dedup stage: each video once, however many playlists it is in
+            walked = list(dict.fromkeys(item['video_id'] for items in result['playlist_items'].values()
+                                        for item in items))
+            known = set(known_video_ids(walked) if callable(known_video_ids) else known_video_ids)
+            unseen = [video_id for video_id in walked if video_id not in known]
+            chunks = [unseen[start:start + VIDEOS_PER_DETAILS_REQUEST]
+                      for start in range(0, len(unseen), VIDEOS_PER_DETAILS_REQUEST)]
+            for chunk, details in zip(chunks, executor.map(self._fetch_video_details, chunks)):
+                result['videos'].extend(details)
+        
+        debug_log(f"[API] Expanded {len(result['playlist_items'])} playlists: "
+                  f"{len(unseen)} unseen videos in {len(chunks)} videos.list calls, "
+                  f"{len(result['failed_playlists'])} failed")
+        return result
+    
+    def _walk_playlist(self, playlist_id: str) -> List[Dict[str, Any]]:
+        """
+        Get every item of a playlist; safe to call from worker threads.
+        
+        Args:
+            playlist_id: YouTube playlist ID
+            
+        Returns:
+            List of dicts with video_id, position and added_at in playlist order
+        """
+        http = get_thread_http(getattr(self.youtube, '_http', None))
+        items = []
+        page_token = None
+        while True:
+            response = self.youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=page_token
+            ).execute(http=http)
+            for item in response.get('items', []):
+                snippet = item.get('snippet', {})
+                video_id = item.get('contentDetails', {}).get('videoId') or snippet.get('resourceId', {}).get('videoId')
+                if not video_id:
+                    # A deleted or private video can leave an item without an ID
+                    debug_log(lambda: f"[API] Skipping item {item.get('id')} of playlist {playlist_id} without a video ID")
+                    continue
+                items.append({
+                    'video_id': video_id,
+                    'position': snippet.get('position'),
+                    'added_at': snippet.get('publishedAt')
+                })
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return items
+    
+    def _fetch_video_details(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get details of up to 50 videos in one call; safe to call from worker threads.
+        
+        Args:
+            video_ids: YouTube video IDs
+            
+        Returns:
+            List of video resources; empty if the call failed
+        """
+        try:
+            response = self.youtube.videos().list(
+                part="snippet,contentDetails,statistics,status,topicDetails,player,liveStreamingDetails",
+                id=','.join(video_ids)
+            ).execute(http=get_thread_http(getattr(self.youtube, '_http', None)))
+            return response.get('items', [])
+        except Exception as e:
+            debug_log(f"[API][ERROR] Exception fetching details of {len(video_ids)} videos: {str(e)}")
+            return []
+    
     def get_channel_playlists(self, channel_id: str, max_results: int = 50) -> List[Dict]:
         """
         Get all playlists for a channel from the YouTube Data API, including the uploads playlist
@@ -411,13 +524,13 @@ class VideoClient(YouTubeBaseClient):
                 
                 # Extract playlist data
                 items = response.get('items', [])
-                debug_log(f"[API] Found {len(items)} regular playlists in page for channel {channel_id}")
+                debug_log(lambda: f"[API] Found {len(items)} regular playlists in page for channel {channel_id}")
                 
                 # Transform items to include playlist_id at the top level and other useful fields
                 for item in items:
                     # Skip uploads playlist if it somehow appears in regular playlists
                     if uploads_playlist_id and item['id'] == uploads_playlist_id:
-                        debug_log(f"[API] Skipping duplicate uploads playlist from regular playlist results")
+                        debug_log(lambda: f"[API] Skipping duplicate uploads playlist from regular playlist results")
                         continue
                         
                     playlist_data = {
@@ -9,9 +9,9 @@ import urllib.parse
 import streamlit as st
 
 from src.config import init_session_state, Settings
-from src.database.sqlite import SQLiteDatabase
 from src.storage.factory import StorageFactory
 from src.utils.debug_utils import initialize_performance_and_debug_state
+from src.utils.metrics import start_metrics_exporters
 
 class YTDataHubApp:
     """
@@ -41,6 +41,9 @@ class YTDataHubApp:
         """Initialize environment variables and Streamlit configuration."""
         # Load environment variables from .env file
         load_dotenv()
+        
+        # Start the metrics exporters configured in the environment
+        start_metrics_exporters()
     
     def _init_app_state(self):
         """Initialize application state variables."""
@@ -0,0 +1,199 @@
+"""
+ytdatahub command-line interface.
+
+Runs the collection services without Streamlit, for cron and batch jobs:
+streamlit is never imported, session state is a plain per-process mapping and
+progress goes to the console or the log instead of the page.
+
+Usage:
+    ytdatahub collect UCxxxxxxxxxxxxxxxxxxxxxx --max-videos 100 --max-comments 20
+    ytdatahub collect --all --processes 16
+    ytdatahub bulk-import channels.csv
+    ytdatahub refresh run --once
+    ytdatahub export --out data/parquet
+    ytdatahub bench --scale small
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from src.utils.headless import set_headless
+from src.utils.progress import ConsoleProgressSink, LoggingProgressSink, NullProgressSink, ProgressSink
+
+# Subcommands whose arguments are passed on to an existing module CLI
+FORWARDED_COMMANDS = ('refresh', 'export', 'bench')
+
+
+def _progress_sink(mode: str) -> ProgressSink:
+    if mode == 'auto':
+        mode = 'console' if sys.stderr.isatty() else 'log'
+    return {'console': ConsoleProgressSink, 'log': LoggingProgressSink, 'none': NullProgressSink}[mode]()
+
+
+def _configure_logging(verbose: bool) -> None:
+    from src.utils.headless import st
+    from src.utils.log_core import ensure_console_handler
+    # Imported for its console setup, which would otherwise reset the levels below when a service imports it
+    import src.utils.logging_utils  # noqa: F401
+
+    ensure_console_handler()
+    logging.getLogger().setLevel(logging.DEBUG if verbose else logging.WARNING)
+    logging.getLogger('ytdatahub.progress').setLevel(logging.INFO)
+    # debug_log reads the debug settings from the (headless) session state
+    st.session_state.debug_mode = verbose
+    st.session_state.log_level = logging.DEBUG if verbose else logging.WARNING
+
+
+def _api_key(args) -> Optional[str]:
+    from dotenv import load_dotenv
+    load_dotenv()
+    api_key = args.api_key or os.getenv('YOUTUBE_API_KEY')
+    if not api_key:
+        print("No API key: pass --api-key or set YOUTUBE_API_KEY", file=sys.stderr)
+    return api_key
+
+
+def _collect(args, out) -> int:
+    from src.services.refresh_scheduler import RefreshPolicy, collect_channel
+    from src.utils.metrics import quota_meter
+
+    api_key = _api_key(args)
+    if not api_key:
+        return 2
+    channel_ids = list(args.channels)
+    if args.all:
+        from src.database.sqlite import SQLiteDatabase
+        channel_ids += [channel['channel_id'] for channel in SQLiteDatabase(args.db).get_channels_list()]
+    channel_ids = list(dict.fromkeys(channel_ids))
+    if not channel_ids:
+        print("No channels to collect: pass channel IDs or --all", file=sys.stderr)
+        return 2
+    policy = RefreshPolicy(max_videos=args.max_videos, max_comments_per_video=args.max_comments)
+    if args.processes > 1:
+        return _collect_sharded(args, api_key, channel_ids, policy, out)
+
+    def collect(channel_id):
+        with quota_meter() as meter:
+            outcome = collect_channel(api_key, channel_id, policy, args.db)
+        return {'channel_id': channel_id, **outcome, 'quota_used': meter.units}
+
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+        results = list(executor.map(collect, channel_ids))
+    for result in results:
+        print(json.dumps(result), file=out)
+    return 0 if all(result['succeeded'] for result in results) else 1
+
+
+def _collect_sharded(args, api_key: str, channel_ids: List[str], policy, out) -> int:
+    from src.services.quota_coordinator import QUOTA_COORDINATOR_PATH, QuotaCoordinator
+    from src.services.sharded_collection import collect_sharded
+
+    coordinator = QuotaCoordinator(QUOTA_COORDINATOR_PATH, daily_budget=args.quota_budget,
+                                   requests_per_second=args.rate_limit)
+    results = collect_sharded(api_key, channel_ids, args.db, processes=args.processes, policy=policy,
+                              coordinator=coordinator)
+    for result in results:
+        print(json.dumps(result), file=out)
+    return 0 if all(result['succeeded'] for result in results) else 1
+
+
+def _bulk_import(args, out) -> int:
+    from src.api.youtube_api import YouTubeAPI
+    from src.database.sqlite import SQLiteDatabase
+    from src.services.bulk_import import import_channels, read_channel_references
+
+    api_key = _api_key(args)
+    if not api_key:
+        return 2
+    references = read_channel_references(args.file)
+    if not references:
+        print(f"No channel references found in {args.file}", file=sys.stderr)
+        return 2
+    api = YouTubeAPI(api_key)
+    if not api.is_initialized():
+        print("Failed to initialize the YouTube API; check the API key", file=sys.stderr)
+        return 2
+    result = import_channels(api, SQLiteDatabase(args.db), references, api_delay=args.delay)
+    print(json.dumps(result), file=out)
+    return 0 if not result['failed'] else 1
+
+
+def _forward(command: str, db: str, argv: List[str]) -> int:
+    if command == 'refresh':
+        from src.services.refresh_scheduler import main
+        return main(['--db', db] + argv)
+    if command == 'export':
+        from src.database.parquet_export import main
+        return main(['--db', db] + argv)
+    from benchmarks.__main__ import main
+    return main(argv)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from src.config import SQLITE_DB_PATH
+    from src.services.refresh_scheduler import SCHEDULER_QUOTA_BUDGET
+
+    parser = argparse.ArgumentParser(prog='ytdatahub', description='Collect, refresh and export YouTube channel data')
+    parser.add_argument('--db', default=str(SQLITE_DB_PATH), help=f'SQLite database (default: {SQLITE_DB_PATH})')
+    parser.add_argument('--progress', choices=('auto', 'console', 'log', 'none'), default='auto',
+                        help='Where progress goes: console on a terminal, the log otherwise (default: auto)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log debug messages')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', help='Collect channels with their videos and comments')
+    collect.add_argument('channels', nargs='*', metavar='CHANNEL', help='Channel IDs')
+    collect.add_argument('--all', action='store_true', help='Also collect every channel stored in the database')
+    collect.add_argument('--api-key', default=None, help='YouTube API key (default: $YOUTUBE_API_KEY)')
+    collect.add_argument('--max-videos', type=int, default=50, help='Videos per channel; 0 collects all (default: 50)')
+    collect.add_argument('--max-comments', type=int, default=0, help='Comments per video; 0 skips comments')
+    collect.add_argument('--workers', type=int, default=1, help='Channels collected in parallel (default: 1)')
+    collect.add_argument('--processes', type=int, default=1,
+                         help='Worker processes sharing a quota budget, with one writer process (default: 1)')
+    collect.add_argument('--quota-budget', type=int, default=SCHEDULER_QUOTA_BUDGET,
+                         help=f'Daily quota units all processes may use (default: {SCHEDULER_QUOTA_BUDGET})')
+    collect.add_argument('--rate-limit', type=float, default=None,
+                         help='Combined requests per second of all processes (default: unlimited)')
+
+    bulk_import = subparsers.add_parser('bulk-import', help='Import channels listed in a CSV file')
+    bulk_import.add_argument('file', help="CSV file with a channel_id column, or one channel per line")
+    bulk_import.add_argument('--api-key', default=None, help='YouTube API key (default: $YOUTUBE_API_KEY)')
+    bulk_import.add_argument('--delay', type=float, default=0.0, help='Seconds between channels.list requests')
+
+    subparsers.add_parser('refresh', add_help=False,
+                          help='Run the background refresh scheduler (see ytdatahub refresh --help)')
+    subparsers.add_parser('export', add_help=False,
+                          help='Export the database to Parquet datasets (see ytdatahub export --help)')
+    subparsers.add_parser('bench', add_help=False, help='Run the benchmark suite (see ytdatahub bench --help)')
+    return parser
+
+
+def main(argv=None) -> int:
+    """Entry point of the ytdatahub console script."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Before anything imports the services, so that they never import streamlit
+    set_headless()
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command not in FORWARDED_COMMANDS:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    set_headless(sink=_progress_sink(args.progress))
+    _configure_logging(args.verbose)
+    if args.command in FORWARDED_COMMANDS:
+        return _forward(args.command, args.db, extra)
+
+    # The services print diagnostics; keep stdout for the results
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command == 'collect':
+            return _collect(args, out)
+        return _bulk_import(args, out)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,6 @@ Configuration settings for the YouTube scraper application.
 """
 import os
 from pathlib import Path
-import streamlit as st
 
 # API configuration
 API_SERVICE_NAME = 'youtube'
@@ -15,8 +14,10 @@ DATA_DIR = BASE_DIR / 'data'
 CHANNELS_FILE = DATA_DIR / 'channels.json'
 SQLITE_DB_PATH = DATA_DIR / 'youtube_data.db'
 
-# Ensure data directory exists
-DATA_DIR.mkdir(exist_ok=True)
+def ensure_data_dir():
+    """Create the data directory; done on first use rather than at import"""
+    DATA_DIR.mkdir(exist_ok=True)
+    return DATA_DIR
 
 # Default application settings
 DEFAULT_MAX_VIDEOS = 25
@@ -44,7 +45,7 @@ class Settings:
         self.youtube_api_key = os.getenv('YOUTUBE_API_KEY', '')
         
         # Application paths
-        self.data_dir = DATA_DIR
+        self.data_dir = ensure_data_dir()
         self.sqlite_db_path = SQLITE_DB_PATH
         self.channels_file = CHANNELS_FILE
     
@@ -131,6 +132,9 @@ SESSION_STATE_VARS = {
 
 def init_session_state():
     """Initialize Streamlit session state variables in a centralized way"""
+    # Imported here so modules that only need paths and defaults do not load streamlit
+    import streamlit as st
+    
     # Initialize all session state variables
     for category, variables in SESSION_STATE_VARS.items():
         for var_name, default_value in variables.items():
@@ -7,9 +7,13 @@ import json
 import os
 
 import pandas as pd
-import streamlit as st
+from src.utils.headless import st
 
 from src.utils.debug_utils import debug_log
+from src.utils.cache_utils import invalidate_channel_cache
+from src.database.version_repository import VersionRepository, content_hash, record_channel_changes
+from src.database.coverage_repository import record_channel_coverage
+from src.utils.metrics import timed
 from src.database.base_repository import BaseRepository
 
 def flatten_dict(d, parent_key='', sep='.'):
@@ -54,6 +58,191 @@ class ChannelRepository(BaseRepository):
             self._video_repository = VideoRepository(self.db_path)
         return self._video_repository
     
+    def prepare_channel_row(self, data, column_types):
+        """
+        Map a channel's API response to a channels row without touching the database.
+
+        Args:
+            data (dict): The collected channel data
+            column_types (dict): Type of each column of the channels table, by name
+
+        Returns:
+            dict or None: The prepared row (channel_id, columns, values, raw_channel_info,
+            content_hash, channel_title, videos_reported, fetched_at), or None if no
+            column could be filled
+        """
+        # --- Flatten the actual raw API response ---
+        raw_api = data.get('raw_channel_info') or data.get('channel_info', data)
+        flat_api = flatten_dict(raw_api)
+        # --- Map dot notation to underscores for DB columns FIRST (before merging extra fields) ---
+        flat_api_underscore = {k.replace('.', '_'): v for k, v in flat_api.items()}
+        
+        # --- Merge in extra fields from the wrapper dict (e.g., channel_id, channel_title) ---
+        # BUT preserve raw API fields - don't let normalized fields override raw API fields
+        extra_fields = {k: v for k, v in data.items() if k not in ['raw_channel_info', 'channel_info']}
+        for key, value in extra_fields.items():
+            # Only add the field if it doesn't already exist in the raw API data
+            # This preserves raw API fields like statistics_subscriberCount while adding normalized fields
+            if key not in flat_api_underscore:
+                flat_api_underscore[key] = value
+        debug_log(f"[DB DEBUG] flat_api_underscore: {flat_api_underscore}")
+        
+        # Track missing fields for debugging
+        missing_fields = []
+        mapped_fields = []
+        
+        # --- Prepare columns and values for insert/update ---
+        columns = []
+        values = []
+        for col in column_types:
+            if col in ['id', 'created_at', 'updated_at']:
+                continue
+            
+            api_key = CANONICAL_FIELD_MAP.get(col, col)
+            v = flat_api_underscore.get(api_key, None)
+            
+            # If no value found with canonical mapping, try direct column name
+            if v is None and api_key != col:
+                v = flat_api_underscore.get(col, None)
+            
+            if v is None:
+                # Field is missing from API response - use appropriate default
+                v = handle_missing_api_field(col, column_types.get(col))
+                missing_fields.append(f"{col} (API field: {api_key})")
+            else:
+                mapped_fields.append(f"{col} -> {api_key}")
+            
+            values.append(serialize_for_sqlite(v))
+            columns.append(col)
+        
+        channel_id = flat_api.get('channel_id') or flat_api.get('id')
+        # Enhanced logging for debugging field mapping
+        debug_log(f"[DB FIELD MAPPING] Channel ID: {channel_id}")
+        debug_log(f"[DB FIELD MAPPING] Successfully mapped {len(mapped_fields)} fields")
+        if missing_fields:
+            debug_log(f"[DB FIELD MAPPING] Missing from API response ({len(missing_fields)} fields): {missing_fields[:5]}{'...' if len(missing_fields) > 5 else ''}")
+        debug_log(f"[DB DEBUG] Available API fields: {list(flat_api_underscore.keys())[:10]}{'...' if len(flat_api_underscore) > 10 else ''}")
+        
+        debug_log(f"[DB INSERT] Final channel insert columns: {columns}")
+        debug_log(f"[DB INSERT] Final channel insert values (first 5): {values[:5]}{'...' if len(values) > 5 else ''}")
+        debug_log(f"[DB INSERT] Final channel insert values: {values}")
+        if not columns:
+            return None
+        
+        import datetime
+        reported = flat_api.get('statistics.videoCount') or data.get('total_videos') or data.get('video_count')
+        return {
+            'channel_id': channel_id,
+            'columns': columns,
+            'values': values,
+            'raw_channel_info': json.dumps(raw_api),
+            'content_hash': content_hash(raw_api),
+            'channel_title': flat_api.get('snippet.title') or data.get('channel_name') or data.get('channel_title'),
+            'videos_reported': safe_int(reported, 'video_count'),
+            'fetched_at': datetime.datetime.utcnow().isoformat(),
+        }
+    
+    def write_channel_row(self, cursor, channel):
+        """
+        Upsert a row from prepare_channel_row, record it in the channel history and update
+        the channel's data version and coverage summary.
+
+        Args:
+            cursor: Cursor of the connection to write with; the caller commits
+            channel (dict): The prepared row
+        """
+        columns = channel['columns']
+        placeholders = ','.join(['?'] * len(columns))
+        update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
+        cursor.execute(f'''
+            INSERT INTO channels ({','.join(columns)})
+            VALUES ({placeholders})
+            ON CONFLICT(channel_id) DO UPDATE SET {update_clause}, updated_at=CURRENT_TIMESTAMP
+        ''', channel['values'])
+        debug_log(f"Inserted/updated channel: {channel['channel_id']}")
+        # --- Insert full JSON into channel_history only ---
+        self._ensure_channel_history_table(cursor)
+        cursor.execute('''
+            INSERT INTO channel_history (channel_id, fetched_at, raw_channel_info) VALUES (?, ?, ?)
+        ''', (channel['channel_id'], channel['fetched_at'], channel['raw_channel_info']))
+        # Bump the data version in the same transaction when the channel record changed
+        record_channel_changes(cursor, channel['channel_id'], channel_hash=channel['content_hash'])
+        # The coverage summary's channel fields; triggers keep its video and comment counts
+        record_channel_coverage(
+            cursor, channel['channel_id'],
+            channel_title=channel['channel_title'],
+            videos_reported=channel['videos_reported'],
+            channel_fetched_at=channel['fetched_at']
+        )
+    
+    def prepare_channel_data(self, data):
+        """
+        Map collected channel data to the rows store_prepared_channel_data writes.
+
+        Only reads the table definitions, so collection processes can do the mapping
+        while a single process writes.
+
+        Args:
+            data (dict): The collected channel data, with its videos and their comments
+
+        Returns:
+            dict or None: The channel row and, per video, its row and comment rows; None
+            if no channel column could be filled
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            column_types = {
+                table: {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for table in ('channels', 'videos', 'comments')
+            }
+        channel = self.prepare_channel_row(data, column_types['channels'])
+        if channel is None:
+            return None
+        videos = []
+        for video in data.get('video_id') or []:
+            row = self.video_repository.prepare_video_row(
+                video, column_types['videos'], channel_id=channel['channel_id']
+            )
+            if row is None:
+                continue
+            comments = [self.video_repository.complete_comment(comment, row['youtube_id'], index)
+                        for index, comment in enumerate(video.get('comments') or [])]
+            videos.append({
+                'video': row,
+                'comments': self.video_repository.comment_repository.prepare_comment_rows(
+                    comments, column_types['comments'], fetched_at=row['fetched_at']
+                ),
+            })
+        return {'channel': channel, 'videos': videos}
+    
+    @timed('db_operation_seconds', operation='store_prepared_channel_data')
+    def store_prepared_channel_data(self, prepared):
+        """
+        Write the rows from prepare_channel_data in one transaction.
+
+        Args:
+            prepared (dict): The prepared channel, video and comment rows
+
+        Returns:
+            bool: True if the rows were written
+        """
+        channel = prepared['channel']
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            self.write_channel_row(cursor, channel)
+            for video in prepared['videos']:
+                self.video_repository.write_video_row(cursor, video['video'], channel['channel_id'])
+                if video['comments']:
+                    cursor.execute("SELECT id FROM videos WHERE youtube_id = ?", (video['video']['youtube_id'],))
+                    video_db_id = cursor.fetchone()[0]
+                    self.video_repository.comment_repository.write_comment_rows(cursor, video['comments'], video_db_id)
+            conn.commit()
+        debug_log(f"[DB] Stored channel {channel['channel_id']} with {len(prepared['videos'])} videos")
+        
+        # Drop analysis results computed from the previous snapshot of this channel
+        invalidate_channel_cache(channel['channel_id'])
+        return True
+
+    @timed('db_operation_seconds', operation='store_channel_data')
     def store_channel_data(self, data):
         """Save channel data to SQLite database, mapping every API field (recursively) to a column, and insert full JSON into channel_history only."""
         try:
@@ -61,90 +250,21 @@ class ChannelRepository(BaseRepository):
             debug_log(f"[DB] Using database at: {abs_db_path}")
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
-            # --- Flatten the actual raw API response ---
-            raw_api = data.get('raw_channel_info') or data.get('channel_info', data)
-            flat_api = flatten_dict(raw_api)
-            # --- Map dot notation to underscores for DB columns FIRST (before merging extra fields) ---
-            flat_api_underscore = {k.replace('.', '_'): v for k, v in flat_api.items()}
-            
-            # --- Merge in extra fields from the wrapper dict (e.g., channel_id, channel_title) ---
-            # BUT preserve raw API fields - don't let normalized fields override raw API fields
-            extra_fields = {k: v for k, v in data.items() if k not in ['raw_channel_info', 'channel_info']}
-            for key, value in extra_fields.items():
-                # Only add the field if it doesn't already exist in the raw API data
-                # This preserves raw API fields like statistics_subscriberCount while adding normalized fields
-                if key not in flat_api_underscore:
-                    flat_api_underscore[key] = value
-            debug_log(f"[DB DEBUG] flat_api_underscore: {flat_api_underscore}")
             # --- Get all columns in the channels table ---
             cursor.execute("PRAGMA table_info(channels)")
-            column_info = cursor.fetchall()
-            existing_cols = set(row[1] for row in column_info)
-            column_types = {row[1]: row[2] for row in column_info}  # column_name -> column_type
-            
-            # Track missing fields for debugging
-            missing_fields = []
-            mapped_fields = []
-            
-            # --- Prepare columns and values for insert/update ---
-            columns = []
-            values = []
-            for col in existing_cols:
-                if col in ['id', 'created_at', 'updated_at']:
-                    continue
-                
-                api_key = CANONICAL_FIELD_MAP.get(col, col)
-                v = flat_api_underscore.get(api_key, None)
-                
-                # If no value found with canonical mapping, try direct column name
-                if v is None and api_key != col:
-                    v = flat_api_underscore.get(col, None)
-                
-                if v is None:
-                    # Field is missing from API response - use appropriate default
-                    v = handle_missing_api_field(col, column_types.get(col))
-                    missing_fields.append(f"{col} (API field: {api_key})")
-                else:
-                    mapped_fields.append(f"{col} -> {api_key}")
-                
-                values.append(serialize_for_sqlite(v))
-                columns.append(col)
-            
-            # Enhanced logging for debugging field mapping
-            debug_log(f"[DB FIELD MAPPING] Channel ID: {flat_api.get('channel_id') or flat_api.get('id')}")
-            debug_log(f"[DB FIELD MAPPING] Successfully mapped {len(mapped_fields)} fields")
-            if missing_fields:
-                debug_log(f"[DB FIELD MAPPING] Missing from API response ({len(missing_fields)} fields): {missing_fields[:5]}{'...' if len(missing_fields) > 5 else ''}")
-            debug_log(f"[DB DEBUG] Available API fields: {list(flat_api_underscore.keys())[:10]}{'...' if len(flat_api_underscore) > 10 else ''}")
-            
-            debug_log(f"[DB INSERT] Final channel insert columns: {columns}")
-            debug_log(f"[DB INSERT] Final channel insert values (first 5): {values[:5]}{'...' if len(values) > 5 else ''}")
-            debug_log(f"[DB INSERT] Final channel insert values: {values}")
-            if not columns:
+            column_types = {row[1]: row[2] for row in cursor.fetchall()}  # column_name -> column_type
+            channel = self.prepare_channel_row(data, column_types)
+            if channel is None:
                 debug_log("[DB WARNING] No columns to insert for channel.")
                 conn.close()
                 return False
-            placeholders = ','.join(['?'] * len(columns))
-            update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
-            cursor.execute(f'''
-                INSERT INTO channels ({','.join(columns)})
-                VALUES ({placeholders})
-                ON CONFLICT(channel_id) DO UPDATE SET {update_clause}, updated_at=CURRENT_TIMESTAMP
-            ''', values)
-            debug_log(f"Inserted/updated channel: {flat_api.get('channel_id') or flat_api.get('id')}")
-            # --- Insert full JSON into channel_history only ---
-            self._ensure_channel_history_table(cursor)
-            import datetime, json
-            fetched_at = datetime.datetime.utcnow().isoformat()
-            raw_channel_info = json.dumps(raw_api)
-            cursor.execute('''
-                INSERT INTO channel_history (channel_id, fetched_at, raw_channel_info) VALUES (?, ?, ?)
-            ''', (flat_api.get('channel_id') or flat_api.get('id'), fetched_at, raw_channel_info))
+            channel_id = channel['channel_id']
+            self.write_channel_row(cursor, channel)
             conn.commit()
             # After commit, check if row exists
-            cursor.execute("SELECT COUNT(*) FROM channels WHERE channel_id = ?", (flat_api.get('channel_id') or flat_api.get('id'),))
+            cursor.execute("SELECT COUNT(*) FROM channels WHERE channel_id = ?", (channel_id,))
             row_count = cursor.fetchone()[0]
-            debug_log(f"[DB] Row count for channel_id={flat_api.get('channel_id') or flat_api.get('id')} after save: {row_count}")
+            debug_log(f"[DB] Row count for channel_id={channel_id} after save: {row_count}")
             conn.close()
             
             # Process and store videos if present in the data
@@ -154,8 +274,10 @@ class ChannelRepository(BaseRepository):
                 videos_stored = 0
                 for video in videos:
                     try:
-                        video_store_result = self.video_repository.store_video_data(video)
-                        debug_log(f"[DB] store_video_data result for video {video.get('video_id')}: {video_store_result}")
+                        video_store_result = self.video_repository.store_video_data(
+                            video, channel_id=channel_id
+                        )
+                        debug_log(lambda: f"[DB] store_video_data result for video {video.get('video_id')}: {video_store_result}")
                         if video_store_result:
                             videos_stored += 1
                             # --- Store comments for this video if present ---
@@ -163,17 +285,20 @@ class ChannelRepository(BaseRepository):
                             yt_id = video.get('youtube_id') or video.get('video_id') or video.get('id')
                             video_db_id = self.video_repository.get_video_db_id(yt_id)
                             comments = video.get('comments', [])
-                            debug_log(f"[DB] Video: yt_id={yt_id}, db_id={video_db_id}, comments={len(comments)}")
+                            debug_log(lambda: f"[DB] Video: yt_id={yt_id}, db_id={video_db_id}, comments={len(comments)}")
                             if comments and video_db_id:
-                                debug_log(f"[DB] First comment for video {yt_id}: {comments[0] if comments else 'None'}")
+                                debug_log(lambda: f"[DB] First comment for video {yt_id}: {comments[0] if comments else 'None'}")
                                 comment_store_result = self.video_repository.store_comments(comments, video_db_id, fetched_at=None)
-                                debug_log(f"[DB] Stored {len(comments)} comments for video {yt_id}, result: {comment_store_result}")
+                                debug_log(lambda: f"[DB] Stored {len(comments)} comments for video {yt_id}, result: {comment_store_result}")
                             elif comments and not video_db_id:
-                                debug_log(f"[DB WARNING] Comments present but could not find DB ID for video {yt_id}")
+                                debug_log(lambda: f"[DB WARNING] Comments present but could not find DB ID for video {yt_id}")
                     except Exception as e:
                         debug_log(f"[DB ERROR] Failed to store video {video.get('video_id', 'unknown')}: {str(e)}")
                 debug_log(f"[DB] Successfully stored {videos_stored} out of {len(videos)} videos")
             
+            # Drop analysis results computed from the previous snapshot of this channel
+            invalidate_channel_cache(channel_id)
+            
             return True
         except Exception as e:
             import traceback
@@ -213,6 +338,7 @@ class ChannelRepository(BaseRepository):
             debug_log(f"Exception in get_channels_list: {str(e)}")
             return []
     
+    @timed('db_operation_seconds', operation='get_channel_data')
     def get_channel_data(self, channel_identifier):
         """Get full data for a specific channel, including all API fields from raw_channel_info if present."""
         conn = None
@@ -259,6 +385,8 @@ class ChannelRepository(BaseRepository):
             record['uploads_playlist_id'] = uploads_playlist_id
             record['playlist_id'] = uploads_playlist_id
             record['raw_channel_info'] = raw_info
+            # Lets analysis caches validate against the stored snapshot with one integer
+            record['data_version'] = VersionRepository(self.db_path).get_data_version(record['channel_id'])
             debug_log(f"[DB] get_channel_data returning: {record}")
             return record
         except Exception as e:
@@ -8,7 +8,9 @@ from datetime import datetime
 import os
 
 from src.utils.debug_utils import debug_log
+from src.utils.metrics import timed
 from src.database.base_repository import BaseRepository
+from src.database.version_repository import channel_for_video, content_hash, record_channel_changes
 
 def handle_missing_api_field(field_name: str, column_type: str = 'TEXT') -> Any:
     """
@@ -143,10 +145,156 @@ class CommentRepository(BaseRepository):
         """
         return self.store_comments([comment], video_db_id, fetched_at)
         
+    def prepare_comment_rows(self, comments, column_types, video_db_id=None, fetched_at=None):
+        """
+        Map comments to comments rows without touching the database.
+
+        Args:
+            comments: Comment data dictionaries
+            column_types: Type of each column of the comments table, by name
+            video_db_id: The database ID of the video the comments belong to; without it
+                the rows get their video when they are written
+            fetched_at: Timestamp when the data was fetched
+
+        Returns:
+            list: The prepared rows (comment_id, row, content_hash, raw_comment_info, fetched_at)
+            of the comments that have a comment ID
+        """
+        existing_cols = set(column_types)
+        track_changes = 'content_hash' in existing_cols
+        prepared = []
+        
+        for comment in comments:
+            # Comment data is already in a flat structure from CommentClient
+            # No need to flatten - just use the data directly
+            raw_api = comment.get('comment_info', comment)
+            row_hash = content_hash(raw_api) if track_changes else None
+            
+            db_row = {}
+            
+            # Map each database column to the correct API field
+            for col in existing_cols:
+                if col == 'id':
+                    continue
+                
+                # Get the corresponding API field from canonical mapping
+                api_field = CANONICAL_FIELD_MAP.get(col)
+                value = None
+                
+                if api_field and api_field in raw_api:
+                    # Found the field in API response
+                    value = raw_api[api_field]
+                    debug_log(lambda: f"[DB MAPPING] {col} -> {api_field} = {str(value)[:100]}")
+                elif col == 'video_id' and video_db_id:
+                    # Special handling for video_id which comes from parameter
+                    value = video_db_id
+                elif col == 'content_hash':
+                    value = row_hash
+                elif col == 'fetched_at':
+                    # Special handling for fetched_at timestamp
+                    value = fetched_at or datetime.utcnow().isoformat()
+                elif col == 'is_reply':
+                    # Special handling for is_reply - determine from parent_id
+                    value = bool(raw_api.get('parent_id'))
+                else:
+                    # Field not found in API response
+                    value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
+                    if value == "NOT_PROVIDED_BY_API":
+                        debug_log(lambda: f"[DB MISSING] {col} not provided by API")
+                    else:
+                        debug_log(lambda: f"[DB DEFAULT] {col} using default: {value}")
+                
+                db_row[col] = value
+            
+            # Validate required NOT NULL fields
+            if not db_row.get('comment_id'):
+                debug_log(f"[DB ERROR] Missing required comment_id")
+                continue
+            
+            prepared.append({
+                'comment_id': comment.get('comment_id') or comment.get('id'),
+                'row': db_row,
+                'content_hash': row_hash,
+                'raw_comment_info': json.dumps(raw_api),
+                'fetched_at': fetched_at or datetime.utcnow().isoformat(),
+            })
+        return prepared
+    
+    def write_comment_rows(self, cursor, prepared, video_db_id=None):
+        """
+        Upsert rows from prepare_comment_rows, record them in the comment history and bump
+        the data version of the channels whose comments changed.
+
+        Args:
+            cursor: Cursor of the connection to write with; the caller commits
+            prepared: The prepared rows
+            video_db_id: The database ID of the video the comments belong to, for rows
+                prepared without one
+
+        Returns:
+            int: Number of rows written
+        """
+        # XOR of old and new content hashes per video, folded into the channel versions below
+        comment_deltas = {}
+        written = 0
+        
+        for comment in prepared:
+            db_row = comment['row']
+            if video_db_id and 'video_id' in db_row:
+                db_row['video_id'] = video_db_id
+            if not db_row.get('video_id'):
+                debug_log(f"[DB ERROR] Missing required video_id")
+                continue
+            
+            # Prepare for database insertion
+            columns = list(db_row)
+            values = [db_row[col] for col in columns]
+            
+            debug_log(lambda: f"[DB INSERT] Comment {db_row.get('comment_id')} with {len(columns)} fields")
+            debug_log(lambda: f"[DB INSERT] Columns: {columns}")
+            debug_log(lambda: f"[DB INSERT] Values: {[str(v)[:50] if v else 'NULL' for v in values]}")
+            
+            # Insert or update
+            placeholders = ','.join(['?'] * len(columns))
+            update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
+            
+            sql = f'''
+                INSERT INTO comments ({','.join(columns)})
+                VALUES ({placeholders})
+                ON CONFLICT(comment_id) DO UPDATE SET {update_clause}
+            '''
+            debug_log(lambda: f"[DB SQL] {sql}")
+            
+            row_hash = comment['content_hash']
+            if row_hash is not None:
+                cursor.execute("SELECT content_hash FROM comments WHERE comment_id = ?", (db_row['comment_id'],))
+                previous = cursor.fetchone()
+                previous_hash = previous[0] if previous else None
+                if previous_hash != row_hash:
+                    video_ref = db_row['video_id']
+                    comment_deltas[video_ref] = comment_deltas.get(video_ref, 0) ^ (previous_hash or 0) ^ row_hash
+            
+            cursor.execute(sql, values)
+            
+            # Store in history table (without ON CONFLICT since table doesn't have unique constraint)
+            cursor.execute('''
+                INSERT INTO comments_history (comment_id, fetched_at, raw_comment_info) 
+                VALUES (?, ?, ?)
+            ''', (comment['comment_id'], comment['fetched_at'], comment['raw_comment_info']))
+            written += 1
+            
+            debug_log(lambda: f"[DB SUCCESS] Stored comment: {comment['comment_id']}")
+        
+        for video_ref, delta in comment_deltas.items():
+            if delta:
+                record_channel_changes(cursor, channel_for_video(cursor, video_ref), comments_delta=delta)
+        return written
+        
+    @timed('db_operation_seconds', operation='comment_store_comments')
     def store_comments(self, comments, video_db_id=None, fetched_at=None):
         """Save comments to SQLite database with proper field mapping and handling of missing API data."""
         abs_db_path = os.path.abspath(self.db_path)
-        debug_log(f"[DB] Using database at: {abs_db_path}")
+        debug_log(lambda: f"[DB] Using database at: {abs_db_path}")
         
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -154,87 +302,10 @@ class CommentRepository(BaseRepository):
                 
                 # Get column information for the comments table
                 cursor.execute("PRAGMA table_info(comments)")
-                table_info = cursor.fetchall()
-                existing_cols = set(row[1] for row in table_info)
-                column_types = {row[1]: row[2] for row in table_info}
+                column_types = {row[1]: row[2] for row in cursor.fetchall()}
                 
-                for comment in comments:
-                    # Comment data is already in a flat structure from CommentClient
-                    # No need to flatten - just use the data directly
-                    raw_api = comment.get('comment_info', comment)
-                    
-                    db_row = {}
-                    
-                    # Map each database column to the correct API field
-                    for col in existing_cols:
-                        if col == 'id':
-                            continue
-                        
-                        # Get the corresponding API field from canonical mapping
-                        api_field = CANONICAL_FIELD_MAP.get(col)
-                        value = None
-                        
-                        if api_field and api_field in raw_api:
-                            # Found the field in API response
-                            value = raw_api[api_field]
-                            debug_log(f"[DB MAPPING] {col} -> {api_field} = {str(value)[:100]}")
-                        elif col == 'video_id' and video_db_id:
-                            # Special handling for video_id which comes from parameter
-                            value = video_db_id
-                        elif col == 'fetched_at':
-                            # Special handling for fetched_at timestamp
-                            value = fetched_at or datetime.utcnow().isoformat()
-                        elif col == 'is_reply':
-                            # Special handling for is_reply - determine from parent_id
-                            value = bool(raw_api.get('parent_id'))
-                        else:
-                            # Field not found in API response
-                            value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
-                            if value == "NOT_PROVIDED_BY_API":
-                                debug_log(f"[DB MISSING] {col} not provided by API")
-                            else:
-                                debug_log(f"[DB DEFAULT] {col} using default: {value}")
-                        
-                        db_row[col] = value
-                    
-                    # Validate required NOT NULL fields
-                    if not db_row.get('comment_id'):
-                        debug_log(f"[DB ERROR] Missing required comment_id")
-                        continue
-                    if not db_row.get('video_id'):
-                        debug_log(f"[DB ERROR] Missing required video_id")
-                        continue
-                    
-                    # Prepare for database insertion
-                    columns = [col for col in existing_cols if col != 'id']
-                    values = [db_row.get(col) for col in columns]
-                    
-                    debug_log(f"[DB INSERT] Comment {db_row.get('comment_id')} with {len(columns)} fields")
-                    debug_log(f"[DB INSERT] Columns: {columns}")
-                    debug_log(f"[DB INSERT] Values: {[str(v)[:50] if v else 'NULL' for v in values]}")
-                    
-                    # Insert or update
-                    placeholders = ','.join(['?'] * len(columns))
-                    update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
-                    
-                    sql = f'''
-                        INSERT INTO comments ({','.join(columns)})
-                        VALUES ({placeholders})
-                        ON CONFLICT(comment_id) DO UPDATE SET {update_clause}
-                    '''
-                    debug_log(f"[DB SQL] {sql}")
-                    
-                    cursor.execute(sql, values)
-                    
-                    # Store in history table (without ON CONFLICT since table doesn't have unique constraint)
-                    comment_id = comment.get('comment_id') or comment.get('id')
-                    raw_comment_info = json.dumps(raw_api)
-                    cursor.execute('''
-                        INSERT INTO comments_history (comment_id, fetched_at, raw_comment_info) 
-                        VALUES (?, ?, ?)
-                    ''', (comment_id, fetched_at or datetime.utcnow().isoformat(), raw_comment_info))
-                    
-                    debug_log(f"[DB SUCCESS] Stored comment: {comment_id}")
+                prepared = self.prepare_comment_rows(comments, column_types, video_db_id, fetched_at)
+                self.write_comment_rows(cursor, prepared)
                 
                 conn.commit()
                 return True
@@ -0,0 +1,402 @@
+"""
+Coverage repository module for the precomputed channel_coverage summary table.
+
+The summary holds one row per channel with the counts the data coverage
+dashboard needs, so the dashboard reads every channel with a single indexed
+SELECT instead of walking all videos and comments on each render.
+
+Triggers on videos and comments keep the counts current in the same
+transaction as every content write, whichever path writes (collection, bulk
+import, the sharded writer or playlist expansion). Inserts and updates apply
+deltas. The rare writes a delta cannot express (a video moving channel or
+changing its publish date, deletes) mark the channel stale instead, and stale
+channels are recounted before the next read; the triggers stay small, which
+matters because every new connection compiles them into its statements. The
+channel title, reported video count and fetch time are recorded by
+store_channel_data on its own write transaction.
+"""
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+COVERAGE_COLUMNS = [
+    'channel_id', 'channel_title', 'videos_reported', 'videos_collected',
+    'videos_with_details', 'videos_with_comments', 'comments_collected',
+    'latest_video_date', 'oldest_video_date', 'channel_fetched_at',
+    'videos_fetched_at', 'comments_fetched_at', 'updated_at'
+]
+
+# Same format as datetime.utcnow().isoformat(), for rows written by the triggers
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+# Recounts the summary rows of {channels} (a query of channel_id) from videos
+# and comments. Both lookups go through indexes (videos.snippet_channel_id and
+# comments.video_id), so recounting a channel only touches its own videos.
+_RECOUNT_SQL = '''
+    INSERT INTO channel_coverage (
+        channel_id, channel_title, videos_reported, videos_collected,
+        videos_with_details, videos_with_comments, comments_collected,
+        latest_video_date, oldest_video_date, channel_fetched_at,
+        videos_fetched_at, comments_fetched_at, updated_at
+    )
+    SELECT
+        ch.channel_id,
+        {channel_title},
+        {videos_reported},
+        COUNT(v.id),
+        COALESCE(SUM(v.statistics_view_count IS NOT NULL AND v.published_at IS NOT NULL), 0),
+        COALESCE(SUM(vc.comment_count > 0), 0),
+        COALESCE(SUM(vc.comment_count), 0),
+        MAX(v.published_at),
+        MIN(v.published_at),
+        {channel_fetched_at},
+        MAX(v.fetched_at),
+        MAX(vc.last_fetched_at),
+        {updated_at}
+    FROM ({channels}) ch
+    LEFT JOIN videos v ON v.snippet_channel_id = ch.channel_id
+    LEFT JOIN (
+        SELECT video_id, COUNT(*) AS comment_count, MAX(fetched_at) AS last_fetched_at
+        FROM comments
+        {comment_filter}
+        GROUP BY video_id
+    ) vc ON vc.video_id = v.id
+    WHERE ch.channel_id IS NOT NULL
+    GROUP BY ch.channel_id
+    ON CONFLICT(channel_id) DO UPDATE SET
+        channel_title = COALESCE(excluded.channel_title, channel_coverage.channel_title),
+        videos_reported = COALESCE(excluded.videos_reported, channel_coverage.videos_reported),
+        videos_collected = excluded.videos_collected,
+        videos_with_details = excluded.videos_with_details,
+        videos_with_comments = excluded.videos_with_comments,
+        comments_collected = excluded.comments_collected,
+        latest_video_date = excluded.latest_video_date,
+        oldest_video_date = excluded.oldest_video_date,
+        channel_fetched_at = COALESCE(excluded.channel_fetched_at, channel_coverage.channel_fetched_at),
+        videos_fetched_at = excluded.videos_fetched_at,
+        comments_fetched_at = excluded.comments_fetched_at,
+        updated_at = excluded.updated_at
+'''
+
+# Recount of one channel, setting the channel fields that are not None
+_REFRESH_SQL = _RECOUNT_SQL.format(
+    channels='SELECT :channel_id AS channel_id', channel_title=':channel_title', videos_reported=':videos_reported',
+    channel_fetched_at=':channel_fetched_at', updated_at=':updated_at',
+    comment_filter='WHERE video_id IN (SELECT id FROM videos WHERE snippet_channel_id = :channel_id)'
+)
+
+
+def _backfill_sql(tables: Iterable[str]) -> str:
+    """Recount of every channel with a video or a channels row, reading the channel fields back."""
+    has_channels, has_history = 'channels' in tables, 'channel_history' in tables
+    return _RECOUNT_SQL.format(
+        channels='SELECT snippet_channel_id AS channel_id FROM videos'
+                 + (' UNION SELECT channel_id FROM channels' if has_channels else ''),
+        channel_title='(SELECT channel_title FROM channels WHERE channel_id = ch.channel_id)' if has_channels else 'NULL',
+        videos_reported='(SELECT video_count FROM channels WHERE channel_id = ch.channel_id)' if has_channels else 'NULL',
+        channel_fetched_at='(SELECT MAX(fetched_at) FROM channel_history WHERE channel_id = ch.channel_id)'
+                           if has_history else 'NULL',
+        updated_at=_NOW_SQL, comment_filter=''
+    )
+
+
+def _later(column: str, value: str) -> str:
+    """The later of a column and a value, either of which may be NULL."""
+    return f'COALESCE(MAX({column}, {value}), {column}, {value})'
+
+
+def _earlier(column: str, value: str) -> str:
+    """The earlier of a column and a value, either of which may be NULL."""
+    return f'COALESCE(MIN({column}, {value}), {column}, {value})'
+
+
+# Adds a video (and the comments it already has) to its channel's row
+_ADD_VIDEO_SQL = f'''
+    INSERT INTO channel_coverage (
+        channel_id, videos_collected, videos_with_details, videos_with_comments, comments_collected,
+        latest_video_date, oldest_video_date, videos_fetched_at, comments_fetched_at, updated_at
+    )
+    VALUES (
+        new.snippet_channel_id, 1,
+        new.statistics_view_count IS NOT NULL AND new.published_at IS NOT NULL,
+        EXISTS (SELECT 1 FROM comments WHERE video_id = new.id),
+        (SELECT COUNT(*) FROM comments WHERE video_id = new.id),
+        new.published_at, new.published_at, new.fetched_at,
+        (SELECT MAX(fetched_at) FROM comments WHERE video_id = new.id),
+        {_NOW_SQL}
+    )
+    ON CONFLICT(channel_id) DO UPDATE SET
+        videos_collected = videos_collected + 1,
+        videos_with_details = videos_with_details + excluded.videos_with_details,
+        videos_with_comments = videos_with_comments + excluded.videos_with_comments,
+        comments_collected = comments_collected + excluded.comments_collected,
+        latest_video_date = {_later('latest_video_date', 'excluded.latest_video_date')},
+        oldest_video_date = {_earlier('oldest_video_date', 'excluded.oldest_video_date')},
+        videos_fetched_at = {_later('videos_fetched_at', 'excluded.videos_fetched_at')},
+        comments_fetched_at = {_later('comments_fetched_at', 'excluded.comments_fetched_at')},
+        updated_at = excluded.updated_at;
+'''
+
+# Marks channels for a recount, for the rare writes a delta cannot express. Not
+# INSERT OR IGNORE: a trigger takes the conflict handling of the statement that fired it.
+_MARK_STALE_SQL = '''
+    INSERT INTO channel_coverage_stale (channel_id)
+    SELECT DISTINCT channel_id FROM ({}) marked
+    WHERE channel_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM channel_coverage_stale s WHERE s.channel_id = marked.channel_id);
+'''
+_VIDEO_CHANNEL = 'SELECT old.snippet_channel_id AS channel_id'
+_COMMENT_CHANNELS = 'SELECT snippet_channel_id AS channel_id FROM videos WHERE id IN ({})'
+
+# Trigger name -> (event, condition, body)
+COVERAGE_TRIGGERS = {
+    'channel_coverage_video_insert': ('AFTER INSERT ON videos', 'new.snippet_channel_id IS NOT NULL', _ADD_VIDEO_SQL),
+    'channel_coverage_video_update': (
+        'AFTER UPDATE ON videos',
+        'new.snippet_channel_id IS NOT NULL AND new.snippet_channel_id IS old.snippet_channel_id '
+        'AND new.published_at IS old.published_at',
+        f'''
+        UPDATE channel_coverage SET
+            videos_with_details = videos_with_details
+                - (old.statistics_view_count IS NOT NULL AND old.published_at IS NOT NULL)
+                + (new.statistics_view_count IS NOT NULL AND new.published_at IS NOT NULL),
+            videos_fetched_at = {_later('videos_fetched_at', 'new.fetched_at')},
+            updated_at = {_NOW_SQL}
+        WHERE channel_id = new.snippet_channel_id;
+        '''
+    ),
+    'channel_coverage_video_added': (
+        'AFTER UPDATE OF snippet_channel_id ON videos',
+        'new.snippet_channel_id IS NOT NULL AND new.snippet_channel_id IS NOT old.snippet_channel_id',
+        _ADD_VIDEO_SQL
+    ),
+    'channel_coverage_video_removed': (
+        'AFTER UPDATE ON videos',
+        'old.snippet_channel_id IS NOT NULL AND (new.snippet_channel_id IS NOT old.snippet_channel_id '
+        'OR new.published_at IS NOT old.published_at)',
+        _MARK_STALE_SQL.format(_VIDEO_CHANNEL)
+    ),
+    'channel_coverage_video_delete': ('AFTER DELETE ON videos', 'old.snippet_channel_id IS NOT NULL',
+                                      _MARK_STALE_SQL.format(_VIDEO_CHANNEL)),
+    'channel_coverage_comment_insert': (
+        'AFTER INSERT ON comments', '1',
+        f'''
+        UPDATE channel_coverage SET
+            comments_collected = comments_collected + 1,
+            videos_with_comments = videos_with_comments
+                + NOT EXISTS (SELECT 1 FROM comments WHERE video_id = new.video_id AND id <> new.id),
+            comments_fetched_at = {_later('comments_fetched_at', 'new.fetched_at')},
+            updated_at = {_NOW_SQL}
+        WHERE channel_id = (SELECT snippet_channel_id FROM videos WHERE id = new.video_id);
+        '''
+    ),
+    'channel_coverage_comment_update': (
+        'AFTER UPDATE ON comments', 'new.video_id IS old.video_id',
+        f'''
+        UPDATE channel_coverage SET
+            comments_fetched_at = {_later('comments_fetched_at', 'new.fetched_at')},
+            updated_at = {_NOW_SQL}
+        WHERE channel_id = (SELECT snippet_channel_id FROM videos WHERE id = new.video_id);
+        '''
+    ),
+    'channel_coverage_comment_moved': (
+        'AFTER UPDATE OF video_id ON comments', 'new.video_id IS NOT old.video_id',
+        _MARK_STALE_SQL.format(_COMMENT_CHANNELS.format('old.video_id, new.video_id'))
+    ),
+    'channel_coverage_comment_delete': (
+        'AFTER DELETE ON comments', '1',
+        _MARK_STALE_SQL.format(_COMMENT_CHANNELS.format('old.video_id'))
+    ),
+}
+
+# Recount of the channels marked stale
+_RECOUNT_STALE_SQL = _RECOUNT_SQL.format(
+    channels='SELECT channel_id FROM channel_coverage_stale', channel_title='NULL', videos_reported='NULL',
+    channel_fetched_at='NULL', updated_at=_NOW_SQL,
+    comment_filter='WHERE video_id IN (SELECT v.id FROM channel_coverage_stale s '
+                   'JOIN videos v ON v.snippet_channel_id = s.channel_id)'
+)
+
+
+def create_coverage_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the channel_coverage table, its triggers and the indexes they rely on.
+
+    The first time the table is created it is filled from the videos and
+    comments already stored, so existing databases need no re-collection.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS channel_coverage (
+        channel_id TEXT PRIMARY KEY,
+        channel_title TEXT,
+        videos_reported INTEGER,
+        videos_collected INTEGER DEFAULT 0,
+        videos_with_details INTEGER DEFAULT 0,
+        videos_with_comments INTEGER DEFAULT 0,
+        comments_collected INTEGER DEFAULT 0,
+        latest_video_date TEXT,
+        oldest_video_date TEXT,
+        channel_fetched_at TEXT,
+        videos_fetched_at TEXT,
+        comments_fetched_at TEXT,
+        updated_at TEXT
+    )
+    ''')
+    cursor.execute('CREATE TABLE IF NOT EXISTS channel_coverage_stale (channel_id TEXT PRIMARY KEY)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_channel_coverage_title ON channel_coverage(channel_title)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_videos_snippet_channel_id ON videos(snippet_channel_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_video_id ON comments(video_id)')
+    for name, (event, condition, body) in COVERAGE_TRIGGERS.items():
+        cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {event} FOR EACH ROW WHEN {condition} BEGIN {body} END')
+    if 'channel_coverage' not in tables:
+        cursor.execute(_backfill_sql(tables))
+        debug_log(f"[DB] Backfilled coverage summaries for {cursor.rowcount} channels")
+
+
+def record_channel_coverage(cursor: sqlite3.Cursor, channel_id: Optional[str], channel_title: Optional[str] = None,
+                            videos_reported: Optional[int] = None, channel_fetched_at: Optional[str] = None) -> None:
+    """
+    Record the channel fields of a channel's coverage summary.
+
+    Runs on the caller's cursor so the summary changes in the same transaction
+    as the channel record; the video and comment counts are kept by triggers.
+
+    Args:
+        cursor: Cursor of the write transaction
+        channel_id: YouTube channel ID
+        channel_title: Channel title, kept when None
+        videos_reported: Video count reported by the API, kept when None
+        channel_fetched_at: When the channel info was fetched, kept when None
+    """
+    if not channel_id:
+        return
+    create_coverage_schema(cursor)
+    cursor.execute('''
+        INSERT INTO channel_coverage (channel_id, channel_title, videos_reported, channel_fetched_at, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            channel_title = COALESCE(excluded.channel_title, channel_coverage.channel_title),
+            videos_reported = COALESCE(excluded.videos_reported, channel_coverage.videos_reported),
+            channel_fetched_at = COALESCE(excluded.channel_fetched_at, channel_coverage.channel_fetched_at),
+            updated_at = excluded.updated_at
+    ''', (channel_id, channel_title, videos_reported, channel_fetched_at, datetime.utcnow().isoformat()))
+
+
+class CoverageRepository(BaseRepository):
+    """Repository for the per-channel data coverage summary."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the coverage summary of one channel.
+
+        Args:
+            id: YouTube channel ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The summary row, or None if the channel has none
+        """
+        self.recount_stale()
+        rows = self.execute_query('SELECT * FROM channel_coverage WHERE channel_id = ?', (id,))
+        return rows[0] if rows else None
+
+    def refresh_channel(self, channel_id: str, video_ids: Optional[Iterable[str]] = None,
+                        channel_title: Optional[str] = None, videos_reported: Optional[int] = None,
+                        channel_fetched_at: Optional[str] = None) -> bool:
+        """
+        Recount the coverage summary of a channel from scratch.
+
+        The triggers keep the summary current on every write; this repairs a
+        channel whose rows were changed with the triggers missing.
+
+        Args:
+            channel_id: YouTube channel ID
+            video_ids: YouTube IDs of the videos saved for the channel; they are
+                linked to the channel when the API response did not carry snippet.channelId
+            channel_title: Channel title, kept when None
+            videos_reported: Video count reported by the API, kept when None
+            channel_fetched_at: When the channel info was fetched, kept when None
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not channel_id:
+            return False
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                create_coverage_schema(cursor)
+                video_ids = [video_id for video_id in (video_ids or []) if video_id]
+                if video_ids:
+                    cursor.executemany(
+                        'UPDATE videos SET snippet_channel_id = ? WHERE youtube_id = ? AND snippet_channel_id IS NULL',
+                        [(channel_id, video_id) for video_id in video_ids]
+                    )
+                cursor.execute(_REFRESH_SQL, {
+                    'channel_id': channel_id,
+                    'channel_title': channel_title,
+                    'videos_reported': videos_reported,
+                    'channel_fetched_at': channel_fetched_at,
+                    'updated_at': datetime.utcnow().isoformat()
+                })
+                conn.commit()
+            debug_log(f"[DB] Refreshed coverage summary for channel {channel_id}")
+            return True
+        except Exception as e:
+            debug_log(f"[DB ERROR] Failed to refresh coverage for channel {channel_id}: {str(e)}")
+            return False
+
+    def recount_stale(self) -> int:
+        """
+        Recount the summaries of the channels the triggers marked stale.
+
+        Returns:
+            int: Number of channels recounted
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if not conn.execute('SELECT 1 FROM channel_coverage_stale LIMIT 1').fetchone():
+                    return 0
+                recounted = conn.execute(_RECOUNT_STALE_SQL).rowcount
+                conn.execute('DELETE FROM channel_coverage_stale')
+                conn.commit()
+            debug_log(f"[DB] Recounted coverage summaries of {recounted} stale channels")
+            return recounted
+        except sqlite3.Error as e:
+            debug_log(f"[DB ERROR] Failed to recount stale coverage summaries: {str(e)}")
+            return 0
+
+    def get_coverage(self, channel_ids: Optional[List[str]] = None,
+                     channel_titles: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get coverage summaries with one indexed SELECT.
+
+        Args:
+            channel_ids: YouTube channel IDs to match
+            channel_titles: Channel titles to match, for snapshots without an ID
+
+        Returns:
+            List[Dict[str, Any]]: Summary rows; every row when no filter is given
+        """
+        self.recount_stale()
+        channel_ids = [channel_id for channel_id in (channel_ids or []) if channel_id]
+        channel_titles = [title for title in (channel_titles or []) if title]
+        query = f"SELECT {', '.join(COVERAGE_COLUMNS)} FROM channel_coverage"
+        conditions = []
+        if channel_ids:
+            conditions.append(f"channel_id IN ({','.join('?' * len(channel_ids))})")
+        if channel_titles:
+            conditions.append(f"channel_title IN ({','.join('?' * len(channel_titles))})")
+        if conditions:
+            query += " WHERE " + " OR ".join(conditions)
+        return self.execute_query(query, tuple(channel_ids) + tuple(channel_titles))
@@ -195,9 +195,14 @@ class DatabaseUtility(BaseRepository):
             cursor.execute("PRAGMA foreign_keys = OFF")
             
             # First drop tables with foreign key dependencies
+            # (channel_versions is kept so a channel's data version never repeats after a clear)
             tables_to_drop = [
+                "comments_fts",
+                "videos_fts",
                 "comments", 
                 "video_locations", 
+                "playlist_items", 
+                "refresh_jobs", 
                 "videos", 
                 "channels",
                 "iteration_history"
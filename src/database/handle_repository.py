@@ -0,0 +1,124 @@
+"""
+Handle repository module for the persistent handle/custom URL -> channel ID cache.
+
+Resolving a handle costs API quota, and a channel's handle rarely changes, so
+every resolution is kept in channel_handles with an expiry time. Lookups that
+found no channel are cached too, for a shorter time, so bulk imports do not
+pay again for the same dead handles.
+"""
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+# How long resolved and unresolvable references are trusted
+HANDLE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+HANDLE_NEGATIVE_TTL_SECONDS = 24 * 3600
+
+
+def create_handle_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the channel_handles table.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS channel_handles (
+        lookup_key TEXT PRIMARY KEY,
+        channel_id TEXT,
+        source TEXT,
+        resolved_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    ''')
+
+
+class HandleRepository(BaseRepository):
+    """Repository for cached channel handle resolutions."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached resolution of one lookup key, expired or not.
+
+        Args:
+            id: Normalized lookup key, e.g. "handle:@name"
+
+        Returns:
+            Optional[Dict[str, Any]]: The cache row, or None if the key was never resolved
+        """
+        rows = self.execute_query('SELECT * FROM channel_handles WHERE lookup_key = ?', (id,))
+        return rows[0] if rows else None
+
+    def get_cached(self, lookup_keys: Iterable[str], now: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """
+        Get the unexpired resolutions of several lookup keys with one query.
+
+        Args:
+            lookup_keys: Normalized lookup keys
+            now: Current time in epoch seconds, for tests
+
+        Returns:
+            Dict[str, Optional[str]]: Channel ID by lookup key; None for keys
+            known to resolve to no channel. Keys without a fresh entry are left out.
+        """
+        lookup_keys = list(dict.fromkeys(key for key in lookup_keys if key))
+        if not lookup_keys:
+            return {}
+        now = time.time() if now is None else now
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                create_handle_schema(conn.cursor())
+                rows = conn.execute(
+                    f"SELECT lookup_key, channel_id FROM channel_handles "
+                    f"WHERE expires_at > ? AND lookup_key IN ({','.join('?' * len(lookup_keys))})",
+                    (now, *lookup_keys)
+                ).fetchall()
+            return dict(rows)
+        except sqlite3.Error as e:
+            debug_log(f"Handle cache unavailable: {str(e)}")
+            return {}
+
+    def store_resolutions(self, resolutions: Iterable[Tuple[str, Optional[str], str]],
+                          now: Optional[float] = None) -> bool:
+        """
+        Cache resolutions in one transaction.
+
+        Args:
+            resolutions: (lookup_key, channel_id or None, source) tuples, where
+                source names the API call that answered, e.g. "forHandle"
+            now: Current time in epoch seconds, for tests
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        now = time.time() if now is None else now
+        rows = [
+            (lookup_key, channel_id, source, now,
+             now + (HANDLE_CACHE_TTL_SECONDS if channel_id else HANDLE_NEGATIVE_TTL_SECONDS))
+            for lookup_key, channel_id, source in resolutions
+        ]
+        if not rows:
+            return True
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                create_handle_schema(conn.cursor())
+                conn.executemany('''
+                    INSERT INTO channel_handles (lookup_key, channel_id, source, resolved_at, expires_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(lookup_key) DO UPDATE SET
+                        channel_id = excluded.channel_id,
+                        source = excluded.source,
+                        resolved_at = excluded.resolved_at,
+                        expires_at = excluded.expires_at
+                ''', rows)
+            return True
+        except sqlite3.Error as e:
+            debug_log(f"Failed to cache handle resolutions: {str(e)}")
+            return False
@@ -0,0 +1,159 @@
+"""
+Metrics history repository module for reading metric time series in bulk.
+
+The history tables keep every fetched snapshot as JSON. This repository pulls
+the metrics the alert thresholds are defined on straight out of that JSON
+with json_extract, for every entity of a channel (or of all channels) in one
+range query per entity type, so alert evaluation never walks the entities one
+by one.
+"""
+import json
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+# JSON paths of each metric, in the order they are tried. Snapshots are saved
+# either as the raw API resource or wrapped by the collection workflow.
+METRIC_PATHS: Dict[str, Dict[str, List[str]]] = {
+    'channel': {
+        'subscribers': ['$.statistics.subscriberCount', '$.raw_channel_info.statistics.subscriberCount',
+                        '$.api_data.raw_channel_info.statistics.subscriberCount', '$.subscribers'],
+        'views': ['$.statistics.viewCount', '$.raw_channel_info.statistics.viewCount',
+                  '$.api_data.raw_channel_info.statistics.viewCount', '$.views'],
+        'total_videos': ['$.statistics.videoCount', '$.raw_channel_info.statistics.videoCount',
+                         '$.api_data.raw_channel_info.statistics.videoCount', '$.total_videos'],
+    },
+    'video': {
+        'views': ['$.statistics.viewCount', '$.views'],
+        'likes': ['$.statistics.likeCount', '$.likes'],
+        'comment_count': ['$.statistics.commentCount', '$.comment_count'],
+    },
+    'comment': {
+        'likes': ['$.like_count', '$.snippet.likeCount', '$.likes'],
+        'reply_count': ['$.reply_count', '$.snippet.totalReplyCount'],
+    },
+}
+
+# History table, entity ID column, JSON column, joins and channel expression per entity type
+_HISTORY_SOURCES = {
+    'channel': ('channel_history', 'h.channel_id', 'h.raw_channel_info', '', 'h.channel_id'),
+    'video': ('videos_history', 'h.video_id', 'h.raw_video_info',
+              'LEFT JOIN videos v ON v.youtube_id = h.video_id', 'v.snippet_channel_id'),
+    'comment': ('comments_history', 'h.comment_id', 'h.raw_comment_info',
+                'LEFT JOIN comments c ON c.comment_id = h.comment_id LEFT JOIN videos v ON v.id = c.video_id',
+                'v.snippet_channel_id'),
+}
+
+SERIES_COLUMNS = ['entity_id', 'channel_id', 'metric', 'timestamp', 'value']
+
+
+def create_metrics_history_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Index the history tables by entity and fetch time for range reads.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    for table, column, index in (('channel_history', 'channel_id', 'idx_channel_history_channel_fetched'),
+                                 ('videos_history', 'video_id', 'idx_videos_history_video_fetched'),
+                                 ('comments_history', 'comment_id', 'idx_comments_history_comment_fetched')):
+        if table in tables:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index} ON {table}({column}, fetched_at)')
+
+
+class MetricsHistoryRepository(BaseRepository):
+    """Repository reading metric time series out of the history tables."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest history snapshot of a channel.
+
+        Args:
+            id: YouTube channel ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The channel_history row, or None if the channel has none
+        """
+        rows = self.execute_query('SELECT * FROM channel_history WHERE channel_id = ? '
+                                  'ORDER BY fetched_at DESC LIMIT 1', (id,))
+        return rows[0] if rows else None
+
+    def get_metric_series(self, entity_type: str, metrics: Optional[Iterable[str]] = None,
+                          channel_ids: Optional[Iterable[str]] = None,
+                          start_time: Optional[str] = None,
+                          entity_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Get the history of several metrics of every entity of some channels in one query.
+
+        Args:
+            entity_type: 'channel', 'video' or 'comment'
+            metrics: Metric names (see METRIC_PATHS); every known metric of the type by default
+            channel_ids: Only the entities of these channels; all channels by default
+            start_time: Only snapshots fetched at or after this ISO time
+            entity_ids: Only these entities; every entity by default
+
+        Returns:
+            pd.DataFrame: Long format with SERIES_COLUMNS, one row per snapshot and
+            metric it has a value for, sorted by entity and fetch time
+        """
+        if entity_type not in _HISTORY_SOURCES:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        paths = METRIC_PATHS[entity_type]
+        metrics = [metric for metric in (metrics or paths) if metric in paths]
+        if not metrics:
+            return pd.DataFrame(columns=SERIES_COLUMNS)
+
+        table, entity, raw, joins, channel = _HISTORY_SOURCES[entity_type]
+        # COALESCE stops at the first path present, so most snapshots are parsed once per metric
+        values = ', '.join(
+            'CAST(COALESCE({}) AS REAL)'.format(', '.join(f"json_extract({raw}, '{path}')" for path in paths[metric]))
+            for metric in metrics
+        )
+        # A malformed snapshot would make json_extract fail the whole query
+        where, params = [f'json_valid({raw})'], []
+        if start_time:
+            where.append('h.fetched_at >= ?')
+            params.append(start_time)
+        if channel_ids is not None:
+            channel_ids = list(channel_ids)
+            if not channel_ids:
+                return pd.DataFrame(columns=SERIES_COLUMNS)
+            where.append(f"{channel} IN ({', '.join('?' * len(channel_ids))})")
+            params.extend(channel_ids)
+            # Inner joins let SQLite start from the channels' videos instead of scanning the history
+            joins = joins.replace('LEFT JOIN', 'JOIN')
+        if entity_ids is not None:
+            entity_ids = list(entity_ids)
+            if not entity_ids:
+                return pd.DataFrame(columns=SERIES_COLUMNS)
+            # One JSON array parameter, so any number of entities stays under SQLite's variable limit
+            where.append(f'{entity} IN (SELECT value FROM json_each(?))')
+            params.append(json.dumps(entity_ids))
+        query = f'''
+            SELECT {entity}, {channel}, h.fetched_at, {values}
+            FROM {table} h {joins}
+            WHERE {' AND '.join(where)}
+            ORDER BY {entity}, h.fetched_at
+        '''
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                create_metrics_history_indexes(conn.cursor())
+                rows = conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            debug_log(f"Failed to read {entity_type} metric history: {str(e)}")
+            return pd.DataFrame(columns=SERIES_COLUMNS)
+
+        wide = pd.DataFrame.from_records(rows, columns=['entity_id', 'channel_id', 'timestamp'] + metrics)
+        series = wide.melt(id_vars=['entity_id', 'channel_id', 'timestamp'], value_vars=metrics,
+                           var_name='metric', value_name='value').dropna(subset=['value'])
+        debug_log(f"Read {len(series)} {entity_type} metric points for {wide['entity_id'].nunique()} entities")
+        return series[SERIES_COLUMNS].reset_index(drop=True)
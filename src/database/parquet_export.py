@@ -0,0 +1,304 @@
+"""
+Columnar Parquet export of the SQLite store.
+
+Tables are streamed out of SQLite in chunks into Hive-partitioned Parquet
+datasets, one per table, partitioned by channel and fetch date::
+
+    <export_dir>/videos/channel=UC.../fetch_date=2025-04-29/part-000003-0.parquet
+
+Each run only exports rows added or updated since the previous run, tracked
+per table in <export_dir>/_export_state.json. The history tables are
+append-only and are read back as they are. Rows of channels, videos and
+comments that change are exported again by a later run, and load_snapshot
+keeps the latest export of each row. Offline analysis can then read the
+snapshot as Arrow tables without touching the live database::
+
+    python -m src.database.parquet_export --db data/youtube_data.db --out data/parquet
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from src.utils.debug_utils import debug_log
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Rows fetched from SQLite and written per record batch
+EXPORT_CHUNK_SIZE = 50000
+STATE_FILE = '_export_state.json'
+
+
+class ExportTable(NamedTuple):
+    """How one SQLite table is exported."""
+    table: str
+    # Column identifying a row across runs; None for append-only history tables
+    key: Optional[str]
+    # Expression that grows whenever a row is added or updated
+    cursor: str
+    channel: str
+    fetched: str
+    joins: str = ''
+    extra_columns: str = ''
+
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    'channels': ExportTable('channels', 'channel_id', "COALESCE(t.updated_at, '')", 't.channel_id', 't.updated_at'),
+    'videos': ExportTable('videos', 'youtube_id', "COALESCE(t.fetched_at, t.updated_at, '')",
+                          't.snippet_channel_id', 'COALESCE(t.fetched_at, t.updated_at)'),
+    'comments': ExportTable('comments', 'comment_id', "COALESCE(t.fetched_at, '')", 'v.snippet_channel_id',
+                            't.fetched_at', 'LEFT JOIN videos v ON v.id = t.video_id',
+                            'v.youtube_id AS video_youtube_id'),
+    'channel_history': ExportTable('channel_history', None, 't.id', 't.channel_id', 't.fetched_at'),
+    'videos_history': ExportTable('videos_history', None, 't.id', 'v.snippet_channel_id', 't.fetched_at',
+                                  'LEFT JOIN videos v ON v.youtube_id = t.video_id'),
+    'comments_history': ExportTable('comments_history', None, 't.id', 'v.snippet_channel_id', 't.fetched_at',
+                                    'LEFT JOIN comments c ON c.comment_id = t.comment_id '
+                                    'LEFT JOIN videos v ON v.id = c.video_id'),
+    'playlists_history': ExportTable('playlists_history', None, 't.id', 'p.snippet_channelId', 't.fetched_at',
+                                     'LEFT JOIN playlists p ON p.playlist_id = t.playlist_id'),
+}
+
+# Columns added to every exported row
+PARTITION_COLUMNS = ('channel', 'fetch_date')
+RUN_COLUMN = 'export_run'
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet export needs pyarrow; install it with 'pip install pyarrow'")
+
+
+def _arrow_type(declared_type: str):
+    declared_type = (declared_type or '').upper()
+    if 'INT' in declared_type:
+        return pa.int64()
+    if any(name in declared_type for name in ('REAL', 'FLOA', 'DOUB')):
+        return pa.float64()
+    if 'BOOL' in declared_type:
+        return pa.bool_()
+    return pa.string()
+
+
+def _coerce(value: Any, arrow_type) -> Any:
+    """Convert a value SQLite stored with a type other than the declared one."""
+    if value is None:
+        return None
+    try:
+        if arrow_type == pa.int64():
+            return int(value)
+        if arrow_type == pa.float64():
+            return float(value)
+        if arrow_type == pa.bool_():
+            return str(value).lower() in ('1', 'true')
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_array(values: List[Any], arrow_type):
+    try:
+        return pa.array(values, type=arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, OverflowError):
+        return pa.array([_coerce(value, arrow_type) for value in values], type=arrow_type)
+
+
+def _load_state(export_dir: Path) -> Dict[str, Any]:
+    state_file = export_dir / STATE_FILE
+    if state_file.exists():
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'run': 0, 'tables': {}}
+
+
+def _save_state(export_dir: Path, state: Dict[str, Any]) -> None:
+    tmp_file = export_dir / f"{STATE_FILE}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, export_dir / STATE_FILE)
+
+
+def _export_table(conn: sqlite3.Connection, spec: ExportTable, export_dir: Path, run: int,
+                  table_state: Dict[str, Any], chunk_size: int) -> int:
+    """
+    Stream the new rows of one table into its Parquet dataset.
+
+    Args:
+        conn: Open SQLite connection
+        spec: How the table is exported
+        export_dir: Root directory of the export
+        run: Number of this export run
+        table_state: Cursor of the previous run, updated in place
+        chunk_size: Rows per record batch
+
+    Returns:
+        int: Number of rows exported
+    """
+    columns = [(row[1], _arrow_type(row[2])) for row in conn.execute(f"PRAGMA table_info({spec.table})")]
+    if not columns:
+        return 0
+    extra = [('video_youtube_id', pa.string())] if spec.extra_columns else []
+    fields = columns + extra + [('channel', pa.string()), ('fetch_date', pa.string()), (RUN_COLUMN, pa.int64())]
+    schema = pa.schema(fields)
+
+    where, params = '', ()
+    if table_state.get('cursor') is not None:
+        # Rows written after the last run within the same timestamp are picked up too
+        # (a whole batch of comments shares one fetched_at, so the IDs go to a temp table)
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS export_seen (id INTEGER PRIMARY KEY)')
+        conn.execute('DELETE FROM temp.export_seen')
+        conn.executemany('INSERT OR IGNORE INTO temp.export_seen (id) VALUES (?)',
+                         [(row_id,) for row_id in table_state.get('ids_at_cursor', [])])
+        where = (f"WHERE {spec.cursor} > ? OR ({spec.cursor} = ? "
+                 f"AND t.id NOT IN (SELECT id FROM temp.export_seen))")
+        params = (table_state['cursor'], table_state['cursor'])
+    select_extra = f", {spec.extra_columns}" if spec.extra_columns else ''
+    query = (f"SELECT t.*{select_extra}, {spec.channel} AS channel, substr({spec.fetched}, 1, 10) AS fetch_date, "
+             f"{spec.cursor} AS _cursor FROM {spec.table} t {spec.joins} {where} ORDER BY {spec.cursor}, t.id")
+    id_index = [name for name, _ in columns].index('id')
+    exported = [0]
+
+    def batches() -> Iterator['pa.RecordBatch']:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            arrays = [_to_array([row[i] for row in rows], arrow_type) for i, (_, arrow_type) in enumerate(fields[:-1])]
+            arrays.append(pa.array([run] * len(rows), type=pa.int64()))
+            exported[0] += len(rows)
+            for row in rows:
+                if row[-1] != table_state.get('cursor'):
+                    table_state['cursor'], table_state['ids_at_cursor'] = row[-1], []
+                table_state['ids_at_cursor'].append(row[id_index])
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    ds.write_dataset(
+        batches(), export_dir / spec.table, schema=schema, format='parquet',
+        partitioning=ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive'),
+        basename_template=f"part-{run:06d}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    return exported[0]
+
+
+def export_parquet_snapshot(db_path: str, export_dir: str, tables: Optional[Iterable[str]] = None,
+                            chunk_size: int = EXPORT_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Export the rows added or changed since the previous run to Parquet.
+
+    Args:
+        db_path: SQLite database to export
+        export_dir: Root directory of the Parquet datasets
+        tables: Names from EXPORT_TABLES; all of them by default
+        chunk_size: Rows read from SQLite per record batch
+
+    Returns:
+        Dict[str, int]: Rows exported per table
+    """
+    _require_pyarrow()
+    export_dir = Path(export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    state = _load_state(export_dir)
+    state['run'] += 1
+    run = state['run']
+
+    exported = {}
+    # A read-only connection never blocks the collectors writing to the live database. pyarrow
+    # pulls the record batches from its own thread, one at a time.
+    with sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False) as conn:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for name in tables or EXPORT_TABLES:
+            spec = EXPORT_TABLES[name]
+            if spec.table not in existing:
+                continue
+            table_state = dict(state['tables'].get(name, {}))
+            exported[name] = _export_table(conn, spec, export_dir, run, table_state, chunk_size)
+            if exported[name]:
+                table_state['exported_rows'] = table_state.get('exported_rows', 0) + exported[name]
+                table_state['last_run'] = run
+                state['tables'][name] = table_state
+            # Saved after every table so a failure later keeps the tables already written
+            state['exported_at'] = datetime.utcnow().isoformat()
+            _save_state(export_dir, state)
+    debug_log(f"Parquet export run {run} to {export_dir}: {exported}")
+    return exported
+
+
+def load_snapshot(export_dir: str, table: str, channel_ids: Optional[Iterable[str]] = None,
+                  columns: Optional[List[str]] = None, latest: bool = True) -> 'pa.Table':
+    """
+    Read an exported table back as an Arrow table.
+
+    The Parquet files are memory-mapped, so the result does not copy the
+    data; table.to_pandas(types_mapper=pd.ArrowDtype) keeps it that way.
+
+    Args:
+        export_dir: Root directory of the Parquet datasets
+        table: Name from EXPORT_TABLES
+        channel_ids: Only read these channels' partitions
+        columns: Columns to read; all by default
+        latest: Keep only the newest export of each row of channels, videos and comments
+
+    Returns:
+        pa.Table: The exported rows; empty if the table was never exported
+    """
+    _require_pyarrow()
+    spec = EXPORT_TABLES[table]
+    path = Path(export_dir) / spec.table
+    if not path.exists():
+        return pa.table({})
+    partitioning = ds.partitioning(pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor='hive')
+    dataset = ds.dataset(path, format='parquet', partitioning=partitioning)
+    # Columns added to SQLite after the first export only exist in later files
+    schema = pa.unify_schemas([fragment.physical_schema for fragment in dataset.get_fragments()] +
+                              [partitioning.schema])
+    dataset = ds.dataset(path, schema=schema, format='parquet', partitioning=partitioning,
+                         filesystem=pafs.LocalFileSystem(use_mmap=True))
+
+    row_filter = None
+    if channel_ids is not None:
+        row_filter = ds.field('channel').isin(list(channel_ids))
+    dedupe = latest and spec.key is not None
+    read_columns = None
+    if columns is not None:
+        read_columns = list(dict.fromkeys(list(columns) + ([spec.key, RUN_COLUMN] if dedupe else [])))
+    result = dataset.to_table(columns=read_columns, filter=row_filter)
+
+    if dedupe and result.num_rows:
+        newest = result.group_by(spec.key).aggregate([(RUN_COLUMN, 'max')])
+        joined = result.join(newest, spec.key, join_type='inner')
+        result = joined.filter(pc.equal(joined[RUN_COLUMN], joined[f"{RUN_COLUMN}_max"])).drop_columns([f"{RUN_COLUMN}_max"])
+    if columns is not None:
+        result = result.select(list(columns))
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.database.parquet_export',
+                                     description='Export the SQLite store to partitioned Parquet datasets')
+    parser.add_argument('--db', required=True, help='SQLite database to export')
+    parser.add_argument('--out', required=True, help='Directory of the Parquet datasets')
+    parser.add_argument('--tables', nargs='*', choices=sorted(EXPORT_TABLES), help='Tables to export; all by default')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    exported = export_parquet_snapshot(args.db, args.out, args.tables, args.chunk_size)
+    for name, rows in exported.items():
+        print(f"{name}: {rows} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Playlist item repository module for playlist membership.
+
+playlist_items maps each playlist to the videos in it, so collecting several
+playlists of a channel can tell which videos are already stored and which
+belong to more than one playlist without walking the playlists again.
+"""
+import sqlite3
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+# Stay below SQLite's default limit of 999 bound variables per statement
+_MAX_IN_VARIABLES = 900
+
+
+def create_playlist_items_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the playlist_items table and its video index.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS playlist_items (
+        playlist_id TEXT NOT NULL,
+        video_id TEXT NOT NULL,
+        position INTEGER,
+        added_at TEXT,
+        PRIMARY KEY (playlist_id, video_id)
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_playlist_items_video_id ON playlist_items(video_id)')
+
+
+class PlaylistItemRepository(BaseRepository):
+    """Repository for playlist membership."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> List[Dict[str, Any]]:
+        """
+        Get the items of a playlist.
+
+        Args:
+            id: YouTube playlist ID
+
+        Returns:
+            List[Dict[str, Any]]: playlist_id, video_id, position and added_at rows in playlist order
+        """
+        return self.execute_query(
+            'SELECT * FROM playlist_items WHERE playlist_id = ? ORDER BY position, video_id', (id,)
+        )
+
+    def get_playlists_for_video(self, video_id: str) -> List[str]:
+        """
+        Get the playlists containing a video.
+
+        Args:
+            video_id: YouTube video ID
+
+        Returns:
+            List[str]: Playlist IDs
+        """
+        rows = self.execute_query(
+            'SELECT playlist_id FROM playlist_items WHERE video_id = ? ORDER BY playlist_id', (video_id,)
+        )
+        return [row['playlist_id'] for row in rows]
+
+    def store_playlist_items(self, memberships: Mapping[str, Iterable[Dict[str, Any]]],
+                             prune: bool = True) -> bool:
+        """
+        Upsert the items of several playlists in one transaction.
+
+        Args:
+            memberships: Items by playlist ID, each a dict with video_id and
+                optionally position and added_at
+            prune: Remove stored items no longer in a playlist; only pass complete playlists
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        rows = []
+        playlist_ids = []
+        for playlist_id, items in memberships.items():
+            playlist_ids.append(playlist_id)
+            rows.extend(
+                (playlist_id, item['video_id'], item.get('position'), item.get('added_at'))
+                for item in items if item.get('video_id')
+            )
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                create_playlist_items_schema(conn.cursor())
+                if prune and playlist_ids:
+                    conn.executemany('DELETE FROM playlist_items WHERE playlist_id = ?',
+                                     [(playlist_id,) for playlist_id in playlist_ids])
+                conn.executemany('''
+                    INSERT INTO playlist_items (playlist_id, video_id, position, added_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(playlist_id, video_id) DO UPDATE SET
+                        position = excluded.position,
+                        added_at = excluded.added_at
+                ''', rows)
+            debug_log(f"Stored {len(rows)} items of {len(playlist_ids)} playlists")
+            return True
+        except sqlite3.Error as e:
+            debug_log(f"Failed to store playlist items: {str(e)}")
+            return False
+
+    def get_stored_video_ids(self, video_ids: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        Get which videos already have a row in the videos table.
+
+        Args:
+            video_ids: YouTube video IDs to check; every stored video when None
+
+        Returns:
+            Set[str]: The stored YouTube video IDs
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if video_ids is None:
+                    return {row[0] for row in conn.execute('SELECT youtube_id FROM videos')}
+                video_ids = list(dict.fromkeys(video_ids))
+                stored = set()
+                for start in range(0, len(video_ids), _MAX_IN_VARIABLES):
+                    chunk = video_ids[start:start + _MAX_IN_VARIABLES]
+                    stored.update(row[0] for row in conn.execute(
+                        f"SELECT youtube_id FROM videos WHERE youtube_id IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ))
+                return stored
+        except sqlite3.Error as e:
+            debug_log(f"Failed to read stored video IDs: {str(e)}")
+            return set()
@@ -0,0 +1,289 @@
+"""
+Scheduler repository module for refresh policies and background refresh jobs.
+
+refresh_policies holds how often each channel should be refreshed and how
+much to collect; refresh_jobs records every job the refresh scheduler queued
+and ran, with the quota it was expected to use and actually used, so
+the Streamlit app can show the scheduler's progress and the scheduler can
+budget the daily quota across restarts.
+"""
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+# Job states; queued and running jobs count against the day's quota with their estimate
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+
+
+def create_scheduler_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the refresh_policies and refresh_jobs tables.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS refresh_policies (
+        channel_id TEXT PRIMARY KEY,
+        interval_hours REAL NOT NULL DEFAULT 24,
+        priority REAL NOT NULL DEFAULT 1,
+        max_videos INTEGER NOT NULL DEFAULT 50,
+        max_comments_per_video INTEGER NOT NULL DEFAULT 0,
+        enabled INTEGER NOT NULL DEFAULT 1,
+        updated_at TEXT
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS refresh_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel_id TEXT NOT NULL,
+        status TEXT NOT NULL,
+        score REAL,
+        quota_day TEXT NOT NULL,
+        quota_estimate INTEGER NOT NULL DEFAULT 0,
+        quota_used INTEGER,
+        videos INTEGER,
+        error TEXT,
+        queued_at TEXT NOT NULL,
+        started_at TEXT,
+        finished_at TEXT
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_refresh_jobs_channel ON refresh_jobs(channel_id, finished_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_refresh_jobs_day ON refresh_jobs(quota_day, status)')
+    # Growth is read from the two latest snapshots of each channel
+    if cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'channel_history'").fetchone():
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_channel_history_channel_fetched '
+                       'ON channel_history(channel_id, fetched_at)')
+
+
+def _utcnow() -> str:
+    # Same naive UTC ISO format as channel_history.fetched_at
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _statistics(raw_channel_info: Optional[str]) -> Dict[str, Optional[float]]:
+    """Views and subscribers of a channel_history snapshot."""
+    try:
+        statistics = json.loads(raw_channel_info or '{}').get('statistics') or {}
+    except (TypeError, ValueError):
+        statistics = {}
+    values = {}
+    for key, field in (('views', 'viewCount'), ('subscribers', 'subscriberCount')):
+        try:
+            values[key] = float(statistics[field])
+        except (KeyError, TypeError, ValueError):
+            values[key] = None
+    return values
+
+
+class SchedulerRepository(BaseRepository):
+    """Repository for refresh policies and refresh jobs."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the refresh policy of a channel.
+
+        Args:
+            id: YouTube channel ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The policy row, or None if the channel has none
+        """
+        rows = self.execute_query('SELECT * FROM refresh_policies WHERE channel_id = ?', (id,))
+        return rows[0] if rows else None
+
+    def set_policy(self, channel_id: str, interval_hours: float = 24, priority: float = 1,
+                   max_videos: int = 50, max_comments_per_video: int = 0, enabled: bool = True) -> bool:
+        """
+        Create or replace the refresh policy of a channel.
+
+        Args:
+            channel_id: YouTube channel ID
+            interval_hours: Refresh the channel once it is this many hours old
+            priority: Weight of the channel when the quota does not cover every due channel
+            max_videos: Videos to collect per refresh
+            max_comments_per_video: Comments to collect per video; 0 skips comments
+            enabled: Whether the scheduler refreshes the channel
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                create_scheduler_schema(conn.cursor())
+                conn.execute('''
+                    INSERT OR REPLACE INTO refresh_policies
+                        (channel_id, interval_hours, priority, max_videos, max_comments_per_video, enabled, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (channel_id, interval_hours, priority, max_videos, max_comments_per_video,
+                      int(enabled), _utcnow()))
+            return True
+        except sqlite3.Error as e:
+            debug_log(f"Failed to store refresh policy for {channel_id}: {str(e)}")
+            return False
+
+    def get_candidates(self, include_unconfigured: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get every channel the scheduler may refresh, with what it needs to rank them.
+
+        Channels with a policy are returned even before they are first stored.
+
+        Args:
+            include_unconfigured: Also return stored channels without a policy
+                (their policy columns are NULL); disabled channels are never returned
+
+        Returns:
+            List[Dict[str, Any]]: One row per channel with its policy, the time
+            of its last refresh (last successful job, else latest snapshot),
+            the quota its last job used and the views/subscribers and fetch
+            times of its two latest channel_history snapshots
+        """
+        stored = 'UNION SELECT channel_id FROM channels' if include_unconfigured else ''
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                create_scheduler_schema(conn.cursor())
+                rows = conn.execute(f'''
+                    WITH ids AS (SELECT channel_id FROM refresh_policies {stored})
+                    SELECT ids.channel_id, c.channel_title, c.video_count, c.updated_at,
+                           p.interval_hours, p.priority, p.max_videos, p.max_comments_per_video,
+                           (SELECT MAX(j.finished_at) FROM refresh_jobs j
+                             WHERE j.channel_id = ids.channel_id AND j.status = 'succeeded') AS last_job_at,
+                           (SELECT j.quota_used FROM refresh_jobs j
+                             WHERE j.channel_id = ids.channel_id AND j.status = 'succeeded'
+                             ORDER BY j.finished_at DESC LIMIT 1) AS last_quota_used,
+                           h1.fetched_at AS latest_fetched_at, h1.raw_channel_info AS latest_info,
+                           h2.fetched_at AS previous_fetched_at, h2.raw_channel_info AS previous_info
+                    FROM ids
+                    LEFT JOIN channels c ON c.channel_id = ids.channel_id
+                    LEFT JOIN refresh_policies p ON p.channel_id = ids.channel_id
+                    LEFT JOIN channel_history h1 ON h1.id = (
+                        SELECT h.id FROM channel_history h WHERE h.channel_id = ids.channel_id
+                        ORDER BY h.fetched_at DESC LIMIT 1)
+                    LEFT JOIN channel_history h2 ON h2.id = (
+                        SELECT h.id FROM channel_history h WHERE h.channel_id = ids.channel_id
+                        ORDER BY h.fetched_at DESC LIMIT 1 OFFSET 1)
+                    WHERE COALESCE(p.enabled, 1) = 1
+                ''').fetchall()
+        except sqlite3.Error as e:
+            debug_log(f"Failed to read refresh candidates: {str(e)}")
+            return []
+
+        candidates = []
+        for row in rows:
+            candidate = dict(row)
+            latest = _statistics(candidate.pop('latest_info'))
+            previous = _statistics(candidate.pop('previous_info'))
+            candidate.update({f'latest_{key}': value for key, value in latest.items()})
+            candidate.update({f'previous_{key}': value for key, value in previous.items()})
+            candidate['last_refreshed_at'] = candidate['last_job_at'] or candidate['latest_fetched_at']
+            candidates.append(candidate)
+        return candidates
+
+    def queue_jobs(self, jobs: Iterable[Dict[str, Any]], quota_day: str) -> List[int]:
+        """
+        Record planned jobs as queued.
+
+        Args:
+            jobs: Dicts with channel_id, score and quota_estimate
+            quota_day: Quota day the jobs are charged to
+
+        Returns:
+            List[int]: Job IDs in the order given
+        """
+        now = _utcnow()
+        ids = []
+        with sqlite3.connect(self.db_path) as conn:
+            create_scheduler_schema(conn.cursor())
+            for job in jobs:
+                cursor = conn.execute('''
+                    INSERT INTO refresh_jobs (channel_id, status, score, quota_day, quota_estimate, queued_at)
+                    VALUES (?, 'queued', ?, ?, ?, ?)
+                ''', (job['channel_id'], job.get('score'), quota_day, job.get('quota_estimate', 0), now))
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def start_job(self, job_id: int) -> None:
+        """Mark a queued job as running."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE refresh_jobs SET status = 'running', started_at = ? WHERE id = ?",
+                         (_utcnow(), job_id))
+
+    def finish_job(self, job_id: int, succeeded: bool, quota_used: Optional[int] = None,
+                   videos: Optional[int] = None, error: Optional[str] = None) -> None:
+        """
+        Record the outcome of a job.
+
+        Args:
+            job_id: Job ID from queue_jobs
+            succeeded: Whether the channel was collected and saved
+            quota_used: Quota units the job's API requests used
+            videos: Number of videos collected
+            error: Failure message
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                UPDATE refresh_jobs SET status = ?, quota_used = ?, videos = ?, error = ?, finished_at = ?
+                WHERE id = ?
+            ''', ('succeeded' if succeeded else 'failed', quota_used, videos, error, _utcnow(), job_id))
+
+    def fail_interrupted_jobs(self) -> int:
+        """
+        Mark jobs left queued or running by a scheduler that stopped as failed.
+
+        Returns:
+            int: Number of jobs marked
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            create_scheduler_schema(conn.cursor())
+            cursor = conn.execute('''
+                UPDATE refresh_jobs SET status = 'failed', error = 'interrupted', finished_at = ?
+                WHERE status IN ('queued', 'running')
+            ''', (_utcnow(),))
+            return cursor.rowcount
+
+    def get_quota_used(self, quota_day: str) -> int:
+        """
+        Get the quota charged to scheduler jobs on a quota day.
+
+        Finished jobs count with the quota they used, pending ones with their estimate.
+
+        Args:
+            quota_day: Quota day, as returned by current_quota_day
+
+        Returns:
+            int: Quota units
+        """
+        rows = self.execute_query('''
+            SELECT COALESCE(SUM(CASE WHEN status IN ('queued', 'running') THEN quota_estimate
+                                     ELSE COALESCE(quota_used, quota_estimate) END), 0) AS used
+            FROM refresh_jobs WHERE quota_day = ?
+        ''', (quota_day,))
+        return int(rows[0]['used']) if rows else 0
+
+    def get_recent_jobs(self, limit: int = 100, channel_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs
+            channel_id: Only the jobs of this channel
+
+        Returns:
+            List[Dict[str, Any]]: Job rows with the channel title
+        """
+        where, params = ('WHERE j.channel_id = ?', (channel_id, limit)) if channel_id else ('', (limit,))
+        return self.execute_query(f'''
+            SELECT j.*, c.channel_title FROM refresh_jobs j
+            LEFT JOIN channels c ON c.channel_id = j.channel_id
+            {where} ORDER BY j.id DESC LIMIT ?
+        ''', params)
@@ -0,0 +1,269 @@
+"""
+Full-text search over stored comments and videos.
+
+comments_fts and videos_fts are FTS5 tables with external content: they index
+comments.text/author_display_name and videos.snippet_title/snippet_description
+without storing a second copy of the text. Triggers keep them in sync with
+every insert, upsert and delete, so the regular and bulk ingestion paths need
+no changes. SQLite builds without FTS5 simply have no search index; callers
+then fall back to scanning.
+"""
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from src.utils.debug_utils import debug_log
+from src.utils.metrics import timed
+from src.database.base_repository import BaseRepository
+
+# Indexed source tables: FTS table -> (content table, indexed columns)
+FTS_TABLES = {
+    'comments_fts': ('comments', ('text', 'author_display_name')),
+    'videos_fts': ('videos', ('snippet_title', 'snippet_description')),
+}
+
+# Case and accent insensitive tokens
+_FTS_TOKENIZER = 'unicode61 remove_diacritics 2'
+
+# "quoted phrases" or single words of a user query
+_QUERY_TERM_RE = re.compile(r'"([^"]*)"|(\w+)', re.UNICODE)
+
+
+def _sync_triggers(fts_table: str, table: str, columns: Sequence[str]) -> List[str]:
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{col}' for col in columns)
+    old_values = ', '.join(f'old.{col}' for col in columns)
+    delete = f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    insert = f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {cols} ON {table} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def create_search_schema(cursor: sqlite3.Cursor) -> bool:
+    """
+    Create the FTS5 tables and their sync triggers, indexing existing rows once.
+
+    Args:
+        cursor: Cursor of an open connection
+
+    Returns:
+        bool: False when this SQLite build has no FTS5 support
+    """
+    try:
+        for fts_table, (table, columns) in FTS_TABLES.items():
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+            exists = cursor.fetchone() is not None
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+                f"{', '.join(columns)}, content='{table}', content_rowid='id', tokenize='{_FTS_TOKENIZER}')"
+            )
+            for trigger in _sync_triggers(fts_table, table, columns):
+                cursor.execute(trigger)
+            if not exists:
+                # Index rows stored before the search tables existed
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        return True
+    except sqlite3.OperationalError as e:
+        debug_log(f"Full-text search unavailable, FTS5 tables not created: {str(e)}")
+        return False
+
+
+def build_match_query(text: Optional[str], column: Optional[str] = None) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Words match as prefixes ("subscrib" finds "subscribed") and "quoted
+    phrases" match exactly; all terms must be present. FTS5 operators in the
+    input are treated as plain words.
+
+    Args:
+        text: User search input
+        column: Restrict every term to this indexed column
+
+    Returns:
+        Optional[str]: The MATCH expression, or None when the text has no terms
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM_RE.findall(text or ''):
+        if phrase.strip():
+            term = '"' + ' '.join(re.findall(r'\w+', phrase, re.UNICODE)) + '"'
+        elif word:
+            term = f'"{word}"*'
+        else:
+            continue
+        if term != '""':
+            terms.append(f'{column} : {term}' if column else term)
+    return ' '.join(terms) or None
+
+
+def has_search_index(conn: sqlite3.Connection, fts_table: str = 'comments_fts') -> bool:
+    """
+    Check whether a database has a full-text search table.
+
+    Args:
+        conn: Open connection
+        fts_table: Name from FTS_TABLES
+
+    Returns:
+        bool: True if the table exists
+    """
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (fts_table,)).fetchone() is not None
+
+
+def _channel_filter(channel_ids: Optional[Iterable[str]], alias: str = 'v') -> tuple:
+    channel_ids = [channel_id for channel_id in (channel_ids or []) if channel_id]
+    if not channel_ids:
+        return '', []
+    return f" AND {alias}.snippet_channel_id IN ({','.join('?' * len(channel_ids))})", channel_ids
+
+
+class SearchRepository(BaseRepository):
+    """Repository for ranked full-text search over comments and videos."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the indexed text of a comment.
+
+        Args:
+            id: Database ID of the comment
+
+        Returns:
+            Optional[Dict[str, Any]]: The indexed columns, or None if not found
+        """
+        rows = self.execute_query('SELECT rowid AS id, text, author_display_name FROM comments_fts WHERE rowid = ?',
+                                  (id,))
+        return rows[0] if rows else None
+
+    @timed('db_operation_seconds', operation='search_comments')
+    def search_comments(self, query: str, channel_ids: Optional[Iterable[str]] = None, limit: int = 50,
+                        offset: int = 0, highlight: Sequence[str] = ('**', '**')) -> List[Dict[str, Any]]:
+        """
+        Find comments matching a query, best matches first.
+
+        Args:
+            query: Free text, see build_match_query
+            channel_ids: Only search comments on these channels' videos
+            limit: Maximum number of hits
+            offset: Number of hits to skip
+            highlight: Markers placed around matched terms in the snippet
+
+        Returns:
+            List of hits with comment_id, text, snippet, author, published_at,
+            like_count, is_reply, video_id, video_title, channel_id and rank
+            (lower is better); empty when nothing matches or there is no index
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        channel_sql, channel_params = _channel_filter(channel_ids)
+        return self.execute_query(f"""
+            SELECT c.comment_id, c.text,
+                   snippet(comments_fts, 0, ?, ?, '…', 16) AS snippet,
+                   c.author_display_name AS author, c.published_at, c.like_count, c.is_reply,
+                   v.youtube_id AS video_id, v.snippet_title AS video_title,
+                   v.snippet_channel_id AS channel_id, comments_fts.rank AS rank
+            FROM comments_fts
+            JOIN comments c ON c.id = comments_fts.rowid
+            LEFT JOIN videos v ON v.id = c.video_id
+            WHERE comments_fts MATCH ?{channel_sql}
+            ORDER BY comments_fts.rank
+            LIMIT ? OFFSET ?
+        """, (highlight[0], highlight[1], match, *channel_params, int(limit), int(offset)))
+
+    def count_comment_matches(self, query: str, channel_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Count the comments matching a query.
+
+        Args:
+            query: Free text, see build_match_query
+            channel_ids: Only count comments on these channels' videos
+
+        Returns:
+            int: Number of matching comments
+        """
+        match = build_match_query(query)
+        if not match:
+            return 0
+        channel_sql, channel_params = _channel_filter(channel_ids)
+        rows = self.execute_query(f"""
+            SELECT COUNT(*) AS total
+            FROM comments_fts
+            JOIN comments c ON c.id = comments_fts.rowid
+            LEFT JOIN videos v ON v.id = c.video_id
+            WHERE comments_fts MATCH ?{channel_sql}
+        """, (match, *channel_params))
+        return rows[0]['total'] if rows else 0
+
+    def matching_comment_ids(self, query: str, channel_ids: Optional[Iterable[str]] = None) -> Optional[Set[str]]:
+        """
+        Get the YouTube IDs of all comments matching a query, for filtering loaded comments.
+
+        Args:
+            query: Free text, see build_match_query
+            channel_ids: Only match comments on these channels' videos
+
+        Returns:
+            Optional[Set[str]]: Matching comment IDs, or None when the
+            database has no search index
+        """
+        match = build_match_query(query)
+        if not match:
+            return set()
+        channel_sql, channel_params = _channel_filter(channel_ids)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if not has_search_index(conn, 'comments_fts'):
+                    return None
+                rows = conn.execute(f"""
+                    SELECT c.comment_id
+                    FROM comments_fts
+                    JOIN comments c ON c.id = comments_fts.rowid
+                    LEFT JOIN videos v ON v.id = c.video_id
+                    WHERE comments_fts MATCH ?{channel_sql}
+                """, (match, *channel_params)).fetchall()
+            return {row[0] for row in rows}
+        except sqlite3.Error as e:
+            debug_log(f"Comment search failed: {str(e)}")
+            return None
+
+    @timed('db_operation_seconds', operation='search_videos')
+    def search_videos(self, query: str, channel_ids: Optional[Iterable[str]] = None, limit: int = 50,
+                      offset: int = 0, highlight: Sequence[str] = ('**', '**')) -> List[Dict[str, Any]]:
+        """
+        Find videos whose title or description matches a query, best matches first.
+
+        Args:
+            query: Free text, see build_match_query
+            channel_ids: Only search these channels' videos
+            limit: Maximum number of hits
+            offset: Number of hits to skip
+            highlight: Markers placed around matched terms in the snippet
+
+        Returns:
+            List of hits with video_id, title, snippet, published_at,
+            channel_id, view_count and rank (lower is better)
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        channel_sql, channel_params = _channel_filter(channel_ids)
+        return self.execute_query(f"""
+            SELECT v.youtube_id AS video_id, v.snippet_title AS title,
+                   snippet(videos_fts, -1, ?, ?, '…', 16) AS snippet,
+                   v.published_at, v.snippet_channel_id AS channel_id,
+                   v.statistics_view_count AS view_count, videos_fts.rank AS rank
+            FROM videos_fts
+            JOIN videos v ON v.id = videos_fts.rowid
+            WHERE videos_fts MATCH ?{channel_sql}
+            ORDER BY videos_fts.rank
+            LIMIT ? OFFSET ?
+        """, (highlight[0], highlight[1], match, *channel_params, int(limit), int(offset)))
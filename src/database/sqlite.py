@@ -8,16 +8,21 @@ from datetime import datetime
 
 from src.utils.debug_utils import debug_log
 from src.database.channel_repository import ChannelRepository
-from src.database.video_repository import VideoRepository
+from src.database.video_repository import (
+    VideoRepository, create_video_page_indexes, ensure_duration_seconds_column
+)
 from src.database.comment_repository import CommentRepository
 from src.database.location_repository import LocationRepository
+from src.database.coverage_repository import CoverageRepository, create_coverage_schema
+from src.database.search_repository import SearchRepository, create_search_schema
+from src.database.version_repository import VersionRepository, create_version_schema
+from src.database.handle_repository import create_handle_schema
+from src.database.playlist_item_repository import PlaylistItemRepository, create_playlist_items_schema
+from src.database.scheduler_repository import SchedulerRepository, create_scheduler_schema
+from src.database.metrics_history_repository import MetricsHistoryRepository, create_metrics_history_indexes
 from src.database.database_utility import DatabaseUtility
 
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 
 class SQLiteDatabase:
     """SQLite database connector for the YouTube scraper application."""
@@ -32,6 +37,12 @@ class SQLiteDatabase:
         self.video_repository = VideoRepository(db_path)
         self.comment_repository = CommentRepository(db_path)
         self.location_repository = LocationRepository(db_path)
+        self.coverage_repository = CoverageRepository(db_path)
+        self.search_repository = SearchRepository(db_path)
+        self.version_repository = VersionRepository(db_path)
+        self.playlist_item_repository = PlaylistItemRepository(db_path)
+        self.scheduler_repository = SchedulerRepository(db_path)
+        self.metrics_history_repository = MetricsHistoryRepository(db_path)
         self.database_utility = DatabaseUtility(db_path)
         # Always initialize the database tables (for each DB instance)
         self.initialize_db()
@@ -137,6 +148,7 @@ class SQLiteDatabase:
                 snippet_thumbnails_maxres TEXT,
                 -- contentDetails
                 content_details_duration TEXT,
+                duration_seconds INTEGER, -- parsed from content_details_duration at ingestion
                 content_details_dimension TEXT,
                 content_details_definition TEXT,
                 content_details_caption TEXT,
@@ -254,6 +266,23 @@ class SQLiteDatabase:
             cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_channels_channel_id ON channels(channel_id)
             ''')
+            # Add columns introduced after the table was first created
+            ensure_duration_seconds_column(cursor)
+            create_video_page_indexes(cursor)
+            # Create the channel_coverage summary table maintained on save
+            create_coverage_schema(cursor)
+            # Full-text search over comments and videos, kept in sync by triggers
+            create_search_schema(cursor)
+            # Per-channel data versions and the row content hashes behind them
+            create_version_schema(cursor)
+            # Persistent handle -> channel ID cache of the channel resolver
+            create_handle_schema(cursor)
+            # Playlist membership written by multi-playlist expansion
+            create_playlist_items_schema(cursor)
+            # Refresh policies and the jobs of the background refresh scheduler
+            create_scheduler_schema(cursor)
+            # Range reads of metric history by the batch alert evaluation
+            create_metrics_history_indexes(cursor)
             conn.commit()
             conn.close()
         except Exception as e:
@@ -308,6 +337,102 @@ class SQLiteDatabase:
         """
         return self.channel_repository.get_channel_data(channel_identifier)
     
+    def get_channel_coverage(self, channel_ids=None, channel_titles=None):
+        """
+        Get precomputed data coverage summaries - delegated to CoverageRepository
+        
+        Args:
+            channel_ids (list, optional): YouTube channel IDs to match
+            channel_titles (list, optional): Channel titles to match
+            
+        Returns:
+            list: Summary rows as dictionaries; every channel when no filter is given
+        """
+        return self.coverage_repository.get_coverage(channel_ids, channel_titles)
+    
+    def search_comments(self, query, channel_ids=None, limit=50, offset=0):
+        """
+        Full-text search over stored comments - delegated to SearchRepository
+        
+        Args:
+            query (str): Words or "phrases" to find
+            channel_ids (list, optional): Only search these channels
+            limit (int): Maximum number of hits
+            offset (int): Number of hits to skip
+            
+        Returns:
+            list: Ranked hits with highlighted snippets
+        """
+        return self.search_repository.search_comments(query, channel_ids, limit, offset)
+    
+    def search_videos(self, query, channel_ids=None, limit=50, offset=0):
+        """
+        Full-text search over stored video titles and descriptions - delegated to SearchRepository
+        
+        Args:
+            query (str): Words or "phrases" to find
+            channel_ids (list, optional): Only search these channels
+            limit (int): Maximum number of hits
+            offset (int): Number of hits to skip
+            
+        Returns:
+            list: Ranked hits with highlighted snippets
+        """
+        return self.search_repository.search_videos(query, channel_ids, limit, offset)
+    
+    def get_data_version(self, channel_id):
+        """
+        Get a channel's data version - delegated to VersionRepository
+        
+        The version grows whenever the stored channel record, its videos or
+        its comments change, and stays the same when an identical snapshot is saved.
+        
+        Args:
+            channel_id (str): YouTube channel ID
+            
+        Returns:
+            int: The data version, 0 if the channel was never stored
+        """
+        return self.version_repository.get_data_version(channel_id)
+    
+    def get_data_versions(self, channel_ids=None):
+        """
+        Get the data versions of several channels - delegated to VersionRepository
+        
+        Args:
+            channel_ids (list, optional): YouTube channel IDs; every channel when None
+            
+        Returns:
+            dict: Data version by channel ID
+        """
+        return self.version_repository.get_data_versions(channel_ids)
+    
+    def get_channel_fingerprints(self, channel_id):
+        """
+        Get a channel's data version and content fingerprints - delegated to VersionRepository
+        
+        Args:
+            channel_id (str): YouTube channel ID
+            
+        Returns:
+            dict or None: data_version plus channel, videos and comments fingerprints as hex strings
+        """
+        return self.version_repository.get_by_id(channel_id)
+    
+    def export_parquet(self, export_dir, tables=None):
+        """
+        Export rows added or changed since the last export to Parquet - delegated to parquet_export
+        
+        Args:
+            export_dir (str): Root directory of the partitioned Parquet datasets
+            tables (list, optional): Table names; every exported table when None
+            
+        Returns:
+            dict: Rows exported per table
+        """
+        from src.database.parquet_export import export_parquet_snapshot
+        return export_parquet_snapshot(str(self.db_path), export_dir, tables)
+    
     def display_channels_data(self):
         """Display all channels from SQLite database in a Streamlit interface - delegated to ChannelRepository"""
         return self.channel_repository.display_channels_data()
@@ -432,6 +557,92 @@ class SQLiteDatabase:
         playlist_repo = PlaylistRepository(self.db_path)
         return playlist_repo.store_playlist_data(playlist)
 
+    def store_playlist_items(self, memberships, prune=True):
+        """
+        Save the items of several playlists in one transaction - delegated to PlaylistItemRepository
+        
+        Args:
+            memberships (dict): Items by playlist ID, each with video_id, position and added_at
+            prune (bool): Remove stored items no longer in a playlist
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.playlist_item_repository.store_playlist_items(memberships, prune)
+    
+    def get_playlist_items(self, playlist_id):
+        """
+        Get the stored items of a playlist - delegated to PlaylistItemRepository
+        
+        Args:
+            playlist_id (str): YouTube playlist ID
+            
+        Returns:
+            list: Item rows in playlist order
+        """
+        return self.playlist_item_repository.get_by_id(playlist_id)
+    
+    def get_stored_video_ids(self, video_ids=None):
+        """
+        Get which videos are already stored - delegated to PlaylistItemRepository
+        
+        Args:
+            video_ids (list, optional): YouTube video IDs to check; every stored video when None
+            
+        Returns:
+            set: The stored YouTube video IDs
+        """
+        return self.playlist_item_repository.get_stored_video_ids(video_ids)
+    
+    def set_refresh_policy(self, channel_id, interval_hours=24, priority=1, max_videos=50,
+                           max_comments_per_video=0, enabled=True):
+        """
+        Set how the refresh scheduler refreshes a channel - delegated to SchedulerRepository
+        
+        Args:
+            channel_id (str): YouTube channel ID
+            interval_hours (float): Refresh once the channel's data is this many hours old
+            priority (float): Weight of the channel when the quota does not cover every due channel
+            max_videos (int): Videos to collect per refresh; 0 for all
+            max_comments_per_video (int): Comments to collect per video; 0 skips comments
+            enabled (bool): Whether the scheduler refreshes the channel
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self.scheduler_repository.set_policy(channel_id, interval_hours, priority, max_videos,
+                                                    max_comments_per_video, enabled)
+    
+    def get_refresh_jobs(self, limit=100, channel_id=None):
+        """
+        Get the most recent refresh scheduler jobs - delegated to SchedulerRepository
+        
+        Args:
+            limit (int): Maximum number of jobs
+            channel_id (str, optional): Only the jobs of this channel
+            
+        Returns:
+            list: Job rows, newest first
+        """
+        return self.scheduler_repository.get_recent_jobs(limit, channel_id)
+    
+    def get_metric_series(self, entity_type, metrics=None, channel_ids=None, start_time=None, entity_ids=None):
+        """
+        Get the history of several metrics of many entities in one query - delegated to MetricsHistoryRepository
+        
+        Args:
+            entity_type (str): 'channel', 'video' or 'comment'
+            metrics (list, optional): Metric names; every known metric of the type when None
+            channel_ids (list, optional): Only the entities of these channels; all channels when None
+            start_time (str, optional): Only snapshots fetched at or after this ISO time
+            entity_ids (list, optional): Only these entities; every entity when None
+            
+        Returns:
+            pandas.DataFrame: entity_id, channel_id, metric, timestamp and value, one row per point
+        """
+        return self.metrics_history_repository.get_metric_series(entity_type, metrics, channel_ids, start_time,
+                                                                 entity_ids)
+
 # Keep the original functions for backward compatibility, but delegate to the class
 def create_sqlite_tables():
     # Use default path from config
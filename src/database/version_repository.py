@@ -0,0 +1,235 @@
+"""
+Version repository module for per-channel data versions and content fingerprints.
+
+channel_versions holds one row per channel with a data_version that only
+grows, plus order-independent fingerprints of the channel record, its videos
+and its comments. The repositories update the row inside the transaction that
+writes the data and only when a row's content hash actually changed, so
+re-saving an identical snapshot leaves the version alone. Caches, coverage
+views and delta reports can then tell whether a channel changed by comparing
+one integer.
+
+Video and comment fingerprints are the XOR of the content hashes of the rows
+written since the videos/comments content_hash columns were added; each write
+folds out the row's previous hash and folds in the new one.
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from src.utils.debug_utils import debug_log
+from src.database.base_repository import BaseRepository
+
+# Keys that change on every fetch or hold nested data fingerprinted separately
+VOLATILE_FIELDS = frozenset({
+    'fetched_at', 'updated_at', 'last_updated', 'comments', 'video_id', 'videos',
+    'delta', 'raw_channel_info', 'raw_api_response', 'video_info', 'comment_info'
+})
+
+VERSION_COLUMNS = [
+    'channel_id', 'data_version', 'channel_fingerprint', 'videos_fingerprint',
+    'comments_fingerprint', 'updated_at'
+]
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+def create_version_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the channel_versions table.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS channel_versions (
+        channel_id TEXT PRIMARY KEY,
+        data_version INTEGER NOT NULL DEFAULT 0,
+        channel_fingerprint INTEGER NOT NULL DEFAULT 0,
+        videos_fingerprint INTEGER NOT NULL DEFAULT 0,
+        comments_fingerprint INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT
+    )
+    ''')
+
+
+def create_version_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the channel_versions table and the per-row content_hash columns.
+
+    Args:
+        cursor: Cursor of an open connection
+    """
+    create_version_table(cursor)
+    for table in ('videos', 'comments'):
+        cursor.execute(f"PRAGMA table_info({table})")
+        if 'content_hash' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN content_hash INTEGER")
+
+
+def content_hash(record: Any) -> int:
+    """
+    Hash the content of an API record, ignoring fetch timestamps and nested collections.
+
+    Args:
+        record: Channel, video or comment data as received for storage
+
+    Returns:
+        int: A signed 64-bit hash, so it fits an SQLite INTEGER column
+    """
+    if isinstance(record, dict):
+        record = {key: value for key, value in record.items()
+                  if key not in VOLATILE_FIELDS and not str(key).startswith('_')}
+    payload = json.dumps(record, sort_keys=True, default=str).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), 'big', signed=True)
+
+
+def format_fingerprint(value: Optional[int]) -> str:
+    """
+    Format a stored fingerprint as 16 hex digits.
+
+    Args:
+        value: Fingerprint as stored in channel_versions
+
+    Returns:
+        str: The fingerprint in hex
+    """
+    return format((value or 0) & _UINT64_MASK, '016x')
+
+
+def channel_for_video(cursor: sqlite3.Cursor, video_ref: Any) -> Optional[str]:
+    """
+    Get the YouTube channel ID of a stored video.
+
+    Args:
+        cursor: Cursor of an open connection
+        video_ref: Database ID or YouTube ID of the video
+
+    Returns:
+        Optional[str]: The channel ID, or None if the video or its channel is unknown
+    """
+    cursor.execute('SELECT snippet_channel_id FROM videos WHERE id = ? OR youtube_id = ? LIMIT 1',
+                   (video_ref, str(video_ref)))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def record_channel_changes(cursor: sqlite3.Cursor, channel_id: Optional[str],
+                           channel_hash: Optional[int] = None, videos_delta: int = 0,
+                           comments_delta: int = 0) -> Optional[int]:
+    """
+    Fold content changes into a channel's fingerprints and bump its data version.
+
+    Runs on the caller's cursor so the version changes in the same transaction
+    as the data. Nothing is written when the content did not change.
+
+    Args:
+        cursor: Cursor of the write transaction
+        channel_id: YouTube channel ID
+        channel_hash: content_hash of the channel record, when it was written
+        videos_delta: XOR of the old and new content hashes of the written videos
+        comments_delta: XOR of the old and new content hashes of the written comments
+
+    Returns:
+        Optional[int]: The channel's data version, or None without a channel ID
+    """
+    if not channel_id:
+        return None
+    create_version_table(cursor)
+    cursor.execute('SELECT data_version, channel_fingerprint, videos_fingerprint, comments_fingerprint '
+                   'FROM channel_versions WHERE channel_id = ?', (channel_id,))
+    row = cursor.fetchone()
+    version, channel_fp, videos_fp, comments_fp = row if row else (0, 0, 0, 0)
+
+    channel_changed = channel_hash is not None and channel_hash != channel_fp
+    if row and not channel_changed and not videos_delta and not comments_delta:
+        return version
+
+    version += 1
+    cursor.execute('''
+        INSERT INTO channel_versions (
+            channel_id, data_version, channel_fingerprint, videos_fingerprint,
+            comments_fingerprint, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(channel_id) DO UPDATE SET
+            data_version = excluded.data_version,
+            channel_fingerprint = excluded.channel_fingerprint,
+            videos_fingerprint = excluded.videos_fingerprint,
+            comments_fingerprint = excluded.comments_fingerprint,
+            updated_at = excluded.updated_at
+    ''', (
+        channel_id, version,
+        channel_hash if channel_changed else channel_fp,
+        videos_fp ^ videos_delta,
+        comments_fp ^ comments_delta,
+        datetime.utcnow().isoformat()
+    ))
+    debug_log(f"[DB] Channel {channel_id} data version is now {version}")
+    return version
+
+
+class VersionRepository(BaseRepository):
+    """Repository for per-channel data versions and fingerprints."""
+
+    def __init__(self, db_path: str):
+        """Initialize the repository with the database path."""
+        self.db_path = db_path
+
+    def get_by_id(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the version row of one channel.
+
+        Args:
+            id: YouTube channel ID
+
+        Returns:
+            Optional[Dict[str, Any]]: data_version and the fingerprints as hex
+            strings, or None if the channel was never stored
+        """
+        rows = self.execute_query(f"SELECT {', '.join(VERSION_COLUMNS)} FROM channel_versions WHERE channel_id = ?",
+                                  (id,))
+        if not rows:
+            return None
+        row = rows[0]
+        for column in ('channel_fingerprint', 'videos_fingerprint', 'comments_fingerprint'):
+            row[column] = format_fingerprint(row[column])
+        return row
+
+    def get_data_version(self, channel_id: str) -> int:
+        """
+        Get the data version of a channel.
+
+        Args:
+            channel_id: YouTube channel ID
+
+        Returns:
+            int: The data version, 0 if the channel was never stored
+        """
+        return self.get_data_versions([channel_id]).get(channel_id, 0)
+
+    def get_data_versions(self, channel_ids: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Get the data versions of several channels with one query.
+
+        Args:
+            channel_ids: YouTube channel IDs; every channel when None
+
+        Returns:
+            Dict[str, int]: Data version by channel ID, for the stored channels
+        """
+        query = 'SELECT channel_id, data_version FROM channel_versions'
+        params = ()
+        if channel_ids is not None:
+            params = tuple(channel_id for channel_id in channel_ids if channel_id)
+            if not params:
+                return {}
+            query += f" WHERE channel_id IN ({','.join('?' * len(params))})"
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return dict(conn.execute(query, params).fetchall())
+        except sqlite3.OperationalError as e:
+            # Databases created before channel_versions existed
+            debug_log(f"Channel data versions unavailable: {str(e)}")
+            return {}
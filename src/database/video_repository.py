@@ -2,16 +2,20 @@
 Video repository module for interacting with YouTube video data in the SQLite database.
 """
 import sqlite3
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Tuple, Union
 from datetime import datetime
 import json
 import os
 
 import pandas as pd
-import streamlit as st
+from src.utils.headless import st
 
 from src.utils.debug_utils import debug_log
+from src.utils.metrics import timed
+from src.utils.duration_utils import format_durations, parse_duration_with_regex
 from src.database.base_repository import BaseRepository
+from src.database.search_repository import build_match_query, has_search_index
+from src.database.version_repository import content_hash, record_channel_changes
 
 def handle_missing_api_field(field_name: str, column_type: str = 'TEXT') -> Any:
     """
@@ -143,6 +147,49 @@ CANONICAL_FIELD_MAP = {
     'updated_at': 'updated_at',
 }
 
+def ensure_duration_seconds_column(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the videos.duration_seconds column to databases created before it
+    existed and fill it from the stored ISO 8601 durations.
+    
+    Args:
+        cursor: Cursor of an open connection
+    """
+    cursor.execute("PRAGMA table_info(videos)")
+    if 'duration_seconds' in {row[1] for row in cursor.fetchall()}:
+        return
+    cursor.execute("ALTER TABLE videos ADD COLUMN duration_seconds INTEGER")
+    cursor.execute("SELECT id, content_details_duration FROM videos WHERE content_details_duration IS NOT NULL")
+    rows = [(parse_duration_with_regex(duration), video_id) for video_id, duration in cursor.fetchall()]
+    cursor.executemany("UPDATE videos SET duration_seconds = ? WHERE id = ?", rows)
+    debug_log(f"Added duration_seconds to videos and backfilled {len(rows)} rows")
+
+# Sort keys accepted by get_videos_page and the columns they order by. Each
+# one has a (snippet_channel_id, column) index so a page is read straight
+# from the index instead of sorting the whole channel.
+VIDEO_PAGE_SORT_COLUMNS = {
+    'published_at': 'published_at',
+    'views': 'statistics_view_count',
+    'likes': 'statistics_like_count',
+    'comments': 'statistics_comment_count',
+    'duration': 'duration_seconds',
+    'title': 'snippet_title',
+}
+
+# Explorer columns of a page in display order
+VIDEO_PAGE_COLUMNS = ['Video ID', 'Title', 'Published', 'Views', 'Likes', 'Comments',
+                      'Duration_Seconds', 'Duration', 'Thumbnail', 'Description']
+
+def create_video_page_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the per-channel sort indexes used by get_videos_page.
+    
+    Args:
+        cursor: Cursor of an open connection
+    """
+    for key, column in VIDEO_PAGE_SORT_COLUMNS.items():
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_videos_channel_{key} ON videos(snippet_channel_id, {column})')
+
 class VideoRepository(BaseRepository):
     """Repository for managing YouTube video data in the SQLite database."""
     
@@ -203,7 +250,190 @@ class VideoRepository(BaseRepository):
                 items.append((new_key, v))
         return dict(items)
     
-    def store_video_data(self, data, channel_db_id=None, fetched_at=None, retry_count=0):
+    def prepare_video_row(self, data, column_types, channel_db_id=None, fetched_at=None, channel_id=None):
+        """
+        Map a video's API response to a videos row without touching the database.
+
+        Args:
+            data (dict): The full YouTube API response for a video
+            column_types (dict): Type of each column of the videos table, by name
+            channel_db_id (int, optional): The database ID of the channel this video belongs to
+            fetched_at (str, optional): Timestamp when the data was fetched
+            channel_id (str, optional): YouTube ID of the channel, used when the response has
+                no snippet.channelId
+
+        Returns:
+            dict or None: The prepared row (youtube_id, row, content_hash, raw_video_info,
+            fetched_at), or None if the video has no YouTube ID
+        """
+        # Ensure youtube_id is present
+        if 'youtube_id' not in data:
+            if 'video_id' in data:
+                data['youtube_id'] = data['video_id']
+            elif 'id' in data:
+                data['youtube_id'] = data['id']
+            else:
+                debug_log(f"[DB ERROR] Skipping video with no youtube_id: {data}")
+                return None
+
+        # Flatten the raw API response
+        raw_api = data.get('raw_api_response') or data.get('video_info', data)
+        flat_api = self.flatten_dict(raw_api, sep='_')
+        
+        existing_cols = set(column_types)
+        row_hash = content_hash(raw_api) if 'content_hash' in existing_cols else None
+        
+        db_row = {}
+        missing_cols = []
+        
+        # Map each database column to the correct API field
+        for col in existing_cols:
+            if col == 'id':
+                continue
+                
+            # Parse the duration once at ingestion so reads never have to
+            if col == 'duration_seconds':
+                duration = flat_api.get('contentDetails_duration')
+                value = parse_duration_with_regex(duration) if duration else None
+            elif col == 'content_hash':
+                value = row_hash
+            # Special handling for thumbnail fields - extract directly from original structure
+            elif col.startswith('snippet_thumbnails_'):
+                thumbnail_size = col.replace('snippet_thumbnails_', '')
+                
+                # Extract thumbnail data directly from original structure
+                value = None
+                if 'snippet' in raw_api and 'thumbnails' in raw_api['snippet']:
+                    thumbnails = raw_api['snippet']['thumbnails']
+                    if thumbnail_size in thumbnails and isinstance(thumbnails[thumbnail_size], dict):
+                        value = json.dumps(thumbnails[thumbnail_size])
+                
+                if not value:
+                    value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
+            else:
+                # Regular field mapping
+                api_field = CANONICAL_FIELD_MAP.get(col)
+                value = None
+                
+                if api_field and api_field in flat_api:
+                    # Found the field in API response
+                    value = flat_api[api_field]
+                else:
+                    # If no value found with canonical mapping, try direct column name
+                    if api_field and api_field != col and col in flat_api:
+                        value = flat_api[col]
+                    else:
+                        # Field not found in API response
+                        value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
+                        if value == "NOT_PROVIDED_BY_API":
+                            missing_cols.append(col)
+                
+                # Handle JSON serialization for complex fields
+                if col in [
+                    'snippet_tags', 'content_details_region_restriction_allowed', 'content_details_region_restriction_blocked',
+                    'content_details_content_rating', 'topic_details_topic_ids', 'topic_details_relevant_topic_ids',
+                    'topic_details_topic_categories', 'localizations'
+                ]:
+                    if value is not None and not isinstance(value, str):
+                        value = json.dumps(value)
+            
+            db_row[col] = value
+        
+        # Handle duplicate fields - ensure consistency
+        # For fields that exist in both forms in the videos table:
+        # - channel_id vs snippet_channel_id (both exist)
+        # Note: title/description don't have snippet_ versions in videos table
+        duplicate_mappings = {
+            ('channel_id', 'snippet_channel_id'): 'snippet_channelId',
+            ('published_at',): 'snippet_publishedAt'
+        }
+        
+        # Sync duplicate fields to ensure consistency
+        for field_group, api_source in duplicate_mappings.items():
+            if api_source in flat_api:
+                api_value = flat_api[api_source]
+                for field in field_group:
+                    if field in existing_cols:
+                        db_row[field] = api_value
+        
+        # Also ensure title and description get their values from snippet API fields
+        if 'title' in existing_cols and 'snippet_title' in flat_api:
+            db_row['title'] = flat_api['snippet_title']
+        if 'description' in existing_cols and 'snippet_description' in flat_api:
+            db_row['description'] = flat_api['snippet_description']
+        
+        # Link the video to the channel it was saved with when the response does not say
+        if channel_id and 'snippet_channel_id' in existing_cols and not db_row.get('snippet_channel_id'):
+            db_row['snippet_channel_id'] = channel_id
+
+        # Add metadata fields
+        if channel_db_id:
+            db_row['channel_id'] = channel_db_id
+        
+        now = datetime.utcnow().isoformat()
+        if 'fetched_at' in existing_cols:
+            db_row['fetched_at'] = fetched_at or now
+        if 'updated_at' in existing_cols:
+            db_row['updated_at'] = now
+        
+        debug_log(lambda: f"[DB INSERT] Video {data.get('youtube_id')} with {len(db_row)} fields, "
+                          f"{len(missing_cols)} not provided by API")
+        
+        return {
+            'youtube_id': db_row.get('youtube_id') or data['youtube_id'],
+            'row': db_row,
+            'content_hash': row_hash,
+            'raw_video_info': json.dumps(raw_api),
+            'fetched_at': fetched_at or now,
+        }
+    
+    def write_video_row(self, cursor, video, channel_id=None):
+        """
+        Upsert a row from prepare_video_row and record it in the video history.
+
+        Args:
+            cursor: Cursor of the connection to write with; the caller commits
+            video (dict): The prepared row
+            channel_id (str, optional): YouTube ID of the channel whose data version is
+                bumped when the row has no snippet_channel_id
+        """
+        db_row = video['row']
+        columns = list(db_row)
+        values = [db_row[col] for col in columns]
+        
+        # Insert or update - using ON CONFLICT without column specification
+        placeholders = ','.join(['?'] * len(columns))
+        update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
+        
+        sql_query = f'''
+            INSERT INTO videos ({','.join(columns)})
+            VALUES ({placeholders})
+            ON CONFLICT DO UPDATE SET {update_clause}
+        '''
+        
+        # Compare content with the stored row before it is overwritten
+        row_hash = video['content_hash']
+        previous_hash = None
+        if row_hash is not None:
+            cursor.execute("SELECT content_hash FROM videos WHERE youtube_id = ?", (video['youtube_id'],))
+            previous = cursor.fetchone()
+            previous_hash = previous[0] if previous else None
+        
+        cursor.execute(sql_query, values)
+        
+        if row_hash is not None and row_hash != previous_hash:
+            record_channel_changes(cursor, db_row.get('snippet_channel_id') or channel_id,
+                                   videos_delta=(previous_hash or 0) ^ row_hash)
+        
+        # Store in history table
+        cursor.execute('''
+            INSERT INTO videos_history (video_id, fetched_at, raw_video_info) 
+            VALUES (?, ?, ?)
+            ON CONFLICT DO UPDATE SET raw_video_info=excluded.raw_video_info
+        ''', (video['youtube_id'], video['fetched_at'], video['raw_video_info']))
+    
+    @timed('db_operation_seconds', operation='store_video_data')
+    def store_video_data(self, data, channel_db_id=None, fetched_at=None, retry_count=0, channel_id=None):
         """
         Save video data to SQLite database with comprehensive field mapping.
 
@@ -212,163 +442,35 @@ class VideoRepository(BaseRepository):
             channel_db_id (int, optional): The database ID of the channel this video belongs to
             fetched_at (str, optional): Timestamp when the data was fetched
             retry_count (int, optional): Internal use for retrying on DB lock
+            channel_id (str, optional): YouTube ID of the channel, whose data version is
+                bumped when the response has no snippet.channelId
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
-                # Ensure youtube_id is present
-                if 'youtube_id' not in data:
-                    if 'video_id' in data:
-                        data['youtube_id'] = data['video_id']
-                    elif 'id' in data:
-                        data['youtube_id'] = data['id']
-                    else:
-                        debug_log(f"[DB ERROR] Skipping video with no youtube_id: {data}")
-                        return False
-
-                # Flatten the raw API response
-                raw_api = data.get('raw_api_response') or data.get('video_info', data)
-                flat_api = self.flatten_dict(raw_api, sep='_')
-                
                 # Get all columns in the videos table
                 cursor = conn.cursor()
                 cursor.execute("PRAGMA table_info(videos)")
-                table_info = cursor.fetchall()
-                existing_cols = set(row[1] for row in table_info)
-                column_types = {row[1]: row[2] for row in table_info}
-                
-                db_row = {}
-                
-                # Map each database column to the correct API field
-                for col in existing_cols:
-                    if col == 'id':
-                        continue
-                        
-                    # Special handling for thumbnail fields - extract directly from original structure
-                    if col.startswith('snippet_thumbnails_'):
-                        thumbnail_size = col.replace('snippet_thumbnails_', '')
-                        
-                        # Extract thumbnail data directly from original structure
-                        value = None
-                        if 'snippet' in raw_api and 'thumbnails' in raw_api['snippet']:
-                            thumbnails = raw_api['snippet']['thumbnails']
-                            if thumbnail_size in thumbnails and isinstance(thumbnails[thumbnail_size], dict):
-                                value = json.dumps(thumbnails[thumbnail_size])
-                                debug_log(f"[DB THUMBNAIL] {col} extracted from original: {value}")
-                        
-                        if not value:
-                            value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
-                            debug_log(f"[DB THUMBNAIL] {col} not found, using default: {value}")
-                    else:
-                        # Regular field mapping
-                        api_field = CANONICAL_FIELD_MAP.get(col)
-                        value = None
-                        
-                        if api_field and api_field in flat_api:
-                            # Found the field in API response
-                            value = flat_api[api_field]
-                            debug_log(f"[DB MAPPING] {col} -> {api_field} = {str(value)[:100]}")
-                        else:
-                            # If no value found with canonical mapping, try direct column name
-                            if api_field and api_field != col and col in flat_api:
-                                value = flat_api[col]
-                                debug_log(f"[DB MAPPING] {col} -> {col} (direct) = {str(value)[:100]}")
-                            else:
-                                # Field not found in API response
-                                value = handle_missing_api_field(col, column_types.get(col, 'TEXT'))
-                                if value == "NOT_PROVIDED_BY_API":
-                                    debug_log(f"[DB MISSING] {col} not provided by API")
-                                else:
-                                    debug_log(f"[DB DEFAULT] {col} using default: {value}")
-                        
-                        # Handle JSON serialization for complex fields
-                        if col in [
-                            'snippet_tags', 'content_details_region_restriction_allowed', 'content_details_region_restriction_blocked',
-                            'content_details_content_rating', 'topic_details_topic_ids', 'topic_details_relevant_topic_ids',
-                            'topic_details_topic_categories', 'localizations'
-                        ]:
-                            if value is not None and not isinstance(value, str):
-                                value = json.dumps(value)
-                    
-                    db_row[col] = value
-                
-                # Handle duplicate fields - ensure consistency
-                # For fields that exist in both forms in the videos table:
-                # - channel_id vs snippet_channel_id (both exist)
-                # Note: title/description don't have snippet_ versions in videos table
-                duplicate_mappings = {
-                    ('channel_id', 'snippet_channel_id'): 'snippet_channelId',
-                    ('published_at',): 'snippet_publishedAt'
-                }
-                
-                # Sync duplicate fields to ensure consistency
-                for field_group, api_source in duplicate_mappings.items():
-                    if api_source in flat_api:
-                        api_value = flat_api[api_source]
-                        for field in field_group:
-                            if field in existing_cols:
-                                db_row[field] = api_value
-                                debug_log(f"[DB SYNC] Set {field} = {str(api_value)[:50]}")
-                
-                # Also ensure title and description get their values from snippet API fields
-                if 'title' in existing_cols and 'snippet_title' in flat_api:
-                    db_row['title'] = flat_api['snippet_title']
-                if 'description' in existing_cols and 'snippet_description' in flat_api:
-                    db_row['description'] = flat_api['snippet_description']
-                
-                # Add metadata fields
-                if channel_db_id:
-                    db_row['channel_id'] = channel_db_id
-                
-                now = datetime.utcnow().isoformat()
-                if 'fetched_at' in existing_cols:
-                    db_row['fetched_at'] = fetched_at or now
-                if 'updated_at' in existing_cols:
-                    db_row['updated_at'] = now
-                
-                # Prepare for database insertion
-                columns = [col for col in existing_cols if col != 'id']
-                values = [db_row.get(col) for col in columns]
+                column_types = {row[1]: row[2] for row in cursor.fetchall()}
                 
-                debug_log(f"[DB INSERT] Video {data.get('youtube_id')} with {len(columns)} fields")
-                debug_log(f"[DB DEBUG] Columns: {list(columns)}")
-                debug_log(f"[DB DEBUG] youtube_id in columns: {'youtube_id' in columns}")
-                debug_log(f"[DB DEBUG] youtube_id value: {db_row.get('youtube_id')}")
-                debug_log(f"[DB DEBUG] Values: {values}")
+                video = self.prepare_video_row(data, column_types, channel_db_id, fetched_at, channel_id)
+                if video is None:
+                    return False
+                video_id = video['youtube_id']
                 
-                # Insert or update - using ON CONFLICT without column specification
-                placeholders = ','.join(['?'] * len(columns))
-                update_clause = ','.join([f'{col}=excluded.{col}' for col in columns])
-                
-                sql_query = f'''
-                    INSERT INTO videos ({','.join(columns)})
-                    VALUES ({placeholders})
-                    ON CONFLICT DO UPDATE SET {update_clause}
-                '''
-                debug_log(f"[DB DEBUG] SQL Query: {sql_query}")
-                
-                cursor.execute(sql_query, values)
-                
-                # Store in history table
-                video_id = data.get('youtube_id') or data.get('id')
-                raw_video_info = json.dumps(raw_api)
-                cursor.execute('''
-                    INSERT INTO videos_history (video_id, fetched_at, raw_video_info) 
-                    VALUES (?, ?, ?)
-                    ON CONFLICT DO UPDATE SET raw_video_info=excluded.raw_video_info
-                ''', (video_id, fetched_at or now, raw_video_info))
+                self.write_video_row(cursor, video, channel_id)
                 
                 conn.commit()
-                debug_log(f"[DB SUCCESS] Stored video: {video_id}")
+                debug_log(lambda: f"[DB SUCCESS] Stored video: {video_id}")
                 
                 # Save comments if present
                 comments = data.get('comments', [])
                 if comments:
-                    debug_log(f"[DB] Saving {len(comments)} comments for video {video_id}")
-                    comment_store_result = self.store_comments(comments, video_id, fetched_at or now)
-                    debug_log(f"[DB] store_comments result: {comment_store_result}")
+                    debug_log(lambda: f"[DB] Saving {len(comments)} comments for video {video_id}")
+                    comment_store_result = self.store_comments(comments, video_id, video['fetched_at'])
+                    debug_log(lambda: f"[DB] store_comments result: {comment_store_result}")
                 
                 return True
                 
@@ -385,7 +487,7 @@ class VideoRepository(BaseRepository):
                 debug_log(f"[DB ERROR] Database locked (attempt {retry_count}/5). Retrying in {wait_time:.1f}s...")
                 time.sleep(wait_time)
                 # Retry with increased wait time
-                return self.store_video_data(data, channel_db_id, fetched_at, retry_count)
+                return self.store_video_data(data, channel_db_id, fetched_at, retry_count, channel_id)
             elif "database is locked" in error_msg:
                 # Max retries reached
                 import traceback
@@ -398,9 +500,41 @@ class VideoRepository(BaseRepository):
                 return {"error": str(e)}
         except Exception as e:
             import traceback
-            debug_log(f"Exception in store_video_data: {str(e)}\n{traceback.format_exc()}")
+            debug_log(lambda: f"Exception in store_video_data: {str(e)}\n{traceback.format_exc()}")
             return {"error": str(e)}
             
+    def complete_comment(self, comment: Dict[str, Any], video_ref: Union[int, str], index: int) -> Dict[str, Any]:
+        """
+        Fill in the fields the comments table needs from their collected aliases.
+
+        Args:
+            comment: Comment data dictionary, completed in place
+            video_ref: The video the comment belongs to, used in a generated comment ID
+            index: Position of the comment in its video, used in generated IDs and text
+
+        Returns:
+            Dict[str, Any]: The completed comment
+        """
+        # Ensure comment_id exists - crucial for database storage
+        if 'comment_id' not in comment:
+            debug_log(lambda: f"VideoRepository: Adding missing comment_id for comment")
+            comment['comment_id'] = f"generated_id_{video_ref}_{index}_{hash(str(comment))}"
+        
+        # Ensure text field exists
+        if 'text' not in comment and 'comment_text' in comment:
+            comment['text'] = comment['comment_text']
+        elif 'text' not in comment and 'comment_text' not in comment:
+            comment['text'] = f"[No text content for comment {index}]"
+            
+        # Ensure author field exists
+        if 'author_display_name' not in comment and 'comment_author' in comment:
+            comment['author_display_name'] = comment['comment_author']
+            
+        # Ensure published_at field exists
+        if 'published_at' not in comment and 'comment_published_at' in comment:
+            comment['published_at'] = comment['comment_published_at']
+        return comment
+    
     def store_comments(self, comments: List[Dict[str, Any]], video_db_id: int, fetched_at: str) -> bool:
         """
         Save comment data to SQLite database - delegated to CommentRepository
@@ -413,36 +547,17 @@ class VideoRepository(BaseRepository):
         Returns:
             bool: True if successful, False otherwise
         """
-        debug_log(f"[DB] Storing {len(comments)} comments for video_db_id={video_db_id}")
+        debug_log(lambda: f"[DB] Storing {len(comments)} comments for video_db_id={video_db_id}")
         inserted = 0
         with sqlite3.connect(self.db_path) as conn:
             for comment in comments:
-                debug_log(f"[DB] Inserting comment: {comment}")
                 try:
-                    # Ensure comment_id exists - crucial for database storage
-                    if 'comment_id' not in comment:
-                        debug_log(f"VideoRepository: Adding missing comment_id for comment")
-                        comment['comment_id'] = f"generated_id_{video_db_id}_{inserted}_{hash(str(comment))}"
-                    
-                    # Ensure text field exists
-                    if 'text' not in comment and 'comment_text' in comment:
-                        comment['text'] = comment['comment_text']
-                    elif 'text' not in comment and 'comment_text' not in comment:
-                        comment['text'] = f"[No text content for comment {inserted}]"
-                        
-                    # Ensure author field exists
-                    if 'author_display_name' not in comment and 'comment_author' in comment:
-                        comment['author_display_name'] = comment['comment_author']
-                        
-                    # Ensure published_at field exists
-                    if 'published_at' not in comment and 'comment_published_at' in comment:
-                        comment['published_at'] = comment['comment_published_at']
-                        
+                    self.complete_comment(comment, video_db_id, inserted)
                     result = self.comment_repository.store_comment(comment, video_db_id, fetched_at)
                     inserted += 1
                 except Exception as e:
                     debug_log(f"[DB ERROR] Failed to insert comment: {e}, comment={comment}")
-        debug_log(f"[DB] Inserted {inserted} comments for video_db_id={video_db_id}")
+        debug_log(lambda: f"[DB] Inserted {inserted} comments for video_db_id={video_db_id}")
         return inserted == len(comments)
             
     def store_video_locations(self, locations: List[Dict[str, Any]], video_db_id: int) -> bool:
@@ -458,6 +573,7 @@ class VideoRepository(BaseRepository):
         """
         return self.location_repository.store_video_locations(locations, video_db_id)
             
+    @timed('db_operation_seconds', operation='get_videos_by_channel')
     def get_videos_by_channel(self, channel_identifier: Union[int, str]) -> List[Dict[str, Any]]:
         """
         Get all videos for a specific channel.
@@ -495,7 +611,8 @@ class VideoRepository(BaseRepository):
                 # Get videos for this channel using YouTube channel ID
                 cursor.execute("""
                     SELECT id, youtube_id, title, description, published_at, statistics_view_count, 
-                           statistics_like_count, statistics_comment_count, content_details_duration, snippet_thumbnails_high, content_details_caption
+                           statistics_like_count, statistics_comment_count, content_details_duration, snippet_thumbnails_high, content_details_caption,
+                           duration_seconds
                     FROM videos 
                     WHERE channel_id = ?
                 """, (youtube_channel_id,))
@@ -514,7 +631,7 @@ class VideoRepository(BaseRepository):
                     examples = cursor.fetchall()
                     debug_log("Example videos in database:")
                     for ex in examples:
-                        debug_log(f"  ID: {ex[0]}, YouTube ID: {ex[1]}, Channel ID: {ex[2]}")
+                        debug_log(lambda: f"  ID: {ex[0]}, YouTube ID: {ex[1]}, Channel ID: {ex[2]}")
                 
                 videos = []
                 for video_row in videos_rows:
@@ -537,6 +654,7 @@ class VideoRepository(BaseRepository):
                         'contentDetails': {
                             'duration': video_row[8]  # Adjusted index due to added comment count
                         },
+                        'duration_seconds': video_row[11],
                         'locations': []  # Add locations array
                     }
                     
@@ -554,6 +672,120 @@ class VideoRepository(BaseRepository):
             debug_log(f"Error getting videos by channel: {str(e)}", e)
             return []
     
+    def _video_page_filter(self, channel_id: str, search: Optional[str] = None,
+                           published_after: Optional[str] = None, use_fts: bool = False) -> Tuple[str, List[Any]]:
+        clauses = ['snippet_channel_id = ?']
+        params: List[Any] = [channel_id]
+        if search and use_fts:
+            clauses.append('id IN (SELECT rowid FROM videos_fts WHERE videos_fts MATCH ?)')
+            params.append(build_match_query(search, column='snippet_title') or '""')
+        elif search:
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("snippet_title LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if published_after:
+            clauses.append('published_at >= ?')
+            params.append(published_after)
+        return ' AND '.join(clauses), params
+
+    @timed('db_operation_seconds', operation='get_videos_page')
+    def get_videos_page(self, channel_id: str, sort_by: str = 'published_at', ascending: bool = False,
+                        limit: int = 10, offset: int = 0, search: Optional[str] = None,
+                        published_after: Optional[str] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Get one page of a channel's videos, sorted and filtered in SQLite.
+        
+        Args:
+            channel_id: YouTube channel ID
+            sort_by: Key of VIDEO_PAGE_SORT_COLUMNS
+            ascending: Sort direction
+            limit: Page size
+            offset: Number of matching videos to skip
+            search: Words or "phrases" to find in the title (substring match
+                when the database has no full-text index)
+            published_after: ISO 8601 timestamp of the oldest video to include
+            
+        Returns:
+            Tuple of the page as a DataFrame with VIDEO_PAGE_COLUMNS and the
+            number of videos matching the filters
+        """
+        if sort_by not in VIDEO_PAGE_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key '{sort_by}', expected one of {', '.join(VIDEO_PAGE_SORT_COLUMNS)}")
+        direction = 'ASC' if ascending else 'DESC'
+        
+        with sqlite3.connect(self.db_path) as conn:
+            # Title search uses the full-text index when the database has one
+            use_fts = bool(search) and has_search_index(conn, 'videos_fts')
+            where, params = self._video_page_filter(channel_id, search, published_after, use_fts)
+            total = conn.execute(f"SELECT COUNT(*) FROM videos WHERE {where}", params).fetchone()[0]
+            rows = pd.read_sql_query(f"""
+                SELECT youtube_id, snippet_title, published_at, statistics_view_count,
+                       statistics_like_count, statistics_comment_count, duration_seconds,
+                       CASE WHEN json_valid(snippet_thumbnails_high)
+                            THEN json_extract(snippet_thumbnails_high, '$.url') END AS thumbnail,
+                       snippet_description
+                FROM videos
+                WHERE {where}
+                ORDER BY {VIDEO_PAGE_SORT_COLUMNS[sort_by]} {direction}, id {direction}
+                LIMIT ? OFFSET ?
+            """, conn, params=params + [int(limit), int(offset)])
+        
+        page = pd.DataFrame({
+            'Video ID': rows['youtube_id'],
+            'Title': rows['snippet_title'].fillna(''),
+        })
+        published = pd.to_datetime(rows['published_at'], errors='coerce', utc=True)
+        page['Published'] = published.dt.tz_localize(None)
+        for column, source in (('Views', 'statistics_view_count'), ('Likes', 'statistics_like_count'),
+                               ('Comments', 'statistics_comment_count'), ('Duration_Seconds', 'duration_seconds')):
+            page[column] = pd.to_numeric(rows[source], errors='coerce').fillna(0).astype('int64')
+        page['Duration'] = format_durations(page['Duration_Seconds'])
+        page['Thumbnail'] = rows['thumbnail'].fillna('')
+        page['Description'] = rows['snippet_description'].fillna('')
+        return page[VIDEO_PAGE_COLUMNS], int(total)
+
+    def get_video_summary(self, channel_id: str) -> Dict[str, int]:
+        """
+        Get the video count and view totals of a channel without loading its videos.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            dict: total_videos, total_views and average_views
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            total, views = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(statistics_view_count), 0) FROM videos WHERE snippet_channel_id = ?",
+                (channel_id,)
+            ).fetchone()
+        return {
+            'total_videos': int(total),
+            'total_views': int(views),
+            'average_views': int(views / total) if total else 0
+        }
+
+    def get_video_counts(self, channel_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the stored counts of a channel's videos, keyed as in collected channel data.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            list: video_id, views, likes and comment_count of each stored video
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT youtube_id, statistics_view_count, statistics_like_count, statistics_comment_count "
+                "FROM videos WHERE snippet_channel_id = ?",
+                (channel_id,)
+            ).fetchall()
+        return [
+            {'video_id': video_id, 'views': views or 0, 'likes': likes or 0, 'comment_count': comments or 0}
+            for video_id, views, likes, comments in rows
+        ]
+
     def get_video_comments(self, video_db_id: int) -> List[Dict[str, Any]]:
         """
         Get comments for a specific video - delegated to CommentRepository
@@ -1,10 +1,14 @@
 """
 Data models for the YouTube scraper application.
 """
+import pickle
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Union
 from datetime import datetime
 
+from src.utils.video_standardizer import VIDEO_ID_PATHS, FieldSpec, extract_video_id, normalize_video
+
 @dataclass
 class VideoLocation:
     """Model representing a location associated with a YouTube video"""
@@ -269,10 +273,441 @@ class YouTubeChannel:
             'video_id': videos_data
         }
 
+def _to_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+
+# Fields of a VideoRecord, extracted like standardized videos; the counts
+# prefer the API statistics, as the analysis frames always have
+VIDEO_RECORD_FIELDS = (
+    FieldSpec('video_id', VIDEO_ID_PATHS, accept=(str,), required=True),
+    FieldSpec('channel_id', [('channel_id',), ('snippet', 'channelId'), ('snippet_channel_id',)], '',
+              accept=(str,)),
+    FieldSpec('title', [('title',), ('snippet', 'title'), ('snippet_title',)], 'Untitled'),
+    FieldSpec('description', [('description',), ('snippet', 'description'), ('video_description',),
+                              ('snippet_description',)], ''),
+    FieldSpec('published_at', [('published_at',), ('snippet', 'publishedAt'), ('snippet_published_at',)], ''),
+    FieldSpec('duration', [('contentDetails', 'duration'), ('duration',), ('content_details_duration',)], '',
+              skip=('', 'Unknown duration'), accept=(str,)),
+    FieldSpec('duration_seconds', [('duration_seconds',)], None, accept=(int,)),
+    FieldSpec('views', [('statistics', 'viewCount'), ('views',), ('statistics_view_count',), ('view_count',)],
+              0, convert=_to_int),
+    FieldSpec('likes', [('statistics', 'likeCount'), ('likes',), ('statistics_like_count',), ('like_count',)],
+              0, convert=_to_int),
+    FieldSpec('comment_count', [('statistics', 'commentCount'), ('comment_count',), ('statistics_comment_count',)],
+              0, convert=_to_int),
+    # Only URLs: a thumbnails dict is looked into, never taken as the URL
+    FieldSpec('thumbnail_url', [('thumbnail_url',)]
+              + [(container, 'thumbnails', size, 'url') for container in ('snippet',) for size in ('high', 'medium', 'default')]
+              + [('thumbnails', size, 'url') for size in ('high', 'medium', 'default')]
+              + [('snippet_thumbnails_high', 'url'), ('thumbnail',), ('thumbnails',)], '', accept=(str,)),
+    FieldSpec('tags', [('tags',), ('snippet', 'tags'), ('snippet_tags',)], (), accept=(list, tuple), convert=tuple),
+)
+
+
+def _encode_payload(data: Dict[str, Any], raw: str) -> Union[bytes, Dict[str, Any], None]:
+    """Keep a dict as pickled bytes, by reference or not at all."""
+    if raw == 'none':
+        return None
+    if raw == 'reference':
+        return data
+    return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_payload(payload: Union[bytes, Dict[str, Any], None]) -> Optional[Dict[str, Any]]:
+    if isinstance(payload, bytes):
+        return pickle.loads(payload)
+    return payload
+
+
+class CommentRecord:
+    """
+    Compact record of one comment or reply.
+
+    Uses __slots__, so a comment costs one small object instead of a dict of
+    flattened keys. The dict it was built from is kept as raw_payload (pickled
+    bytes by default), so to_dict gives every collected key back.
+    """
+    __slots__ = ('comment_id', 'video_id', 'text', 'author', 'published_at', 'like_count', 'parent_id',
+                 'updated_at', 'raw_payload')
+    FIELDS = __slots__
+
+    def __init__(self, comment_id: str, video_id: str = '', text: str = '', author: str = '',
+                 published_at: str = '', like_count: int = 0, parent_id: Optional[str] = None,
+                 updated_at: str = '', raw_payload: Union[bytes, Dict[str, Any], None] = None):
+        self.comment_id = comment_id
+        self.video_id = video_id
+        self.text = text
+        self.author = author
+        self.published_at = published_at
+        self.like_count = like_count
+        self.parent_id = parent_id
+        self.updated_at = updated_at
+        self.raw_payload = raw_payload
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], video_id: str = '', raw: str = 'bytes') -> 'CommentRecord':
+        """
+        Create a record from a comment in the collection format.
+
+        Args:
+            data: Comment dict with comment_id, comment_text, comment_author, ...
+            video_id: Video the comment belongs to, when the dict does not say
+            raw: 'bytes' to keep the dict as pickled bytes, 'reference' to keep
+                the dict itself, or 'none' to keep only the record fields
+
+        Returns:
+            CommentRecord
+        """
+        return cls(
+            comment_id=data.get('comment_id', ''),
+            video_id=data.get('video_id') or video_id,
+            text=data.get('comment_text', ''),
+            author=data.get('comment_author') or data.get('comment_authorc', ''),
+            published_at=data.get('comment_published_at', ''),
+            like_count=_to_int(data.get('like_count', data.get('comment_like_count', 0))),
+            parent_id=data.get('parent_id'),
+            updated_at=data.get('updated_at', ''),
+            raw_payload=_encode_payload(data, raw)
+        )
+
+    @property
+    def raw(self) -> Optional[Dict[str, Any]]:
+        """The dict the record was built from, decoded on every access when held as bytes."""
+        return _decode_payload(self.raw_payload)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the record back to the collection format: the original dict when it was kept."""
+        if self.raw_payload is not None:
+            return dict(self.raw)
+        data = {
+            'comment_id': self.comment_id,
+            'video_id': self.video_id,
+            'comment_text': self.text,
+            'comment_author': self.author,
+            'comment_published_at': self.published_at,
+            'like_count': self.like_count,
+            'updated_at': self.updated_at
+        }
+        if self.parent_id:
+            data['parent_id'] = self.parent_id
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CommentRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS if name != 'raw_payload')
+
+    def __repr__(self) -> str:
+        return f"CommentRecord(comment_id={self.comment_id!r}, video_id={self.video_id!r})"
+
+
+class VideoRecord:
+    """
+    Compact record of one video.
+
+    The fields used by storage and analysis are slots, extracted from any
+    supported video shape with VIDEO_RECORD_FIELDS. The dict the record was
+    built from is kept as raw_payload, by reference or, by default, as pickled
+    bytes that are only decoded when raw or to_dict is called, so no collected
+    key is lost.
+    """
+    __slots__ = tuple(spec.name for spec in VIDEO_RECORD_FIELDS) + ('raw_payload',)
+    FIELDS = __slots__
+
+    def __init__(self, video_id: str, channel_id: str = '', title: str = '', description: str = '',
+                 published_at: str = '', duration: str = '', duration_seconds: Optional[int] = None,
+                 views: int = 0, likes: int = 0, comment_count: int = 0, thumbnail_url: str = '',
+                 tags: Sequence[str] = (), raw_payload: Union[bytes, Dict[str, Any], None] = None):
+        self.video_id = video_id
+        self.channel_id = channel_id
+        self.title = title
+        self.description = description
+        self.published_at = published_at
+        self.duration = duration
+        self.duration_seconds = duration_seconds
+        self.views = views
+        self.likes = likes
+        self.comment_count = comment_count
+        self.thumbnail_url = thumbnail_url
+        self.tags = tuple(tags)
+        self.raw_payload = raw_payload
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], raw: str = 'bytes') -> Optional['VideoRecord']:
+        """
+        Create a record from a video dict in the collection, API or database format.
+
+        Args:
+            data: Video dict
+            raw: 'bytes' to keep the dict as pickled bytes, 'reference' to keep
+                the dict itself, or 'none' to keep only the record fields
+
+        Returns:
+            VideoRecord, or None if the video has no ID
+        """
+        fields = normalize_video(data, VIDEO_RECORD_FIELDS, keep_other_keys=False)
+        if fields is None:
+            return None
+        return cls(**fields, raw_payload=_encode_payload(data, raw))
+
+    @property
+    def raw(self) -> Optional[Dict[str, Any]]:
+        """The dict the record was built from, decoded on every access when held as bytes."""
+        return _decode_payload(self.raw_payload)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record back to a video dict.
+
+        Returns:
+            Dict[str, Any]: A copy of the original dict when it was kept, the
+            record fields in the collection format otherwise
+        """
+        if self.raw_payload is not None:
+            return dict(self.raw)
+        data = {
+            'video_id': self.video_id,
+            'channel_id': self.channel_id,
+            'title': self.title,
+            'video_description': self.description,
+            'published_at': self.published_at,
+            'duration': self.duration,
+            'views': str(self.views),
+            'likes': str(self.likes),
+            'comment_count': str(self.comment_count),
+            'thumbnail_url': self.thumbnail_url,
+            'tags': list(self.tags)
+        }
+        if self.duration_seconds is not None:
+            data['duration_seconds'] = self.duration_seconds
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, VideoRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS if name != 'raw_payload')
+
+    def __repr__(self) -> str:
+        return f"VideoRecord(video_id={self.video_id!r}, title={self.title!r})"
+
+
+class _RecordBatch:
+    """
+    Columnar container of records: one list per text column and one
+    array('q') per integer column, instead of one dict per row.
+    """
+    RECORD = None
+    INT_COLUMNS = ()
+
+    def __init__(self, records: Iterable = ()):
+        self._columns = {
+            name: array('q') if name in self.INT_COLUMNS else []
+            for name in self.RECORD.FIELDS
+        }
+        self._index = None
+        for record in records:
+            self.append(record)
+
+    def append(self, record) -> None:
+        """Add a record as a new row."""
+        for name, column in self._columns.items():
+            column.append(getattr(record, name))
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self._columns[self.RECORD.FIELDS[0]])
+
+    def __getitem__(self, position: int):
+        return self.RECORD(**{name: column[position] for name, column in self._columns.items()})
+
+    def __iter__(self) -> Iterator:
+        for position in range(len(self)):
+            yield self[position]
+
+    def column(self, name: str) -> Sequence:
+        """
+        Get a column without copying it.
+
+        Args:
+            name: Field name of the record type
+
+        Returns:
+            The list or array holding the column
+        """
+        return self._columns[name]
+
+    def total(self, name: str) -> int:
+        """Sum of an integer column."""
+        return sum(self._columns[name])
+
+    def index_of(self, record_id: str) -> int:
+        """
+        Position of the row with the given id.
+
+        Args:
+            record_id: Value of the first field (video_id or comment_id)
+
+        Returns:
+            int: Row position
+
+        Raises:
+            KeyError: If no row has the id
+        """
+        if self._index is None:
+            self._index = {value: position for position, value in enumerate(self._columns[self.RECORD.FIELDS[0]])}
+        return self._index[record_id]
+
+    def select(self, positions: Iterable[int]):
+        """
+        Build a new batch holding the given rows.
+
+        Args:
+            positions: Row positions, in the order wanted
+
+        Returns:
+            A batch of the same type
+        """
+        positions = list(positions)
+        batch = type(self)()
+        for name, column in self._columns.items():
+            selected = [column[position] for position in positions]
+            batch._columns[name] = array('q', selected) if name in self.INT_COLUMNS else selected
+        return batch
+
+    def where(self, name: str, predicate):
+        """
+        Rows whose value in a column satisfies a predicate.
+
+        Args:
+            name: Column name
+            predicate: Callable taking a column value
+
+        Returns:
+            A batch of the same type
+        """
+        return self.select(position for position, value in enumerate(self._columns[name]) if predicate(value))
+
+    def sort_by(self, name: str, descending: bool = False):
+        """
+        Rows ordered by a column.
+
+        Args:
+            name: Column name
+            descending: Whether to sort largest first
+
+        Returns:
+            A batch of the same type
+        """
+        column = self._columns[name]
+        return self.select(sorted(range(len(self)), key=column.__getitem__, reverse=descending))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert every row back to a dict, the original one where it was kept."""
+        return [record.to_dict() for record in self]
+
+    def to_dataframe(self):
+        """
+        Build a DataFrame with one column per record field, without the payloads.
+
+        Returns:
+            pandas.DataFrame
+        """
+        import pandas as pd
+        return pd.DataFrame({name: list(column) for name, column in self._columns.items() if name != 'raw_payload'})
+
+
+class VideoBatch(_RecordBatch):
+    """Columnar batch of VideoRecord rows."""
+    RECORD = VideoRecord
+    INT_COLUMNS = ('views', 'likes', 'comment_count')
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Dict[str, Any]], raw: str = 'bytes') -> 'VideoBatch':
+        """
+        Build a batch from video dicts.
+
+        Args:
+            videos: Videos in the collection, API or database format; items
+                that are not dicts or have no video ID are skipped
+            raw: How to keep the video dicts, see VideoRecord.from_dict
+
+        Returns:
+            VideoBatch
+        """
+        batch = cls()
+        # Filled column by column: no record object is built per video
+        columns = [(name, batch._columns[name]) for name in VideoRecord.FIELDS if name != 'raw_payload']
+        payloads = batch._columns['raw_payload']
+        for video in videos:
+            fields = normalize_video(video, VIDEO_RECORD_FIELDS, keep_other_keys=False) if isinstance(video, dict) else None
+            if fields is None:
+                continue
+            for name, column in columns:
+                column.append(fields[name])
+            payloads.append(_encode_payload(video, raw))
+        return batch
+
+
+class CommentBatch(_RecordBatch):
+    """Columnar batch of CommentRecord rows."""
+    RECORD = CommentRecord
+    INT_COLUMNS = ('like_count',)
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Dict[str, Any]], video_id: str = '',
+                      raw: str = 'bytes') -> 'CommentBatch':
+        """
+        Build a batch from comment dicts.
+
+        Args:
+            comments: Comments in the collection format
+            video_id: Video of comments that do not name one
+            raw: How to keep the comment dicts, see CommentRecord.from_dict
+
+        Returns:
+            CommentBatch
+        """
+        return cls(CommentRecord.from_dict(comment, video_id=video_id, raw=raw) for comment in comments)
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Dict[str, Any]], raw: str = 'bytes') -> 'CommentBatch':
+        """
+        Build a batch from the comments nested in video dicts.
+
+        Args:
+            videos: Videos with a 'comments' list
+            raw: How to keep the comment dicts, see CommentRecord.from_dict
+
+        Returns:
+            CommentBatch
+        """
+        batch = cls()
+        for video in videos:
+            video_id = extract_video_id(video) or ''
+            for comment in video.get('comments') or []:
+                batch.append(CommentRecord.from_dict(comment, video_id=video_id, raw=raw))
+        return batch
+
+    def counts_by_video(self) -> Dict[str, int]:
+        """Number of comments per video id."""
+        counts: Dict[str, int] = {}
+        for video_id in self._columns['video_id']:
+            counts[video_id] = counts.get(video_id, 0) + 1
+        return counts
+
+
 # For backward compatibility
 Video = YouTubeVideo
 Channel = YouTubeChannel
 Comment = VideoComment
 
 # Explicitly expose these classes in __all__
-__all__ = ['YouTubeChannel', 'YouTubeVideo', 'VideoComment', 'Video', 'Channel', 'Comment']
\ No newline at end of file
+__all__ = ['YouTubeChannel', 'YouTubeVideo', 'VideoComment', 'Video', 'Channel', 'Comment',
+           'VideoRecord', 'CommentRecord', 'VideoBatch', 'CommentBatch']
\ No newline at end of file
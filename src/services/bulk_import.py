@@ -0,0 +1,154 @@
+"""
+Bulk import of channels without the Streamlit UI.
+
+Reads channel IDs, handles or channel URLs from a CSV file like the one the
+Bulk Import tab accepts, resolves the handles and URLs, fetches the channels
+50 per channels.list request and stores them with the same fields as the tab.
+"""
+import csv
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.utils.debug_utils import debug_log
+from src.utils.progress import ProgressSink, get_progress_sink
+
+# channels.list accepts up to 50 IDs per request
+BATCH_SIZE = 50
+
+CHANNEL_PARTS = "snippet,contentDetails,statistics,brandingSettings,status,topicDetails,localizations"
+
+# Column of the channel references; Google Takeout subscription exports use 'Channel Id'
+REFERENCE_COLUMNS = ('channel_id', 'Channel Id')
+
+
+def read_channel_references(path: str) -> List[str]:
+    """
+    Read the channel references of an import file.
+
+    Args:
+        path: CSV file with a channel_id (or Google Takeout 'Channel Id') column,
+            or a plain list with one reference per line
+
+    Returns:
+        List[str]: Channel IDs, handles or channel URLs in file order
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        lines = [line for line in f.read().splitlines() if line.strip() and not line.startswith('#')]
+    if not lines:
+        return []
+    header = next(csv.reader([lines[0]]))
+    column = next((name for name in REFERENCE_COLUMNS if name in header), None)
+    if column is None:
+        return [line.strip() for line in lines]
+    return [row[column].strip() for row in csv.DictReader(lines) if (row.get(column) or '').strip()]
+
+
+def channel_record(channel_item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the stored channel record of a channels.list item.
+
+    Args:
+        channel_item: Item of a channels.list response
+
+    Returns:
+        Dict[str, Any]: Record for SQLiteDatabase.store_channel_data
+    """
+    snippet = channel_item.get('snippet', {})
+    statistics = channel_item.get('statistics', {})
+    content_details = channel_item.get('contentDetails', {})
+    status = channel_item.get('status', {})
+    topic_details = channel_item.get('topicDetails', {})
+    branding_settings = channel_item.get('brandingSettings', {})
+
+    record = {
+        'channel_id': channel_item['id'],
+        'channel_name': snippet.get('title', 'Unknown Channel'),
+        'subscribers': statistics.get('subscriberCount', 0),
+        'views': statistics.get('viewCount', 0),
+        'total_videos': statistics.get('videoCount', 0),
+        'channel_description': snippet.get('description', ''),
+        'custom_url': snippet.get('customUrl', ''),
+        'published_at': snippet.get('publishedAt', ''),
+        'country': snippet.get('country', ''),
+        'default_language': snippet.get('defaultLanguage', ''),
+        'fetched_at': datetime.now().isoformat(),
+
+        # Add additional fields from content details
+        'uploads_playlist_id': content_details.get('relatedPlaylists', {}).get('uploads', ''),
+
+        # Add fields from status
+        'privacy_status': status.get('privacyStatus', ''),
+        'is_linked': status.get('isLinked', False),
+        'long_uploads_status': status.get('longUploadsStatus', ''),
+        'made_for_kids': status.get('madeForKids', False),
+        'hidden_subscriber_count': statistics.get('hiddenSubscriberCount', False),
+
+        # Add fields from topicDetails
+        'topic_categories': ','.join(topic_details.get('topicCategories', [])) if 'topicCategories' in topic_details else '',
+
+        # Add fields from brandingSettings
+        'keywords': branding_settings.get('channel', {}).get('keywords', '')
+    }
+
+    # Add thumbnails if available
+    if 'thumbnails' in snippet:
+        thumbnails = snippet['thumbnails']
+        record['thumbnail_default'] = thumbnails.get('default', {}).get('url', '')
+        record['thumbnail_medium'] = thumbnails.get('medium', {}).get('url', '')
+        record['thumbnail_high'] = thumbnails.get('high', {}).get('url', '')
+    return record
+
+
+def import_channels(api, db, references: List[str], api_delay: float = 0.0,
+                    sink: Optional[ProgressSink] = None) -> Dict[str, List[str]]:
+    """
+    Fetch and store channels.
+
+    Args:
+        api: Initialized YouTubeAPI
+        db: SQLiteDatabase to store the channels in
+        references: Channel IDs, handles or channel URLs
+        api_delay: Pause between two channels.list requests, in seconds
+        sink: Progress sink; the current one by default
+
+    Returns:
+        Dict with the 'successful' channel IDs and the 'failed' references
+    """
+    sink = sink or get_progress_sink()
+    handles = sorted({reference for reference in references if not reference.startswith('UC')})
+    resolved = api.resolve_channel_references(handles) if handles else {}
+    failed = [reference for reference in handles if not resolved.get(reference)]
+    channel_ids = list(dict.fromkeys(
+        resolved.get(reference) or reference for reference in references if reference not in failed
+    ))
+
+    successful = []
+    for start in range(0, len(channel_ids), BATCH_SIZE):
+        batch = channel_ids[start:start + BATCH_SIZE]
+        try:
+            response = api.channel_client.youtube.channels().list(
+                part=CHANNEL_PARTS, id=','.join(batch), maxResults=BATCH_SIZE
+            ).execute()
+        except Exception as e:
+            debug_log(f"Bulk import batch {start // BATCH_SIZE + 1} failed: {str(e)}")
+            failed.extend(batch)
+            continue
+        found = set()
+        for item in response.get('items', []):
+            found.add(item['id'])
+            if db.store_channel_data(channel_record(item)):
+                successful.append(item['id'])
+            else:
+                failed.append(item['id'])
+        failed.extend(channel_id for channel_id in batch if channel_id not in found)
+        done = min(start + BATCH_SIZE, len(channel_ids))
+        sink.status(f"Imported {done}/{len(channel_ids)} channels", done / len(channel_ids))
+        if api_delay and done < len(channel_ids):
+            time.sleep(api_delay)
+
+    sink.clear()
+    if failed:
+        sink.notify('warning', f"{len(failed)} channels could not be imported")
+    sink.notify('success', f"Imported {len(successful)} channels")
+    return {'successful': successful, 'failed': failed}
@@ -0,0 +1,233 @@
+"""
+Quota and request-rate coordination between collection processes.
+
+The processes of a sharded collection share one daily quota budget and,
+optionally, one request rate. Both live in a small SQLite database of their
+own (so they never wait on the main database's writer):
+
+- quota_leases is a ledger of the units each worker leased (positive rows)
+  and gave back unused (negative rows); a worker leases a block at a time, so
+  the ledger is touched once every few channels rather than per request.
+- rate_slots holds the wall-clock time of the next free request slot; each
+  request reserves a slot in an immediate transaction and sleeps until it.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.config import DATA_DIR
+from src.utils.debug_utils import debug_log
+from src.utils.metrics import current_quota_day
+
+# Ledger shared by every process collecting with the same API project
+QUOTA_COORDINATOR_PATH = os.getenv('YTDATAHUB_QUOTA_COORDINATOR', str(DATA_DIR / 'quota_coordinator.db'))
+
+# Units a worker leases at a time; larger blocks mean fewer ledger writes but more units held back
+QUOTA_LEASE_UNITS = 100
+
+
+class QuotaCoordinator:
+    """
+    Cross-process quota ledger and request-rate limiter backed by SQLite.
+
+    Instances are picklable and open one connection per thread lazily, so one
+    can be passed to every worker process.
+    """
+
+    def __init__(self, path: str = QUOTA_COORDINATOR_PATH, daily_budget: Optional[int] = None,
+                 requests_per_second: Optional[float] = None):
+        """
+        Initialize the coordinator.
+
+        Args:
+            path: SQLite file of the ledger
+            daily_budget: Units that may be leased per quota day; None leaves the quota unlimited
+            requests_per_second: Combined request rate of all processes; None or 0 disables the limit
+        """
+        self.path = str(path)
+        self.daily_budget = daily_budget
+        self.requests_per_second = requests_per_second or None
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Autocommit mode: every method opens its own immediate transaction
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS quota_leases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    quota_day TEXT NOT NULL,
+                    worker TEXT,
+                    units INTEGER NOT NULL,
+                    leased_at TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_quota_leases_day ON quota_leases(quota_day)')
+            conn.execute('CREATE TABLE IF NOT EXISTS rate_slots (name TEXT PRIMARY KEY, next_slot REAL NOT NULL)')
+        return conn
+
+    def _record(self, units: int, worker: Optional[str], quota_day: str) -> None:
+        self.conn.execute(
+            'INSERT INTO quota_leases (quota_day, worker, units, leased_at) VALUES (?, ?, ?, ?)',
+            (quota_day, worker, units, datetime.now(timezone.utc).replace(tzinfo=None).isoformat())
+        )
+
+    def used(self, quota_day: Optional[str] = None) -> int:
+        """
+        Get the units leased and not given back on a quota day.
+
+        Args:
+            quota_day: Quota day; today by default
+
+        Returns:
+            int: Quota units
+        """
+        row = self.conn.execute('SELECT COALESCE(SUM(units), 0) FROM quota_leases WHERE quota_day = ?',
+                                (quota_day or current_quota_day(),)).fetchone()
+        return int(row[0])
+
+    def lease(self, units: int, worker: Optional[str] = None) -> int:
+        """
+        Lease quota units for a worker.
+
+        Args:
+            units: Units wanted
+            worker: Worker name recorded in the ledger
+
+        Returns:
+            int: Units granted; fewer than asked (possibly 0) once the day's budget runs out
+        """
+        if units <= 0:
+            return 0
+        day = current_quota_day()
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            granted = units
+            if self.daily_budget is not None:
+                granted = max(min(units, self.daily_budget - self.used(day)), 0)
+            if granted:
+                self._record(granted, worker, day)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return granted
+
+    def release(self, units: int, worker: Optional[str] = None) -> None:
+        """
+        Give back leased units a worker did not use.
+
+        Args:
+            units: Unused units
+            worker: Worker name recorded in the ledger
+        """
+        if units > 0:
+            self._record(-units, worker, current_quota_day())
+
+    def charge(self, units: int, worker: Optional[str] = None) -> None:
+        """
+        Record units used beyond what a worker had leased, whatever the budget.
+
+        Args:
+            units: Units used
+            worker: Worker name recorded in the ledger
+        """
+        if units > 0:
+            self._record(units, worker, current_quota_day())
+
+    def acquire(self) -> float:
+        """
+        Wait for the next request slot of the combined rate; the rate limiter interface.
+
+        Returns:
+            float: Seconds waited
+        """
+        if not self.requests_per_second:
+            return 0.0
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT next_slot FROM rate_slots WHERE name = 'api'").fetchone()
+            now = time.time()
+            slot = max(now, row[0] if row else 0.0)
+            conn.execute("INSERT OR REPLACE INTO rate_slots (name, next_slot) VALUES ('api', ?)",
+                         (slot + 1.0 / self.requests_per_second,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class WorkerQuota:
+    """A worker's share of the coordinated quota: leases blocks and spends them locally."""
+
+    def __init__(self, coordinator: QuotaCoordinator, worker: str, block_units: int = QUOTA_LEASE_UNITS):
+        """
+        Initialize the share.
+
+        Args:
+            coordinator: The shared coordinator
+            worker: Worker name recorded in the ledger
+            block_units: Units leased at a time
+        """
+        self.coordinator = coordinator
+        self.worker = worker
+        self.block_units = block_units
+        self.balance = 0
+
+    def reserve(self, estimate: int) -> bool:
+        """
+        Make sure the worker holds enough units for a job, leasing more if needed.
+
+        Args:
+            estimate: Estimated units of the job
+
+        Returns:
+            bool: False if the budget cannot cover the job
+        """
+        if self.balance < estimate:
+            self.balance += self.coordinator.lease(max(estimate - self.balance, self.block_units), self.worker)
+        if self.balance < estimate:
+            debug_log(f"Quota budget exhausted for {self.worker}: {self.balance} units left, {estimate} needed")
+            return False
+        return True
+
+    def spend(self, units: int) -> None:
+        """Charge the units a job actually used; overruns are settled by the next lease."""
+        self.balance -= units
+
+    def settle(self) -> None:
+        """Give the unused units back, or record an overrun, when the worker stops."""
+        if self.balance > 0:
+            self.coordinator.release(self.balance, self.worker)
+        elif self.balance < 0:
+            self.coordinator.charge(-self.balance, self.worker)
+        self.balance = 0
@@ -0,0 +1,430 @@
+"""
+Headless scheduler for periodic channel refreshes.
+
+Each tick reads the refresh policy of every channel, ranks the channels that
+are due by how overdue they are and how fast they have been growing (views,
+else subscribers, between their two latest channel_history snapshots), and
+queues as many as the remaining daily quota budget covers. The jobs run
+collect_channel_data and save the result on a worker pool; their state and
+the quota each one used are kept in refresh_jobs, where the Utilities tab
+shows them. After each tick the metric alert thresholds are evaluated in one
+batch over every channel and video of the refreshed channels.
+
+Usage:
+    python -m src.services.refresh_scheduler policy UC... --interval-hours 12 --max-videos 100
+    python -m src.services.refresh_scheduler run --workers 4
+    python -m src.services.refresh_scheduler status
+"""
+import argparse
+import math
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from src.config import SQLITE_DB_PATH
+from src.database.scheduler_repository import SchedulerRepository
+from src.utils.debug_utils import debug_log
+from src.utils.metrics import YOUTUBE_DAILY_QUOTA, current_quota_day, get_metrics_registry, quota_meter
+
+# Share of the daily quota the scheduler may use (override with YTDATAHUB_SCHEDULER_QUOTA)
+SCHEDULER_QUOTA_BUDGET = int(os.getenv('YTDATAHUB_SCHEDULER_QUOTA', str(int(YOUTUBE_DAILY_QUOTA * 0.8))))
+
+# An overdue channel stops gaining priority at this many intervals
+MAX_OVERDUE_FACTOR = 10.0
+
+# A channel growing 1% a day is ranked as if it were twice as overdue, up to MAX_GROWTH_BOOST
+GROWTH_WEIGHT = 100.0
+MAX_GROWTH_BOOST = 4.0
+
+# Entity types whose alert thresholds are evaluated after each tick
+ALERT_ENTITY_TYPES = ('channel', 'video')
+
+# API page sizes behind the quota estimate
+_VIDEOS_PER_PAGE = 50
+_COMMENTS_PER_PAGE = 100
+
+
+class RefreshPolicy(NamedTuple):
+    """How often a channel is refreshed and how much each refresh collects."""
+    interval_hours: float = 24.0
+    priority: float = 1.0
+    max_videos: int = 50
+    max_comments_per_video: int = 0
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored timestamp as naive UTC."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00').replace(' ', 'T'))
+    except ValueError:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def estimate_quota_cost(policy: RefreshPolicy, video_count: Optional[int] = None) -> int:
+    """
+    Estimate the quota units of one refresh.
+
+    Args:
+        policy: The channel's policy
+        video_count: Videos the channel has, used when the policy collects all of them
+
+    Returns:
+        int: channels.list plus one playlistItems.list and one videos.list page
+        per 50 videos plus the commentThreads.list pages of every video
+    """
+    videos = policy.max_videos or video_count or _VIDEOS_PER_PAGE
+    if video_count:
+        videos = min(videos, video_count)
+    cost = 1 + 2 * math.ceil(videos / _VIDEOS_PER_PAGE)
+    if policy.max_comments_per_video:
+        cost += videos * math.ceil(policy.max_comments_per_video / _COMMENTS_PER_PAGE)
+    return cost
+
+
+def growth_per_day(candidate: Dict[str, Any]) -> float:
+    """
+    Relative daily growth between a channel's two latest snapshots.
+
+    Args:
+        candidate: Row from SchedulerRepository.get_candidates
+
+    Returns:
+        float: e.g. 0.01 for 1% a day; 0 when it cannot be measured or the channel shrank
+    """
+    latest_at = _parse_time(candidate.get('latest_fetched_at'))
+    previous_at = _parse_time(candidate.get('previous_fetched_at'))
+    if not latest_at or not previous_at or latest_at <= previous_at:
+        return 0.0
+    days = max((latest_at - previous_at).total_seconds() / 86400, 1 / 24)
+    for metric in ('views', 'subscribers'):
+        latest, previous = candidate.get(f'latest_{metric}'), candidate.get(f'previous_{metric}')
+        if latest is not None and previous:
+            return max((latest - previous) / previous / days, 0.0)
+    return 0.0
+
+
+def score_candidate(candidate: Dict[str, Any], policy: RefreshPolicy, now: datetime) -> float:
+    """
+    Rank a channel for refreshing.
+
+    Args:
+        candidate: Row from SchedulerRepository.get_candidates
+        policy: The channel's policy
+        now: Current naive UTC time
+
+    Returns:
+        float: 0 when the channel is not due yet; otherwise its priority times
+        how many intervals it is overdue, boosted by its recent growth
+    """
+    last_refreshed = _parse_time(candidate.get('last_refreshed_at'))
+    if last_refreshed is None:
+        overdue = MAX_OVERDUE_FACTOR
+    else:
+        overdue = (now - last_refreshed).total_seconds() / 3600 / max(policy.interval_hours, 1e-6)
+    if overdue < 1:
+        return 0.0
+    boost = 1 + min(growth_per_day(candidate) * GROWTH_WEIGHT, MAX_GROWTH_BOOST)
+    return policy.priority * min(overdue, MAX_OVERDUE_FACTOR) * boost
+
+
+class RefreshScheduler:
+    """Plans refresh jobs within the quota budget and runs them on a worker pool."""
+
+    def __init__(self, api_key: str, db_path: Optional[str] = None, max_workers: int = 4,
+                 quota_budget: int = SCHEDULER_QUOTA_BUDGET, max_jobs_per_tick: Optional[int] = None,
+                 default_policy: Optional[RefreshPolicy] = None,
+                 alert_entity_types: Iterable[str] = ALERT_ENTITY_TYPES):
+        """
+        Initialize the scheduler.
+
+        Args:
+            api_key: YouTube API key
+            db_path: SQLite database; the configured database by default
+            max_workers: Jobs run at the same time
+            quota_budget: Quota units the scheduler may use per quota day
+            max_jobs_per_tick: Jobs queued per tick; 4 per worker by default
+            default_policy: Policy of stored channels without one; None leaves them alone
+            alert_entity_types: Entity types to evaluate alert thresholds for after each tick; empty disables alerts
+        """
+        from src.database.sqlite import SQLiteDatabase
+
+        self.api_key = api_key
+        self.db_path = str(db_path or SQLITE_DB_PATH)
+        # Creates the schema, including the scheduler tables
+        SQLiteDatabase(self.db_path)
+        self.repository = SchedulerRepository(self.db_path)
+        self.max_workers = max_workers
+        self.quota_budget = quota_budget
+        self.max_jobs_per_tick = max_jobs_per_tick or max_workers * 4
+        self.default_policy = default_policy
+        self.alert_entity_types = tuple(alert_entity_types)
+        # Alerts of the last tick that refreshed a channel, a DataFrame once evaluated
+        self.last_alerts = None
+        self._metrics_service = None
+        self._stop = threading.Event()
+
+    def plan(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Pick the channels to refresh now.
+
+        Args:
+            now: Current naive UTC time, for tests
+
+        Returns:
+            List of dicts with channel_id, score, quota_estimate and policy,
+            highest score first, within the remaining quota of the day
+        """
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        due = []
+        for candidate in self.repository.get_candidates(include_unconfigured=self.default_policy is not None):
+            if candidate['interval_hours'] is None:
+                policy = self.default_policy
+            else:
+                policy = RefreshPolicy(candidate['interval_hours'], candidate['priority'],
+                                       candidate['max_videos'], candidate['max_comments_per_video'])
+            score = score_candidate(candidate, policy, now)
+            if score <= 0:
+                continue
+            estimate = candidate['last_quota_used'] or estimate_quota_cost(policy, candidate.get('video_count'))
+            due.append({'channel_id': candidate['channel_id'], 'score': score,
+                        'quota_estimate': int(estimate), 'policy': policy})
+        due.sort(key=lambda job: job['score'], reverse=True)
+
+        remaining = self.quota_budget - self.repository.get_quota_used(current_quota_day())
+        planned = []
+        for job in due[:self.max_jobs_per_tick]:
+            # Keep the ranking: a costly top channel is not passed over for cheaper ones
+            if job['quota_estimate'] > remaining:
+                break
+            remaining -= job['quota_estimate']
+            planned.append(job)
+        debug_log(f"Refresh scheduler: {len(due)} channels due, {len(planned)} planned, "
+                  f"{max(remaining, 0)} quota units left today")
+        return planned
+
+    def run_once(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Plan one tick and run its jobs to completion.
+
+        Alert thresholds are then evaluated for the refreshed channels; the
+        alerts are kept in last_alerts.
+
+        Returns:
+            List of the planned jobs with their job_id, succeeded and quota_used
+        """
+        jobs = self.plan(now)
+        if not jobs:
+            return []
+        job_ids = self.repository.queue_jobs(jobs, current_quota_day())
+        for job, job_id in zip(jobs, job_ids):
+            job['job_id'] = job_id
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='refresh') as pool:
+            results = list(pool.map(self._run_job, jobs))
+        refreshed = [job['channel_id'] for job in results if job['succeeded']]
+        if refreshed and self.alert_entity_types:
+            self.last_alerts = self.evaluate_alerts(refreshed)
+        return results
+
+    def evaluate_alerts(self, channel_ids: Optional[List[str]] = None):
+        """
+        Evaluate the alert thresholds of the channels and their videos in one batch per entity type.
+
+        Args:
+            channel_ids: Channels to evaluate; every stored channel by default
+
+        Returns:
+            pandas.DataFrame: The alerts (see MetricsTrackingService.evaluate_alerts)
+        """
+        import pandas as pd
+        from src.services.youtube.metrics_tracking.metrics_tracking_service import (
+            ALERT_COLUMNS, MetricsTrackingService
+        )
+
+        if self._metrics_service is None:
+            from src.database.sqlite import SQLiteDatabase
+            self._metrics_service = MetricsTrackingService(db=SQLiteDatabase(self.db_path))
+        started = time.perf_counter()
+        frames = []
+        for entity_type in self.alert_entity_types:
+            try:
+                frames.append(self._metrics_service.evaluate_alerts(entity_type, channel_ids))
+            except Exception as e:
+                debug_log(f"Alert evaluation for {entity_type} metrics failed: {str(e)}")
+        alerts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ALERT_COLUMNS)
+        elapsed = time.perf_counter() - started
+
+        registry = get_metrics_registry()
+        registry.observe('alert_evaluation_seconds', elapsed)
+        for (entity_type, level), count in alerts.groupby(['entity_type', 'threshold_level']).size().items():
+            registry.inc('metric_alerts_total', int(count), entity_type=entity_type, level=level)
+        debug_log(f"Refresh scheduler: {len(alerts)} metric alerts for "
+                  f"{len(channel_ids) if channel_ids is not None else 'all'} channels in {elapsed:.2f}s")
+        return alerts
+
+    def run_forever(self, poll_seconds: float = 300) -> None:
+        """
+        Run ticks until stop() is called.
+
+        Args:
+            poll_seconds: Pause between ticks
+        """
+        interrupted = self.repository.fail_interrupted_jobs()
+        if interrupted:
+            debug_log(f"Refresh scheduler: marked {interrupted} interrupted jobs as failed")
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                debug_log(f"Refresh scheduler tick failed: {str(e)}")
+            self._stop.wait(poll_seconds)
+
+    def stop(self) -> None:
+        """Stop run_forever after the running tick."""
+        self._stop.set()
+
+    def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        channel_id = job['channel_id']
+        self.repository.start_job(job['job_id'])
+        with quota_meter() as meter:
+            outcome = collect_channel(self.api_key, channel_id, job['policy'], self.db_path)
+        succeeded, videos, error = outcome['succeeded'], outcome['videos'], outcome['error']
+        self.repository.finish_job(job['job_id'], succeeded, meter.units, videos, error)
+        get_metrics_registry().inc('refresh_jobs_total', status='succeeded' if succeeded else 'failed')
+        debug_log(f"Refresh job {job['job_id']} for {channel_id}: "
+                  f"{'succeeded' if succeeded else 'failed: ' + str(error)}, {meter.units} quota units")
+        return {**job, 'succeeded': succeeded, 'quota_used': meter.units, 'videos': videos, 'error': error}
+
+
+def collect_channel(api_key: str, channel_id: str, policy: RefreshPolicy, db_path: str) -> Dict[str, Any]:
+    """
+    Collect a channel as its policy says and save it to the SQLite database.
+
+    Args:
+        api_key: YouTube Data API key
+        channel_id: YouTube channel ID
+        policy: How many videos and comments to collect
+        db_path: SQLite database
+
+    Returns:
+        Dict with succeeded, videos (number collected) and error
+    """
+    from src.services.youtube_service import YouTubeService
+
+    succeeded, videos, error = False, None, None
+    try:
+        # One service per call: the HTTP client must not be shared between threads
+        service = YouTubeService(api_key)
+        options = {
+            'fetch_channel_data': True,
+            'fetch_videos': True,
+            'fetch_comments': policy.max_comments_per_video > 0,
+            'max_videos': policy.max_videos,
+            'max_comments_per_video': policy.max_comments_per_video,
+        }
+        data = service.collect_channel_data(channel_id, options)
+        if not data or data.get('error'):
+            error = (data or {}).get('error') or 'No data returned'
+        else:
+            data['channel_id'] = data.get('channel_id') or channel_id
+            videos = len(data.get('video_id') or [])
+            config = SimpleNamespace(sqlite_db_path=db_path)
+            succeeded = bool(service.save_channel_data(data, 'SQLite Database', config))
+            if not succeeded:
+                error = 'Save failed'
+    except Exception as e:
+        error = str(e)
+    return {'succeeded': succeeded, 'videos': videos, 'error': error}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m src.services.refresh_scheduler',
+                                     description='Refresh stored channels in the background within the daily quota')
+    parser.add_argument('--db', default=str(SQLITE_DB_PATH), help='SQLite database')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Run the scheduler')
+    run.add_argument('--api-key', default=None, help='YouTube API key (default: $YOUTUBE_API_KEY)')
+    run.add_argument('--workers', type=int, default=4)
+    run.add_argument('--poll-seconds', type=float, default=300, help='Pause between ticks (default: 300)')
+    run.add_argument('--quota-budget', type=int, default=SCHEDULER_QUOTA_BUDGET,
+                     help=f'Quota units per day (default: {SCHEDULER_QUOTA_BUDGET})')
+    run.add_argument('--max-jobs', type=int, help='Jobs per tick (default: 4 per worker)')
+    run.add_argument('--all-channels', action='store_true',
+                     help='Also refresh stored channels without a policy, with the default policy')
+    run.add_argument('--once', action='store_true', help='Run a single tick and exit')
+    run.add_argument('--no-alerts', action='store_true', help='Do not evaluate alert thresholds after each tick')
+
+    policy = subparsers.add_parser('policy', help='Set the refresh policy of channels')
+    policy.add_argument('channel_ids', nargs='+')
+    policy.add_argument('--interval-hours', type=float, default=RefreshPolicy().interval_hours)
+    policy.add_argument('--priority', type=float, default=RefreshPolicy().priority)
+    policy.add_argument('--max-videos', type=int, default=RefreshPolicy().max_videos, help='0 collects every video')
+    policy.add_argument('--max-comments', type=int, default=RefreshPolicy().max_comments_per_video,
+                        help='Comments per video; 0 skips comments')
+    policy.add_argument('--disable', action='store_true')
+
+    status = subparsers.add_parser('status', help='Show recent jobs and the quota used today')
+    status.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'policy':
+        from src.database.sqlite import SQLiteDatabase
+        db = SQLiteDatabase(args.db)
+        for channel_id in args.channel_ids:
+            db.set_refresh_policy(channel_id, args.interval_hours, args.priority, args.max_videos,
+                                  args.max_comments, enabled=not args.disable)
+        print(f"Policy set for {len(args.channel_ids)} channels", file=sys.stderr)
+        return 0
+
+    if args.command == 'status':
+        from src.database.sqlite import SQLiteDatabase
+        db = SQLiteDatabase(args.db)
+        day = current_quota_day()
+        print(f"Quota used on {day}: {db.scheduler_repository.get_quota_used(day)}")
+        for job in db.get_refresh_jobs(args.limit):
+            print(f"{job['id']:>6} {job['status']:9} {job['channel_id']} {job['queued_at']} "
+                  f"quota={job['quota_used'] if job['quota_used'] is not None else job['quota_estimate']}"
+                  f"{'  ' + job['error'] if job['error'] else ''}")
+        return 0
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    api_key = args.api_key or os.getenv('YOUTUBE_API_KEY')
+    if not api_key:
+        print("No API key: pass --api-key or set YOUTUBE_API_KEY", file=sys.stderr)
+        return 2
+    scheduler = RefreshScheduler(
+        api_key, args.db, max_workers=args.workers, quota_budget=args.quota_budget,
+        max_jobs_per_tick=args.max_jobs, default_policy=RefreshPolicy() if args.all_channels else None,
+        alert_entity_types=() if args.no_alerts else ALERT_ENTITY_TYPES
+    )
+    if args.once:
+        results = scheduler.run_once()
+        print(f"Ran {len(results)} jobs, {sum(job['succeeded'] for job in results)} succeeded", file=sys.stderr)
+        if scheduler.last_alerts is not None:
+            for message in scheduler.last_alerts['message']:
+                print(message, file=sys.stderr)
+        return 0 if all(job['succeeded'] for job in results) else 1
+
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.run_forever(args.poll_seconds)
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Multi-process collection of many channels.
+
+Collecting a channel is I/O bound, but standardizing its videos, computing
+their deltas and mapping the result to table rows are CPU bound and hold the
+GIL, so threads stop scaling after a few channels. collect_sharded spreads the
+channels over worker processes instead:
+
+- the workers take channel IDs from a shared queue (so a slow channel never
+  holds up a whole shard), collect them in headless mode against the stored
+  counts of their videos, map them to rows and send the rows to the writer;
+- a single writer process only executes the inserts, so the SQLite database
+  only ever has one writer;
+- the daily quota and, optionally, the request rate are shared through a
+  QuotaCoordinator; each worker leases quota in blocks and skips the channels
+  the budget no longer covers.
+"""
+import logging
+import os
+import queue
+from typing import Any, Dict, List, Optional
+
+from src.services.quota_coordinator import QUOTA_COORDINATOR_PATH, QuotaCoordinator, WorkerQuota
+from src.services.refresh_scheduler import SCHEDULER_QUOTA_BUDGET, RefreshPolicy, estimate_quota_cost
+from src.utils.progress import ProgressSink, get_progress_sink
+
+# Prepared channels waiting for the writer; workers pause when it falls this far behind
+WRITER_QUEUE_SIZE = 32
+
+# Seconds to wait for room in the write queue for the writer's sentinel
+WRITER_STOP_TIMEOUT = 5.0
+
+
+def _init_process(log_level: int) -> None:
+    """Run a spawned process headless, logging at the parent's level."""
+    from src.utils.headless import set_headless
+    from src.utils.progress import NullProgressSink
+    set_headless(sink=NullProgressSink())
+    # Imported for its console setup, which would otherwise reset the level when a service imports it
+    import src.utils.logging_utils  # noqa: F401
+    logging.getLogger().setLevel(log_level)
+
+
+def _worker_main(worker: str, api_key: str, policy: RefreshPolicy, coordinator: QuotaCoordinator,
+                 db_path: str, tasks, writes, results, log_level: int = logging.WARNING) -> None:
+    """Collect channels from the task queue until its sentinel; runs in a worker process."""
+    _init_process(log_level)
+
+    from src.api.youtube.rate_limit import set_api_rate_limiter
+    from src.database.channel_repository import ChannelRepository
+    from src.services.youtube_service import YouTubeService
+    from src.utils.metrics import quota_meter
+
+    if coordinator.requests_per_second:
+        set_api_rate_limiter(coordinator)
+    quota = WorkerQuota(coordinator, worker)
+    service = YouTubeService(api_key)
+    # Only reads the database: the stored videos and the table definitions
+    repository = ChannelRepository(db_path)
+    options = {
+        'fetch_channel_data': True,
+        'fetch_videos': True,
+        'fetch_comments': policy.max_comments_per_video > 0,
+        'max_videos': policy.max_videos,
+        'max_comments_per_video': policy.max_comments_per_video,
+    }
+    estimate = estimate_quota_cost(policy)
+    try:
+        while True:
+            channel_id = tasks.get()
+            if channel_id is None:
+                break
+            outcome = {'channel_id': channel_id, 'worker': worker, 'succeeded': False,
+                       'videos': None, 'updated_videos': None, 'quota_used': 0, 'error': None}
+            if not quota.reserve(estimate):
+                results.put({**outcome, 'error': 'Quota budget exhausted'})
+                continue
+            with quota_meter() as meter:
+                try:
+                    # Deltas are computed against the stored counts
+                    existing = {'video_id': repository.video_repository.get_video_counts(channel_id)}
+                    data = service.collect_channel_data(channel_id, dict(options), existing_data=existing)
+                except Exception as e:
+                    data = {'error': str(e)}
+            quota.spend(meter.units)
+            outcome['quota_used'] = meter.units
+            if not data or data.get('error'):
+                results.put({**outcome, 'error': (data or {}).get('error') or 'No data returned'})
+                continue
+            data = data.get('api_data') or data
+            if 'error_videos' in data:
+                # The video list is still the stored one, which must not be saved over the stored rows
+                data.pop('video_id', None)
+            data['channel_id'] = data.get('channel_id') or channel_id
+            outcome['videos'] = len(data.get('video_id') or [])
+            deltas = (data.get('delta') or {}).get('videos') or []
+            outcome['updated_videos'] = sum(
+                1 for delta in deltas if delta['view_delta'] or delta['like_delta'] or delta['comment_delta']
+            )
+            try:
+                rows = repository.prepare_channel_data(data)
+            except Exception as e:
+                results.put({**outcome, 'error': str(e)})
+                continue
+            if rows is None:
+                results.put({**outcome, 'error': 'No channel fields to save'})
+                continue
+            # The writer reports the outcome once the rows are saved
+            writes.put((outcome, rows))
+    finally:
+        quota.settle()
+        coordinator.close()
+
+
+def _writer_main(db_path: str, writes, results, log_level: int = logging.WARNING) -> None:
+    """Write the prepared channels until the sentinel; runs in the writer process."""
+    _init_process(log_level)
+
+    from src.database.channel_repository import ChannelRepository
+
+    repository = ChannelRepository(db_path)
+    while True:
+        item = writes.get()
+        if item is None:
+            break
+        outcome, rows = item
+        try:
+            saved = bool(repository.store_prepared_channel_data(rows))
+            results.put({**outcome, 'succeeded': saved, 'error': None if saved else 'Save failed'})
+        except Exception as e:
+            results.put({**outcome, 'error': str(e)})
+
+
+def _stop_writer(writes) -> bool:
+    """Send the writer its sentinel; False if the write queue stayed full."""
+    try:
+        writes.put(None, timeout=WRITER_STOP_TIMEOUT)
+        return True
+    except queue.Full:
+        return False
+
+
+def collect_sharded(api_key: str, channel_ids: List[str], db_path: str, processes: Optional[int] = None,
+                    policy: RefreshPolicy = RefreshPolicy(), coordinator: Optional[QuotaCoordinator] = None,
+                    sink: Optional[ProgressSink] = None) -> List[Dict[str, Any]]:
+    """
+    Collect channels with several worker processes and one writer process.
+
+    Args:
+        api_key: YouTube Data API key
+        channel_ids: Channels to collect; duplicates are collected once
+        db_path: SQLite database the workers read the stored videos from and the writer saves to
+        processes: Worker processes; one per CPU by default
+        policy: How many videos and comments to collect per channel
+        coordinator: Shared quota and rate limit; SCHEDULER_QUOTA_BUDGET a day in the default ledger by default
+        sink: Progress sink; the current one by default
+
+    Returns:
+        List[Dict[str, Any]]: One outcome per channel (channel_id, worker, succeeded, videos,
+        updated_videos, quota_used, error), in completion order; updated_videos counts the
+        stored videos whose view, like or comment count changed
+    """
+    import multiprocessing
+
+    from src.database.sqlite import SQLiteDatabase
+
+    channel_ids = list(dict.fromkeys(channel_ids))
+    if not channel_ids:
+        return []
+    sink = sink or get_progress_sink()
+    coordinator = coordinator or QuotaCoordinator(QUOTA_COORDINATOR_PATH, daily_budget=SCHEDULER_QUOTA_BUDGET)
+    processes = max(1, min(processes or os.cpu_count() or 1, len(channel_ids)))
+    # Create the tables up front: the workers read their definitions and the writer only inserts
+    SQLiteDatabase(db_path)
+
+    # Spawned, not forked: the parent may hold threads, HTTP clients and SQLite connections
+    context = multiprocessing.get_context('spawn')
+    tasks, results = context.Queue(), context.Queue()
+    writes = context.Queue(maxsize=WRITER_QUEUE_SIZE)
+    for channel_id in channel_ids:
+        tasks.put(channel_id)
+    for _ in range(processes):
+        tasks.put(None)
+
+    log_level = logging.getLogger().getEffectiveLevel()
+    writer = context.Process(target=_writer_main, args=(db_path, writes, results, log_level),
+                             name='ytdatahub-writer')
+    workers = [
+        context.Process(target=_worker_main, name=f'ytdatahub-worker-{i}',
+                        args=(f'worker-{i}', api_key, policy, coordinator, db_path, tasks, writes, results,
+                              log_level))
+        for i in range(processes)
+    ]
+    writer.start()
+    for process in workers:
+        process.start()
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    writer_stopping = False
+    while len(outcomes) < len(channel_ids):
+        try:
+            outcome = results.get(timeout=0.5)
+        except queue.Empty:
+            if not writer.is_alive():
+                # Nothing drains the write queue any more, so workers would block on it forever
+                for process in workers:
+                    if process.is_alive():
+                        process.terminate()
+                break
+            # Workers that died leave their channels without an outcome
+            if not writer_stopping and not any(process.is_alive() for process in workers):
+                writer_stopping = _stop_writer(writes)
+            continue
+        outcomes[outcome['channel_id']] = outcome
+        sink.status(f"Collected {len(outcomes)}/{len(channel_ids)} channels", len(outcomes) / len(channel_ids))
+
+    for process in workers:
+        process.join()
+    writer_lost = not writer.is_alive() and not writer_stopping
+    if not writer_stopping and writer.is_alive() and not _stop_writer(writes):
+        writer.terminate()
+    writer.join()
+    sink.clear()
+
+    error = 'Writer process exited' if writer_lost else 'Worker process exited'
+    lost = [channel_id for channel_id in channel_ids if channel_id not in outcomes]
+    for channel_id in lost:
+        outcomes[channel_id] = {'channel_id': channel_id, 'worker': None, 'succeeded': False,
+                                'videos': None, 'updated_videos': None, 'quota_used': 0, 'error': error}
+    succeeded = sum(1 for outcome in outcomes.values() if outcome['succeeded'])
+    sink.notify('success' if succeeded == len(channel_ids) else 'warning',
+                f"Collected {succeeded} of {len(channel_ids)} channels with {processes} processes")
+    return list(outcomes.values())
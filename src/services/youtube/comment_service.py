@@ -59,9 +59,9 @@ class CommentService(BaseService):
         debug_log(f"[COMMENT SERVICE] Found {len(channel_data['video_id'])} videos for comment collection")
         for i, video in enumerate(channel_data['video_id'][:2]):  # Log first 2 videos
             video_id = video.get('id') or video.get('video_id')
-            debug_log(f"[COMMENT SERVICE] Video {i+1}: ID={video_id}, Title={video.get('snippet', {}).get('title', 'Unknown')}")
+            debug_log(lambda: f"[COMMENT SERVICE] Video {i+1}: ID={video_id}, Title={video.get('snippet', {}).get('title', 'Unknown')}")
             if 'statistics' in video:
-                debug_log(f"[COMMENT SERVICE] Video {i+1} statistics: {video['statistics']}")
+                debug_log(lambda: f"[COMMENT SERVICE] Video {i+1} statistics: {video['statistics']}")
     
         # Extract parameters from options
         videos = channel_data['video_id']
@@ -186,7 +186,7 @@ class CommentService(BaseService):
                             video['_comment_ids_seen'] = set()
                         video['_comment_ids_seen'].add(comment_id)
                 
-                debug_log(f"Added {len(video_comments_map[video_id]['comments'])} comments to video {video_id}")
+                debug_log(lambda: f"Added {len(video_comments_map[video_id]['comments'])} comments to video {video_id}")
                 
                 # Copy any additional fields
                 for key, value in video_comments_map[video_id].items():
@@ -253,7 +253,7 @@ class CommentService(BaseService):
         
         # Continue fetching pages until we have enough comments or run out of pages
         while next_page_token is not None or current_page == 0:
-            debug_log(f"Comment pagination: current_page={current_page}, next_page_token={next_page_token}, comments_fetched={comments_fetched}")
+            debug_log(lambda: f"Comment pagination: current_page={current_page}, next_page_token={next_page_token}, comments_fetched={comments_fetched}")
             
             # Call the API with the page_token for pagination
             try:
@@ -268,7 +268,7 @@ class CommentService(BaseService):
                         video_id = video.get('video_id')
                         if video_id in all_comments and all_comments[video_id].get('nextPageToken'):
                             video['nextPageToken'] = all_comments[video_id]['nextPageToken']
-                            debug_log(f"Set nextPageToken {video['nextPageToken']} for video {video_id} in API call data")
+                            debug_log(lambda: f"Set nextPageToken {video['nextPageToken']} for video {video_id} in API call data")
                 
                 # Always preserve existing comments in the video objects before making the API call
                 for video in channel_data_for_api.get('video_id', []):
@@ -284,7 +284,7 @@ class CommentService(BaseService):
                     max_comments_per_video=max_comments_per_video,
                     page_token=next_page_token
                 )
-                debug_log(f"API get_video_comments call with page_token={next_page_token}, response keys: {list(comments_response.keys()) if comments_response else 'None'}")
+                debug_log(lambda: f"API get_video_comments call with page_token={next_page_token}, response keys: {list(comments_response.keys()) if comments_response else 'None'}")
                 
                 # Process the comments from this page
                 if comments_response:
@@ -314,7 +314,7 @@ class CommentService(BaseService):
                     
                 # Break condition: If next_page_token is None after first iteration, exit loop
                 if next_page_token is None and current_page > 0:
-                    debug_log(f"Breaking comment pagination: current_page={current_page}, next_page_token={next_page_token}")
+                    debug_log(lambda: f"Breaking comment pagination: current_page={current_page}, next_page_token={next_page_token}")
                     break
                     
             except Exception as e:
@@ -370,16 +370,16 @@ class CommentService(BaseService):
                 
                 # Count how many new comments we added for this page
                 comments_fetched += new_comments_count
-                debug_log(f"Added {new_comments_count} new comments for video {video_id} (total now: {len(all_comments[video_id]['comments'])})")
+                debug_log(lambda: f"Added {new_comments_count} new comments for video {video_id} (total now: {len(all_comments[video_id]['comments'])})")
                 
             # Also preserve the nextPageToken at the video level if it exists
             if 'nextPageToken' in video_with_comments:
                 all_comments[video_id]['nextPageToken'] = video_with_comments.get('nextPageToken')
-                debug_log(f"Stored nextPageToken in all_comments for {video_id}: {all_comments[video_id]['nextPageToken']}")
+                debug_log(lambda: f"Stored nextPageToken in all_comments for {video_id}: {all_comments[video_id]['nextPageToken']}")
             elif 'nextPageToken' in all_comments[video_id]:
                 # If this video no longer has a nextPageToken but previously did, 
                 # it means we've reached the end of comments for this video
-                debug_log(f"Removing nextPageToken for {video_id} as it's no longer present in response")
+                debug_log(lambda: f"Removing nextPageToken for {video_id} as it's no longer present in response")
                 del all_comments[video_id]['nextPageToken']
                 
         return comments_fetched
@@ -407,7 +407,7 @@ class CommentService(BaseService):
                 # Get the next page token from any video that has one
                 if 'nextPageToken' in video_with_comments:
                     next_page_token = video_with_comments.get('nextPageToken')
-                    debug_log(f"Found nextPageToken in video: {next_page_token}")
+                    debug_log(lambda: f"Found nextPageToken in video: {next_page_token}")
                     if next_page_token:
                         break
         
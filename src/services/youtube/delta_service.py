@@ -58,7 +58,7 @@ class DeltaService(BaseService):
             delta_options.update(options)
             
         comparison_level = delta_options.get('comparison_level')
-        debug_log(f"Calculating deltas for channel {channel_data.get('channel_id')} at {comparison_level} level")
+        debug_log(lambda: f"Calculating deltas for channel {channel_data.get('channel_id')} at {comparison_level} level")
         
         # Ensure channel_data has references to the original data and options for other methods
         channel_data['_existing_data'] = original_data
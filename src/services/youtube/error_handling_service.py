@@ -9,12 +9,8 @@ import random
 import traceback
 from typing import Dict, Any, Optional, Union, Tuple
 
-# Try to import streamlit but don't fail if it's not available
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except (ImportError, ModuleNotFoundError):
-    STREAMLIT_AVAILABLE = False
+# Streamlit is imported on first use, and never in headless runs
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 
 import googleapiclient.errors
 from src.utils.debug_utils import debug_log
@@ -5,12 +5,13 @@ and visualization components for the YouTube data.
 """
 from .metrics_tracking_service import MetricsTrackingService
 from .alert_threshold_config import AlertThresholdConfig
-from .trend_analysis import TrendAnalyzer
+from .trend_analysis import TrendAnalyzer, SeriesBatch
 from .metrics_delta_integration import MetricsDeltaIntegration
 
 __all__ = [
     'MetricsTrackingService',
     'AlertThresholdConfig',
     'TrendAnalyzer',
+    'SeriesBatch',
     'MetricsDeltaIntegration',
 ]
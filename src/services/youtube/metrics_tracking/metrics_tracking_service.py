@@ -4,14 +4,21 @@ Service for tracking, analyzing and visualizing metrics over time.
 import logging
 import json
 from typing import Dict, List, Optional, Union, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import numpy as np
 import pandas as pd
 
 from src.services.youtube.base_service import BaseService
 from src.utils.debug_utils import debug_log
 from .alert_threshold_config import AlertThresholdConfig
-from .trend_analysis import TrendAnalyzer
+from .trend_analysis import TrendAnalyzer, SeriesBatch
+
+# Columns of the alerts returned by MetricsTrackingService.evaluate_alerts
+ALERT_COLUMNS = [
+    'entity_type', 'entity_id', 'channel_id', 'metric_name', 'threshold_level', 'threshold_type',
+    'threshold_value', 'current_value', 'from_value', 'to_value', 'window_days', 'actual_days',
+    'direction', 'message'
+]
 
 class MetricsTrackingService(BaseService):
     """
@@ -247,6 +254,150 @@ class MetricsTrackingService(BaseService):
                 
         return report
 
+    def analyze_trends_batch(self, entity_ids: List[str], metric_name: str,
+                             entity_type: str = 'video', time_window: int = 90,
+                             analysis_types: List[str] = None) -> Dict[str, Any]:
+        """
+        Analyze one metric for many entities (e.g. every video of a channel) in a single batch.
+        
+        The history of all the entities is read with one range query
+        (db.get_metric_series); databases without it are read entity by entity.
+        
+        Args:
+            entity_ids: IDs of the entities to analyze
+            metric_name: Name of the metric to analyze
+            entity_type: Type of the entities
+            time_window: Number of days to look back for analysis
+            analysis_types: Batch analyses to run (see TrendAnalyzer.analyze_batch)
+            
+        Returns:
+            Dictionary with the analyzed entity count and one DataFrame per
+            analysis type, keyed by entity ID
+        """
+        if self.db is not None and hasattr(self.db, 'get_metric_series'):
+            # Every entity's series in one range query instead of one query per entity
+            start_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=time_window)
+            series = self.db.get_metric_series(entity_type, [metric_name], start_time=start_date.isoformat(),
+                                               entity_ids=entity_ids)
+            position = {entity_id: index for index, entity_id in enumerate(entity_ids)}
+            data = series[['timestamp', 'value', 'entity_id']].sort_values(
+                'entity_id', key=lambda column: column.map(position), kind='stable')
+        else:
+            frames = []
+            for entity_id in entity_ids:
+                history = self._get_historical_data(entity_id, metric_name, entity_type, time_window)
+                if history:
+                    frames.append(pd.DataFrame(history, columns=['timestamp', 'value']).assign(entity_id=entity_id))
+            data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['timestamp', 'value', 'entity_id'])
+        
+        batch = SeriesBatch.from_frame(data, key_column='entity_id')
+        
+        results = {
+            'entity_type': entity_type,
+            'metric_name': metric_name,
+            'time_window_days': time_window,
+            'entities': len(batch),
+            'data_points': len(batch.values),
+            'timestamp': datetime.now().isoformat()
+        }
+        results.update(self.trend_analyzer.analyze_batch(batch, analysis_types))
+        return results
+    
+    def evaluate_alerts(self, entity_type: str = 'video', channel_ids: List[str] = None,
+                        metrics: List[str] = None, time_window: int = 90) -> pd.DataFrame:
+        """
+        Evaluate every configured threshold of an entity type for many entities at once.
+        
+        The history of all the rule metrics is read in one range query
+        (db.get_metric_series), the growth over every comparison window is
+        computed for all series with calculate_growth_rates_batch, and each
+        warning/critical rule is applied as a vectorized mask.
+        
+        Unlike check_threshold_violations, a rule's comparison_window and
+        direction are read from the rule (a level may override them), and
+        absolute thresholds are compared with the absolute change.
+        'statistical' thresholds are not evaluated, as in check_threshold_violations.
+        
+        Args:
+            entity_type: Type of entity ('channel', 'video', or 'comment')
+            channel_ids: Only the entities of these channels (None for all channels)
+            metrics: Only the rules of these metrics (None for every configured rule)
+            time_window: Number of days of history to read
+            
+        Returns:
+            DataFrame with ALERT_COLUMNS, one row per violated rule level and
+            entity, critical alerts first and then by the size of the change
+        """
+        rules = {
+            metric: config for metric, config in self.alert_config.get_all_thresholds().get(entity_type, {}).items()
+            if not metrics or metric in metrics
+        }
+        if not rules or not self.db or not hasattr(self.db, 'get_metric_series'):
+            debug_log(f"No alert rules or metric history available for {entity_type} alerts")
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        
+        start_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=time_window)
+        series = self.db.get_metric_series(entity_type, list(rules), channel_ids, start_date.isoformat())
+        if series.empty:
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        channels = series.drop_duplicates('entity_id').set_index('entity_id')['channel_id']
+        
+        frames = []
+        for metric, config in rules.items():
+            levels = [level for level in self._alert_levels(config) if level[1] in ('percentage', 'absolute')]
+            if not levels:
+                continue
+            batch = SeriesBatch.from_frame(series[series['metric'] == metric])
+            growth = self.trend_analyzer.calculate_growth_rates_batch(
+                batch, periods=sorted({window for _, _, _, window, _ in levels})
+            )
+            if growth.empty:
+                continue
+            
+            for level, threshold_type, threshold_value, window, direction in levels:
+                rows = growth[growth['period'] == window]
+                actual = rows['percentage' if threshold_type == 'percentage' else 'absolute_change']
+                limit = abs(threshold_value)
+                if direction == 'increase':
+                    violated = actual >= limit
+                elif direction == 'decrease':
+                    violated = actual <= -limit
+                else:
+                    violated = actual.abs() >= limit
+                if not violated.any():
+                    continue
+                
+                hits = rows[violated]
+                frames.append(pd.DataFrame({
+                    'entity_type': entity_type,
+                    'entity_id': hits['key'].to_numpy(),
+                    'channel_id': channels.reindex(hits['key']).to_numpy(),
+                    'metric_name': metric,
+                    'threshold_level': level,
+                    'threshold_type': threshold_type,
+                    'threshold_value': threshold_value,
+                    'current_value': actual[violated].to_numpy(),
+                    'from_value': hits['from_value'].to_numpy(),
+                    'to_value': hits['to_value'].to_numpy(),
+                    'window_days': window,
+                    'actual_days': hits['actual_days'].to_numpy(),
+                    'direction': direction
+                }))
+        
+        if not frames:
+            return pd.DataFrame(columns=ALERT_COLUMNS)
+        alerts = pd.concat(frames, ignore_index=True)
+        alerts['message'] = [
+            self._alert_message(*row) for row in alerts[[
+                'threshold_level', 'threshold_type', 'threshold_value', 'current_value',
+                'metric_name', 'entity_type', 'entity_id', 'window_days'
+            ]].itertuples(index=False)
+        ]
+        alerts = alerts.assign(_critical=alerts['threshold_level'] == 'critical', _size=alerts['current_value'].abs())
+        alerts = alerts.sort_values(['_critical', '_size'], ascending=False, kind='stable')
+        debug_log(f"Evaluated {entity_type} alerts for {len(channels)} entities: {len(alerts)} violations")
+        return alerts[ALERT_COLUMNS].reset_index(drop=True)
+    
     def save_threshold_config(self) -> bool:
         """
         Save threshold configurations to disk.
@@ -319,6 +470,39 @@ class MetricsTrackingService(BaseService):
             logging.error(f"Error retrieving historical data: {str(e)}")
             return []
             
+    @staticmethod
+    def _alert_levels(threshold_config: Dict[str, Any]) -> List[Tuple[str, str, float, int, str]]:
+        """
+        Resolve the warning and critical levels of a threshold rule.
+        
+        Args:
+            threshold_config: Threshold configuration of one metric
+            
+        Returns:
+            List of (level, threshold type, threshold value, comparison window, direction)
+        """
+        levels = []
+        for level in ('warning', 'critical'):
+            level_config = threshold_config.get(level)
+            if not level_config:
+                continue
+            window = level_config.get('comparison_window', threshold_config.get('comparison_window', 7))
+            direction = level_config.get('direction', threshold_config.get('direction', 'both'))
+            levels.append((level, level_config['type'], level_config['value'], window, direction))
+        return levels
+    
+    @staticmethod
+    def _alert_message(level, threshold_type, threshold_value, actual_value,
+                       metric_name, entity_type, entity_id, window) -> str:
+        """Format the message of a batch-evaluated alert like _check_single_threshold does."""
+        unit = '%' if threshold_type == 'percentage' else ''
+        if actual_value > 0:
+            change_description = f"increased by {actual_value:.2f}{unit}"
+        else:
+            change_description = f"decreased by {abs(actual_value):.2f}{unit}"
+        return (f"[{level.upper()}] {metric_name} for {entity_type} {entity_id} has {change_description} "
+                f"in the last {window} days, exceeding the {level} threshold of {threshold_value}{unit}")
+    
     def _check_single_threshold(self, level, threshold_type, threshold_value,
                                actual_value, direction, metric_name, entity_id, 
                                entity_type, window) -> Dict[str, Any]:
@@ -2,10 +2,119 @@
 Trend analysis module for YTDataHub metrics tracking.
 """
 import logging
-from typing import Dict, Any, List, Union, Optional, Tuple
+from typing import Dict, Any, List, Union, Optional, Tuple, Hashable, Mapping
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+NANOSECONDS_PER_DAY = 24 * 3600 * 10**9
+
+
+class SeriesBatch:
+    """
+    Many time series packed into ragged arrays.
+    
+    Series ``i`` occupies ``values[offsets[i]:offsets[i + 1]]`` (and the same
+    slice of ``timestamps``), sorted by timestamp. Sorting and timestamp
+    conversion happen once here, so the batch methods of TrendAnalyzer can
+    work on all series with a handful of vectorized operations.
+    """
+    
+    __slots__ = ('keys', 'timestamps', 'values', 'offsets')
+    
+    def __init__(self, keys: List[Hashable], timestamps: np.ndarray, values: np.ndarray, offsets: np.ndarray):
+        """
+        Initialize from already packed arrays.
+        
+        Args:
+            keys: One key per series (e.g. entity IDs)
+            timestamps: int64 nanoseconds since the epoch (UTC), sorted within each series
+            values: float64 values aligned with timestamps
+            offsets: int64 array of len(keys) + 1 series boundaries
+        """
+        self.keys = list(keys)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, key_column: str = 'entity_id',
+                   timestamp_column: str = 'timestamp', value_column: str = 'value') -> 'SeriesBatch':
+        """
+        Pack a long-format DataFrame with one row per observation.
+        
+        Args:
+            data: DataFrame with key, timestamp and value columns
+            key_column: Column identifying the series
+            timestamp_column: Column with observation times
+            value_column: Column with observed values
+            
+        Returns:
+            SeriesBatch with one series per distinct key, in order of first appearance;
+            observations without a finite value or a timestamp are left out
+        """
+        if data.empty:
+            return cls([], np.empty(0, np.int64), np.empty(0), np.zeros(1, np.int64))
+        
+        codes, keys = pd.factorize(data[key_column], sort=False)
+        timestamps = pd.to_datetime(data[timestamp_column], utc=True).dt.tz_localize(None)
+        values = pd.to_numeric(data[value_column], errors='coerce').to_numpy(dtype=np.float64)
+        
+        # A NaN would spread through the packed sums into every later series
+        valid = np.isfinite(values) & timestamps.notna().to_numpy()
+        codes = codes[valid]
+        timestamps = timestamps.to_numpy(dtype='datetime64[ns]').view(np.int64)[valid]
+        values = values[valid]
+        
+        order = np.lexsort((timestamps, codes))
+        counts = np.bincount(codes, minlength=len(keys))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        return cls(list(keys), timestamps[order], values[order], offsets)
+    
+    @classmethod
+    def from_series(cls, series: Mapping[Hashable, pd.DataFrame]) -> 'SeriesBatch':
+        """
+        Pack a mapping of per-series DataFrames with 'timestamp' and 'value' columns.
+        
+        Args:
+            series: Mapping from series key to its DataFrame
+            
+        Returns:
+            SeriesBatch with the series in mapping order
+        """
+        frames = [frame[['timestamp', 'value']].assign(series_key=key) for key, frame in series.items() if len(frame)]
+        if not frames:
+            return cls(list(series), np.empty(0, np.int64), np.empty(0), np.zeros(len(series) + 1, np.int64))
+        batch = cls.from_frame(pd.concat(frames, ignore_index=True), key_column='series_key')
+        
+        # Keep empty series so keys line up with the input mapping
+        if len(batch.keys) != len(series):
+            counts = dict(zip(batch.keys, np.diff(batch.offsets)))
+            lengths = [counts.get(key, 0) for key in series]
+            batch.keys = list(series)
+            batch.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of observations in each series."""
+        return np.diff(self.offsets)
+    
+    @property
+    def series_ids(self) -> np.ndarray:
+        """Series index of every observation."""
+        return np.repeat(np.arange(len(self.keys)), self.lengths)
+    
+    @property
+    def days(self) -> np.ndarray:
+        """Days since each series' first observation, for every observation."""
+        lengths = self.lengths
+        first = self.timestamps[np.minimum(self.offsets[:-1], max(len(self.timestamps) - 1, 0))] if len(self.timestamps) else np.empty(0, np.int64)
+        return (self.timestamps - np.repeat(first, lengths)) / NANOSECONDS_PER_DAY
+
 class TrendAnalyzer:
     """
     Provides trend analysis functionality for time-series metrics data.
@@ -365,9 +474,7 @@ class TrendAnalyzer:
                     return result
                     
                 # First, check if we have regular time intervals
-                timestamps = data_indexed.index
-                intervals = [(timestamps[i+1] - timestamps[i]).total_seconds() / 3600 
-                            for i in range(len(timestamps)-1)]
+                intervals = np.diff(data_indexed.index.asi8) / 3.6e12  # nanoseconds to hours
                 
                 # If intervals are not relatively consistent, we can't do seasonal decomposition
                 if max(intervals) / min(intervals) > 2:  # More than 2x variation in intervals
@@ -557,3 +664,262 @@ class TrendAnalyzer:
             logging.error(f"Error detecting anomalies: {str(e)}")
             
         return result
+    
+    def calculate_linear_trends(self, batch: SeriesBatch) -> pd.DataFrame:
+        """
+        Calculate the linear trend of every series in a batch.
+        
+        Least-squares sums are accumulated per series with np.bincount, so
+        all fits take a fixed number of array passes. Significance uses the
+        same R-squared bands as calculate_linear_trend without statsmodels.
+        
+        Args:
+            batch: Packed series
+            
+        Returns:
+            DataFrame indexed by series key with slope (units per day),
+            intercept, r_squared, direction, significance and data_points
+        """
+        n_series = len(batch)
+        ids = batch.series_ids
+        x = batch.days
+        y = batch.values
+        n = batch.lengths.astype(np.float64)
+        
+        sum_x = np.bincount(ids, x, n_series)
+        sum_y = np.bincount(ids, y, n_series)
+        sum_xx = np.bincount(ids, x * x, n_series)
+        sum_xy = np.bincount(ids, x * y, n_series)
+        sum_yy = np.bincount(ids, y * y, n_series)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var_x = n * sum_xx - sum_x ** 2
+            var_y = n * sum_yy - sum_y ** 2
+            cov_xy = n * sum_xy - sum_x * sum_y
+            slope = np.where(var_x > 0, cov_xy / var_x, 0.0)
+            intercept = np.where(n > 0, (sum_y - slope * sum_x) / n, 0.0)
+            r_squared = np.where((var_x > 0) & (var_y > 0), cov_xy ** 2 / (var_x * var_y), 0.0)
+            mean = np.where(n > 0, sum_y / n, 0.0)
+        
+        # Need at least 3 data points for meaningful trend
+        enough = n >= 3
+        slope = np.where(enough, slope, 0.0)
+        intercept = np.where(enough, intercept, 0.0)
+        r_squared = np.where(enough, r_squared, 0.0)
+        
+        direction = np.where(
+            np.abs(slope) < 0.001 * mean, 'stable',
+            np.where(slope > 0, 'increasing', 'decreasing')
+        )
+        direction = np.where(enough & np.isfinite(slope), direction, 'stable')
+        significance = np.select(
+            [r_squared > 0.7, r_squared > 0.5, r_squared > 0.3],
+            ['high', 'medium', 'low'],
+            default='none'
+        )
+        
+        return pd.DataFrame({
+            'slope': slope,
+            'intercept': intercept,
+            'r_squared': r_squared,
+            'direction': direction,
+            'significance': significance,
+            'data_points': batch.lengths
+        }, index=pd.Index(batch.keys, name='key'))
+    
+    def rolling_means(self, batch: SeriesBatch, window: int) -> np.ndarray:
+        """
+        Calculate a trailing moving average over every observation of a batch.
+        
+        Matches ``rolling(window, min_periods=1).mean()`` applied to each
+        series separately, using one cumulative sum over the packed values.
+        
+        Args:
+            batch: Packed series
+            window: Window size in observations
+            
+        Returns:
+            Array aligned with batch.values
+        """
+        if not len(batch.values):
+            return np.empty(0)
+        positions = np.arange(len(batch.values))
+        starts = np.repeat(batch.offsets[:-1], batch.lengths)
+        window_starts = np.maximum(starts, positions - window + 1)
+        cumulative = np.concatenate(([0.0], np.cumsum(batch.values)))
+        return (cumulative[positions + 1] - cumulative[window_starts]) / (positions + 1 - window_starts)
+    
+    def calculate_moving_averages_batch(self, batch: SeriesBatch,
+                                        window_sizes: Dict[str, int] = None) -> pd.DataFrame:
+        """
+        Calculate the latest moving averages of every series in a batch.
+        
+        Args:
+            batch: Packed series
+            window_sizes: Dictionary of window sizes and labels
+            
+        Returns:
+            DataFrame indexed by series key with one column per label; NaN
+            where a series is shorter than the window
+        """
+        if window_sizes is None:
+            window_sizes = self.default_window_sizes
+        
+        lengths = batch.lengths
+        last = np.maximum(batch.offsets[1:] - 1, 0)
+        result = pd.DataFrame(index=pd.Index(batch.keys, name='key'))
+        for label, window in window_sizes.items():
+            latest = self.rolling_means(batch, window)[last] if len(batch.values) else np.full(len(batch), np.nan)
+            result[label] = np.where(lengths >= max(window, 2), latest, np.nan)
+        return result
+    
+    def calculate_growth_rates_batch(self, batch: SeriesBatch, periods: List[int] = None) -> pd.DataFrame:
+        """
+        Calculate growth rates of every series in a batch.
+        
+        For each period the reference point is the last observation at least
+        ``period`` days before the series' latest one, found for all series
+        with a single searchsorted over the packed timestamps.
+        
+        Args:
+            batch: Packed series
+            periods: List of periods in days to calculate growth rates for
+            
+        Returns:
+            Long DataFrame with one row per (key, period) that has a reference
+            point: from/to values and dates, absolute and percentage change,
+            daily change, actual_days and direction
+        """
+        if periods is None:
+            periods = self.default_growth_periods
+        
+        columns = ['key', 'period', 'from_value', 'to_value', 'from_date', 'to_date',
+                   'absolute_change', 'percentage', 'daily_change', 'actual_days', 'direction']
+        lengths = batch.lengths
+        valid = lengths >= 2
+        if not valid.any():
+            return pd.DataFrame(columns=columns)
+        
+        # Offsetting each series by a span larger than any series makes the packed
+        # timestamps globally sorted, so one searchsorted serves every series
+        days = batch.days
+        span = np.ceil(days.max()) + max(periods) + 1
+        composite = batch.series_ids * span + days
+        
+        series = np.flatnonzero(valid)
+        last = batch.offsets[series + 1] - 1
+        current_value = batch.values[last]
+        current_days = days[last]
+        
+        frames = []
+        for period in periods:
+            targets = series * span + current_days - period
+            reference = np.searchsorted(composite, targets, side='right') - 1
+            has_reference = reference >= batch.offsets[series]
+            if not has_reference.any():
+                continue
+            rows = series[has_reference]
+            ref = reference[has_reference]
+            cur = last[has_reference]
+            from_value = batch.values[ref]
+            to_value = current_value[has_reference]
+            absolute = to_value - from_value
+            actual_days = (batch.timestamps[cur] - batch.timestamps[ref]) / NANOSECONDS_PER_DAY
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                percentage = np.where(
+                    from_value != 0, absolute / from_value * 100,
+                    np.where(absolute > 0, np.inf, 0.0)
+                )
+                daily = np.where(actual_days > 0, absolute / actual_days, 0.0)
+            
+            frames.append(pd.DataFrame({
+                'key': [batch.keys[i] for i in rows],
+                'period': period,
+                'from_value': from_value,
+                'to_value': to_value,
+                'from_date': pd.to_datetime(batch.timestamps[ref]),
+                'to_date': pd.to_datetime(batch.timestamps[cur]),
+                'absolute_change': absolute,
+                'percentage': percentage,
+                'daily_change': daily,
+                'actual_days': actual_days,
+                'direction': np.where(
+                    np.abs(percentage) < 0.1, 'stable',
+                    np.where(percentage > 0, 'increasing', 'decreasing')
+                )
+            }))
+        
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
+    
+    def detect_anomalies_batch(self, batch: SeriesBatch, threshold: float = 3.0,
+                               window_size: int = 7) -> pd.DataFrame:
+        """
+        Detect Z-score anomalies in every series of a batch.
+        
+        Rolling statistics come from one grouped pandas rolling window over
+        the packed values. Unlike detect_anomalies, the threshold is applied
+        as given for every series length.
+        
+        Args:
+            batch: Packed series
+            threshold: Z-score threshold for anomaly detection
+            window_size: Window size for rolling statistics
+            
+        Returns:
+            Long DataFrame with one row per anomaly: key, timestamp, value,
+            expected_value, deviation, z_score, direction and severity
+        """
+        columns = ['key', 'timestamp', 'value', 'expected_value', 'deviation',
+                   'z_score', 'direction', 'severity']
+        if not len(batch.values):
+            return pd.DataFrame(columns=columns)
+        
+        ids = batch.series_ids
+        rolling = pd.Series(batch.values).groupby(ids).rolling(window=window_size)
+        rolling_mean = rolling.mean().to_numpy()
+        rolling_std = rolling.std().to_numpy()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = np.nan_to_num((batch.values - rolling_mean) / rolling_std)
+        
+        # Series too short for the window have no anomalies
+        min_points = min(5, 2 * window_size)
+        eligible = np.repeat(batch.lengths >= min_points, batch.lengths)
+        hits = np.flatnonzero(eligible & (np.abs(z_scores) > threshold))
+        
+        return pd.DataFrame({
+            'key': [batch.keys[i] for i in ids[hits]],
+            'timestamp': pd.to_datetime(batch.timestamps[hits]),
+            'value': batch.values[hits],
+            'expected_value': rolling_mean[hits],
+            'deviation': batch.values[hits] - rolling_mean[hits],
+            'z_score': z_scores[hits],
+            'direction': np.where(z_scores[hits] > 0, 'above', 'below'),
+            'severity': np.where(np.abs(z_scores[hits]) > 2 * threshold, 'extreme', 'moderate')
+        }, columns=columns)
+    
+    def analyze_batch(self, batch: SeriesBatch, analysis_types: List[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Run several batch analyses over the same packed series.
+        
+        Args:
+            batch: Packed series
+            analysis_types: Subset of 'linear_trend', 'moving_average',
+                'growth_rate' and 'anomaly_detection' (default: the first three)
+                
+        Returns:
+            Dictionary mapping each analysis type to its result DataFrame
+        """
+        if not analysis_types:
+            analysis_types = ['linear_trend', 'moving_average', 'growth_rate']
+        
+        analyses = {
+            'linear_trend': self.calculate_linear_trends,
+            'moving_average': self.calculate_moving_averages_batch,
+            'growth_rate': self.calculate_growth_rates_batch,
+            'anomaly_detection': self.detect_anomalies_batch
+        }
+        return {name: analyses[name](batch) for name in analysis_types if name in analyses}
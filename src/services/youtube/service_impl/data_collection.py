@@ -11,7 +11,7 @@ import sys
 from src.api.errors import YouTubeAPIError
 from googleapiclient.errors import HttpError
 
-from src.utils.video_formatter import fix_missing_views
+from src.utils.video_standardizer import COLLECTION_VIDEO_FIELDS, normalize_videos
 
 class DataCollectionMixin:
     """
@@ -110,27 +110,23 @@ class DataCollectionMixin:
                                 full_videos.append(video)
                                 log(f"[DB PATCH] Video missing full API response, using processed dict for video_id={video.get('video_id')}")
                         
-                        # Fix missing views safely with proper error handling
-                        try:
-                            channel_data['video_id'] = fix_missing_views(full_videos)
-                            log(f"[PATCH] Fixed missing views for videos. Count: {len(channel_data['video_id'])}")
-                            if channel_data['video_id']:
-                                log(f"[PATCH] Sample video keys: {list(channel_data['video_id'][0].keys())}")
-                        except Exception as e:
-                            log(f"[PATCH] Error in fix_missing_views: {str(e)}")
-                            # Fall back to using full_videos directly if fix_missing_views fails
-                            channel_data['video_id'] = full_videos
-                            log(f"[PATCH] Using full_videos directly due to error. Count: {len(channel_data['video_id'])}")
+                        # Flatten the counts and snippet fields in one pass over the batch
+                        channel_data['video_id'] = normalize_videos(full_videos, COLLECTION_VIDEO_FIELDS)
+                        log(f"[PATCH] Normalized videos. Count: {len(channel_data['video_id'])}")
+                        if channel_data['video_id']:
+                            log(f"[PATCH] Sample video keys: {list(channel_data['video_id'][0].keys())}")
                             
                         if existing_data and 'video_id' in existing_data:
-                            existing_videos_copy = copy.deepcopy(existing_data['video_id'])
-                            for v in existing_videos_copy:
-                                if 'statistics' in v:
-                                    del v['statistics']
-                            existing_videos_fixed = fix_missing_views(existing_videos_copy)
+                            # Compare against the stored flattened counts, not the stored statistics
+                            existing_videos_fixed = normalize_videos(
+                                [{key: value for key, value in v.items() if key != 'statistics'}
+                                 for v in existing_data['video_id'] if isinstance(v, dict)],
+                                COLLECTION_VIDEO_FIELDS
+                            )
+                            existing_by_id = {v.get('video_id'): v for v in existing_videos_fixed}
                             video_deltas = []
                             for video in channel_data['video_id']:
-                                existing_video = next((v for v in existing_videos_fixed if v['video_id'] == video['video_id']), None)
+                                existing_video = existing_by_id.get(video.get('video_id'))
                                 if existing_video:
                                     video['view_delta'] = int(video['views']) - int(existing_video.get('views', '0'))
                                     video['like_delta'] = int(video['likes']) - int(existing_video.get('likes', '0'))
@@ -270,7 +266,7 @@ class DataCollectionMixin:
             
             # Attach debug logs and full response for frontend
             try:
-                import streamlit as st
+                from src.utils.headless import st
                 if hasattr(st, 'session_state') and 'ui_debug_logs' in st.session_state:
                     debug_logs = list({*debug_logs, *st.session_state['ui_debug_logs']})
             except Exception:
@@ -284,7 +280,8 @@ class DataCollectionMixin:
                 channel_data['video_id'] = []
             # DB fetch
             log(f"[WORKFLOW] Saving channel data to DB for channel_id={channel_id}")
-            db_data = self.storage_service.get_channel_data(channel_id, "sqlite")
+            # The caller's snapshot is what the deltas were computed against
+            db_data = existing_data if existing_data is not None else self.storage_service.get_channel_data(channel_id, "sqlite")
             log(f"[WORKFLOW] DB fetch complete for channel_id={channel_id}, found {len(db_data.get('video_id', [])) if db_data and 'video_id' in db_data else 0} videos")
             
             # Create a properly structured response for API compatibility
@@ -31,9 +31,9 @@ class DataRefreshMixin:
         # Process videos in batches of 50 (YouTube API limit)
         self._refresh_video_details(channel_data)
         
-        # Apply video formatter for consistent data structure
-        from src.utils.video_formatter import fix_missing_views
-        channel_data['video_id'] = fix_missing_views(channel_data['video_id'])
+        # Normalize the refreshed videos for a consistent data structure
+        from src.utils.video_standardizer import COLLECTION_VIDEO_FIELDS, normalize_videos
+        channel_data['video_id'] = normalize_videos(channel_data['video_id'], COLLECTION_VIDEO_FIELDS)
         
         return channel_data
     
@@ -79,20 +79,20 @@ class VideoService(BaseService):
                 stats = None
                 if isinstance(video.get('statistics'), dict):
                     stats = video['statistics']
-                    debug_log(f"Found statistics dict for video {video.get('video_id')}: {stats}")
+                    debug_log(lambda: f"Found statistics dict for video {video.get('video_id')}: {stats}")
                 elif isinstance(video.get('statistics'), str):
                     try:
                         stats = json.loads(video['statistics'])
-                        debug_log(f"Parsed statistics string for video {video.get('video_id')}")
+                        debug_log(lambda: f"Parsed statistics string for video {video.get('video_id')}")
                     except Exception as e:
-                        debug_log(f"Failed to parse statistics string: {str(e)}")
+                        debug_log(lambda: f"Failed to parse statistics string: {str(e)}")
                         pass
                 elif isinstance(video.get('contentDetails', {}).get('statistics'), dict):
                     stats = video['contentDetails']['statistics']
-                    debug_log(f"Found contentDetails.statistics for video {video.get('video_id')}")
+                    debug_log(lambda: f"Found contentDetails.statistics for video {video.get('video_id')}")
                 elif isinstance(video.get('snippet', {}).get('statistics'), dict):
                     stats = video['snippet']['statistics']
-                    debug_log(f"Found snippet.statistics for video {video.get('video_id')}")
+                    debug_log(lambda: f"Found snippet.statistics for video {video.get('video_id')}")
                 if stats:
                     # Set metrics from statistics if available, else fallback to 0
                     def safe_int(val):
@@ -104,7 +104,7 @@ class VideoService(BaseService):
                     video['views'] = safe_int(stats.get('viewCount', video.get('views', 0)))
                     video['likes'] = safe_int(stats.get('likeCount', video.get('likes', 0)))
                     video['comment_count'] = safe_int(stats.get('commentCount', video.get('comment_count', 0)))
-                    debug_log(f"Set metrics from statistics for video {video.get('video_id')}: views={video['views']}, likes={video['likes']}, comments={video['comment_count']}")
+                    debug_log(lambda: f"Set metrics from statistics for video {video.get('video_id')}: views={video['views']}, likes={video['likes']}, comments={video['comment_count']}")
                 # Coerce metrics to int if they are digit strings
                 for metric in ['views', 'likes', 'comment_count']:
                     if metric in video and isinstance(video[metric], str) and video[metric].isdigit():
@@ -193,7 +193,7 @@ class VideoService(BaseService):
             }
             # Merge all unique logs from debug_logs and ui_debug_logs
             try:
-                import streamlit as st
+                from src.utils.headless import st
                 if hasattr(st, 'session_state') and 'ui_debug_logs' in st.session_state:
                     debug_logs = list({*debug_logs, *st.session_state['ui_debug_logs']})
                     result['debug_logs'] = debug_logs
@@ -239,7 +239,7 @@ class VideoService(BaseService):
                     # If the video is unavailable, mark it with error info
                     if e.status_code == 404 or e.error_type == "videoNotFound":
                         video['error'] = f"Video unavailable: {str(e)}"
-                        debug_log(f"Marked video {video_id} as unavailable")
+                        debug_log(lambda: f"Marked video {video_id} as unavailable")
                     else:
                         # For other errors, also record them
                         video['error'] = f"Error fetching video: {str(e)}"
@@ -297,7 +297,7 @@ class VideoService(BaseService):
             
             for i in range(0, len(all_video_ids), batch_size):
                 batch = all_video_ids[i:i + batch_size]
-                debug_log(f"Processing batch {i//batch_size + 1} with {len(batch)} videos")
+                debug_log(lambda: f"Processing batch {i//batch_size + 1} with {len(batch)} videos")
                 
                 # Get details for this batch of videos
                 details_response = self.get_video_details_batch(batch)
@@ -308,7 +308,7 @@ class VideoService(BaseService):
                     for item in details_response['items']:
                         details_map[item['id']] = item
                     
-                    debug_log(f"Received details for {len(details_map)} videos")
+                    debug_log(lambda: f"Received details for {len(details_map)} videos")
                     
                     # Update videos with details
                     for video in channel_data['video_id']:
@@ -350,19 +350,13 @@ class VideoService(BaseService):
                                 video['statistics'] = item['statistics']
                                 
                                 # Log for debugging
-                                debug_log(f"Updated video {video['video_id']} with stats: views={video['views']}, likes={video['likes']}, comments={video['comment_count']}")
+                                debug_log(lambda: f"Updated video {video['video_id']} with stats: views={video['views']}, likes={video['likes']}, comments={video['comment_count']}")
             
             debug_log(f"Successfully updated details for {videos_updated}/{len(all_video_ids)} videos")
             
-            # Apply video processor to ensure consistent data structure
-            from src.utils.video_formatter import fix_missing_views
-            from src.utils.video_processor import process_video_data
-            
-            # First ensure views data is properly set
-            channel_data['video_id'] = fix_missing_views(channel_data['video_id'])
-            
-            # Then process all video data consistently
-            channel_data['video_id'] = process_video_data(channel_data['video_id'])
+            # Normalize the refreshed videos in one pass over the batch
+            from src.utils.video_standardizer import standardize_video_data
+            channel_data['video_id'] = standardize_video_data(channel_data['video_id'])
             
             return channel_data
             
@@ -1032,7 +1032,7 @@ class YouTubeService(YouTubeServiceImpl):
                 error_msg = f"Invalid channel input: {channel_input}"
                 debug_log(f"[WORKFLOW][ERROR] {error_msg}")
                 try:
-                    import streamlit as st
+                    from src.utils.headless import st
                     st.error(error_msg)
                 except Exception:
                     pass
@@ -1045,7 +1045,7 @@ class YouTubeService(YouTubeServiceImpl):
                     error_msg = f"Could not resolve channel handle: {channel_input}"
                     debug_log(f"[WORKFLOW][ERROR] {error_msg}")
                     try:
-                        import streamlit as st
+                        from src.utils.headless import st
                         st.error(error_msg)
                     except Exception:
                         pass
@@ -1058,7 +1058,7 @@ class YouTubeService(YouTubeServiceImpl):
                 error_msg = f"No channel info found for: {channel_id}"
                 debug_log(f"[WORKFLOW][ERROR] {error_msg}")
                 try:
-                    import streamlit as st
+                    from src.utils.headless import st
                     st.error(error_msg)
                 except Exception:
                     pass
@@ -1078,7 +1078,7 @@ class YouTubeService(YouTubeServiceImpl):
                     error_msg = f"Could not determine uploads playlist for channel: {channel_id}"
                     debug_log(f"[WORKFLOW][ERROR] {error_msg}")
                     try:
-                        import streamlit as st
+                        from src.utils.headless import st
                         st.error(error_msg)
                     except Exception:
                         pass
@@ -1090,7 +1090,7 @@ class YouTubeService(YouTubeServiceImpl):
             error_msg = f"Exception in get_basic_channel_info: {str(e)}"
             debug_log(f"[WORKFLOW][ERROR] {error_msg}")
             try:
-                import streamlit as st
+                from src.utils.headless import st
                 st.error(error_msg)
             except Exception:
                 pass
@@ -1232,4 +1232,33 @@ class YouTubeService(YouTubeServiceImpl):
             return playlists
         except Exception as e:
             debug_log(f"[WORKFLOW][ERROR] Exception in get_channel_playlists: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    def expand_playlists(self, playlist_ids, channel_id=None, max_workers=8):
+        """
+        Collect the videos of several playlists in one pass and store their membership.
+        Playlists are walked concurrently, videos already in the database or in an
+        earlier playlist are skipped and the rest are fetched with one videos.list per 50 IDs.
+        Args:
+            playlist_ids (list): YouTube playlist IDs
+            channel_id (str, optional): YouTube channel ID of the playlists, for videos lacking one
+            max_workers (int): Maximum number of concurrent requests
+        Returns:
+            Dict: playlist_items, videos (newly stored) and failed_playlists
+        """
+        debug_log(f"[WORKFLOW] expand_playlists called with {len(playlist_ids)} playlists")
+        try:
+            from src.config import SQLITE_DB_PATH
+            from src.database.sqlite import SQLiteDatabase
+            db = SQLiteDatabase(SQLITE_DB_PATH)
+            api = self.api if hasattr(self, 'api') else self
+            # Only the walked video IDs are looked up, not every stored video
+            result = api.video_client.expand_playlists(playlist_ids, db.get_stored_video_ids, max_workers)
+            db.store_playlist_items(result['playlist_items'])
+            for video in result['videos']:
+                db.video_repository.store_video_data(video, channel_id=channel_id)
+            debug_log(f"[WORKFLOW] Expanded {len(result['playlist_items'])} playlists, stored {len(result['videos'])} new videos")
+            return result
+        except Exception as e:
+            debug_log(f"[WORKFLOW][ERROR] Exception in expand_playlists: {str(e)}")
+            return {'playlist_items': {}, 'videos': [], 'failed_playlists': list(playlist_ids)}
@@ -1,92 +1,371 @@
 """
 Local storage functions for the YouTube scraper application.
 """
+import gzip
 import json
 import streamlit as st
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
+import threading
+import time
+import zlib
 from pathlib import Path
 
-from src.config import CHANNELS_FILE
-from src.utils.debug_utils import debug_log, parse_duration_with_regex
+from src.config import DATA_DIR
+from src.utils.debug_utils import debug_log
+from src.utils.duration_utils import parse_duration_with_regex
+
+# Layout version written to the manifest
+STORAGE_FORMAT_VERSION = 2
+# Channel segments are spread over this many directories
+SHARD_COUNT = 64
+# Compact once the index holds this many superseded lines
+COMPACTION_THRESHOLD = 256
+
+# One background worker compacts every data directory
+_compaction_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='local-storage-compaction')
+_states = {}
+_states_lock = threading.Lock()
+
+
+class _DirectoryState:
+    """Index and lock shared by every LocalStorage instance on one data directory."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index = None
+        self.index_lines = 0
+        self.index_torn = False
+        self.compaction_pending = False
+
+
+def _directory_state(data_dir):
+    key = str(Path(data_dir).resolve())
+    with _states_lock:
+        return _states.setdefault(key, _DirectoryState())
+
+
+def _atomic_write(path, write):
+    """Write a file through a temporary file in the same directory and rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _channel_summary(channel_data, videos):
+    """Summary fields kept in the index so listing never opens a segment."""
+    total_fetched_views = 0
+    for video in videos:
+        try:
+            total_fetched_views += int(video.get('views', 0) or 0)
+        except (TypeError, ValueError):
+            pass
+    return {
+        'channel_name': channel_data.get('channel_name'),
+        'subscribers': channel_data.get('subscribers', 0),
+        'views': channel_data.get('views', 0),
+        'total_videos': channel_data.get('total_videos', 0),
+        'fetched_videos': len(videos),
+        'fetched_video_views': total_fetched_views,
+        'fetched_at': channel_data.get('fetched_at')
+    }
+
 
 class LocalStorage:
+    """
+    JSON storage of channel data in a data directory.
+
+    Every save writes a new gzip-compressed JSON-lines segment for the channel
+    (the channel record on the first line, one video per following line) and
+    renames it into place, so a crash never leaves a half-written channel.
+    Segments live under shards/<nn>/ to keep directories small at thousands of
+    channels. index.jsonl is append-only: each save adds one line with the
+    channel's current segment and summary fields, and listing channels reads
+    only the index. manifest.json records the layout. Superseded segments and
+    index lines are removed by compaction on a background thread.
+
+    Writers in one process are serialized per data directory; the layout does
+    not coordinate separate processes writing the same directory.
+    """
+
     def __init__(self, data_dir):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        # channels.json and <channel_id>.json are the legacy layout, imported once
         self.channels_file = self.data_dir / "channels.json"
+        self.manifest_file = self.data_dir / "manifest.json"
+        self.index_file = self.data_dir / "index.jsonl"
+        self.shards_dir = self.data_dir / "shards"
+        self._state = _directory_state(self.data_dir)
         
+        with self._state.lock:
+            if not self.manifest_file.exists():
+                self._create_layout()
+            if self._state.index is None:
+                self._load_index()
+    
+    def _create_layout(self):
+        """Write the manifest and import channels saved in the legacy layout."""
+        self.shards_dir.mkdir(exist_ok=True)
+        self._state.index = {}
+        self._state.index_lines = 0
+        migrated = 0
+        for channel_data in self._legacy_channels():
+            if self._write_channel(channel_data):
+                migrated += 1
+        manifest = {
+            'format_version': STORAGE_FORMAT_VERSION,
+            'shard_count': SHARD_COUNT,
+            'created_at': datetime.now().isoformat(),
+            'migrated_channels': migrated
+        }
+        _atomic_write(self.manifest_file, lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8')))
+        if migrated:
+            debug_log(f"Imported {migrated} channels from the legacy local storage layout")
+    
+    def _legacy_channels(self):
+        """Yield channel records saved as channels.json plus one <channel_id>.json per channel."""
+        channel_ids = []
+        try:
+            if self.channels_file.exists():
+                with open(self.channels_file, 'r') as f:
+                    listed = json.load(f)
+                if isinstance(listed, dict):
+                    channel_ids = list(listed)
+                else:
+                    # Older exports kept whole channel records in channels.json
+                    for channel_data in listed:
+                        if isinstance(channel_data, dict) and channel_data.get('channel_id'):
+                            yield channel_data
+        except Exception as e:
+            debug_log(f"Error reading legacy channels list: {str(e)}")
+        for channel_id in channel_ids:
+            filename = self.data_dir / f"{channel_id}.json"
+            try:
+                if filename.exists():
+                    with open(filename, 'r') as f:
+                        yield json.load(f)
+            except Exception as e:
+                debug_log(f"Error reading legacy channel file {filename}: {str(e)}")
+    
+    def _load_index(self):
+        """Read index.jsonl; the last line of each channel wins."""
+        index = {}
+        lines = 0
+        line = '\n'
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash is skipped
+                        continue
+                    lines += 1
+                    if entry.get('deleted'):
+                        index.pop(entry['channel_id'], None)
+                    else:
+                        index[entry['channel_id']] = entry
+        self._state.index = index
+        self._state.index_lines = lines
+        self._state.index_torn = not line.endswith('\n')
+    
+    def _append_index(self, entry):
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            # Start on a fresh line after a line cut short by a crash
+            f.write(('\n' if self._state.index_torn else '') + json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._state.index_torn = False
+        self._state.index_lines += 1
+    
+    def _segment_path(self, channel_id):
+        shard = zlib.crc32(channel_id.encode('utf-8')) % SHARD_COUNT
+        return self.shards_dir / f"{shard:02d}" / f"{channel_id}.{time.time_ns():x}.jsonl.gz"
+    
+    def _write_channel(self, channel_data):
+        """Write a channel segment and point the index at it. Caller holds the lock."""
+        channel_id = channel_data.get('channel_id')
+        if not channel_id:
+            return False
+        videos = channel_data.get('video_id')
+        videos = videos if isinstance(videos, list) else []
+        record = {key: value for key, value in channel_data.items() if not (key == 'video_id' and videos)}
+        
+        def write(f):
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6) as gz:
+                gz.write((json.dumps({'channel': record}) + '\n').encode('utf-8'))
+                for video in videos:
+                    gz.write((json.dumps({'video': video}) + '\n').encode('utf-8'))
+        
+        segment = self._segment_path(channel_id)
+        segment.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(segment, write)
+        entry = {
+            'channel_id': channel_id,
+            'segment': segment.relative_to(self.data_dir).as_posix(),
+            'saved_at': time.time(),
+            'summary': _channel_summary(channel_data, videos)
+        }
+        self._append_index(entry)
+        self._state.index[channel_id] = entry
+        return True
+    
     def store_channel_data(self, channel_data):
         """
-        Store channel data to local JSON file
+        Store channel data as a new segment and record it in the index
         """
         try:
-            # Create a filename based on channel ID
-            channel_id = channel_data.get('channel_id')
-            filename = self.data_dir / f"{channel_id}.json"
-            
-            # Write the data to file
-            with open(filename, 'w') as f:
-                json.dump(channel_data, f, indent=2)
-            
-            # Update the channels.json file with the list of channels
-            channels = self.get_channels_list()
-            channel_name = channel_data.get('channel_name')
-            
-            if channel_id not in channels:
-                self._update_channels_list(channel_id, channel_name)
-            
+            with self._state.lock:
+                if not self._write_channel(channel_data):
+                    debug_log("Cannot store channel data locally: missing channel_id")
+                    return False
+            self._schedule_compaction()
             return True
         except Exception as e:
             debug_log(f"Error storing channel data locally: {str(e)}")
             return False
     
-    def _update_channels_list(self, channel_id, channel_name):
-        """Update the channels list file with a new channel"""
+    def delete_channel_data(self, channel_id):
+        """Remove a channel; its segments are deleted by the next compaction"""
         try:
-            channels = {}
-            
-            # Read existing channels if file exists
-            if self.channels_file.exists():
-                with open(self.channels_file, 'r') as f:
-                    channels = json.load(f)
-            
-            # Add or update channel
-            channels[channel_id] = channel_name
-            
-            # Write back to file
-            with open(self.channels_file, 'w') as f:
-                json.dump(channels, f, indent=2)
-                
+            with self._state.lock:
+                if channel_id not in self._state.index:
+                    return False
+                self._append_index({'channel_id': channel_id, 'deleted': True, 'saved_at': time.time()})
+                del self._state.index[channel_id]
+            self._schedule_compaction()
             return True
         except Exception as e:
-            debug_log(f"Error updating channels list: {str(e)}")
+            debug_log(f"Error deleting local channel data: {str(e)}")
             return False
     
     def get_channels_list(self):
         """Get list of stored channels"""
-        try:
-            if self.channels_file.exists():
-                with open(self.channels_file, 'r') as f:
-                    channels = json.load(f)
-                return channels
-            return {}
-        except Exception as e:
-            debug_log(f"Error reading channels list: {str(e)}")
-            return {}
+        with self._state.lock:
+            return {channel_id: entry['summary'].get('channel_name')
+                    for channel_id, entry in self._state.index.items()}
+    
+    def list_channels(self, limit=None, offset=None):
+        """
+        List channel summaries from the index without reading any segment
+        
+        Args:
+            limit: Maximum number of channels to return
+            offset: Number of channels to skip
+            
+        Returns:
+            list: Dicts with channel_id, saved_at and the summary fields
+        """
+        with self._state.lock:
+            entries = sorted(self._state.index.values(), key=lambda entry: entry['channel_id'])
+        start = offset or 0
+        entries = entries[start:start + limit] if limit is not None else entries[start:]
+        return [dict(entry['summary'], channel_id=entry['channel_id'], saved_at=entry['saved_at'])
+                for entry in entries]
     
     def get_channel_data(self, channel_id):
         """Get data for a specific channel"""
         try:
-            filename = self.data_dir / f"{channel_id}.json"
-            if filename.exists():
-                with open(filename, 'r') as f:
-                    return json.load(f)
-            return None
+            for attempt in range(2):
+                with self._state.lock:
+                    entry = self._state.index.get(channel_id)
+                if entry is None:
+                    return None
+                channel_data = None
+                videos = []
+                try:
+                    for kind, value in self._read_segment(entry['segment']):
+                        if kind == 'channel':
+                            channel_data = value
+                        else:
+                            videos.append(value)
+                except FileNotFoundError:
+                    # Superseded and compacted while we looked it up; read the newer segment
+                    if attempt:
+                        raise
+                    continue
+                if channel_data is not None and videos:
+                    channel_data['video_id'] = videos
+                return channel_data
         except Exception as e:
             debug_log(f"Error reading channel data: {str(e)}")
             return None
+    
+    def iter_videos(self, channel_ids=None):
+        """
+        Stream stored videos one at a time without loading whole channels
+        
+        Args:
+            channel_ids: Channels to read; every channel when None
+            
+        Yields:
+            tuple: (channel summary with channel_id, video dict)
+        """
+        with self._state.lock:
+            entries = [entry for channel_id, entry in sorted(self._state.index.items())
+                       if channel_ids is None or channel_id in channel_ids]
+        for entry in entries:
+            summary = dict(entry['summary'], channel_id=entry['channel_id'])
+            try:
+                for kind, value in self._read_segment(entry['segment']):
+                    if kind == 'video':
+                        yield summary, value
+            except OSError as e:
+                # The segment was compacted away after a newer save; skip it
+                debug_log(f"Error reading segment {entry['segment']}: {str(e)}")
+    
+    def _read_segment(self, segment):
+        with gzip.open(self.data_dir / segment, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                kind = 'channel' if 'channel' in record else 'video'
+                yield kind, record[kind]
+    
+    def _schedule_compaction(self):
+        with self._state.lock:
+            superseded = self._state.index_lines - len(self._state.index)
+            if superseded < COMPACTION_THRESHOLD or self._state.compaction_pending:
+                return
+            self._state.compaction_pending = True
+        _compaction_executor.submit(self.compact)
+    
+    def compact(self):
+        """
+        Rewrite the index with one line per channel and delete superseded segments
+        
+        Returns:
+            int: Number of segment files removed
+        """
+        removed = 0
+        try:
+            with self._state.lock:
+                index = dict(self._state.index)
+                lines = ''.join(json.dumps(entry) + '\n' for entry in index.values())
+                _atomic_write(self.index_file, lambda f: f.write(lines.encode('utf-8')))
+                self._state.index_lines = len(index)
+                self._state.index_torn = False
+                
+                live = {entry['segment'] for entry in index.values()}
+                for segment in self.shards_dir.glob('*/*.jsonl.gz'):
+                    if segment.relative_to(self.data_dir).as_posix() not in live:
+                        segment.unlink()
+                        removed += 1
+            debug_log(f"Compacted local storage: {len(index)} channels, {removed} segments removed")
+        except Exception as e:
+            debug_log(f"Error compacting local storage: {str(e)}")
+        finally:
+            self._state.compaction_pending = False
+        return removed
 
 def save_to_local_storage(data):
     """Legacy function for backward compatibility"""
@@ -98,17 +377,16 @@ def get_local_channels_data():
     debug_log("Loading channels from local storage")
     
     try:
-        if CHANNELS_FILE.exists():
-            with open(CHANNELS_FILE, "r") as f:
-                channels = json.load(f)
-            
+        # Summaries come from the index; no channel segment is opened
+        channels = LocalStorage(DATA_DIR).list_channels()
+        if channels:
             debug_log(f"Loaded {len(channels)} channels from local storage")
             
             # Create a list to hold simplified channel data
             data_rows = []
             for channel in channels:
                 # Get video count
-                video_count = len(channel.get('video_id', []))
+                video_count = int(channel.get('fetched_videos', 0))
                 
                 # Calculate total views and average views per video
                 total_views = int(channel.get('views', 0))
@@ -117,7 +395,7 @@ def get_local_channels_data():
                     avg_views = total_views / video_count
                 
                 data_rows.append([
-                    channel.get('channel_name', 'Unknown'),
+                    channel.get('channel_name') or 'Unknown',
                     channel.get('channel_id', 'Unknown'),
                     int(channel.get('subscribers', 0)),
                     total_views,
@@ -156,41 +434,39 @@ def get_local_videos_data():
     debug_log("Loading videos from local storage")
     
     try:
-        if CHANNELS_FILE.exists():
-            with open(CHANNELS_FILE, "r") as f:
-                channels = json.load(f)
-            
-            # Create a list to hold all videos
+        storage = LocalStorage(DATA_DIR)
+        channels = storage.get_channels_list()
+        if channels:
+            # Create a list to hold all videos, streamed one at a time from the segments
             videos = []
-            for channel in channels:
-                channel_name = channel.get('channel_name', 'Unknown')
+            for channel, video in storage.iter_videos():
+                channel_name = channel.get('channel_name') or 'Unknown'
                 channel_id = channel.get('channel_id', 'Unknown')
                 
-                for video in channel.get('video_id', []):
-                    # Parse video duration
-                    duration_sec = parse_duration_with_regex(video.get('duration', 'PT0S'))
-                    
-                    # Get view and like counts
-                    views = int(video.get('views', 0))
-                    likes = int(video.get('likes', 0))
-                    
-                    # Calculate engagement (likes per view)
-                    engagement = 0
-                    if views > 0:
-                        engagement = likes / views
-                    
-                    videos.append({
-                        'channel_name': channel_name,
-                        'channel_id': channel_id,
-                        'video_id': video.get('video_id', ''),
-                        'title': video.get('title', 'Unknown'),
-                        'published_at': video.get('published_at', ''),
-                        'views': views,
-                        'likes': likes,
-                        'duration_sec': duration_sec,
-                        'engagement': engagement
-                    })
-            
+                # Prefer stored seconds over parsing the duration string
+                duration_sec = parse_duration_with_regex(video.get('duration_seconds') or video.get('duration', 'PT0S'))
+                
+                # Get view and like counts
+                views = int(video.get('views', 0))
+                likes = int(video.get('likes', 0))
+                
+                # Calculate engagement (likes per view)
+                engagement = 0
+                if views > 0:
+                    engagement = likes / views
+                
+                videos.append({
+                    'channel_name': channel_name,
+                    'channel_id': channel_id,
+                    'video_id': video.get('video_id', ''),
+                    'title': video.get('title', 'Unknown'),
+                    'published_at': video.get('published_at', ''),
+                    'views': views,
+                    'likes': likes,
+                    'duration_sec': duration_sec,
+                    'engagement': engagement
+                })
+        
             # Convert to DataFrame
             if videos:
                 videos_df = pd.DataFrame(videos)
@@ -218,16 +494,13 @@ def local_get_video_duration_stats():
     debug_log("Analyzing video durations from local storage")
     
     try:
-        if CHANNELS_FILE.exists():
-            with open(CHANNELS_FILE, "r") as f:
-                channels = json.load(f)
-            
+        storage = LocalStorage(DATA_DIR)
+        if storage.get_channels_list():
             # Calculate video durations
             durations = []
-            for channel in channels:
-                for video in channel.get('video_id', []):
-                    duration_sec = parse_duration_with_regex(video.get('duration', 'PT0S'))
-                    durations.append(duration_sec)
+            for _, video in storage.iter_videos():
+                duration_sec = parse_duration_with_regex(video.get('duration_seconds') or video.get('duration', 'PT0S'))
+                durations.append(duration_sec)
             
             if durations:
                 # Basic statistics
@@ -291,26 +564,21 @@ def local_get_video_duration_stats():
 def local_get_video_published_data():
     """Get channels that published videos in 2022 from local storage"""
     try:
-        if CHANNELS_FILE.exists():
-            with open(CHANNELS_FILE, "r") as f:
-                channels = json.load(f)
-                
+        storage = LocalStorage(DATA_DIR)
+        if storage.get_channels_list():
             # Create a list to hold channel data
             data_rows = []
             channels_found = set()  # To avoid duplicate channel names
             
-            for channel in channels:
-                channel_name = channel.get('channel_name', 'Unknown')
+            # Check each video's published date
+            for channel, video in storage.iter_videos():
+                channel_name = channel.get('channel_name') or 'Unknown'
+                published_at = video.get('published_date', '')
                 
-                # Check each video's published date
-                for video in channel.get('video_id', []):
-                    published_at = video.get('published_date', '')
-                    
-                    # Check if the video was published in 2022
-                    if published_at and '2022' in published_at and channel_name not in channels_found:
-                        data_rows.append([channel_name])
-                        channels_found.add(channel_name)
-                        break
+                # Check if the video was published in 2022
+                if published_at and '2022' in published_at and channel_name not in channels_found:
+                    data_rows.append([channel_name])
+                    channels_found.add(channel_name)
             
             columns = ['Channel Name']
             
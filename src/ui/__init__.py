@@ -1,11 +1,27 @@
 """
 UI module for YTDataHub application.
 This package contains all UI-related modules.
+
+The tab renderers are imported on first use, so importing one tab (or any
+src.ui helper) does not load the others and their analytics dependencies.
 """
+import importlib
 
 # Export the UI rendering functions for use in the application
 # Import directly from the modern implementations instead of legacy wrappers
-from src.ui.data_collection.main import render_data_collection_tab
-from src.ui.data_analysis.main import render_data_analysis_tab
-from src.ui.utilities import render_utilities_tab
-from src.ui.bulk_import.render import render_bulk_import_tab
\ No newline at end of file
+_EXPORTS = {
+    'render_data_collection_tab': 'src.ui.data_collection.main',
+    'render_data_analysis_tab': 'src.ui.data_analysis.main',
+    'render_utilities_tab': 'src.ui.utilities',
+    'render_bulk_import_tab': 'src.ui.bulk_import.render',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
@@ -79,6 +79,11 @@ def batch_process_channels(channel_ids, log_container, progress_container, resul
         else:
             update_debug_log(log_container, "DRY RUN: Would connect to SQLite database")
         
+        # Resolve handles and channel URLs up front: cached answers are free and the
+        # rest use 1-unit lookups, with search only as a last resort
+        if not dry_run:
+            channel_ids = resolve_channel_references(api, channel_ids, log_container)
+        
         # Initialize counters
         total_channels = len(channel_ids)
         processed_count = 0
@@ -406,6 +411,37 @@ def batch_process_channels(channel_ids, log_container, progress_container, resul
         st.session_state.import_running = False
         st.session_state.import_results['in_progress'] = False
 
+def resolve_channel_references(api, channel_ids, log_container):
+    """
+    Replace the handles and channel URLs in an import list with channel IDs.
+    
+    Args:
+        api: Initialized YouTube API client
+        channel_ids: Channel IDs, handles or channel URLs from the import file
+        log_container: Streamlit container for logging messages
+        
+    Returns:
+        The list with every resolvable reference replaced by its channel ID;
+        unresolved references are kept so they are reported as failed
+    """
+    references = [
+        reference.strip() for reference in channel_ids
+        if isinstance(reference, str) and reference.strip() and not reference.strip().startswith('UC')
+    ]
+    if not references:
+        return channel_ids
+    
+    update_debug_log(log_container, f"Resolving {len(set(references))} handles and channel URLs...")
+    resolved = api.resolve_channel_references(references)
+    unresolved = sorted({reference for reference in references if not resolved.get(reference)})
+    if unresolved:
+        update_debug_log(log_container, f"Could not resolve: {', '.join(unresolved[:5])}{'...' if len(unresolved) > 5 else ''}", is_error=True)
+    
+    return [
+        resolved.get(reference.strip()) or reference if isinstance(reference, str) else reference
+        for reference in channel_ids
+    ]
+
 def update_results_table(container):
     """
     Update the real-time results table displaying import progress and results.
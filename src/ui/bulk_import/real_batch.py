@@ -3,8 +3,8 @@ Provides functionality to process batches of channel IDs with real API calls.
 This module handles the actual fetching of data from the YouTube API and storing it in the database.
 """
 import time
-from datetime import datetime
 
+from src.services.bulk_import import channel_record
 from src.ui.bulk_import.logger import update_debug_log
 from src.ui.bulk_import.processor import update_results_table
 
@@ -81,52 +81,13 @@ def process_real_batch(batch_channel_ids, api, db, debug_container, progress_con
                 channel_id = channel_item['id']
                 snippet = channel_item.get('snippet', {})
                 statistics = channel_item.get('statistics', {})
-                content_details = channel_item.get('contentDetails', {})
-                status = channel_item.get('status', {})
-                topic_details = channel_item.get('topicDetails', {})
-                branding_settings = channel_item.get('brandingSettings', {})
                 
                 channel_title = snippet.get('title', 'Unknown Channel')
                 
                 update_debug_log(debug_container, f"Processing channel: {channel_title} ({channel_id})")
                 
                 # Prepare the data for storage with all available fields
-                db_data = {
-                    'channel_id': channel_id,
-                    'channel_name': channel_title,
-                    'subscribers': statistics.get('subscriberCount', 0),
-                    'views': statistics.get('viewCount', 0),
-                    'total_videos': statistics.get('videoCount', 0),
-                    'channel_description': snippet.get('description', ''),
-                    'custom_url': snippet.get('customUrl', ''),
-                    'published_at': snippet.get('publishedAt', ''),
-                    'country': snippet.get('country', ''),
-                    'default_language': snippet.get('defaultLanguage', ''),
-                    'fetched_at': datetime.now().isoformat(),
-                    
-                    # Add additional fields from content details
-                    'uploads_playlist_id': content_details.get('relatedPlaylists', {}).get('uploads', ''),
-                    
-                    # Add fields from status
-                    'privacy_status': status.get('privacyStatus', ''),
-                    'is_linked': status.get('isLinked', False),
-                    'long_uploads_status': status.get('longUploadsStatus', ''),
-                    'made_for_kids': status.get('madeForKids', False),
-                    'hidden_subscriber_count': statistics.get('hiddenSubscriberCount', False),
-                    
-                    # Add fields from topicDetails
-                    'topic_categories': ','.join(topic_details.get('topicCategories', [])) if 'topicCategories' in topic_details else '',
-                    
-                    # Add fields from brandingSettings
-                    'keywords': branding_settings.get('channel', {}).get('keywords', '')
-                }
-                
-                # Add thumbnails if available
-                if 'thumbnails' in snippet:
-                    thumbnails = snippet['thumbnails']
-                    db_data['thumbnail_default'] = thumbnails.get('default', {}).get('url', '')
-                    db_data['thumbnail_medium'] = thumbnails.get('medium', {}).get('url', '')
-                    db_data['thumbnail_high'] = thumbnails.get('high', {}).get('url', '')
+                db_data = channel_record(channel_item)
                 
                 # Store in database
                 update_debug_log(debug_container, f"Storing data for channel: {channel_title}")
@@ -80,34 +80,21 @@ def render_analytics_dashboard(channel_data):
         progress_pct = (idx / len(channels_dict)) 
         channel_progress.progress(progress_pct, text=f"Processing data for channel: {channel_name}")
         
-        # Generate a unique cache key for this channel
-        cache_key = f"analysis_dashboard_{channel_name}"
-        
         # Assign a color to the channel
         channel_colors[channel_name] = color_palette[idx % len(color_palette)]
         
-        # Check if we have cached results
-        if use_cache and cache_key in st.session_state:
-            debug_log(f"Using cached analytics dashboard data for {channel_name}")
-            video_stats = st.session_state[cache_key]
-        else:
-            # Log start time for this operation
-            channel_start_time = time.time()
-            debug_log(f"Starting video statistics processing for {channel_name}", performance_tag=f"start_video_stats_{channel_name}")
-            
-            # Get video statistics for charts
-            video_stats = analysis.get_video_statistics(channel_data)
-            
-            # Log completion time
-            channel_end_time = time.time()
-            processing_time = channel_end_time - channel_start_time
-            debug_log(f"Video statistics processed for {channel_name} in {processing_time:.2f} seconds", 
-                     performance_tag=f"end_video_stats_{channel_name}")
-            
-            # Cache the results if caching is enabled
-            if use_cache:
-                st.session_state[cache_key] = video_stats
-                debug_log(f"Cached analytics dashboard data for {channel_name}")
+        # Log start time for this operation
+        channel_start_time = time.time()
+        debug_log(f"Starting video statistics processing for {channel_name}", performance_tag="start_video_stats")
+        
+        # Get video statistics for charts (cached by the analysis layer)
+        video_stats = analysis.get_video_statistics(channel_data)
+        
+        # Log completion time
+        channel_end_time = time.time()
+        processing_time = channel_end_time - channel_start_time
+        debug_log(f"Video statistics processed for {channel_name} in {processing_time:.2f} seconds", 
+                 performance_tag="end_video_stats")
         
         # Add channel name to the dataframe for multi-channel identification
         if video_stats['df'] is not None and not video_stats['df'].empty:
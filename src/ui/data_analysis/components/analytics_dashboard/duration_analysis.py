@@ -26,15 +26,9 @@ def render_duration_analysis(combined_df, channels_dict, analysis, use_cache, is
     channel_name = list(channels_dict.keys())[0]  # Get first channel for single channel display
     channel_data = channels_dict[channel_name]
     
-    # Generate or retrieve cached duration data
-    duration_cache_key = f"analysis_duration_{channel_name}"
-    if use_cache and duration_cache_key in st.session_state:
-        duration_analysis = st.session_state[duration_cache_key]
-    else:
-        with st.spinner("Analyzing video durations..."):
-            duration_analysis = analysis.get_duration_analysis(channel_data)
-            if use_cache:
-                st.session_state[duration_cache_key] = duration_analysis
+    # Duration analysis is cached by the analysis layer
+    with st.spinner("Analyzing video durations..."):
+        duration_analysis = analysis.get_duration_analysis(channel_data)
     
     duration_col1, duration_col2 = st.columns([3, 2])
     
@@ -49,14 +49,8 @@ def render_multi_channel_timeline(timeline_col1, timeline_col2, channels_dict, c
         try:
             monthly_data = []
             for channel_name, channel_data in channels_dict.items():
-                # Generate or retrieve cached timeline data
-                timeline_cache_key = f"analysis_timeline_{channel_name}"
-                if use_cache and timeline_cache_key in st.session_state:
-                    timeline_data = st.session_state[timeline_cache_key]
-                else:
-                    timeline_data = analysis.get_publication_timeline(channel_data)
-                    if use_cache:
-                        st.session_state[timeline_cache_key] = timeline_data
+                # Timeline data is cached by the analysis layer
+                timeline_data = analysis.get_publication_timeline(channel_data)
                 
                 # Process monthly data
                 if timeline_data['monthly_df'] is not None:
@@ -104,16 +98,14 @@ def render_multi_channel_timeline(timeline_col1, timeline_col2, channels_dict, c
         try:
             yearly_data = []
             for channel_name, channel_data in channels_dict.items():
-                # Use the timeline data we already retrieved
-                timeline_cache_key = f"analysis_timeline_{channel_name}"
-                if timeline_cache_key in st.session_state:
-                    timeline_data = st.session_state[timeline_cache_key]
-                    
-                    # Process yearly data
-                    if timeline_data['yearly_df'] is not None:
-                        yearly_df = timeline_data['yearly_df'].copy()
-                        yearly_df['Channel'] = channel_name
-                        yearly_data.append(yearly_df)
+                # Served from the analysis cache filled by the monthly chart
+                timeline_data = analysis.get_publication_timeline(channel_data)
+                
+                # Process yearly data
+                if timeline_data['yearly_df'] is not None:
+                    yearly_df = timeline_data['yearly_df'].copy()
+                    yearly_df['Channel'] = channel_name
+                    yearly_data.append(yearly_df)
             
             # Combine all yearly data
             combined_yearly = pd.concat(yearly_data) if yearly_data else None
@@ -147,20 +139,14 @@ def render_single_channel_timeline(timeline_col1, timeline_col2, channels_dict,
     channel_name = list(channels_dict.keys())[0]
     channel_data = channels_dict[channel_name]
     
-    # Generate or retrieve cached timeline data
-    timeline_cache_key = f"analysis_timeline_{channel_name}"
-    if use_cache and timeline_cache_key in st.session_state:
-        timeline_data = st.session_state[timeline_cache_key]
-    else:
-        timeline_processing = st.empty()
-        with timeline_processing.container():
-            st.info("Analyzing publication patterns...")
-        
-        timeline_data = analysis.get_publication_timeline(channel_data)
-        
-        timeline_processing.empty()
-        if use_cache:
-            st.session_state[timeline_cache_key] = timeline_data
+    # Timeline data is cached by the analysis layer
+    timeline_processing = st.empty()
+    with timeline_processing.container():
+        st.info("Analyzing publication patterns...")
+    
+    timeline_data = analysis.get_publication_timeline(channel_data)
+    
+    timeline_processing.empty()
     
     with timeline_col1:
         # Get publication timeline data
@@ -40,18 +40,10 @@ def render_multi_channel_top_videos(channels_dict, analysis, use_cache):
     # Get data for the selected channel
     selected_channel_data = channels_dict.get(analysis_channel)
     if selected_channel_data:
-        # Generate or retrieve cached top videos data
-        top_videos_cache_key = f"analysis_top_videos_{analysis_channel}"
-        if use_cache and top_videos_cache_key in st.session_state:
-            top_views = st.session_state[f"{top_videos_cache_key}_views"]
-            top_likes = st.session_state[f"{top_videos_cache_key}_likes"]
-        else:
-            with st.spinner(f"Finding top performing videos for {analysis_channel}..."):
-                top_views = analysis.get_top_videos(selected_channel_data, n=5, by='Views')
-                top_likes = analysis.get_top_videos(selected_channel_data, n=5, by='Likes')
-                if use_cache:
-                    st.session_state[f"{top_videos_cache_key}_views"] = top_views
-                    st.session_state[f"{top_videos_cache_key}_likes"] = top_likes
+        # Top videos are cached by the analysis layer
+        with st.spinner(f"Finding top performing videos for {analysis_channel}..."):
+            top_views = analysis.get_top_videos(selected_channel_data, n=5, by='Views')
+            top_likes = analysis.get_top_videos(selected_channel_data, n=5, by='Likes')
         
         perf_col1, perf_col2 = st.columns([1, 1])
         
@@ -83,18 +75,10 @@ def render_single_channel_top_videos(channels_dict, analysis, use_cache):
     channel_name = list(channels_dict.keys())[0]
     channel_data = channels_dict[channel_name]
     
-    # Generate or retrieve cached top videos data
-    top_videos_cache_key = f"analysis_top_videos_{channel_name}"
-    if use_cache and top_videos_cache_key in st.session_state:
-        top_views = st.session_state[f"{top_videos_cache_key}_views"]
-        top_likes = st.session_state[f"{top_videos_cache_key}_likes"]
-    else:
-        with st.spinner("Finding top performing videos..."):
-            top_views = analysis.get_top_videos(channel_data, n=5, by='Views')
-            top_likes = analysis.get_top_videos(channel_data, n=5, by='Likes')
-            if use_cache:
-                st.session_state[f"{top_videos_cache_key}_views"] = top_views
-                st.session_state[f"{top_videos_cache_key}_likes"] = top_likes
+    # Top videos are cached by the analysis layer
+    with st.spinner("Finding top performing videos..."):
+        top_views = analysis.get_top_videos(channel_data, n=5, by='Views')
+        top_likes = analysis.get_top_videos(channel_data, n=5, by='Likes')
     
     perf_col1, perf_col2 = st.columns([1, 1])
     
@@ -6,8 +6,11 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 from src.analysis.youtube_analysis import YouTubeAnalysis
+from src.config import SQLITE_DB_PATH
+from src.database.search_repository import SearchRepository
 from src.utils.ui_helpers import paginate_dataframe, render_pagination_controls
 from src.ui.data_analysis.utils.session_state import initialize_pagination, get_pagination_state, update_pagination_state
+from src.ui.data_analysis.utils.search import find_channel_comment_ids, get_channel_id
 from src.ui.data_analysis.components.comment_analysis.temporal_tab import render_temporal_tab
 from src.ui.data_analysis.components.comment_analysis.commenter_tab import render_commenter_tab
 from src.ui.data_analysis.components.comment_analysis.engagement_tab import render_engagement_tab
@@ -165,12 +168,13 @@ def render_comment_explorer(channel_data):
         "Comment Explorer", 
         "Temporal Analysis", 
         "Top Commenters", 
-        "Engagement"
+        "Engagement",
+        "Search All Channels"
     ])
     
     # Tab 1: Comment Explorer
     with comment_tabs[0]:
-        render_comment_explorer_tab(df, comment_analysis)
+        render_comment_explorer_tab(df, comment_analysis, get_channel_id(channel_data))
     
     # Tab 2: Temporal Analysis
     with comment_tabs[1]:
@@ -183,14 +187,19 @@ def render_comment_explorer(channel_data):
     # Tab 4: Engagement Analysis
     with comment_tabs[3]:
         render_engagement_tab(comment_analysis, total_comments)
+    
+    # Tab 5: Full-text search over every stored channel
+    with comment_tabs[4]:
+        render_cross_channel_search()
 
-def render_comment_explorer_tab(df, comment_analysis):
+def render_comment_explorer_tab(df, comment_analysis, channel_id=None):
     """
     Render the comment explorer tab.
     
     Args:
         df: DataFrame with comment data
         comment_analysis: Dictionary with comment analysis data
+        channel_id: YouTube channel ID, used to search stored comments with the full-text index
     """
     # Filter and search for comments
     col1, col2, col3 = st.columns([2, 1, 1])
@@ -229,9 +238,10 @@ def render_comment_explorer_tab(df, comment_analysis):
     # Apply filters
     filtered_df = df.copy()
     
-    # Text search
+    # Text search, answered by the full-text index when the channel's comments are stored
+    comment_ids = find_channel_comment_ids(channel_id, comment_search) if comment_search else None
     if comment_search:
-        filtered_df = filtered_df[filtered_df['Text'].str.contains(comment_search, case=False)]
+        filtered_df = filtered_df[search_comments(filtered_df, comment_search, comment_ids)]
     
     # Comment type filter
     if selected_filter == "Top-level Only":
@@ -251,7 +261,29 @@ def render_comment_explorer_tab(df, comment_analysis):
     if display_format == "Flat Table":
         render_flat_table_view(filtered_df)
     else:
-        render_threaded_view(filtered_df, comment_analysis, comment_search, selected_filter, sort_by, comment_sorts)
+        render_threaded_view(filtered_df, comment_analysis, comment_search, selected_filter, sort_by, comment_sorts,
+                             comment_ids)
+
+def search_comments(df, search_term, comment_ids=None):
+    """
+    Build a boolean mask of comments matching a search term.
+    
+    With comment_ids from the full-text index the mask is a membership test;
+    otherwise it falls back to a substring scan of the prebuilt lowercase
+    'Search Text' column so that reruns never lowercase the full comment text again.
+    
+    Args:
+        df: DataFrame with comment data
+        search_term: Case-insensitive substring to look for
+        comment_ids: IDs of the comments matching search_term, if already known
+        
+    Returns:
+        Boolean Series aligned with df
+    """
+    if comment_ids is not None and 'Comment ID' in df.columns:
+        return df['Comment ID'].isin(comment_ids)
+    text = df['Search Text'] if 'Search Text' in df.columns else df['Text'].str.lower()
+    return text.str.contains(search_term.lower(), regex=False, na=False)
 
 def render_flat_table_view(filtered_df):
     """
@@ -350,7 +382,8 @@ def render_flat_table_view(filtered_df):
         hide_index=True
     )
 
-def render_threaded_view(filtered_df, comment_analysis, comment_search, selected_filter, sort_by, comment_sorts):
+def render_threaded_view(filtered_df, comment_analysis, comment_search, selected_filter, sort_by, comment_sorts,
+                         comment_ids=None):
     """
     Render comments in a threaded view.
     
@@ -361,6 +394,7 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
         selected_filter: Selected filter option
         sort_by: Sort option
         comment_sorts: Dictionary with sort options
+        comment_ids: IDs of the comments matching comment_search from the full-text index
     """
     # Initialize custom CSS for better comment display
     st.markdown("""
@@ -402,37 +436,24 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
     </style>
     """, unsafe_allow_html=True)
     
-    # Display in threaded view using thread_structure
-    if 'thread_data' in comment_analysis and 'thread_structure' in comment_analysis['thread_data']:
-        # Get thread structure
-        thread_structure = comment_analysis['thread_data']['thread_structure']
+    # Display in threaded view using the compact thread index
+    thread_data = comment_analysis.get('thread_data') or {}
+    threads = thread_data.get('thread_index')
+    df = comment_analysis.get('df')
+    
+    if threads is not None and df is not None:
+        # Filter whole threads at once: a thread matches if its root or any reply matches
+        include = np.ones(len(threads), dtype=bool)
         
-        # Apply filtering to thread structure
-        filtered_threads = {}
+        # Apply text search filter if set
+        if comment_search:
+            include &= threads.match(search_comments(df, comment_search, comment_ids).to_numpy())
         
-        # First get all root comments that pass the filter
-        for comment_id, thread in thread_structure.items():
-            # Check if the comment passes filters
-            root_comment = thread['comment']
-            include_thread = True
-            
-            # Apply text search filter if set
-            if comment_search:
-                # Check if root comment or any replies match the search
-                root_matches = comment_search.lower() in root_comment['Text'].lower()
-                reply_matches = any(comment_search.lower() in reply['Text'].lower() for reply in thread['replies'])
-                
-                if not (root_matches or reply_matches):
-                    include_thread = False
-            
-            # Apply filter type
-            if selected_filter == "Top-level Only" and thread['replies']:
-                # Skip threads with replies in "top-level only" mode
-                include_thread = False
-            
-            # Include this thread if it passes all filters
-            if include_thread:
-                filtered_threads[comment_id] = thread
+        # Skip threads with replies in "top-level only" mode
+        if selected_filter == "Top-level Only":
+            include &= threads.reply_counts == 0
+        
+        thread_ids = np.flatnonzero(include)
         
         # Initialize pagination for threaded view with the custom page size
         initialize_pagination("thread_explorer", page=1, page_size=st.session_state.get("comment_page_size", 5))
@@ -441,21 +462,18 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
         current_page, page_size = get_pagination_state("thread_explorer")
         
         # Display the filtered threads with pagination
-        if filtered_threads:
-            # Get a sorted list of root comments based on the selected sort option
-            root_comments = []
-            for comment_id, thread in filtered_threads.items():
-                root_comments.append(thread['comment'])
-            
-            # Sort root comments
+        if len(thread_ids):
+            # Sort threads by their root comment based on the selected sort option
             if sort_by in comment_sorts:
                 sort_col, sort_asc = comment_sorts[sort_by]
-                if sort_col in root_comments[0]:
-                    root_comments.sort(key=lambda x: x.get(sort_col, 0), reverse=not sort_asc)
+                if sort_col in df.columns:
+                    sort_keys = df[sort_col].iloc[threads.root_positions[thread_ids]].reset_index(drop=True)
+                    order = sort_keys.sort_values(ascending=sort_asc, kind='stable').index.to_numpy()
+                    thread_ids = thread_ids[order]
             
             # Update page based on controls
             new_page = render_pagination_controls(
-                len(root_comments), 
+                len(thread_ids), 
                 page_size, 
                 current_page, 
                 "thread_explorer"
@@ -466,17 +484,17 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
                 current_page = new_page
             
             # Get paginated threads
-            start_idx = (current_page - 1) * page_size
-            end_idx = min(start_idx + page_size, len(root_comments))
-            paginated_root_comments = root_comments[start_idx:end_idx]
+            start_idx = max(0, (current_page - 1) * page_size)
+            end_idx = min(start_idx + page_size, len(thread_ids))
+            paginated_threads = thread_ids[start_idx:end_idx]
             
             # Show results count
-            st.write(f"Showing {len(paginated_root_comments)} of {len(root_comments)} comment threads")
+            st.write(f"Showing {len(paginated_threads)} of {len(thread_ids)} comment threads")
             
-            # Display each thread as a card with enhanced styling
-            for root_comment in paginated_root_comments:
-                comment_id = root_comment['Comment ID']
-                thread = filtered_threads.get(comment_id, {'replies': []})
+            # Display each thread as a card with enhanced styling; only rows on this page are materialized
+            for thread_id in paginated_threads:
+                root_comment = df.iloc[threads.root_positions[thread_id]]
+                replies = df.iloc[threads.replies(thread_id)].to_dict('records')
                 
                 # Create clean date format if available
                 published_date = ""
@@ -509,9 +527,9 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
                         st.caption(f"On video: {root_comment['Video Title']}")
                     
                     # Display replies if any with enhanced styling
-                    if thread['replies']:
-                        with st.expander(f"View {len(thread['replies'])} replies"):
-                            for reply in thread['replies']:
+                    if replies:
+                        with st.expander(f"View {len(replies)} replies"):
+                            for reply in replies:
                                 # Format reply date
                                 reply_date = ""
                                 if 'Published' in reply:
@@ -542,4 +560,45 @@ def render_threaded_view(filtered_df, comment_analysis, comment_search, selected
         st.warning("Threaded view not available. Try using Flat Table view instead.")
         
         # Provide guidance on how to get threaded view
-        st.info("To enable threaded view, make sure to collect comments with replies when fetching YouTube data.")
\ No newline at end of file
+        st.info("To enable threaded view, make sure to collect comments with replies when fetching YouTube data.")
+
+def render_cross_channel_search():
+    """
+    Render ranked full-text search over the comments and videos of every stored channel.
+    """
+    st.caption('Words match by prefix and "quoted phrases" match exactly, ignoring case and accents.')
+    search_col, scope_col = st.columns([3, 1])
+    
+    with search_col:
+        query = st.text_input("Search all channels:", key="cross_channel_search")
+    
+    with scope_col:
+        scope = st.selectbox("Search in:", ["Comments", "Video Titles & Descriptions"], key="cross_channel_scope")
+    
+    if not query:
+        return
+    
+    repository = SearchRepository(SQLITE_DB_PATH)
+    try:
+        if scope == "Comments":
+            total = repository.count_comment_matches(query)
+            hits = repository.search_comments(query, limit=50)
+        else:
+            hits = repository.search_videos(query, limit=50)
+            total = len(hits)
+    except Exception as e:
+        st.warning(f"Search is unavailable: {str(e)}")
+        return
+    
+    if not hits:
+        st.info("No matches found.")
+        return
+    
+    st.write(f"Showing {len(hits)} of {total} matches, best first.")
+    for hit in hits:
+        if scope == "Comments":
+            st.markdown(f"**{hit.get('author') or 'Unknown'}** on *{hit.get('video_title') or hit.get('video_id')}* "
+                        f"({hit.get('like_count') or 0} likes)")
+        else:
+            st.markdown(f"**{hit.get('title') or hit.get('video_id')}** ({hit.get('view_count') or 0} views)")
+        st.caption(hit.get('snippet') or '')
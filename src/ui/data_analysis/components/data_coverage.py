@@ -9,7 +9,9 @@ from datetime import datetime, timedelta
 import os
 import time
 
-from src.analysis.youtube_analysis import YouTubeAnalysis
+from src.analysis.youtube_analysis import YouTubeAnalysis, get_channel_cache_id
+from src.config import SQLITE_DB_PATH
+from src.database.coverage_repository import CoverageRepository
 from src.utils.debug_utils import debug_log
 from src.utils.formatters import format_number
 
@@ -39,6 +41,46 @@ if 'show_comments_chart' not in st.session_state:
 if 'show_duration_chart' not in st.session_state:
     st.session_state.show_duration_chart = False
 
+def load_coverage_summaries(channels_dict, db=None):
+    """
+    Load the precomputed coverage summaries for a set of channels.
+    
+    Args:
+        channels_dict: Dictionary mapping channel names to channel data
+        db: Database connection (optional); the configured SQLite database is used otherwise
+        
+    Returns:
+        Dictionary mapping channel names to their channel_coverage rows;
+        channels without a summary are left out
+    """
+    channel_keys = {}
+    for channel_name, channel_data in channels_dict.items():
+        if isinstance(channel_data, dict) and 'channel_info' in channel_data:
+            channel_info = channel_data['channel_info']
+            channel_keys[channel_name] = (get_channel_cache_id(channel_data), channel_info.get('title'))
+    if not channel_keys:
+        return {}
+    
+    channel_ids = [channel_id for channel_id, _ in channel_keys.values()]
+    channel_titles = [title for _, title in channel_keys.values()]
+    try:
+        if db is not None and hasattr(db, 'get_channel_coverage'):
+            rows = db.get_channel_coverage(channel_ids, channel_titles)
+        else:
+            rows = CoverageRepository(SQLITE_DB_PATH).get_coverage(channel_ids, channel_titles)
+    except Exception as e:
+        debug_log(f"Error loading coverage summaries: {str(e)}")
+        return {}
+    
+    by_id = {row['channel_id']: row for row in rows}
+    by_title = {row['channel_title']: row for row in rows if row.get('channel_title')}
+    summaries = {}
+    for channel_name, (channel_id, title) in channel_keys.items():
+        row = by_id.get(channel_id) or by_title.get(title)
+        if row is not None:
+            summaries[channel_name] = row
+    return summaries
+
 def render_data_coverage_dashboard(channel_data, db=None):
     """
     Render the data coverage dashboard showing data completeness and update options.
@@ -65,9 +107,6 @@ def render_data_coverage_dashboard(channel_data, db=None):
         is_multi_channel = False
         debug_log("Processing single channel dashboard")
     
-    # Use caching for analysis results if enabled
-    use_cache = st.session_state.get('use_data_cache', True)
-    
     # Initialize analysis object
     analysis = YouTubeAnalysis()
     
@@ -87,26 +126,23 @@ def render_data_coverage_dashboard(channel_data, db=None):
         st.warning("No channel data available for analysis. Please collect data first.")
         return
         
+    # Read the precomputed summaries of every channel with one indexed SELECT
+    coverage_summaries = load_coverage_summaries(channels_dict, db)
+    
     for channel_name, channel_data in channels_dict.items():
         # Get data coverage information
         debug_log(f"Processing coverage for channel: {channel_name}", 
-                  performance_tag=f"start_channel_coverage_{channel_name}")
+                  performance_tag="start_channel_coverage")
         
-        cache_key = f"data_coverage_{channel_name}"
-        if use_cache and cache_key in st.session_state:
-            debug_log(f"Using cached data coverage for: {channel_name}")
-            coverage_info = st.session_state[cache_key]
+        summary = coverage_summaries.get(channel_name)
+        if summary is not None:
+            coverage_info = analysis.coverage_from_summary(summary)
         else:
-            # Time the coverage analysis
+            # Channels saved before the summary table existed fall back to scanning the snapshot
             start_time = time.time()
             coverage_info = analysis.get_data_coverage(channel_data)
             elapsed = time.time() - start_time
             debug_log(f"Generated data coverage for {channel_name} in {elapsed:.2f}s")
-            
-            # Cache the result
-            if use_cache:
-                st.session_state[cache_key] = coverage_info
-                debug_log(f"Cached data coverage for: {channel_name}")
         
         # Add to the coverage data list for display
         coverage_data.append({
@@ -125,7 +161,7 @@ def render_data_coverage_dashboard(channel_data, db=None):
         })
         
         debug_log(f"Completed coverage for channel: {channel_name}", 
-                  performance_tag=f"end_channel_coverage_{channel_name}")
+                  performance_tag="end_channel_coverage")
     
     # Convert to dataframe for display
     coverage_df = pd.DataFrame(coverage_data)
@@ -290,18 +326,15 @@ def render_data_coverage_dashboard(channel_data, db=None):
     debug_log("Generating enhanced coverage visualizations", performance_tag="start_coverage_visualization")
     try:
         # Extract coverage data for visualization and ensure proper numeric types
-        coverage_metrics = pd.DataFrame([
-            {
-                'Channel': row['Channel'],
-                'Total Videos': float(row['Total Videos (Reported)']),
-                'Videos Collected': float(row['Videos Collected']),
-                'Videos with Comments': float(row['Videos with Comments']),
-                'Video Coverage (%)': float(row['Video Coverage (%)']),
-                'Comment Coverage (%)': float(row['Comment Coverage (%)']),
-                'Is Complete': row['Is Complete']
-            }
-            for _, row in coverage_df.iterrows()
-        ])
+        coverage_metrics = pd.DataFrame({
+            'Channel': coverage_df['Channel'],
+            'Total Videos': coverage_df['Total Videos (Reported)'].astype(float),
+            'Videos Collected': coverage_df['Videos Collected'].astype(float),
+            'Videos with Comments': coverage_df['Videos with Comments'].astype(float),
+            'Video Coverage (%)': coverage_df['Video Coverage (%)'].astype(float),
+            'Comment Coverage (%)': coverage_df['Comment Coverage (%)'].astype(float),
+            'Is Complete': coverage_df['Is Complete']
+        })
         
         # Create column layout
         col1, col2 = st.columns([1, 1])
@@ -368,27 +401,16 @@ def render_data_coverage_dashboard(channel_data, db=None):
             debug_log("Generating video distribution chart", performance_tag="start_video_distribution_chart")
             
             # Calculate videos with and without comments
-            distribution_data = []
-            
-            for _, row in coverage_metrics.iterrows():
-                channel = row['Channel']
-                videos_with_comments = int(row['Videos with Comments'])
-                videos_collected = int(row['Videos Collected'])
-                total_videos = int(row['Total Videos'])
-                
-                # Protect against negative numbers due to data inconsistencies
-                videos_without_comments = max(0, videos_collected - videos_with_comments)
-                videos_not_collected = max(0, total_videos - videos_collected)
-                
-                distribution_data.append({
-                    'Channel': channel,
-                    'Videos with Comments': videos_with_comments,
-                    'Videos without Comments': videos_without_comments,
-                    'Uncollected Videos': videos_not_collected
-                })
-            
-            # Create dataframe for distribution
-            distribution_df = pd.DataFrame(distribution_data)
+            # Protect against negative numbers due to data inconsistencies
+            videos_with_comments = coverage_metrics['Videos with Comments'].astype(int)
+            videos_collected = coverage_metrics['Videos Collected'].astype(int)
+            total_videos = coverage_metrics['Total Videos'].astype(int)
+            distribution_df = pd.DataFrame({
+                'Channel': coverage_metrics['Channel'],
+                'Videos with Comments': videos_with_comments,
+                'Videos without Comments': (videos_collected - videos_with_comments).clip(lower=0),
+                'Uncollected Videos': (total_videos - videos_collected).clip(lower=0)
+            })
             
             # Sort by the same order as the first chart
             channel_order = coverage_chart_data['Channel'].tolist()
@@ -814,9 +836,6 @@ def render_data_coverage_summary(channel_data, analysis):
         channels_dict = {'Single Channel': channel_data}
         is_multi_channel = False
     
-    # Use caching for analysis results if enabled
-    use_cache = st.session_state.get('use_data_cache', True)
-    
     # Temporarily disable coverage cache if requested
     if st.session_state.get('refresh_coverage_data', False):
         st.session_state['skip_coverage_cache'] = True
@@ -840,17 +859,17 @@ def render_data_coverage_summary(channel_data, analysis):
                 st.session_state['refresh_coverage_data'] = True
                 st.rerun()
         
+        # Read the precomputed summaries of every channel with one indexed SELECT
+        coverage_summaries = load_coverage_summaries(channels_dict)
+        
         # Process each channel and collect coverage metrics
         for channel_name, channel_data in channels_dict.items():
             # Get data coverage information
-            cache_key = f"data_coverage_{channel_name}"
-            if use_cache and not st.session_state.get('skip_coverage_cache', False) and cache_key in st.session_state:
-                coverage_info = st.session_state[cache_key]
+            summary = coverage_summaries.get(channel_name)
+            if summary is not None:
+                coverage_info = analysis.coverage_from_summary(summary)
             else:
                 coverage_info = analysis.get_data_coverage(channel_data)
-                # Cache the result
-                if use_cache:
-                    st.session_state[cache_key] = coverage_info
             
             # Format date range with proper handling of None values
             oldest_date = "N/A"
@@ -6,14 +6,57 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 from src.analysis.youtube_analysis import YouTubeAnalysis
+from src.config import SQLITE_DB_PATH
+from src.utils.debug_utils import debug_log
 from src.utils.ui_helpers import paginate_dataframe, render_pagination_controls
 from src.ui.data_analysis.utils.session_state import initialize_pagination, get_pagination_state, update_pagination_state
+from src.ui.data_analysis.utils.search import get_channel_id
+from src.ui.data_analysis.utils.video_pages import get_channel_video_summary, load_video_page
 from src.ui.data_analysis.components.data_coverage import render_data_coverage_summary
 
+# Date range choices and their length in days
+DATE_RANGES = {
+    "All Time": None,
+    "Last 90 Days": 90,
+    "Last 180 Days": 180,
+    "Last Year": 365,
+    "Last 2 Years": 730,
+    "Last 3 Years": 1095
+}
+
+# Explorer sort columns and the matching VideoRepository.get_videos_page sort keys
+DB_SORT_KEYS = {
+    "Published": "published_at",
+    "Views": "views",
+    "Likes": "likes",
+    "Comments": "comments",
+    "Duration_Seconds": "duration"
+}
+
+def _get_db_summary(channel_id):
+    """Get the stored video summary of a channel, or None when SQLite has no videos for it."""
+    if not channel_id:
+        return None
+    try:
+        summary = get_channel_video_summary(SQLITE_DB_PATH, channel_id)
+    except Exception as e:
+        debug_log(f"Video explorer falling back to in-memory data: {str(e)}")
+        return None
+    return summary if summary['total_videos'] else None
+
+def _date_filter_start(date_filter):
+    """Get the oldest publish date included by a date range choice."""
+    days = DATE_RANGES.get(date_filter)
+    return datetime.now() - timedelta(days=days) if days else None
+
 def render_video_explorer(channel_data):
     """
     Render the video explorer component.
     
+    Videos stored in SQLite are browsed page by page, with search, date
+    filtering and sorting done by the database; channel data that only exists
+    in memory is paginated as a DataFrame.
+    
     Args:
         channel_data: Dictionary containing channel data
     """
@@ -23,8 +66,13 @@ def render_video_explorer(channel_data):
     # Add data coverage summary at the top to show data completeness
     render_data_coverage_summary(channel_data, analysis)
     
+    # Browse from SQLite when the channel's videos are stored there
+    channel_id = get_channel_id(channel_data)
+    db_summary = _get_db_summary(channel_id)
+    has_videos = bool(channel_data and channel_data.get('videos'))
+    
     # Check if we have valid channel data with videos
-    if not channel_data or 'videos' not in channel_data or not channel_data['videos']:
+    if not has_videos and not db_summary:
         st.warning("No video data available for this channel.")
         
         # Show guidance on how to collect data
@@ -39,11 +87,23 @@ def render_video_explorer(channel_data):
             st.rerun()
         return
     
-    # Get video statistics with error handling
-    try:
-        video_stats = analysis.get_video_statistics(channel_data)
+    # Get video statistics with error handling; the charts need the whole channel
+    df = None
+    if has_videos:
+        try:
+            df = analysis.get_video_statistics(channel_data)['df']
+        except Exception as e:
+            if not db_summary:
+                st.error(f"Error loading video data: {str(e)}")
+                st.info("There may be an issue with your video data. Try refreshing or updating your data collection.")
+                
+                # Add a button to go to the data coverage dashboard
+                if st.button("Go to Data Coverage Dashboard", key="video_explorer_error_btn"):
+                    st.session_state.active_analysis_section = "coverage"
+                    st.rerun()
+                return
         
-        if video_stats['df'] is None or video_stats['df'].empty:
+        if (df is None or df.empty) and not db_summary:
             st.info("No detailed video data available for analysis.")
             
             # Show more specific guidance
@@ -57,129 +117,31 @@ def render_video_explorer(channel_data):
                 st.session_state.active_analysis_section = "coverage"
                 st.rerun()
             return
-            
-        df = video_stats['df']
-        
-    except Exception as e:
-        st.error(f"Error loading video data: {str(e)}")
-        st.info("There may be an issue with your video data. Try refreshing or updating your data collection.")
-        
-        # Add a button to go to the data coverage dashboard
-        if st.button("Go to Data Coverage Dashboard", key="video_explorer_error_btn"):
-            st.session_state.active_analysis_section = "coverage" 
-            st.rerun()
-        return
     
     # Create dashboard-style header with metrics
+    if db_summary:
+        total_videos = db_summary['total_videos']
+        total_views = db_summary['total_views']
+        avg_views = db_summary['average_views']
+    else:
+        total_videos = len(df)
+        total_views = int(df['Views'].sum()) if 'Views' in df.columns else 0
+        avg_views = int(df['Views'].mean()) if 'Views' in df.columns and len(df) > 0 else 0
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Videos", f"{len(df):,}")
+        st.metric("Total Videos", f"{total_videos:,}")
     
     with col2:
-        total_views = int(df['Views'].sum()) if 'Views' in df.columns else 0
         st.metric("Total Views", f"{total_views:,}")
     
     with col3:
-        avg_views = int(df['Views'].mean()) if 'Views' in df.columns and len(df) > 0 else 0
         st.metric("Average Views", f"{avg_views:,}")
     
-    # Add a performance distribution chart
-    st.subheader("Video Performance Distribution")
-    
-    perf_col1, perf_col2 = st.columns([3, 2])
-    
-    with perf_col1:
-        # Create a distribution chart of views
-        if 'Views' in df.columns and len(df) > 0:
-            try:
-                # Import numpy only when needed
-                import numpy as np
-                
-                # Set a reasonable upper limit to prevent skewing by outliers
-                views_upper_limit = np.percentile(df['Views'], 95) * 1.5
-                views_filtered = df[df['Views'] <= views_upper_limit]
-                
-                # Create histogram
-                views_fig = px.histogram(
-                    views_filtered, 
-                    x='Views',
-                    nbins=20, 
-                    title="Views Distribution",
-                    labels={'Views': 'View Count'},
-                    opacity=0.8,
-                    color_discrete_sequence=['#1E88E5']
-                )
-                
-                # Improve layout
-                views_fig.update_layout(
-                    xaxis_title="Views",
-                    yaxis_title="Number of Videos",
-                    bargap=0.1,
-                    plot_bgcolor='rgba(245, 245, 245, 0.95)',
-                    height=300
-                )
-                
-                st.plotly_chart(views_fig, use_container_width=True)
-                
-                # Add explanation for the distribution
-                if np.percentile(df['Views'], 75) > (np.percentile(df['Views'], 50) * 2):
-                    st.info("Your views distribution shows a long tail, which is typical for YouTube channels. A few videos drive most of your views.")
-            except Exception as e:
-                st.error(f"Error generating views distribution: {str(e)}")
-        else:
-            st.info("Views data is not available for this channel.")
-    
-    with perf_col2:
-        # Create a ratio chart (likes/views)
-        if 'Likes' in df.columns and 'Views' in df.columns and len(df) > 0:
-            try:
-                # Import numpy only when needed
-                import numpy as np
-                
-                # Calculate like/view ratio and filter out NaN values
-                df['LikeViewRatio'] = df['Likes'] / df['Views'] * 100
-                # Remove infinite values and NaNs
-                df['LikeViewRatio'] = df['LikeViewRatio'].replace([np.inf, -np.inf], np.nan)
-                ratio_df = df.dropna(subset=['LikeViewRatio'])
-                
-                if not ratio_df.empty:
-                    # Calculate average ratio
-                    avg_ratio = ratio_df['LikeViewRatio'].mean()
-                    
-                    # Create scatter plot of likes vs views
-                    ratio_fig = px.scatter(
-                        ratio_df,
-                        x='Views',
-                        y='Likes',
-                        hover_name='Title',
-                        log_x=True,
-                        log_y=True,
-                        title=f"Likes vs Views (Avg Ratio: {avg_ratio:.2f}%)",
-                        opacity=0.7,
-                        color='LikeViewRatio',
-                        color_continuous_scale='Viridis',
-                        size='LikeViewRatio',
-                        size_max=15
-                    )
-                    
-                    # Improve layout
-                    ratio_fig.update_layout(
-                        height=300,
-                        plot_bgcolor='rgba(245, 245, 245, 0.95)',
-                        coloraxis_colorbar=dict(
-                            title="Like/View %"
-                        )
-                    )
-                    
-                    st.plotly_chart(ratio_fig, use_container_width=True)
-                else:
-                    st.info("Not enough like/view data for ratio analysis.")
-            except Exception as e:
-                st.error(f"Error generating engagement ratio chart: {str(e)}")
-        else:
-            st.info("Like and view data is needed for engagement ratio analysis.")
-    
+    if df is not None and not df.empty:
+        render_performance_charts(df)
+
     # Add filter and sort options
     st.subheader("Video Explorer")
     
@@ -240,10 +202,13 @@ def render_video_explorer(channel_data):
             st.session_state.video_sort_by = "Duration (Longest)"
         else:
             st.session_state.video_sort_by = sort_by
-    
+
     with filter_col3:
-        # Date range filter if we have dates
-        if 'Published' in df.columns:
+        # Date range filter; in-memory data needs valid dates for it
+        date_filter = "All Time"
+        if db_summary:
+            date_filter = st.selectbox("Date Range:", list(DATE_RANGES))
+        elif 'Published' in df.columns:
             # Convert to datetime if not already
             if not pd.api.types.is_datetime64_dtype(df['Published']):
                 try:
@@ -252,63 +217,14 @@ def render_video_explorer(channel_data):
                     pass
             
             try:
-                min_date = df['Published'].min()
-                max_date = df['Published'].max()
-                
                 # Only show date filter if we have valid dates
-                if min_date and max_date:
-                    # For better UX, we'll use a single-select dropdown for common date ranges
-                    date_ranges = [
-                        "All Time",
-                        "Last 90 Days",
-                        "Last 180 Days",
-                        "Last Year",
-                        "Last 2 Years",
-                        "Last 3 Years"
-                    ]
-                    
-                    date_filter = st.selectbox("Date Range:", date_ranges)
+                if df['Published'].notna().any():
+                    date_filter = st.selectbox("Date Range:", list(DATE_RANGES))
             except:
                 date_filter = "All Time"
-        else:
-            date_filter = "All Time"
-    
-    # Apply filters and sorting
-    filtered_df = df.copy()
-    
-    # Apply search filter
-    if search_term:
-        filtered_df = filtered_df[filtered_df['Title'].str.contains(search_term, case=False)]
     
-    # Apply date filter if available
-    if 'Published' in filtered_df.columns and date_filter != "All Time":
-        try:
-            # Make sure Published is datetime
-            if not pd.api.types.is_datetime64_dtype(filtered_df['Published']):
-                filtered_df['Published'] = pd.to_datetime(filtered_df['Published'])
-            
-            today = datetime.now()
-            
-            if date_filter == "Last 90 Days":
-                start_date = today - timedelta(days=90)
-            elif date_filter == "Last 180 Days":
-                start_date = today - timedelta(days=180)
-            elif date_filter == "Last Year":
-                start_date = today - timedelta(days=365)
-            elif date_filter == "Last 2 Years":
-                start_date = today - timedelta(days=730)
-            elif date_filter == "Last 3 Years":
-                start_date = today - timedelta(days=1095)
-            
-            filtered_df = filtered_df[filtered_df['Published'] >= start_date]
-        except Exception as e:
-            st.error(f"Error applying date filter: {str(e)}")
-    
-    # Apply sorting
-    if sort_by in sort_options:
-        sort_col, sort_asc = sort_options[sort_by]
-        if sort_col in filtered_df.columns:
-            filtered_df = filtered_df.sort_values(by=sort_col, ascending=sort_asc)
+    sort_col, sort_asc = sort_options.get(sort_by, ("Published", False))
+    start_date = _date_filter_start(date_filter)
     
     # Initialize pagination with page size from session state
     initialize_pagination("video", page=1, page_size=st.session_state.get("video_page_size", 10))
@@ -316,24 +232,56 @@ def render_video_explorer(channel_data):
     # Get current pagination values
     current_page, page_size = get_pagination_state("video")
     
-    # Render pagination for videos table
-    new_page = render_pagination_controls(
-        len(filtered_df), 
-        page_size, 
-        current_page,
-        "video"
-    )
-    
-    # Update page state if changed
-    if update_pagination_state("video", new_page):
-        current_page = new_page
-    
-    # Get paginated dataframe
-    paginated_df = paginate_dataframe(filtered_df, page_size, current_page)
+    if db_summary:
+        # Only the visible page is read from SQLite; the next one is prefetched
+        def load_page(page):
+            return load_video_page(
+                SQLITE_DB_PATH, channel_id, page, page_size,
+                sort_by=DB_SORT_KEYS.get(sort_col, "published_at"), ascending=sort_asc,
+                search=search_term or None,
+                published_after=start_date.strftime('%Y-%m-%dT%H:%M:%S') if start_date else None
+            )
+        
+        paginated_df, total_matching, current_page = load_page(current_page)
+        
+        # Render pagination for videos table
+        new_page = render_pagination_controls(total_matching, page_size, current_page, "video")
+        
+        # Update page state if changed
+        if update_pagination_state("video", new_page):
+            paginated_df, total_matching, current_page = load_page(new_page)
+    else:
+        # Apply search filter
+        filtered_df = df
+        if search_term:
+            filtered_df = filtered_df[filtered_df['Title'].str.contains(search_term, case=False, regex=False)]
+        
+        # Apply date filter if available
+        if start_date is not None and 'Published' in filtered_df.columns:
+            try:
+                filtered_df = filtered_df[pd.to_datetime(filtered_df['Published']) >= start_date]
+            except Exception as e:
+                st.error(f"Error applying date filter: {str(e)}")
+        
+        # Apply sorting
+        if sort_col in filtered_df.columns:
+            filtered_df = filtered_df.sort_values(by=sort_col, ascending=sort_asc)
+        
+        total_matching = len(filtered_df)
+        
+        # Render pagination for videos table
+        new_page = render_pagination_controls(total_matching, page_size, current_page, "video")
+        
+        # Update page state if changed
+        if update_pagination_state("video", new_page):
+            current_page = new_page
+        
+        # Get paginated dataframe
+        paginated_df = paginate_dataframe(filtered_df, page_size, current_page)
     
     # Show results count
-    st.write(f"Showing {len(paginated_df)} of {len(filtered_df)} videos")
-    
+    st.write(f"Showing {len(paginated_df)} of {total_matching:,} videos")
+
     # Display toggle for view mode
     display_options = ["Grid View", "Table View", "Card View"]
     selected_view = st.radio("Display as:", display_options, horizontal=True)
@@ -356,39 +304,153 @@ def render_video_explorer(channel_data):
         st.session_state.active_analysis_section = "coverage"
         st.rerun()
 
-def render_videos_table(df):
+def render_performance_charts(df):
     """
-    Render videos in a well-formatted table view.
+    Render the views distribution and likes vs views charts.
     
     Args:
-        df: DataFrame containing video data
+        df: DataFrame containing the videos of the whole channel
     """
-    # Keep original dataframe for sorting logic
-    display_df = df.copy()
-    
-    # Create display version for column configs
-    formatted_df = df.copy()
-    
-    # Create properly formatted columns for display that won't interfere with sorting
-    if 'Title' in formatted_df.columns:
-        formatted_df['Title_Display'] = formatted_df['Title'].apply(lambda x: (x[:80] + '...') if len(x) > 80 else x)
+    # Add a performance distribution chart
+    st.subheader("Video Performance Distribution")
     
-    # For numeric columns, keep the original values for sorting
-    # but add display versions for formatting
-    if 'Views' in formatted_df.columns:
-        formatted_df['Views_Display'] = formatted_df['Views'].apply(lambda x: f"{x:,}")
+    perf_col1, perf_col2 = st.columns([3, 2])
     
-    if 'Likes' in formatted_df.columns:
-        formatted_df['Likes_Display'] = formatted_df['Likes'].apply(lambda x: f"{x:,}")
+    with perf_col1:
+        # Create a distribution chart of views
+        if 'Views' in df.columns and len(df) > 0:
+            try:
+                # Import numpy only when needed
+                import numpy as np
+                
+                # Set a reasonable upper limit to prevent skewing by outliers
+                views_upper_limit = np.percentile(df['Views'], 95) * 1.5
+                views_filtered = df[df['Views'] <= views_upper_limit]
+                
+                # Create histogram
+                views_fig = px.histogram(
+                    views_filtered, 
+                    x='Views',
+                    nbins=20, 
+                    title="Views Distribution",
+                    labels={'Views': 'View Count'},
+                    opacity=0.8,
+                    color_discrete_sequence=['#1E88E5']
+                )
+                
+                # Improve layout
+                views_fig.update_layout(
+                    xaxis_title="Views",
+                    yaxis_title="Number of Videos",
+                    bargap=0.1,
+                    plot_bgcolor='rgba(245, 245, 245, 0.95)',
+                    height=300
+                )
+                
+                st.plotly_chart(views_fig, use_container_width=True)
+                
+                # Add explanation for the distribution
+                if np.percentile(df['Views'], 75) > (np.percentile(df['Views'], 50) * 2):
+                    st.info("Your views distribution shows a long tail, which is typical for YouTube channels. A few videos drive most of your views.")
+            except Exception as e:
+                st.error(f"Error generating views distribution: {str(e)}")
+        else:
+            st.info("Views data is not available for this channel.")
     
-    if 'Comments' in formatted_df.columns:
-        formatted_df['Comments_Display'] = formatted_df['Comments'].apply(lambda x: f"{x:,}")
+    with perf_col2:
+        # Create a ratio chart (likes/views)
+        if 'Likes' in df.columns and 'Views' in df.columns and len(df) > 0:
+            try:
+                # Import numpy only when needed
+                import numpy as np
+                
+                # Calculate like/view ratio and filter out NaN values
+                df['LikeViewRatio'] = df['Likes'] / df['Views'] * 100
+                # Remove infinite values and NaNs
+                df['LikeViewRatio'] = df['LikeViewRatio'].replace([np.inf, -np.inf], np.nan)
+                ratio_df = df.dropna(subset=['LikeViewRatio'])
+                
+                if not ratio_df.empty:
+                    # Calculate average ratio
+                    avg_ratio = ratio_df['LikeViewRatio'].mean()
+                    
+                    # Create scatter plot of likes vs views
+                    ratio_fig = px.scatter(
+                        ratio_df,
+                        x='Views',
+                        y='Likes',
+                        hover_name='Title',
+                        log_x=True,
+                        log_y=True,
+                        title=f"Likes vs Views (Avg Ratio: {avg_ratio:.2f}%)",
+                        opacity=0.7,
+                        color='LikeViewRatio',
+                        color_continuous_scale='Viridis',
+                        size='LikeViewRatio',
+                        size_max=15
+                    )
+                    
+                    # Improve layout
+                    ratio_fig.update_layout(
+                        height=300,
+                        plot_bgcolor='rgba(245, 245, 245, 0.95)',
+                        coloraxis_colorbar=dict(
+                            title="Like/View %"
+                        )
+                    )
+                    
+                    st.plotly_chart(ratio_fig, use_container_width=True)
+                else:
+                    st.info("Not enough like/view data for ratio analysis.")
+            except Exception as e:
+                st.error(f"Error generating engagement ratio chart: {str(e)}")
+        else:
+            st.info("Like and view data is needed for engagement ratio analysis.")
+
+def _format_counts(values):
+    """Format a Series of counts with thousands separators."""
+    digits = pd.to_numeric(values, errors='coerce').fillna(0).astype('int64').astype(str)
+    return digits.str.replace(r'(\d)(?=(\d{3})+$)', r'\1,', regex=True)
+
+def _escape_html(values):
+    """HTML-escape a Series of strings."""
+    return (values.fillna('').astype(str)
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False)
+            .str.replace('"', '&quot;', regex=False))
+
+def _column(df, name, default):
+    """Get a column, or a Series of the default when it is missing."""
+    return df[name] if name in df.columns else pd.Series(default, index=df.index)
+
+def _format_published(df):
+    """Format the Published column as 'Mon DD, YYYY' ('' when missing)."""
+    published = pd.to_datetime(_column(df, 'Published', None), errors='coerce')
+    return published.dt.strftime('%b %d, %Y').fillna('')
+
+def _thumbnail_urls(df):
+    """Get thumbnail URLs, falling back to the standard image of each video ID."""
+    video_ids = _column(df, 'Video ID', '').fillna('').astype(str)
+    fallback = ('https://img.youtube.com/vi/' + video_ids + '/mqdefault.jpg').where(video_ids != '', '')
+    thumbnails = _column(df, 'Thumbnail', '').fillna('').astype(str)
+    return thumbnails.where(thumbnails != '', fallback)
+
+def render_videos_table(df):
+    """
+    Render videos in a well-formatted table view.
     
-    # Format date column for display
-    if 'Published' in formatted_df.columns:
-        if pd.api.types.is_datetime64_dtype(formatted_df['Published']):
-            formatted_df['Published_Display'] = formatted_df['Published'].dt.strftime('%b %d, %Y')
+    Args:
+        df: DataFrame containing the videos of the current page
+    """
+    # Create display version for column configs; numeric columns keep their
+    # values and are formatted by the column configuration
+    formatted_df = df.copy()
     
+    if 'Title' in formatted_df.columns:
+        titles = formatted_df['Title'].fillna('').astype(str)
+        formatted_df['Title_Display'] = titles.where(titles.str.len() <= 80, titles.str.slice(0, 80) + '...')
+
     # Create column configuration for the dataframe
     column_config = {
         "Title_Display": st.column_config.TextColumn(
@@ -467,12 +529,15 @@ def render_videos_grid(df):
     """
     Render videos in a responsive grid layout.
     
+    The page is rendered as a single HTML block built with vectorized string
+    operations rather than one Streamlit element per video.
+    
     Args:
-        df: DataFrame containing video data
+        df: DataFrame containing the videos of the current page
     """
     # Check if thumbnail display is enabled
     show_thumbnails = st.session_state.get("show_video_thumbnails", True)
-    
+
     # Add CSS for grid layout
     st.markdown("""
     <style>
@@ -560,113 +625,83 @@ def render_videos_grid(df):
     }
     </style>
     """, unsafe_allow_html=True)
+
+    if df.empty:
+        return
     
-    # Create a list of rows for the grid
-    items_per_row = 3
-    num_rows = (len(df) + items_per_row - 1) // items_per_row
-    
-    # Start the grid container
-    st.markdown('<div class="video-grid">', unsafe_allow_html=True)
-    
-    # Render each video as a grid item
-    for _, video in df.iterrows():
-        # Format date
-        published_date = ""
-        if 'Published' in video:
-            if hasattr(video['Published'], 'strftime'):
-                published_date = video['Published'].strftime('%b %d, %Y')
-            else:
-                published_date = str(video['Published'])
-        
-        # Format video ID
-        video_id = video.get('Video ID', '')
-        video_url = f"https://www.youtube.com/watch?v={video_id}" if video_id else "#"
-        
-        # Format thumbnail URL (either from the data or generate from video ID)
-        thumbnail_url = video.get('Thumbnail', '')
-        if not thumbnail_url and video_id:
-            thumbnail_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
-        
-        # Create thumbnail HTML based on settings
-        thumbnail_html = ""
-        if show_thumbnails:
-            if thumbnail_url:
-                thumbnail_html = f'<div class="video-thumbnail"><img src="{thumbnail_url}" alt="{video.get("Title", "Video")}"></div>'
-            else:
-                thumbnail_html = '<div class="video-thumbnail"><div class="placeholder-thumbnail">No Thumbnail</div></div>'
-        
-        # Render grid item
-        st.markdown(f"""
-        <div class="video-item">
-            <div class="video-header">
-                {thumbnail_html}
-                <div class="video-title">
-                    <h3>{video.get('Title', 'Untitled Video')}</h3>
-                    <div class="video-date">{published_date}</div>
-                </div>
-            </div>
-            <div class="video-stats">
-                <div class="stat-item">
-                    <span class="stat-label">Views:</span> {video.get('Views', 0):,}
-                </div>
-                <div class="stat-item">
-                    <span class="stat-label">Likes:</span> {video.get('Likes', 0):,}
-                </div>
-                <div class="stat-item">
-                    <span class="stat-label">Comments:</span> {video.get('Comments', 0):,}
-                </div>
-                <div class="stat-item">
-                    <span class="stat-label">Duration:</span> {video.get('Duration', 'N/A')}
-                </div>
-            </div>
-            <div class="video-links">
-                <a href="{video_url}" target="_blank" class="video-link">Watch on YouTube</a>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Close the grid container
-    st.markdown('</div>', unsafe_allow_html=True)
+    titles = _escape_html(_column(df, 'Title', 'Untitled Video'))
+    video_ids = _column(df, 'Video ID', '').fillna('').astype(str)
+    video_urls = ('https://www.youtube.com/watch?v=' + video_ids).where(video_ids != '', '#')
+    
+    # Create thumbnail HTML based on settings
+    thumbnails_html = pd.Series('', index=df.index)
+    if show_thumbnails:
+        thumbnail_urls = _escape_html(_thumbnail_urls(df))
+        thumbnails_html = ('<div class="video-thumbnail"><img src="' + thumbnail_urls + '" alt="' + titles + '"></div>').where(
+            thumbnail_urls != '',
+            '<div class="video-thumbnail"><div class="placeholder-thumbnail">No Thumbnail</div></div>'
+        )
+    
+    items = (
+        '<div class="video-item"><div class="video-header">' + thumbnails_html
+        + '<div class="video-title"><h3>' + titles + '</h3>'
+        + '<div class="video-date">' + _format_published(df) + '</div></div></div>'
+        + '<div class="video-stats">'
+        + '<div class="stat-item"><span class="stat-label">Views:</span> ' + _format_counts(_column(df, 'Views', 0)) + '</div>'
+        + '<div class="stat-item"><span class="stat-label">Likes:</span> ' + _format_counts(_column(df, 'Likes', 0)) + '</div>'
+        + '<div class="stat-item"><span class="stat-label">Comments:</span> ' + _format_counts(_column(df, 'Comments', 0)) + '</div>'
+        + '<div class="stat-item"><span class="stat-label">Duration:</span> ' + _escape_html(_column(df, 'Duration', 'N/A')) + '</div>'
+        + '</div><div class="video-links"><a href="' + video_urls
+        + '" target="_blank" class="video-link">Watch on YouTube</a></div></div>'
+    )
+    
+    # Render the grid container and its items as one element
+    st.markdown('<div class="video-grid">' + ''.join(items.tolist()) + '</div>', unsafe_allow_html=True)
 
 def render_videos_cards(df):
     """
     Render videos in a card layout with expandable details.
     
     Args:
-        df: DataFrame containing video data
+        df: DataFrame containing the videos of the current page
     """
     # Show thumbnails based on setting
     show_thumbnails = st.session_state.get("show_video_thumbnails", True)
     
-    # Process each video
-    for _, video in df.iterrows():
-        # Format date
-        published_date = ""
-        if 'Published' in video:
-            if hasattr(video['Published'], 'strftime'):
-                published_date = video['Published'].strftime('%b %d, %Y')
-            else:
-                published_date = str(video['Published'])
-        
-        # Create a card with expander for each video
-        with st.expander(f"{video.get('Title', 'Untitled Video')} - {published_date}"):
+    if df.empty:
+        return
+    
+    # Format every card field for the whole page at once
+    views = pd.to_numeric(_column(df, 'Views', 0), errors='coerce').fillna(0)
+    likes = pd.to_numeric(_column(df, 'Likes', 0), errors='coerce').fillna(0)
+    comments = pd.to_numeric(_column(df, 'Comments', 0), errors='coerce').fillna(0)
+    has_views = views > 0
+    cards = pd.DataFrame({
+        'header': _column(df, 'Title', 'Untitled Video').fillna('Untitled Video').astype(str) + ' - ' + _format_published(df),
+        'thumbnail': _thumbnail_urls(df),
+        'views': _format_counts(views),
+        'likes': _format_counts(likes),
+        'comments': _format_counts(comments),
+        'duration': _column(df, 'Duration', 'N/A').fillna('N/A').astype(str),
+        'engagement': ((likes + comments) / views.where(has_views) * 100).map('{:.2f}%'.format).where(has_views, ''),
+        'like_ratio': (likes / views.where(has_views) * 100).map('{:.2f}%'.format).where(has_views, ''),
+        'video_id': _column(df, 'Video ID', '').fillna('').astype(str),
+        'description': _column(df, 'Description', '').fillna('').astype(str)
+    })
+    
+    # One expander per video of the current page
+    for card in cards.itertuples(index=False):
+        with st.expander(card.header):
             col1, col2 = st.columns([1, 2])
             
             with col1:
                 # Display thumbnail if available and enabled
-                if show_thumbnails:
-                    video_id = video.get('Video ID', '')
-                    thumbnail_url = video.get('Thumbnail', '')
-                    
-                    if not thumbnail_url and video_id:
-                        thumbnail_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
-                    
-                    if thumbnail_url:
-                        st.image(thumbnail_url, use_column_width=True)
+                if show_thumbnails and card.thumbnail:
+                    st.image(card.thumbnail, use_column_width=True)
                 
                 # Display key metrics
-                st.metric("Views", f"{video.get('Views', 0):,}")
-                st.metric("Likes", f"{video.get('Likes', 0):,}")
+                st.metric("Views", card.views)
+                st.metric("Likes", card.likes)
             
             with col2:
                 # Video details
@@ -675,31 +710,19 @@ def render_videos_cards(df):
                 details_col1, details_col2 = st.columns(2)
                 
                 with details_col1:
-                    st.markdown(f"**Duration:** {video.get('Duration', 'N/A')}")
-                    st.markdown(f"**Comments:** {video.get('Comments', 0):,}")
+                    st.markdown(f"**Duration:** {card.duration}")
+                    st.markdown(f"**Comments:** {card.comments}")
                 
                 with details_col2:
-                    # Calculate engagement rate
-                    views = video.get('Views', 0)
-                    likes = video.get('Likes', 0)
-                    comments = video.get('Comments', 0)
-                    
-                    if views > 0:
-                        engagement_rate = (likes + comments) / views * 100
-                        st.markdown(f"**Engagement Rate:** {engagement_rate:.2f}%")
-                    
-                    # Calculate like/view ratio
-                    if views > 0:
-                        like_view_ratio = likes / views * 100
-                        st.markdown(f"**Like/View Ratio:** {like_view_ratio:.2f}%")
+                    if card.engagement:
+                        st.markdown(f"**Engagement Rate:** {card.engagement}")
+                        st.markdown(f"**Like/View Ratio:** {card.like_ratio}")
                 
                 # Display video link
-                video_id = video.get('Video ID', '')
-                if video_id:
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    st.markdown(f"[Watch on YouTube]({video_url})")
+                if card.video_id:
+                    st.markdown(f"[Watch on YouTube](https://www.youtube.com/watch?v={card.video_id})")
                 
                 # Display description if available
-                if 'Description' in video and video['Description']:
+                if card.description:
                     with st.expander("Video Description"):
-                        st.markdown(video['Description'])
\ No newline at end of file
+                        st.markdown(card.description)
@@ -13,6 +13,7 @@ from src.ui.data_analysis.components import (
 )
 from src.ui.data_analysis.utils.session_state import initialize_chart_toggles, initialize_analysis_section
 from src.utils.debug_utils import debug_log, ensure_debug_panel_state
+from src.utils.cache_utils import get_analysis_cache
 from src.utils.logging_utils import log_error
 
 def render_data_analysis_tab():
@@ -173,6 +174,7 @@ def render_data_analysis_tab():
                     
                     for key in keys_to_delete:
                         del st.session_state[key]
+                    get_analysis_cache().clear()
                         
                     st.success("Cache cleared. Data will be reloaded from the database.")
                     st.rerun()
@@ -188,6 +190,7 @@ def render_data_analysis_tab():
                 
                 for key in keys_to_delete:
                     del st.session_state[key]
+                get_analysis_cache().clear()
                     
                 st.success("Cache cleared. Data will be reloaded from the database.")
                 st.rerun()
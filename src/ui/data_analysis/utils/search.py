@@ -0,0 +1,54 @@
+"""
+Search helpers shared by the data analysis explorers.
+"""
+from typing import Optional, Set
+
+from src.config import SQLITE_DB_PATH
+from src.database.coverage_repository import CoverageRepository
+from src.database.search_repository import SearchRepository
+from src.utils.debug_utils import debug_log
+
+
+def get_channel_id(channel_data) -> Optional[str]:
+    """
+    Get the YouTube channel ID from the different channel data shapes.
+
+    Args:
+        channel_data: Channel data as loaded by the channel selector
+
+    Returns:
+        Optional[str]: The channel ID, or None if it has none
+    """
+    if not isinstance(channel_data, dict):
+        return None
+    channel_info = channel_data.get('channel_info')
+    if isinstance(channel_info, dict) and channel_info.get('id'):
+        return channel_info['id']
+    return channel_data.get('channel_id')
+
+
+def find_channel_comment_ids(channel_id: Optional[str], search_term: str,
+                             db_path: str = SQLITE_DB_PATH) -> Optional[Set[str]]:
+    """
+    Find a channel's stored comments matching a search with the full-text index.
+
+    Args:
+        channel_id: YouTube channel ID
+        search_term: Words or "phrases" to find
+        db_path: SQLite database path
+
+    Returns:
+        Optional[Set[str]]: Matching comment IDs, or None when the channel's
+        comments are not stored or the database has no search index, in which
+        case callers scan the loaded comments instead
+    """
+    if not channel_id or not search_term:
+        return None
+    try:
+        coverage = CoverageRepository(db_path).get_by_id(channel_id)
+        if not coverage or not coverage.get('comments_collected'):
+            return None
+        return SearchRepository(db_path).matching_comment_ids(search_term, [channel_id])
+    except Exception as e:
+        debug_log(f"Full-text comment search unavailable for {channel_id}: {str(e)}")
+        return None
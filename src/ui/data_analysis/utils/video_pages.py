@@ -0,0 +1,99 @@
+"""
+Server-side paging for the video explorer.
+
+Pages are read from SQLite with ORDER BY/LIMIT, kept in the process-wide
+analysis cache keyed by the channel's data version (so a save from any
+process retires its pages) and the page after the one being shown is loaded
+on a background thread while the user looks at the current one.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from src.database.version_repository import VersionRepository
+from src.database.video_repository import VideoRepository
+from src.utils.cache_utils import get_analysis_cache
+from src.utils.debug_utils import debug_log
+
+# One worker is enough: only the next page of the visible query is prefetched
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='video-page-prefetch')
+
+
+def _data_version(db_path: str, channel_id: str) -> Tuple:
+    return (db_path, VersionRepository(db_path).get_data_version(channel_id))
+
+
+def _page_key(version: Tuple, channel_id: str, query: Tuple, page: int) -> Tuple:
+    return get_analysis_cache().make_key(channel_id, version, 'video_page', query + (page,))
+
+
+def _fetch_page(db_path: str, channel_id: str, query: Tuple, page: int) -> Tuple[pd.DataFrame, int]:
+    page_size, sort_by, ascending, search, published_after = query
+    return VideoRepository(db_path).get_videos_page(
+        channel_id, sort_by=sort_by, ascending=ascending, limit=page_size, offset=page * page_size,
+        search=search, published_after=published_after
+    )
+
+
+def _prefetch(db_path: str, version: Tuple, channel_id: str, query: Tuple, page: int) -> None:
+    try:
+        get_analysis_cache().get_or_compute(_page_key(version, channel_id, query, page),
+                                            lambda: _fetch_page(db_path, channel_id, query, page))
+    except Exception as e:
+        debug_log(f"Prefetching video page {page} for {channel_id} failed: {str(e)}")
+
+
+def load_video_page(db_path: str, channel_id: str, page: int, page_size: int,
+                    sort_by: str = 'published_at', ascending: bool = False,
+                    search: Optional[str] = None, published_after: Optional[str] = None,
+                    prefetch: bool = True) -> Tuple[pd.DataFrame, int, int]:
+    """
+    Load one page of a channel's videos and start prefetching the next one.
+
+    Args:
+        db_path: SQLite database path
+        channel_id: YouTube channel ID
+        page: 0-indexed page number; pages past the end are clamped to the last page
+        page_size: Videos per page
+        sort_by: Sort key of VideoRepository.get_videos_page
+        ascending: Sort direction
+        search: Case-insensitive substring of the title
+        published_after: ISO 8601 timestamp of the oldest video to include
+        prefetch: Load the following page in the background
+
+    Returns:
+        Tuple of (page DataFrame, number of matching videos, page number served)
+    """
+    cache = get_analysis_cache()
+    version = _data_version(db_path, channel_id)
+    query = (int(page_size), sort_by, bool(ascending), search or None, published_after)
+    page = max(0, int(page))
+
+    frame, total = cache.get_or_compute(_page_key(version, channel_id, query, page),
+                                        lambda: _fetch_page(db_path, channel_id, query, page))
+    if page and frame.empty and total:
+        # Filters changed under a deep page; serve the last page instead
+        page = (total - 1) // page_size
+        frame, total = cache.get_or_compute(_page_key(version, channel_id, query, page),
+                                            lambda: _fetch_page(db_path, channel_id, query, page))
+
+    if prefetch and (page + 1) * page_size < total:
+        _prefetch_executor.submit(_prefetch, db_path, version, channel_id, query, page + 1)
+    return frame, total, page
+
+
+def get_channel_video_summary(db_path: str, channel_id: str) -> dict:
+    """
+    Get the stored video count and view totals of a channel, cached until its data version changes.
+
+    Args:
+        db_path: SQLite database path
+        channel_id: YouTube channel ID
+
+    Returns:
+        dict: total_videos, total_views and average_views
+    """
+    cache = get_analysis_cache()
+    return cache.get_or_compute(cache.make_key(channel_id, _data_version(db_path, channel_id), 'video_summary'),
+                                lambda: VideoRepository(db_path).get_video_summary(channel_id))
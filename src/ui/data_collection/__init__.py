@@ -1,17 +1,28 @@
 """
 YouTube Data Collection UI components.
 This module provides UI components for collecting YouTube data.
+
+Names are imported from their modules on first use so that importing a single
+component does not load the whole data collection tab.
 """
-from .main import render_data_collection_tab
-from .steps_ui import render_collection_steps
-from .comparison_ui import render_comparison_view, render_api_db_comparison
-from .channel_refresh_ui import channel_refresh_section
-from .debug_ui import render_debug_panel, render_debug_logs
-from .state_management import initialize_session_state, toggle_debug_mode
-from .utils.data_conversion import convert_db_to_api_format, format_number
-from .utils.delta_reporting import render_delta_report
-from src.database.sqlite import SQLiteDatabase
-from src.services.youtube_service import YouTubeService
+import importlib
+
+_EXPORTS = {
+    'render_data_collection_tab': '.main',
+    'render_collection_steps': '.steps_ui',
+    'render_comparison_view': '.comparison_ui',
+    'render_api_db_comparison': '.comparison_ui',
+    'channel_refresh_section': '.channel_refresh_ui',
+    'render_debug_panel': '.debug_ui',
+    'render_debug_logs': '.debug_ui',
+    'initialize_session_state': '.state_management',
+    'toggle_debug_mode': '.state_management',
+    'convert_db_to_api_format': '.utils.data_conversion',
+    'format_number': '.utils.data_conversion',
+    'SQLiteDatabase': 'src.database.sqlite',
+    'YouTubeService': 'src.services.youtube_service',
+    'render_delta_report': '.utils.delta_reporting',
+}
 
 __all__ = [
     'render_data_collection_tab',
@@ -28,4 +39,13 @@ __all__ = [
     'SQLiteDatabase',
     'YouTubeService',
     'render_delta_report'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    # Cache it so later lookups (and unittest.mock.patch) see a plain attribute
+    globals()[name] = value
+    return value
@@ -2,6 +2,7 @@
 This module handles the comparison between database and API data for channels.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload
 import pandas as pd
 from src.utils.debug_utils import debug_log
 from ..components.comprehensive_display import render_detailed_change_dashboard, render_collapsible_field_explorer
@@ -166,7 +167,7 @@ def display_comparison_results(db_data, api_data):
     # Show detailed delta report if available
     if 'delta' in st.session_state:
         st.subheader("🔍 Detailed Change Analysis")
-        delta = st.session_state['delta']
+        delta = get_payload('delta')
         
         # Get comparison options for display
         comparison_options = None
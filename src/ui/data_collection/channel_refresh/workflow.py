@@ -2,6 +2,7 @@
 This module handles the workflow for channel refresh UI.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload, set_payload
 import inspect
 from src.utils.debug_utils import debug_log
 from .comparison import display_comparison_results
@@ -141,8 +142,8 @@ def _render_step_2_review_data(youtube_service):
 
     # Get data from session state
     channel_id = st.session_state.get('existing_channel_id')
-    db_data = st.session_state.get('db_data', {})
-    api_data = st.session_state.get('api_data', {})
+    db_data = get_payload('db_data', {})
+    api_data = get_payload('api_data', {})
 
     debug_log("Entering _render_step_2_review_data")
     debug_log(f"Reference of st.warning: {id(st.warning)}")
@@ -161,8 +162,8 @@ def _render_step_2_review_data(youtube_service):
     st.session_state['channel_input'] = channel_id
 
     # Ensure db_data and api_data are dictionaries
-    db_data = st.session_state.get('db_data') or {}
-    api_data = st.session_state.get('api_data') or {}
+    db_data = get_payload('db_data') or {}
+    api_data = get_payload('api_data') or {}
 
     # Log the current state of data
     debug_log(f"Channel ID: {channel_id}")
@@ -245,9 +246,9 @@ def _render_step_2_review_data(youtube_service):
                     
                     if video_data and isinstance(video_data, dict):
                         # Store video data for next step - Look for videos under 'video_id' key which is what the API returns
-                        st.session_state['videos_data'] = video_data.get('api_data', {}).get('video_id', [])
+                        set_payload('videos_data', video_data.get('api_data', {}).get('video_id', []))
                         st.session_state['videos_fetched'] = True
-                        st.success(f"Successfully collected {len(st.session_state['videos_data'])} videos!")
+                        st.success(f"Successfully collected {len(get_payload('videos_data'))} videos!")
                     else:
                         st.warning("No video data was retrieved. You can still continue.")
                 except Exception as e:
@@ -268,7 +269,7 @@ def _render_step_3_video_collection(youtube_service):
     
     # Get data from session state
     channel_id = st.session_state.get('existing_channel_id')
-    videos_data = st.session_state.get('videos_data', [])
+    videos_data = get_payload('videos_data', [])
     
     # Video collection options
     options = configure_video_collection()
@@ -297,17 +298,9 @@ def _render_step_3_video_collection(youtube_service):
                         debug_log(f"First video keys: {list(video_list[0].keys()) if isinstance(video_list[0], dict) else 'Not a dict'}")
                         debug_log(f"First video views: {video_list[0].get('views', 'Not found')}")
                         
-                        # Fix views AND comment data using our advanced utility functions
-                        from src.utils.video_formatter import fix_missing_views
-                        from src.utils.video_processor import process_video_data
-                        
-                        # First process data to ensure comment counts are properly extracted
-                        debug_log("Applying process_video_data to video list")
-                        video_list = process_video_data(video_list)
-                        
-                        # Then apply fix_missing_views for backward compatibility
-                        debug_log("Applying fix_missing_views to video list")
-                        video_list = fix_missing_views(video_list)
+                        # Normalize views, likes and comment counts in one pass over the batch
+                        from src.utils.video_standardizer import standardize_video_data
+                        video_list = standardize_video_data(video_list)
                         
                         # Log sample data for debugging
                         if video_list and len(video_list) > 0:
@@ -322,9 +315,9 @@ def _render_step_3_video_collection(youtube_service):
                             debug_log(f"First video {video_id} views extracted by utility: {formatted_views}")
                             
                         # Store video data for next step
-                        st.session_state['videos_data'] = video_list
+                        set_payload('videos_data', video_list)
                         st.session_state['videos_fetched'] = True
-                        st.success(f"Successfully collected {len(st.session_state['videos_data'])} videos!")
+                        st.success(f"Successfully collected {len(get_payload('videos_data'))} videos!")
                     else:
                         st.warning("No video data was retrieved. You can still continue.")
                 else:
@@ -362,7 +355,7 @@ def _render_step_3_video_collection(youtube_service):
                     
                     if comment_data and isinstance(comment_data, dict):
                         # Store comment data for next step
-                        st.session_state['comments_data'] = comment_data.get('api_data', {}).get('comments', [])
+                        set_payload('comments_data', comment_data.get('api_data', {}).get('comments', []))
                         st.session_state['comments_fetched'] = True
                         st.success("Comments collected successfully!")
                     else:
@@ -380,7 +373,7 @@ def _render_step_3_video_collection(youtube_service):
 
 def _render_step_4_comment_collection(youtube_service):
     """Render step 4: Comment collection results."""
-    comments_data = st.session_state.get('comments_data', [])
+    comments_data = get_payload('comments_data', [])
     
     # Render comment section
     render_comment_section(comments_data)
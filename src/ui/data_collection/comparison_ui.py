@@ -3,6 +3,7 @@ Comparison UI components for data collection.
 Provides UI to compare data from different sources.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload
 from src.utils.debug_utils import debug_log
 from .utils.data_conversion import format_number
 
@@ -54,8 +55,8 @@ def render_comparison_view(youtube_service):
     st.header("Channel Data Comparison")
     
     # Get data from session state with improved error handling
-    db_data = st.session_state.get('db_data', {})
-    api_data = st.session_state.get('api_data', {})
+    db_data = get_payload('db_data', {})
+    api_data = get_payload('api_data', {})
     channel_id = st.session_state.get('existing_channel_id')
     
     # Check if we have valid data for comparison
@@ -342,10 +343,10 @@ def render_api_db_comparison(st):
         st: Streamlit instance
     """
     # Get data from session state with improved error handling
-    db_data = st.session_state.get('db_data', {})
-    api_data = st.session_state.get('api_data', {})
+    db_data = get_payload('db_data', {}, state=st.session_state)
+    api_data = get_payload('api_data', {}, state=st.session_state)
     channel_id = st.session_state.get('existing_channel_id')
-    delta = st.session_state.get('delta', {})
+    delta = get_payload('delta', {}, state=st.session_state)
     
     # Validate that we have proper data
     if db_data is None or api_data is None:
@@ -3,8 +3,8 @@ Component for rendering video items in the data collection UI.
 """
 import streamlit as st
 from datetime import datetime
-import re
 from ...data_collection.utils.data_conversion import format_number
+from src.utils.duration_utils import parse_duration_with_regex
 
 def render_video_item(video, index=0, selectable=False):
     """
@@ -255,22 +255,19 @@ def render_video_item(video, index=0, selectable=False):
         
         # Try to extract duration from PT format (ISO 8601 duration)
         if duration and duration.startswith('PT'):
-            duration_pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-            match = re.match(duration_pattern, duration)
+            hours, remainder = divmod(parse_duration_with_regex(duration), 3600)
+            minutes, seconds = divmod(remainder, 60)
+            formatted_duration = ""
             
-            if match:
-                hours, minutes, seconds = match.groups()
-                formatted_duration = ""
-                
-                if hours:
-                    formatted_duration += f"{int(hours)}h "
-                if minutes:
-                    formatted_duration += f"{int(minutes)}m "
-                if seconds:
-                    formatted_duration += f"{int(seconds)}s"
-                
-                if formatted_duration:
-                    st.caption(f"Duration: {formatted_duration.strip()}")
+            if hours:
+                formatted_duration += f"{hours}h "
+            if minutes:
+                formatted_duration += f"{minutes}m "
+            if seconds:
+                formatted_duration += f"{seconds}s"
+            
+            if formatted_duration:
+                st.caption(f"Duration: {formatted_duration.strip()}")
         else:
             st.caption(f"Duration: {duration}")
             
@@ -231,7 +231,7 @@ def render_debug_panel():
                 logs = st.session_state.get('ui_debug_logs', [])
                 if logs:
                     st.write("**Recent Debug Logs:**")
-                    for log in logs[-20:]:
+                    for log in list(logs)[-20:]:
                         st.write(log)
                 else:
                     st.info("No debug logs available.")
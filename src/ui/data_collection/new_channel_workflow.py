@@ -2,6 +2,7 @@
 New channel workflow implementation for data collection.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload, set_payload, pop_payload
 from src.utils.debug_utils import debug_log
 from src.ui.data_collection.workflow_base import BaseCollectionWorkflow
 from .components.video_item import render_video_item, render_video_table_row
@@ -122,7 +123,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
             except Exception as e:
                 debug_log(f"[WORKFLOW][ERROR] st.error failed: {str(e)}")
             return
-        info_temp = st.session_state.get('channel_info_temp')
+        info_temp = get_payload('channel_info_temp')
         info_valid = info_temp and info_temp.get('channel_id') and info_temp.get('playlist_id')
         fetch_attempts = 0
         while not info_valid and channel_input and fetch_attempts < 2:
@@ -140,9 +141,9 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                             debug_log(f"[WORKFLOW][ERROR] Channel field extraction/validation failed for channel_id={channel_id}")
                             return
                         debug_log(f"[WORKFLOW] Extracted and validated channel_info_temp: {channel_info_temp}")
-                        st.session_state['channel_info_temp'] = channel_info_temp
+                        set_payload('channel_info_temp', channel_info_temp)
                         st.session_state['channel_data_fetched'] = True
-                        st.session_state['api_data'] = channel_info_temp
+                        set_payload('api_data', channel_info_temp)
                         debug_log(f"[WORKFLOW] Channel data ready for channel_id={channel_id}")
                         info_valid = True
                     else:
@@ -170,7 +171,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
         st.subheader("Step 1: Channel Details")
         self.show_progress_indicator(1)
         
-        channel_info = st.session_state.get('channel_info_temp', {})
+        channel_info = get_payload('channel_info_temp', {})
         
         if not channel_info:
             st.warning("No channel data available. Please fetch channel data first.")
@@ -215,7 +216,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
             if st.button("🔙 Back", key="channel_data_back_btn"):
                 # Clear temporary data
                 if 'channel_info_temp' in st.session_state:
-                    del st.session_state['channel_info_temp']
+                    pop_payload('channel_info_temp')
                 # Go back to channel input
                 st.session_state['collection_step'] = 1
                 st.rerun()
@@ -248,7 +249,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
         """Render playlist review step with multi-playlist selection."""
         st.subheader("Step 2: Playlist Review & Selection")
         
-        channel_info = st.session_state.get('channel_info_temp', {})
+        channel_info = get_payload('channel_info_temp', {})
         channel_id = channel_info.get('channel_id')
         uploads_playlist_id = channel_info.get('playlist_id')
         
@@ -260,17 +261,17 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
         if 'selected_playlists' not in st.session_state:
             st.session_state['selected_playlists'] = []
         if 'all_playlists_data' not in st.session_state:
-            st.session_state['all_playlists_data'] = []
+            set_payload('all_playlists_data', [])
         if 'playlists_saved' not in st.session_state:
             st.session_state['playlists_saved'] = False
         
         # Fetch all channel playlists (from session or API)
-        all_playlists = st.session_state.get('all_playlists_data')
+        all_playlists = get_payload('all_playlists_data')
         if not all_playlists:
             try:
                 with st.spinner("Fetching all channel playlists..."):
                     all_playlists = self.youtube_service.get_channel_playlists(channel_id, max_results=100)
-                    st.session_state['all_playlists_data'] = all_playlists
+                    set_payload('all_playlists_data', all_playlists)
             except Exception as e:
                 st.error(f"❌ Error fetching playlists: {str(e)}")
                 return
@@ -383,6 +384,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                 try:
                     saved_count = 0
                     errors = []
+                    saved_playlist_ids = []
                     for playlist_data in selected_playlists_data:
                         # Prepare playlist data for saving (convert to expected format)
                         playlist_save_data = {
@@ -413,6 +415,9 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                         success = self.youtube_service.save_playlist_data(playlist_save_data)
                         if success:
                             saved_count += 1
+                            # The uploads playlist's videos are collected in step 3
+                            if playlist_save_data.get('type') != 'uploads':
+                                saved_playlist_ids.append(playlist_data['playlist_id'])
                         else:
                             errors.append(playlist_data['title'])
                     
@@ -423,6 +428,14 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                         st.warning(f"⚠️ {saved_count} of {len(selected_playlists_data)} playlists saved. Errors with: {', '.join(errors)}")
                     else:
                         st.error(f"❌ Failed to save playlists. Errors with: {', '.join(errors)}")
+                    
+                    if saved_playlist_ids:
+                        with st.spinner(f"Collecting the videos of {len(saved_playlist_ids)} playlists..."):
+                            expansion = self.youtube_service.expand_playlists(saved_playlist_ids, channel_id=channel_id)
+                        item_count = sum(len(items) for items in expansion['playlist_items'].values())
+                        st.info(f"📋 {item_count} playlist items saved, {len(expansion['videos'])} new videos collected")
+                        if expansion['failed_playlists']:
+                            st.warning(f"⚠️ Could not read playlists: {', '.join(expansion['failed_playlists'])}")
                         
                 except Exception as e:
                     st.error(f"❌ Error saving playlists: {str(e)}")
@@ -438,7 +451,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
         st.subheader("Step 3: Videos Data")
         self.show_progress_indicator(3)
         
-        channel_info = st.session_state.get('channel_info_temp', {})
+        channel_info = get_payload('channel_info_temp', {})
         channel_id = channel_info.get('channel_id', '')
         videos_data = channel_info.get('video_id', []) if 'video_id' in channel_info else []
         
@@ -622,7 +635,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                                     debug_log(f"[VIDEO FETCH DEBUG] updated_data is falsy: {updated_data}")
                                 
                                 if updated_data and 'video_id' in updated_data and updated_data['video_id']:
-                                    st.session_state['channel_info_temp']['video_id'] = updated_data['video_id']
+                                    get_payload('channel_info_temp')['video_id'] = updated_data['video_id']
                                     st.session_state['videos_fetched'] = True
                                     
                                     total_videos = len(updated_data['video_id'])
@@ -716,7 +729,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                     else:
                         # Only keep selected videos for next step
                         channel_info['video_id'] = [v for v in videos_data if v.get('video_id') in selected_video_ids]
-                        st.session_state['channel_info_temp'] = channel_info
+                        set_payload('channel_info_temp', channel_info)
                         st.session_state['collection_step'] = 4
                         st.rerun()
             with col3:
@@ -729,7 +742,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
         st.subheader("Step 4: Comments Data")
         self.show_progress_indicator(4)
         
-        channel_info = st.session_state.get('channel_info_temp', {})
+        channel_info = get_payload('channel_info_temp', {})
         channel_id = channel_info.get('channel_id', '')
         videos = channel_info.get('video_id', [])
         
@@ -887,7 +900,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
                                 )
                                 
                                 if updated_data and 'video_id' in updated_data:
-                                    st.session_state['channel_info_temp']['video_id'] = updated_data['video_id']
+                                    get_payload('channel_info_temp')['video_id'] = updated_data['video_id']
                                     st.session_state['comments_fetched'] = True
                                     
                                     total_comments = sum(len(video.get('comments', [])) for video in updated_data['video_id'])
@@ -1004,7 +1017,7 @@ class NewChannelWorkflow(BaseCollectionWorkflow):
 
     def save_data(self):
         """Save collected data to the database with user-friendly feedback."""
-        channel_info = st.session_state.get('channel_info_temp')
+        channel_info = get_payload('channel_info_temp')
         if not channel_info:
             st.error("❌ No data to save.")
             return
@@ -2,6 +2,7 @@
 Channel refresh workflow implementation for data collection.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload, set_payload
 import pandas as pd
 import json
 import sys
@@ -16,8 +17,7 @@ from .components.save_operation_manager import SaveOperationManager
 from .channel_refresh.comparison import display_comparison_results, compare_data
 from .utils.data_conversion import format_number, convert_db_to_api_format
 from .utils.error_handling import handle_collection_error
-from src.utils.video_processor import process_video_data
-from src.utils.video_formatter import fix_missing_views
+from src.utils.video_standardizer import standardize_video_data
 from src.database.channel_repository import ChannelRepository
 from src.ui.data_collection.utils.delta_reporting import render_delta_report
 from src.utils.data_collection.channel_normalizer import normalize_channel_data_for_save
@@ -108,35 +108,33 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                         comparison_data = self.youtube_service.update_channel_data(channel_id, options, interactive=False, existing_data=None)
                         st.session_state['last_api_call'] = datetime.now().isoformat()
                         if comparison_data and isinstance(comparison_data, dict):
-                            st.session_state['db_data'] = comparison_data.get('db_data', {})
+                            db_data = comparison_data.get('db_data', {})
                             api_data_raw = comparison_data.get('api_data', {})
                             # --- NEW: Extract and validate fields for UI parity ---
-                            api_data_ui = self.extract_api_data_from_delta(api_data_raw)
-                            if api_data_ui:
-                                st.session_state['api_data'] = api_data_ui
-                            else:
-                                st.session_state['api_data'] = {}
-                            debug_log_with_time(f"API data after extraction: {st.session_state['api_data']}")
-                            if st.session_state['db_data'] is None:
-                                st.session_state['db_data'] = {}
+                            api_data = self.extract_api_data_from_delta(api_data_raw) or {}
+                            debug_log_with_time(f"API data after extraction: {api_data}")
+                            if db_data is None:
+                                db_data = {}
                             # Promote delta info from api_data if present
                             if 'delta' in api_data_raw:
-                                st.session_state['delta'] = api_data_raw['delta']
+                                set_payload('delta', api_data_raw['delta'])
                             elif 'delta' in comparison_data:
-                                st.session_state['delta'] = comparison_data['delta']
-                            if 'delta' not in st.session_state['api_data'] and 'delta' in st.session_state:
-                                st.session_state['api_data']['delta'] = st.session_state['delta']
-                            if 'channel' in st.session_state['api_data']:
-                                if 'delta' in st.session_state['api_data']:
-                                    st.session_state['api_data']['channel']['delta'] = st.session_state['api_data']['delta']
+                                set_payload('delta', comparison_data['delta'])
+                            if 'delta' not in api_data and 'delta' in st.session_state:
+                                api_data['delta'] = get_payload('delta')
+                            if 'channel' in api_data:
+                                if 'delta' in api_data:
+                                    api_data['channel']['delta'] = api_data['delta']
                                 elif 'delta' in st.session_state:
-                                    st.session_state['api_data']['channel']['delta'] = st.session_state['delta']
+                                    api_data['channel']['delta'] = get_payload('delta')
+                            set_payload('db_data', db_data)
+                            set_payload('api_data', api_data)
                             # Store debug logs and response data if present
                             if 'debug_logs' in comparison_data:
                                 st.session_state['debug_logs'] = comparison_data['debug_logs']
                             if 'response_data' in comparison_data:
-                                st.session_state['response_data'] = comparison_data['response_data']
-                            if (len(st.session_state['db_data']) == 0 and len(st.session_state['api_data']) == 0):
+                                set_payload('response_data', comparison_data['response_data'])
+                            if (len(db_data) == 0 and len(api_data) == 0):
                                 st.error("No data could be retrieved from either the database or YouTube API.")
                                 return
                             st.session_state['existing_channel_id'] = channel_id
@@ -144,8 +142,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                             st.session_state['refresh_workflow_step'] = 2
                             st.rerun()
                         else:
-                            st.session_state['db_data'] = {}
-                            st.session_state['api_data'] = {}
+                            set_payload('db_data', {})
+                            set_payload('api_data', {})
                             st.error("Failed to retrieve channel data for comparison. Please try again.")
                     except Exception as e:
                         handle_collection_error(e, "retrieving channel data for comparison")
@@ -157,8 +155,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
         st.subheader("Step 2: Review and Update Channel Data")
         self.show_progress_indicator(2)
         channel_id = st.session_state.get('existing_channel_id')
-        db_data_raw = st.session_state.get('db_data', {})
-        api_data_raw = self.extract_api_data_from_delta(st.session_state.get('api_data', {}))
+        db_data_raw = get_payload('db_data', {})
+        api_data_raw = self.extract_api_data_from_delta(get_payload('api_data', {}))
         api_data = self.convert_api_to_ui_format(api_data_raw)
         debug_log_with_time(f"[UI] Checking api_data for channel_id={channel_id}: {api_data}")
         raw_info = api_data.get('raw_channel_info')
@@ -271,7 +269,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                         db_repo = ChannelRepository(SQLITE_DB_PATH)
                         db_record = db_repo.get_channel_data(normalized_channel_data.get('channel_id'))
                         db_api_format = convert_db_to_api_format(db_record) if db_record else {}
-                        st.session_state['db_data'] = db_record
+                        set_payload('db_data', db_record)
                         debug_log_with_time(f"[PARITY] Reloaded DB data after save for channel_id={channel_id}: {bool(db_record)}")
                         # Store post-save raw data in debug state
                         st.session_state['debug_raw_data']['channel_post_save'] = {
@@ -322,8 +320,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
         self.show_progress_indicator(3)
         channel_id = st.session_state.get('existing_channel_id')
         from src.ui.data_collection.utils.data_conversion import convert_db_to_api_format
-        db_data_raw = st.session_state.get('db_data', {})
-        api_data_raw = st.session_state.get('api_data', {})
+        db_data_raw = get_payload('db_data', {})
+        api_data_raw = get_payload('api_data', {})
         api_data = self.convert_api_to_ui_format(self.extract_api_data_from_delta(api_data_raw))
         db_data = convert_db_to_api_format(db_data_raw) if db_data_raw else {}
         debug_log_with_time(f"[PARITY] Checking data for channel_id={channel_id}: {db_data}")
@@ -464,8 +462,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
         
         # Get API and DB data
         from src.ui.data_collection.utils.data_conversion import convert_db_to_api_format
-        db_data_raw = st.session_state.get('db_data', {})
-        api_data_raw = st.session_state.get('api_data', {})
+        db_data_raw = get_payload('db_data', {})
+        api_data_raw = get_payload('api_data', {})
         api_data = self.convert_api_to_ui_format(self.extract_api_data_from_delta(api_data_raw))
         db_data = convert_db_to_api_format(db_data_raw) if db_data_raw else {}
         
@@ -558,8 +556,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
         
         # Get API and DB data
         from src.ui.data_collection.utils.data_conversion import convert_db_to_api_format
-        db_data_raw = st.session_state.get('db_data', {})
-        api_data_raw = st.session_state.get('api_data', {})
+        db_data_raw = get_payload('db_data', {})
+        api_data_raw = get_payload('api_data', {})
         api_data = self.convert_api_to_ui_format(self.extract_api_data_from_delta(api_data_raw))
         db_data = convert_db_to_api_format(db_data_raw) if db_data_raw else {}
         
@@ -768,7 +766,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                                 video['comments'] = video_with_comments['comments']
                         
                         # Update the session state with new data
-                        st.session_state['api_data'] = updated_api_data
+                        set_payload('api_data', updated_api_data)
                         
                         # Recount videos with comments and total comments
                         videos_with_comments = 0
@@ -810,7 +808,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
     def save_data(self):
         """Save collected data to the database."""
         # Get API data from session state
-        api_data = st.session_state.get('api_data', {})
+        api_data = get_payload('api_data', {})
         
         if not api_data:
             st.error("No data to save.")
@@ -827,7 +825,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                     return
             
             # Update the video and comment data
-            videos_data = st.session_state.get('videos_data', [])
+            videos_data = get_payload('videos_data', [])
             if videos_data:
                 api_data['video_id'] = videos_data
             
@@ -864,7 +862,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
     def store_video_data_in_session(self, video_response):
         """Store video data in session state for use in later steps."""
         if video_response and 'video_id' in video_response:
-            st.session_state['videos_data'] = video_response['video_id']
+            set_payload('videos_data', video_response['video_id'])
     
     def render_current_step(self):
         """
@@ -944,11 +942,8 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
                 videos = video_response.get('video_id', [])
                 debug_log_with_time(f"[WORKFLOW] Found {len(videos)} videos in response")
                 
-                # Process videos for display
-                process_video_data(videos)
-                # Fix missing fields in videos
-                for video in videos:
-                    fix_missing_views(video)
+                # Normalize videos for display
+                video_response['video_id'] = standardize_video_data(videos)
                 # Update video data in session_state
                 self.store_video_data_in_session(video_response)
                 
@@ -1009,7 +1004,7 @@ class RefreshChannelWorkflow(BaseCollectionWorkflow):
         import streamlit as st
         channel_id = st.session_state.get('existing_channel_id')
         if channel_id:
-            st.session_state['api_data'] = {}
+            set_payload('api_data', {})
             st.session_state['api_last_error'] = None
             # Set a flag to trigger API fetch in the next run
             st.session_state['refresh_api_fetch'] = True
@@ -3,6 +3,7 @@ Session state management for data collection UI.
 Handles initialization and toggling of session state variables.
 """
 import streamlit as st
+from src.utils.session_budget import pop_payload
 import logging
 from src.utils.debug_utils import debug_log
 
@@ -80,7 +81,7 @@ def reset_collection_state():
         st.session_state.collection_mode = "new_channel"
         
     if 'channel_info_temp' in st.session_state:
-        del st.session_state.channel_info_temp
+        pop_payload('channel_info_temp')
     if 'current_channel_data' in st.session_state:
         del st.session_state.current_channel_data
     if 'previous_channel_data' in st.session_state:
@@ -3,6 +3,7 @@ Collection steps UI components for data collection.
 Provides functions to render the step-by-step data collection workflow.
 """
 import streamlit as st
+from src.utils.session_budget import get_payload, set_payload, pop_payload
 import pandas as pd
 from datetime import datetime
 from src.utils.debug_utils import debug_log
@@ -25,7 +26,7 @@ def render_collection_steps(channel_input, youtube_service):
     debug_log(f"[UI DEBUG] session_state: {dict(st.session_state)}")
     
     # Get the channel info from session state with safe access
-    channel_info = st.session_state.get('channel_info_temp')
+    channel_info = get_payload('channel_info_temp')
     
     # Safety check - if channel_info is None, show an error and return
     if channel_info is None:
@@ -33,7 +34,7 @@ def render_collection_steps(channel_input, youtube_service):
         if st.button("Return to channel entry"):
             # Clear temp state and force a rerun
             if 'channel_info_temp' in st.session_state:
-                del st.session_state['channel_info_temp']
+                pop_payload('channel_info_temp')
             st.rerun()
         return
     
@@ -128,7 +129,7 @@ def render_collection_steps(channel_input, youtube_service):
                     )
                     
                     if updated_channel_info and 'video_id' in updated_channel_info:
-                        st.session_state.channel_info_temp = updated_channel_info
+                        set_payload('channel_info_temp', updated_channel_info)
                         st.session_state.current_channel_data = updated_channel_info
                         st.session_state.videos_fetched = True
                         st.session_state.show_all_videos = False
@@ -347,7 +348,7 @@ def render_collection_steps(channel_input, youtube_service):
                                         st.session_state.show_all_videos = False
                                         st.session_state.collection_mode = "new_channel"
                                         if 'channel_info_temp' in st.session_state:
-                                            del st.session_state.channel_info_temp
+                                            pop_payload('channel_info_temp')
                                         if 'current_channel_data' in st.session_state:
                                             del st.session_state.current_channel_data
                                         if 'previous_channel_data' in st.session_state:
@@ -518,7 +519,7 @@ def render_collection_steps(channel_input, youtube_service):
                     # Always pass the current channel_info (with video_id) as existing_data
                     updated_channel_info = youtube_service.collect_channel_data(channel_input, options, existing_data=channel_info)
                     if updated_channel_info:
-                        st.session_state.channel_info_temp = updated_channel_info
+                        set_payload('channel_info_temp', updated_channel_info)
                         st.session_state.current_channel_data = updated_channel_info
                         st.session_state.comments_fetched = True
                         st.rerun()
@@ -561,7 +562,7 @@ def render_collection_steps(channel_input, youtube_service):
                 updated_channel_info = youtube_service.collect_channel_data(channel_input, options, existing_data=channel_info)
                 
                 if updated_channel_info and 'video_id' in updated_channel_info:
-                    st.session_state.channel_info_temp = updated_channel_info
+                    set_payload('channel_info_temp', updated_channel_info)
                     st.session_state.current_channel_data = updated_channel_info
                     st.session_state.videos_fetched = True
                     
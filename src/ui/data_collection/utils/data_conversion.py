@@ -2,6 +2,7 @@
 Data conversion utilities for the data collection UI.
 """
 from src.utils.debug_utils import debug_log
+from src.utils.video_standardizer import COLLECTION_VIDEO_FIELDS, normalize_videos
 
 def convert_db_to_api_format(db_data):
     """
@@ -137,46 +138,9 @@ def convert_db_to_api_format(db_data):
                 api_format['playlist_id'] = playlists['uploads']
                 debug_log(f"Mapped playlist_id from nested channel_info: {playlists['uploads']}")
 
-    # --- Video data mapping (unchanged) ---
+    # --- Video data mapping ---
     if 'videos' in db_data and isinstance(db_data['videos'], list):
-        api_format['video_id'] = []
-        for video in db_data['videos']:
-            video_item = {}
-            if 'id' in video:
-                video_item['video_id'] = video['id']
-            if 'snippet' in video:
-                snippet = video['snippet']
-                if 'title' in snippet:
-                    video_item['title'] = snippet['title']
-                if 'description' in snippet:
-                    video_item['video_description'] = snippet['description']
-                if 'publishedAt' in snippet:
-                    video_item['published_at'] = snippet['publishedAt']
-                    try:
-                        video_item['published_date'] = snippet['publishedAt'].split('T')[0]
-                    except (IndexError, AttributeError):
-                        pass
-            if 'statistics' in video:
-                stats = video['statistics']
-                if 'viewCount' in stats:
-                    video_item['views'] = stats['viewCount']
-                if 'likeCount' in stats:
-                    video_item['likes'] = stats['likeCount']
-                if 'commentCount' in stats:
-                    video_item['comment_count'] = stats['commentCount']
-            if 'contentDetails' in video and 'duration' in video['contentDetails']:
-                video_item['duration'] = video['contentDetails']['duration']
-            if 'snippet' in video and 'thumbnails' in video['snippet']:
-                thumbs = video['snippet']['thumbnails']
-                if 'maxres' in thumbs:
-                    video_item['thumbnails'] = thumbs['maxres'].get('url', '')
-                elif 'high' in thumbs:
-                    video_item['thumbnails'] = thumbs['high'].get('url', '')
-                elif 'medium' in thumbs:
-                    video_item['thumbnails'] = thumbs['medium'].get('url', '')
-                elif 'default' in thumbs:
-                    video_item['thumbnails'] = thumbs['default'].get('url', '')
-            api_format['video_id'].append(video_item)
+        api_format['video_id'] = normalize_videos(db_data['videos'], COLLECTION_VIDEO_FIELDS, keep_other_keys=False)
         debug_log(f"Converted {len(api_format['video_id'])} videos from database format.")
     elif 'video_id' in db_data and isinstance(db_data['video_id'], list):
         api_format['video_id'] = db_data['video_id']
@@ -8,6 +8,7 @@ import time
 from src.utils.cache_utils import clear_cache
 from src.utils.debug_utils import debug_log, get_ui_freeze_report, initialize_performance_and_debug_state, ensure_debug_panel_state
 from src.utils.debug_tools import log_app_state, format_duration_bar, get_performance_summary
+from src.utils.metrics import get_metrics_registry
 from src.config import Settings
 from src.ui.components.ui_utils import render_template_as_markdown
 from dotenv import find_dotenv, set_key
@@ -282,7 +283,34 @@ def render_utilities_tab():
                             st.error("❌ There was an error clearing the database. Please check the logs for details.")
     except Exception as e:
         st.error(f"Error in Database Management Tools section: {e}")
-    
+
+    # Background refresh scheduler jobs
+    st.divider()
+    try:
+        with st.expander("Refresh Scheduler", expanded=False):
+            from src.config import SQLITE_DB_PATH
+            from src.database.sqlite import SQLiteDatabase
+            from src.services.refresh_scheduler import SCHEDULER_QUOTA_BUDGET
+            from src.utils.metrics import current_quota_day
+
+            st.write("""
+            Channels with a refresh policy are refreshed in the background by
+            `python -m src.services.refresh_scheduler run`. Its recent jobs are shown below.
+            """)
+            db = SQLiteDatabase(SQLITE_DB_PATH)
+            quota_used = db.scheduler_repository.get_quota_used(current_quota_day())
+            st.metric("Scheduler quota used today", f"{quota_used:,} / {SCHEDULER_QUOTA_BUDGET:,}")
+
+            jobs = db.get_refresh_jobs(limit=50)
+            if jobs:
+                columns = ['id', 'channel_id', 'channel_title', 'status', 'score', 'quota_estimate',
+                           'quota_used', 'videos', 'queued_at', 'finished_at', 'error']
+                st.dataframe(pd.DataFrame(jobs)[columns], use_container_width=True, hide_index=True)
+            else:
+                st.info("No refresh jobs have run yet.")
+    except Exception as e:
+        st.error(f"Error in Refresh Scheduler section: {e}")
+
     # Add a new section for API key management
     st.divider()
     try:
@@ -525,18 +553,9 @@ def render_utilities_tab():
                     'critical': critical_threshold
                 }
                 st.success("Performance thresholds updated")
-    if show_metrics and 'performance_metrics' in st.session_state:
+    if show_metrics:
         st.subheader("Recent Performance Metrics")
-        performance_df = get_ui_freeze_report()
-        if not performance_df.empty:
-            st.dataframe(performance_df, use_container_width=True)
-            if st.button("Clear Performance Data"):
-                st.session_state.performance_metrics = {}
-                st.session_state.ui_timing_metrics = []
-                st.success("Performance data cleared")
-                st.rerun()
-        else:
-            st.info("No performance metrics collected yet. Enable debug mode and use the app to generate metrics.")
+        show_debug_metrics()
     if 'debug_mode' in st.session_state and st.session_state.debug_mode:
         st.subheader("Debug Actions")
         # Create columns for buttons
@@ -599,7 +618,8 @@ def render_utilities_tab():
                                 st.json(values)
         
         # Add advanced performance metrics visualization
-        if 'performance_metrics' in st.session_state and st.session_state.performance_metrics:
+        latency_metrics = get_metrics_registry().snapshot()['histograms']
+        if latency_metrics:
             st.subheader("Advanced Performance Metrics")
             
             # Get performance summary
@@ -631,15 +651,14 @@ def render_utilities_tab():
             
             # Convert metrics to a dataframe format that's easier to display
             metrics_list = []
-            for key, metric in st.session_state.performance_metrics.items():
-                if isinstance(metric, dict):
-                    operation = {
-                        'Operation': metric.get('tag', 'Unknown'),
-                        'Duration': metric.get('duration', 0),
-                        'Timestamp': metric.get('timestamp', 0),
-                        'Message': metric.get('message', '')
-                    }
-                    metrics_list.append(operation)
+            for metric in latency_metrics:
+                label = ', '.join(f"{k}={v}" for k, v in metric['labels'].items())
+                metrics_list.append({
+                    'Operation': f"{metric['name']} ({label})" if label else metric['name'],
+                    'Duration': metric['p95'],
+                    'Timestamp': metric['last_observed_at'],
+                    'Message': f"p95 of {metric['count']} runs, max {metric['max']:.3f}s"
+                })
             
             # Sort by duration (slowest first)
             metrics_list.sort(key=lambda x: x['Duration'], reverse=True)
@@ -689,14 +708,60 @@ def render_utilities_tab():
         render_debug_panel()
 
 def show_debug_metrics():
-    """Show debug metrics from the performance monitor"""
+    """Show latency, counter and quota metrics from the process-wide metrics registry"""
     try:
-        # Get any UI freeze reports
-        freezes = get_ui_freeze_report()
-        # Display the freezes report
-        if freezes:
-            st.dataframe(freezes)
-        else:
-            st.info("No performance issues detected")
+        registry = get_metrics_registry()
+        snapshot = registry.snapshot()
+        if not any(snapshot.values()):
+            st.info("No performance metrics collected yet. Use the app to generate metrics.")
+            return
+        
+        # Quota gauges first, they are what users run out of
+        gauges = {entry['name']: entry['value'] for entry in snapshot['gauges'] if not entry['labels']}
+        if 'youtube_api_quota_used_today' in gauges:
+            quota_col1, quota_col2 = st.columns(2)
+            quota_col1.metric("API Quota Used Today", f"{int(gauges['youtube_api_quota_used_today']):,}")
+            quota_col2.metric("API Quota Remaining", f"{int(gauges.get('youtube_api_quota_remaining', 0)):,}")
+        
+        if snapshot['histograms']:
+            st.write("**Latency by operation (all sessions):**")
+            latency_df = pd.DataFrame([
+                {
+                    'Metric': entry['name'],
+                    'Labels': ', '.join(f"{k}={v}" for k, v in entry['labels'].items()),
+                    'Count': entry['count'],
+                    'p50 (s)': round(entry['p50'], 4),
+                    'p95 (s)': round(entry['p95'], 4),
+                    'p99 (s)': round(entry['p99'], 4),
+                    'Max (s)': round(entry['max'], 4)
+                }
+                for entry in snapshot['histograms']
+            ]).sort_values('p95 (s)', ascending=False)
+            st.dataframe(latency_df, use_container_width=True, hide_index=True)
+        
+        other_values = snapshot['counters'] + [entry for entry in snapshot['gauges'] if entry['labels']]
+        if other_values:
+            st.write("**Counters and gauges:**")
+            st.dataframe(pd.DataFrame([
+                {
+                    'Metric': entry['name'],
+                    'Labels': ', '.join(f"{k}={v}" for k, v in entry['labels'].items()),
+                    'Value': entry['value']
+                }
+                for entry in other_values
+            ]), use_container_width=True, hide_index=True)
+        
+        export_col1, export_col2, export_col3 = st.columns(3)
+        with export_col1:
+            st.download_button("Download Prometheus Text", registry.to_prometheus(),
+                               file_name="ytdatahub_metrics.prom", mime="text/plain")
+        with export_col2:
+            st.download_button("Download JSON", registry.to_json(),
+                               file_name="ytdatahub_metrics.json", mime="application/json")
+        with export_col3:
+            if st.button("Clear Performance Data"):
+                registry.reset()
+                st.success("Performance data cleared")
+                st.rerun()
     except Exception as e:
-        st.error(f"Error showing debug metrics: {e}")
\ No newline at end of file
+        st.error(f"Error showing debug metrics: {e}")
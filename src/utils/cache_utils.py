@@ -5,15 +5,212 @@ import os
 import sys
 import shutil
 import logging
-from typing import Dict, Any, Optional
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Hashable, Tuple
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 
 # Import utility functions
 from src.utils.logging_utils import debug_log
+from src.utils.metrics import get_metrics_registry
+
+# Memory budget of the process-wide analysis cache (override with YTDATAHUB_ANALYSIS_CACHE_MB)
+ANALYSIS_CACHE_MAX_MB = int(os.getenv('YTDATAHUB_ANALYSIS_CACHE_MB', '512'))
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+    
+    DataFrames, Series and NumPy arrays report their own memory usage;
+    containers and slotted/plain objects are walked a few levels deep.
+    
+    Args:
+        obj: Value to measure
+        
+    Returns:
+        Approximate size in bytes
+    """
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'columns'):
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'index'):
+        return int(obj.memory_usage(deep=True))
+    if hasattr(obj, 'nbytes') and hasattr(obj, 'dtype'):
+        return int(obj.nbytes)
+    size = sys.getsizeof(obj)
+    if _depth >= 4:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _depth + 1) for item in obj)
+    if hasattr(obj, '__slots__'):
+        return size + sum(estimate_size(getattr(obj, slot, None), _depth + 1) for slot in obj.__slots__)
+    if hasattr(obj, '__dict__'):
+        return size + estimate_size(vars(obj), _depth + 1)
+    return size
+
+
+class AnalysisCache:
+    """
+    Process-wide LRU cache for analysis results, shared by all sessions.
+    
+    Entries are keyed by (channel_id, data_version, function, params). The
+    cache evicts least recently used entries once the estimated size exceeds
+    the memory budget, computes each missing key only once even when several
+    sessions ask for it concurrently, and drops a channel's entries when the
+    repositories report that the channel was saved.
+    """
+    
+    def __init__(self, max_bytes: int = ANALYSIS_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._pending: Dict[Tuple, threading.Event] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(channel_id: Hashable, data_version: Hashable, function: str, params: Tuple = ()) -> Tuple:
+        """Build a cache key from its components."""
+        return (channel_id, data_version, function, tuple(params))
+    
+    def get(self, key: Tuple, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            return default
+    
+    def put(self, key: Tuple, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay within budget.
+        
+        Args:
+            key: Cache key from make_key
+            value: Value to cache
+            generation: Channel generation observed before computing the value;
+                the value is discarded if the channel was invalidated meanwhile
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key[0], 0):
+                return
+            if size > self.max_bytes:
+                return
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a key, computing and caching it on a miss.
+        
+        Concurrent callers for the same missing key wait for the first one
+        instead of computing the value again.
+        """
+        sentinel = object()
+        with self._lock:
+            value = self.get(key, sentinel)
+            if value is not sentinel:
+                return value
+            self.misses += 1
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._pending[key] = event
+            generation = self._generations.get(key[0], 0)
+        
+        if not owner:
+            event.wait()
+            value = self.get(key, sentinel)
+            return compute() if value is sentinel else value
+        
+        try:
+            value = compute()
+            self.put(key, value, generation)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+    
+    def invalidate_channel(self, channel_id: Hashable) -> int:
+        """
+        Drop every entry cached for a channel.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generations[channel_id] = self._generations.get(channel_id, 0) + 1
+            stale = [key for key in self._entries if key[0] == channel_id]
+            for key in stale:
+                self.current_bytes -= self._entries.pop(key)[1]
+        return len(stale)
+    
+    def clear(self) -> int:
+        """Drop all entries and return how many were removed."""
+        with self._lock:
+            removed = len(self._entries)
+            for channel_id in {key[0] for key in self._entries}:
+                self._generations[channel_id] = self._generations.get(channel_id, 0) + 1
+            self._entries.clear()
+            self.current_bytes = 0
+        return removed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+_analysis_cache = AnalysisCache()
+
+
+def _analysis_cache_metrics():
+    """Report the analysis cache statistics as gauges of the metrics registry."""
+    return [(f'analysis_cache_{name}', value, {}) for name, value in _analysis_cache.stats().items()]
+
+
+get_metrics_registry().register_collector(_analysis_cache_metrics)
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide analysis cache."""
+    return _analysis_cache
+
+
+def invalidate_channel_cache(channel_id: Hashable) -> int:
+    """
+    Drop cached analysis results for a channel after its data changed.
+    
+    Called by the repositories whenever a channel is saved.
+    """
+    if not channel_id:
+        return 0
+    removed = _analysis_cache.invalidate_channel(channel_id)
+    if removed:
+        debug_log(f"Invalidated {removed} cached analysis results for channel {channel_id}")
+    return removed
 
 def clear_cache(clear_api_cache: bool = True, 
                 clear_python_cache: bool = True, 
@@ -48,6 +245,9 @@ def clear_cache(clear_api_cache: bool = True,
             cache_size = len(st.session_state.api_cache)
             st.session_state.api_cache = {}
         
+        # Analysis results are shared by all sessions and computed on demand
+        cache_size += _analysis_cache.clear()
+        
         results["api_cache_cleared"] = True
         results["total_items_cleared"] += cache_size
         
@@ -8,6 +8,8 @@ from datetime import datetime
 import json
 import logging
 
+from src.utils.video_standardizer import extract_video_id
+
 # Set up simple logging
 logger = logging.getLogger(__name__)
 
@@ -75,10 +77,10 @@ def normalize_channel_data_for_save(channel_data, workflow_type="unknown"):
     normalized['fetched_at'] = _normalize_timestamp(channel_data.get('fetched_at') or datetime.now().isoformat())
     normalized['updated_at'] = _normalize_timestamp(datetime.now().isoformat())
     
-    # --- Video data (simple handling without external dependencies) ---
+    # --- Video data (stored by ID) ---
     videos = _extract_videos(channel_data)
     if videos:
-        normalized['video_id'] = _standardize_videos_simple(videos)
+        normalized['video_id'] = _video_ids(videos)
         logger.info(f"normalize_channel_data_for_save ({workflow_type}): Normalized {len(normalized['video_id'])} videos")
     else:
         normalized['video_id'] = []
@@ -277,31 +279,11 @@ def _extract_videos(data):
     
     return videos
 
-def _standardize_videos_simple(videos):
-    """Simple video standardization without external dependencies."""
-    if not videos:
-        return []
-    
-    # If it's already a list of video IDs, return as-is
-    if all(isinstance(v, str) for v in videos):
-        return videos
-    
-    # If it's a list of video objects, extract IDs
-    video_ids = []
-    for video in videos:
-        if isinstance(video, dict):
-            video_id = (
-                video.get('video_id') or
-                video.get('id') or
-                video.get('snippet', {}).get('resourceId', {}).get('videoId') or
-                ''
-            )
-            if video_id:
-                video_ids.append(video_id)
-        elif isinstance(video, str):
-            video_ids.append(video)
-    
-    return video_ids
+def _video_ids(videos):
+    """Reduce videos in any shape, or their IDs, to the list of video IDs."""
+    video_ids = [video if isinstance(video, str) else extract_video_id(video)
+                 for video in videos if isinstance(video, (str, dict))]
+    return [video_id for video_id in video_ids if video_id]
 
 def _normalize_integer_field(data, field_names, default=0):
     """Extract and normalize an integer field from various possible locations."""
@@ -198,42 +198,30 @@ def get_performance_summary() -> Dict[str, Any]:
             'active_operations': list(timers.keys())
         }
     
-    # Get performance metrics
-    if 'performance_metrics' in st.session_state:
-        metrics = st.session_state.performance_metrics
-        if isinstance(metrics, dict):
-            total_time = 0
-            warning_count = 0
-            critical_count = 0
-            
-            for key, metric in metrics.items():
-                if isinstance(metric, dict) and 'duration' in metric:
-                    duration = metric['duration']
-                    total_time += duration
-                    
-                    if 'warning_threshold' in metric and duration >= metric['warning_threshold']:
-                        warning_count += 1
-                    elif duration >= 1.0:  # Default warning threshold
-                        warning_count += 1
-                        
-                    if 'critical_threshold' in metric and duration >= metric['critical_threshold']:
-                        critical_count += 1
-                    elif duration >= 3.0:  # Default critical threshold
-                        critical_count += 1
-            
-            result['metrics'] = {
-                'count': len(metrics),
-                'total_time': total_time,
-                'warning_count': warning_count,
-                'critical_count': critical_count,
-                'avg_time': total_time / len(metrics) if metrics else 0
-            }
-            
-            result['summary'] = {
-                'total_measurements': len(metrics),
-                'warning_count': warning_count,
-                'critical_count': critical_count,
-                'avg_operation_time': round(total_time / len(metrics) if metrics else 0, 3)
-            }
+    # Get latency metrics aggregated across sessions by the metrics registry
+    from src.utils.metrics import get_metrics_registry
+    histograms = get_metrics_registry().snapshot()['histograms']
+    if histograms:
+        total_time = sum(entry['sum'] for entry in histograms)
+        total_count = sum(entry['count'] for entry in histograms)
+        # An operation counts as slow when its 95th percentile crosses a threshold
+        warning_count = sum(1 for entry in histograms if entry['p95'] >= 1.0)
+        critical_count = sum(1 for entry in histograms if entry['p95'] >= 3.0)
+        
+        result['metrics'] = {
+            'count': total_count,
+            'operations': len(histograms),
+            'total_time': total_time,
+            'warning_count': warning_count,
+            'critical_count': critical_count,
+            'avg_time': total_time / total_count if total_count else 0
+        }
+        
+        result['summary'] = {
+            'total_measurements': total_count,
+            'warning_count': warning_count,
+            'critical_count': critical_count,
+            'avg_operation_time': round(total_time / total_count if total_count else 0, 3)
+        }
     
     return result
@@ -5,14 +5,14 @@ This module contains functions for debugging and logging.
 import sys
 import time
 import logging
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 from typing import Any, Dict, Optional, List, Union
-from src.utils.performance_tracking import start_timer, end_timer
+from src.utils.performance_tracking import start_timer, end_timer, OPERATION_HISTOGRAM
+from src.utils.metrics import get_metrics_registry
 from src.utils.log_level_helper import get_log_level_int
+from src.utils.log_core import (
+    Message, append_to_buffer, ensure_console_handler, infer_level, is_enabled, render_message
+)
 
 # Message type indicators for better visual distinction
 DEBUG_INDICATORS = {
@@ -83,34 +83,22 @@ def get_indicator(message: str) -> str:
     else:
         return DEBUG_INDICATORS['info']
 
-def debug_log(message: str, data: Any = None, performance_tag: str = None):
+def debug_log(message: Message, data: Any = None, performance_tag: str = None, level: Optional[int] = None):
     """
     Log debug messages to server console if debug mode is enabled
-    Also append to st.session_state['ui_debug_logs'] if it exists, for UI visibility.
+    Also append to the st.session_state['ui_debug_logs'] ring buffer, for UI visibility.
+    
+    The level is checked against the session settings and the calling
+    module's logger before the message is formatted, so pass a callable
+    for messages that are expensive to build.
     
     Args:
-        message: The message to log
+        message: The message to log, or a callable returning it
         data: Optional data to include with the log
         performance_tag: Optional tag for performance tracking
+        level: Optional logging level; error messages are logged at ERROR and others at DEBUG by default
     """
-    # Add an appropriate indicator symbol based on message content
-    indicator = get_indicator(message)
-    enhanced_message = f"{indicator}{message}"
-    
-    # Append to UI debug logs for Streamlit UI regardless of log level
-    try:
-        if STREAMLIT_AVAILABLE and hasattr(st, 'session_state'):
-            if 'ui_debug_logs' not in st.session_state:
-                st.session_state['ui_debug_logs'] = []
-            st.session_state['ui_debug_logs'].append(enhanced_message)
-            # Also append to debug_logs for backward compatibility
-            if 'debug_logs' not in st.session_state:
-                st.session_state['debug_logs'] = []
-            st.session_state['debug_logs'].append(enhanced_message)
-    except Exception:
-        pass
-    # Always print to console
-    print(enhanced_message, file=sys.stderr)
+    module = sys._getframe(1).f_globals.get('__name__', __name__)
     
     # In test environments, st.session_state might not be available, so we need fallbacks
     if 'pytest' in sys.modules:
@@ -160,6 +148,7 @@ def debug_log(message: str, data: Any = None, performance_tag: str = None):
                     
                     # Remove the timer after use
                     del mock_session_state.performance_timers[tag]
+                    get_metrics_registry().observe(OPERATION_HISTOGRAM, elapsed, operation=tag)
                     
                     # Check for threshold violations and log warnings
                     if hasattr(mock_session_state, 'ui_freeze_thresholds'):
@@ -201,14 +190,21 @@ def debug_log(message: str, data: Any = None, performance_tag: str = None):
             return
     
     # Regular debug logging (no performance tagging)
-    # Convert log_level to integer using the helper
-    log_level_int = get_log_level_int(log_level)
+    if level is None:
+        level = infer_level(message)
+    if not is_enabled(module, level, debug_mode, log_level):
+        return
+    
+    text = render_message(message, data)
+    ensure_console_handler()
+    logging.getLogger(module).log(level, text)
     
-    if debug_mode and log_level_int <= logging.DEBUG:
-        if data is not None:
-            logging.debug(f"{message}: {data}")
-        else:
-            logging.debug(message)
+    # Keep the most recent messages for the UI debug panel
+    try:
+        if STREAMLIT_AVAILABLE and hasattr(st, 'session_state'):
+            append_to_buffer(st.session_state, f"{get_indicator(text)}{text}")
+    except Exception:
+        pass
 
 def log_error(message: str, error: Exception = None):
     """
@@ -318,21 +314,20 @@ def get_ui_freeze_report():
         return []
     
     # Normal (non-test) environment
-    # Access performance metrics from session state
-    if 'performance_metrics' not in st.session_state:
-        return []
-    
-    # Look for operations that took more than 1 second (potential UI freezes)
+    # Operations whose slowest run took more than 1 second (potential UI freezes),
+    # aggregated across all sessions by the metrics registry
     freezes = []
-    for key, metric in st.session_state.performance_metrics.items():
-        # Only consider metrics with duration (time taken)
-        if 'duration' in metric and metric['duration'] > 1.0:
-            freezes.append({
-                'tag': metric.get('tag', 'unknown'),
-                'duration': metric['duration'],
-                'timestamp': metric.get('timestamp', 0),
-                'severity': 'high' if metric['duration'] > 3.0 else 'medium' if metric['duration'] > 2.0 else 'low'
-            })
+    for entry in get_metrics_registry().snapshot()['histograms']:
+        if entry['name'] != OPERATION_HISTOGRAM or entry['max'] <= 1.0:
+            continue
+        freezes.append({
+            'tag': entry['labels'].get('operation', 'unknown'),
+            'duration': entry['max'],
+            'p95': entry['p95'],
+            'count': entry['count'],
+            'timestamp': entry['last_observed_at'],
+            'severity': 'high' if entry['max'] > 3.0 else 'medium' if entry['max'] > 2.0 else 'low'
+        })
     
     # Sort by duration (longest first)
     return sorted(freezes, key=lambda x: x['duration'], reverse=True)
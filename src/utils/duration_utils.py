@@ -2,30 +2,106 @@
 Utility functions for handling and formatting time durations.
 """
 import re
+import math
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-def parse_duration_with_regex(duration_str: str) -> int:
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas is imported by the vectorized helpers on first use
+    import pandas as pd
+
+# ISO 8601 durations as returned by the API: weeks, days and a time part with
+# optional fractional seconds (e.g. 'P1W2DT3H4M5.5S'). The leading P and the T
+# separator are optional so bare values such as '4M5S' still parse.
+_ISO_DURATION_PATTERN = (
+    r'^\s*P?(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?'
+    r'T?(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?\s*$'
+)
+_ISO_DURATION_RE = re.compile(_ISO_DURATION_PATTERN)
+
+# Seconds per pattern group
+_DURATION_UNITS = (('weeks', 604800), ('days', 86400), ('hours', 3600), ('minutes', 60), ('seconds', 1))
+
+# Distinct duration strings remembered by parse_duration_with_regex
+DURATION_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=DURATION_CACHE_SIZE)
+def _parse_iso_duration(duration_str: str) -> int:
+    match = _ISO_DURATION_RE.match(duration_str)
+    if not match:
+        return 0
+    total = sum(float(match.group(name) or 0) * unit for name, unit in _DURATION_UNITS)
+    # Round fractional seconds half up
+    return int(total + 0.5)
+
+def parse_duration_with_regex(duration_str) -> int:
     """
     Parse YouTube duration string (ISO 8601) to seconds using regex
-    Example: 'PT1H2M3S' -> 3723 seconds
+    Example: 'PT1H2M3S' -> 3723 seconds, 'P1DT1S' -> 86401 seconds
+    
+    Results are memoized per distinct string (see duration_cache_info), and
+    numbers are taken to already be seconds.
+    
+    Args:
+        duration_str: Duration string, number of seconds or None
+        
+    Returns:
+        int: Seconds, 0 for empty or invalid durations
     """
     if not duration_str:
         return 0
+    if isinstance(duration_str, str):
+        return _parse_iso_duration(duration_str)
+    if isinstance(duration_str, (int, float, np.number)) and not math.isnan(duration_str):
+        return max(int(duration_str + 0.5), 0)
+    return 0
+
+def duration_cache_info():
+    """Get the hit/miss statistics of the parse_duration_with_regex memo"""
+    return _parse_iso_duration.cache_info()
+
+def clear_duration_cache() -> None:
+    """Empty the parse_duration_with_regex memo"""
+    _parse_iso_duration.cache_clear()
+
+def durations_to_seconds(durations) -> 'pd.Series':
+    """
+    Vectorized conversion of YouTube durations (ISO 8601) to seconds.
+    Example: pd.Series(['PT1H2M3S', 'PT45S']) -> pd.Series([3723, 45])
     
-    # Extract hours, minutes, and seconds with regex
-    hours = re.search(r'(\d+)H', duration_str)
-    minutes = re.search(r'(\d+)M', duration_str)
-    seconds = re.search(r'(\d+)S', duration_str)
-    
-    # Convert to seconds
-    total_seconds = 0
-    if hours:
-        total_seconds += int(hours.group(1)) * 3600
-    if minutes:
-        total_seconds += int(minutes.group(1)) * 60
-    if seconds:
-        total_seconds += int(seconds.group(1))
-    
-    return total_seconds
+    Each distinct value is parsed once with the same pattern as
+    parse_duration_with_regex; numeric values (such as a stored
+    duration_seconds column) are passed through as seconds.
+    
+    Args:
+        durations: Series, NumPy array or list of durations (missing values count as 0)
+        
+    Returns:
+        pd.Series: int64 seconds aligned with the input
+    """
+    import pandas as pd
+    
+    if not isinstance(durations, pd.Series):
+        if not isinstance(durations, (list, tuple, np.ndarray)):
+            durations = list(durations)
+        durations = pd.Series(durations, dtype='object')
+    codes, uniques = pd.factorize(durations)
+    uniques = pd.Series(uniques, dtype='object')
+    
+    is_text = uniques.map(lambda value: isinstance(value, str)).astype(bool)
+    parts = uniques[is_text].astype(str).str.extract(_ISO_DURATION_PATTERN)
+    parts = parts.apply(pd.to_numeric, errors='coerce').fillna(0)
+    seconds = pd.Series(0.0, index=uniques.index)
+    seconds[is_text] = sum(parts[name] * unit for name, unit in _DURATION_UNITS)
+    seconds[~is_text] = pd.to_numeric(uniques[~is_text], errors='coerce').fillna(0)
+    unique_seconds = np.floor(seconds.to_numpy(dtype='float64') + 0.5).clip(min=0).astype('int64')
+    
+    values = np.zeros(len(codes), dtype='int64')
+    found = codes >= 0
+    values[found] = unique_seconds[codes[found]]
+    return pd.Series(values, index=durations.index, dtype='int64')
 
 def duration_to_seconds(duration):
     """Convert YouTube duration format (PT1H2M3S) to seconds"""
@@ -60,6 +136,26 @@ def format_duration(duration):
     # For longer videos, use H:MM:SS format (no leading zero for hours)
     return f"{hours}:{minutes:02d}:{secs:02d}"
 
+def format_durations(seconds) -> 'pd.Series':
+    """
+    Vectorized version of format_duration for a Series of seconds.
+    
+    Args:
+        seconds: Series of durations in seconds
+        
+    Returns:
+        pd.Series: Strings formatted as H:MM:SS or M:SS ("0:00" for empty durations)
+    """
+    import pandas as pd
+    
+    seconds = pd.to_numeric(pd.Series(seconds), errors='coerce').fillna(0).clip(lower=0).astype('int64')
+    hours = seconds // 3600
+    minutes = (seconds % 3600) // 60
+    secs = (seconds % 60).astype(str).str.zfill(2)
+    short = minutes.astype(str) + ':' + secs
+    long = hours.astype(str) + ':' + minutes.astype(str).str.zfill(2) + ':' + secs
+    return short.where(hours == 0, long)
+
 def format_duration_human_friendly(seconds):
     """
     Format seconds into a human-friendly duration string.
@@ -1,7 +1,6 @@
 """
 Formatting utilities for the YouTube Data Hub application.
 """
-import re
 from typing import Optional, Union, Dict, Any
 from datetime import timedelta
 
@@ -53,59 +52,6 @@ def format_number(num: Union[int, str, float, None]) -> str:
     except:
         return str(num)
 
-def format_duration(duration_str: Optional[str]) -> str:
-    """
-    Format YouTube duration string into human-readable format
-    
-    Args:
-        duration_str: YouTube duration string (e.g. PT1H30M20S)
-        
-    Returns:
-        Formatted duration string (e.g. 1:30:20)
-    """
-    if not duration_str:
-        return "0:00"
-        
-    # Extract hours, minutes, and seconds
-    hours_match = re.search(r'(\d+)H', duration_str)
-    minutes_match = re.search(r'(\d+)M', duration_str)
-    seconds_match = re.search(r'(\d+)S', duration_str)
-    
-    hours = int(hours_match.group(1)) if hours_match else 0
-    minutes = int(minutes_match.group(1)) if minutes_match else 0
-    seconds = int(seconds_match.group(1)) if seconds_match else 0
-    
-    # Format the duration
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{seconds:02d}"
-    else:
-        return f"{minutes}:{seconds:02d}"
-
-def duration_to_seconds(duration_str: Optional[str]) -> int:
-    """
-    Convert YouTube duration string to seconds
-    
-    Args:
-        duration_str: YouTube duration string (e.g. PT1H30M20S)
-        
-    Returns:
-        Duration in seconds
-    """
-    if not duration_str:
-        return 0
-        
-    # Extract hours, minutes, and seconds
-    hours_match = re.search(r'(\d+)H', duration_str)
-    minutes_match = re.search(r'(\d+)M', duration_str)
-    seconds_match = re.search(r'(\d+)S', duration_str)
-    
-    hours = int(hours_match.group(1)) if hours_match else 0
-    minutes = int(minutes_match.group(1)) if minutes_match else 0
-    seconds = int(seconds_match.group(1)) if seconds_match else 0
-    
-    # Convert to seconds
-    return hours * 3600 + minutes * 60 + seconds
-
 def format_timedelta(delta: timedelta) -> str:
     """
     Format a timedelta object into a human-readable string
@@ -0,0 +1,189 @@
+"""
+Streamlit access for code shared by the app and headless runs.
+
+Services, API clients and repositories use ``st`` from this module instead of
+importing streamlit. In the app it forwards to streamlit, which is imported on
+first use. Once set_headless() has been called (the ytdatahub CLI does so
+before importing anything else), streamlit is never imported: session state
+is a plain per-process mapping, alerts go to the current progress sink and
+placeholders and progress bars report to it as status lines. The same happens
+when streamlit is not installed.
+"""
+import functools
+import importlib.util
+import logging
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from src.utils.progress import LoggingProgressSink, ProgressSink, get_progress_sink, set_progress_sink
+
+logger = logging.getLogger(__name__)
+
+STREAMLIT_AVAILABLE = importlib.util.find_spec('streamlit') is not None
+
+_headless = not STREAMLIT_AVAILABLE
+
+# Last status line shown through a placeholder; labels progress bars that have no text
+_last_status = {'message': 'Working'}
+
+
+class HeadlessSessionState(dict):
+    """Session state of a headless run; supports attribute access like st.session_state."""
+
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+
+class _HeadlessPlaceholder:
+    """Stand-in for st.empty() and st.progress(): what it would display becomes the sink's status."""
+
+    def __init__(self):
+        self._message = ''
+
+    def _status(self, message: Any = '', *args, **kwargs) -> None:
+        self._message = _last_status['message'] = str(message).lstrip('🔄 ')
+        get_progress_sink().status(self._message)
+
+    info = text = write = markdown = caption = _status
+
+    def success(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('success', str(message))
+
+    def warning(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('warning', str(message))
+
+    def error(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('error', str(message))
+
+    def progress(self, value: float = 0, text: Optional[str] = None) -> '_HeadlessPlaceholder':
+        if text:
+            self._message = str(text)
+        # st.progress accepts a fraction or a percentage
+        fraction = value / 100 if isinstance(value, int) and value > 1 else value
+        get_progress_sink().status(self._message or _last_status['message'], fraction)
+        return self
+
+    def empty(self) -> None:
+        get_progress_sink().clear()
+
+    def __getattr__(self, name):
+        return _ignore(name)
+
+
+def _ignore(name: str):
+    def ignored(*args, **kwargs):
+        logger.debug(f"st.{name} ignored in headless mode")
+    return ignored
+
+
+def _caching_decorator(cache: bool):
+    """st.cache_resource (cached per process) or st.cache_data (not cached) for headless runs."""
+    def decorator(func=None, **options):
+        if func is None:
+            return decorator
+        return functools.lru_cache(maxsize=None)(func) if cache else func
+    return decorator
+
+
+class _HeadlessStreamlit:
+    """The parts of streamlit the services use, without streamlit."""
+
+    def __init__(self):
+        self.session_state = HeadlessSessionState()
+
+    def info(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('info', str(message))
+
+    write = text = markdown = caption = info
+
+    def success(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('success', str(message))
+
+    def warning(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('warning', str(message))
+
+    def error(self, message: Any, *args, **kwargs) -> None:
+        get_progress_sink().notify('error', str(message))
+
+    def exception(self, exception: BaseException, *args, **kwargs) -> None:
+        get_progress_sink().notify('error', str(exception))
+
+    def empty(self) -> _HeadlessPlaceholder:
+        return _HeadlessPlaceholder()
+
+    def progress(self, value: float = 0, text: Optional[str] = None) -> _HeadlessPlaceholder:
+        return _HeadlessPlaceholder().progress(value, text)
+
+    @contextmanager
+    def spinner(self, text: str = '', *args, **kwargs):
+        get_progress_sink().status(text)
+        yield
+
+    cache_resource = staticmethod(_caching_decorator(cache=True))
+    cache_data = staticmethod(_caching_decorator(cache=False))
+
+    def __getattr__(self, name):
+        return _ignore(name)
+
+
+_HEADLESS_ST = _HeadlessStreamlit()
+
+
+class _StreamlitProxy:
+    """``st`` of the shared modules: streamlit in the app, _HeadlessStreamlit in headless runs."""
+
+    @staticmethod
+    def _target():
+        if _headless:
+            return _HEADLESS_ST
+        import streamlit
+        return streamlit
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._target(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._target(), name)
+
+    def __repr__(self):
+        return '<streamlit (headless)>' if _headless else '<streamlit (lazy)>'
+
+
+st = _StreamlitProxy()
+
+if _headless:
+    set_progress_sink(LoggingProgressSink())
+
+
+def set_headless(enabled: bool = True, sink: Optional[ProgressSink] = None) -> None:
+    """
+    Switch the shared modules to headless mode.
+
+    Args:
+        enabled: Whether to run without streamlit; ignored (always headless) when it is not installed
+        sink: Default progress sink of the process, e.g. a ConsoleProgressSink;
+            a LoggingProgressSink by default, as the Streamlit sink needs streamlit
+    """
+    global _headless
+    _headless = enabled or not STREAMLIT_AVAILABLE
+    set_progress_sink(sink or LoggingProgressSink() if _headless else sink)
+
+
+def is_headless() -> bool:
+    """Whether the shared modules run without streamlit."""
+    return _headless
@@ -0,0 +1,219 @@
+"""
+Logging core behind debug_log.
+
+Messages are checked against the session debug settings and the level of the
+calling module's logger before anything is formatted. Enabled messages are
+kept in a fixed-size ring buffer for the UI debug panel and passed to the
+standard logging tree, whose console handler sits behind a queue so writing
+to the terminal never blocks the caller.
+
+Per-module levels use the standard logger hierarchy, for example
+``YTDATAHUB_LOG_LEVELS="src.database=WARNING,src.api.youtube=INFO"``.
+"""
+import os
+import sys
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Union
+
+from src.utils.log_level_helper import get_log_level_int
+
+# Number of messages kept for the UI debug panel
+LOG_BUFFER_SIZE = int(os.getenv('YTDATAHUB_LOG_BUFFER_SIZE', '500'))
+
+# Environment variable with per-module levels
+LOG_LEVELS_ENV = 'YTDATAHUB_LOG_LEVELS'
+
+# Session state key of the UI ring buffer
+UI_LOG_BUFFER_KEY = 'ui_debug_logs'
+
+# Application modules log through the 'src' logger tree. It passes everything
+# by default so verbosity is decided by the session settings and the
+# per-module levels rather than by the root logger's WARNING default.
+APP_LOGGER_NAME = 'src'
+
+Message = Union[str, Callable[[], str]]
+
+_console_lock = threading.Lock()
+_console_listener: Optional[logging.handlers.QueueListener] = None
+_console_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def set_module_levels(levels: Union[str, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Set the log level of modules or packages.
+
+    Args:
+        levels: Mapping of module name to level, or a comma separated
+            "module=LEVEL" string as used by YTDATAHUB_LOG_LEVELS
+
+    Returns:
+        Dict[str, int]: The levels that were applied
+    """
+    if isinstance(levels, str):
+        parsed = {}
+        for item in levels.split(','):
+            name, _, level = item.partition('=')
+            if name.strip() and level.strip():
+                parsed[name.strip()] = level.strip()
+        levels = parsed
+
+    applied = {}
+    for name, level in levels.items():
+        level_int = get_log_level_int(level)
+        logging.getLogger(name).setLevel(level_int)
+        applied[name] = level_int
+    return applied
+
+
+def infer_level(message: Message) -> int:
+    """
+    Infer the level of a debug_log message that did not pass one.
+
+    Error messages in this code base are tagged "[... ERROR]" or start with
+    "Error", and should reach the console even when debug mode is off.
+
+    Args:
+        message: The message or message factory
+
+    Returns:
+        int: logging.ERROR for error messages, logging.DEBUG otherwise
+    """
+    if isinstance(message, str) and ('ERROR' in message or message.startswith('Error')):
+        return logging.ERROR
+    return logging.DEBUG
+
+
+def is_enabled(module: str, level: int, debug_mode: bool, session_level: Any) -> bool:
+    """
+    Check whether a message would be recorded, without formatting it.
+
+    Args:
+        module: Name of the calling module
+        level: Level of the message
+        debug_mode: Whether debug mode is enabled for the session
+        session_level: Log level selected in the session
+
+    Returns:
+        bool: True if the message should be formatted and recorded
+    """
+    if level < logging.WARNING and not (debug_mode and get_log_level_int(session_level) <= level):
+        return False
+    return logging.getLogger(module).isEnabledFor(level)
+
+
+def render_message(message: Message, data: Any = None) -> str:
+    """
+    Build the text of an enabled message.
+
+    Args:
+        message: The message, or a callable returning it
+        data: Optional data appended to the message
+
+    Returns:
+        str: The formatted message
+    """
+    if callable(message):
+        message = message()
+    if data is not None:
+        return f"{message}: {data}"
+    return str(message)
+
+
+def new_log_buffer(entries=()) -> deque:
+    """
+    Create a ring buffer for UI log display.
+
+    Args:
+        entries: Existing entries; only the most recent LOG_BUFFER_SIZE are kept
+
+    Returns:
+        deque: The bounded buffer
+    """
+    return deque(entries, maxlen=LOG_BUFFER_SIZE)
+
+
+def append_to_buffer(session_state: Any, entry: str, key: str = UI_LOG_BUFFER_KEY) -> None:
+    """
+    Append an entry to the session's ring buffer, creating it when missing.
+
+    A buffer left over as a plain list from an older session is converted
+    in place, keeping its most recent entries.
+
+    Args:
+        session_state: Streamlit session state
+        entry: Text to store
+        key: Session state key of the buffer
+    """
+    buffer = session_state[key] if key in session_state else None
+    if not isinstance(buffer, deque) or buffer.maxlen != LOG_BUFFER_SIZE:
+        buffer = new_log_buffer(buffer or ())
+        session_state[key] = buffer
+    buffer.append(entry)
+
+
+def install_console_handler(handler: Optional[logging.Handler] = None) -> logging.handlers.QueueHandler:
+    """
+    Route console output through a queue drained by a background thread.
+
+    Replaces the console handler installed by a previous call, so it is safe
+    to call from several entry points.
+
+    Args:
+        handler: Handler that writes to the console; a stderr StreamHandler by default
+
+    Returns:
+        logging.handlers.QueueHandler: The handler attached to the root logger
+    """
+    global _console_listener, _console_queue_handler
+
+    if handler is None:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s', datefmt='%H:%M:%S'))
+
+    with _console_lock:
+        _stop_console_listener()
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        logging.getLogger().addHandler(queue_handler)
+        _console_listener = listener
+        _console_queue_handler = queue_handler
+    return queue_handler
+
+
+def ensure_console_handler() -> None:
+    """Install the default queued console handler if none is installed yet."""
+    if _console_queue_handler is None and 'pytest' not in sys.modules:
+        install_console_handler()
+
+
+def _stop_console_listener() -> None:
+    """Flush and detach the current console handler. Caller holds _console_lock."""
+    global _console_listener, _console_queue_handler
+    if _console_queue_handler is not None:
+        logging.getLogger().removeHandler(_console_queue_handler)
+        _console_queue_handler = None
+    if _console_listener is not None:
+        _console_listener.stop()
+        _console_listener = None
+
+
+def shutdown_console_handler() -> None:
+    """Flush pending console output and stop the listener thread."""
+    with _console_lock:
+        _stop_console_listener()
+
+
+atexit.register(shutdown_console_handler)
+
+if logging.getLogger(APP_LOGGER_NAME).level == logging.NOTSET:
+    logging.getLogger(APP_LOGGER_NAME).setLevel(logging.DEBUG)
+
+if os.getenv(LOG_LEVELS_ENV):
+    set_module_levels(os.getenv(LOG_LEVELS_ENV))
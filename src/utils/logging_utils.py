@@ -6,11 +6,7 @@ import os
 import sys
 import json
 import logging
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 import time
 from datetime import datetime
 from typing import Any, Dict, Optional, List, Union
@@ -20,6 +16,7 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 from src.utils.log_level_helper import get_log_level_int
+from src.utils.log_core import install_console_handler
 
 # ANSI Color codes for terminal output
 COLORS = {
@@ -80,7 +77,8 @@ root_logger.setLevel(logging.DEBUG)
 # Remove any existing handlers
 for hdlr in root_logger.handlers[:]:
     root_logger.removeHandler(hdlr)
-root_logger.addHandler(handler)
+# Write to the console from a background thread so logging never blocks callers
+install_console_handler(handler)
 
 def initialize_performance_tracking():
     """Initialize performance tracking variables in session state."""
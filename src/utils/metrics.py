@@ -0,0 +1,489 @@
+"""
+Process-wide metrics registry for the YouTube Data Hub application.
+
+Repositories, API clients and analyzers record into one registry shared by
+all sessions, so latency distributions aggregate across users and survive
+page reloads. The registry keeps counters, gauges and latency histograms
+(p50/p95/p99 over a sliding window of recent samples) and exports them as
+Prometheus text or JSON.
+
+Usage:
+    @timed('db_operation_seconds', operation='store_channel_data')
+    def store_channel_data(...): ...
+
+    with timed('analysis_seconds', function='video_statistics'):
+        ...
+"""
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+import functools
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Number of recent samples each histogram keeps for percentiles (override with YTDATAHUB_METRICS_WINDOW)
+METRICS_WINDOW = int(os.getenv('YTDATAHUB_METRICS_WINDOW', '2048'))
+
+# Daily YouTube Data API quota of the project (override with YTDATAHUB_DAILY_QUOTA)
+YOUTUBE_DAILY_QUOTA = int(os.getenv('YTDATAHUB_DAILY_QUOTA', '10000'))
+
+# Optional exporters: a Prometheus text endpoint and a JSON file written on exit
+METRICS_PORT_ENV = 'YTDATAHUB_METRICS_PORT'
+METRICS_FILE_ENV = 'YTDATAHUB_METRICS_FILE'
+
+# Quota cost of YouTube Data API v3 methods; anything not listed costs 1 unit
+QUOTA_COSTS = {
+    'youtube.search.list': 100,
+    'youtube.videos.insert': 1600,
+    'youtube.videos.update': 50,
+    'youtube.videos.delete': 50,
+    'youtube.playlists.insert': 50,
+    'youtube.playlists.update': 50,
+    'youtube.playlists.delete': 50,
+    'youtube.playlistItems.insert': 50,
+    'youtube.playlistItems.update': 50,
+    'youtube.playlistItems.delete': 50,
+    'youtube.commentThreads.insert': 50,
+    'youtube.comments.insert': 50,
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Label sets each metric keeps (override with YTDATAHUB_METRICS_MAX_SERIES); labels
+# name operations and statuses, so anything beyond this is folded into one overflow series
+METRICS_MAX_SERIES = int(os.getenv('YTDATAHUB_METRICS_MAX_SERIES', '200'))
+OVERFLOW_KEY = (('overflow', 'true'),)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+_thread_meters = threading.local()
+
+
+class QuotaMeter:
+    """Quota units used by the API requests made on one thread while the meter is active."""
+
+    __slots__ = ('units', 'requests')
+
+    def __init__(self):
+        self.units = 0
+        self.requests = 0
+
+    def __enter__(self):
+        meters = getattr(_thread_meters, 'active', None)
+        if meters is None:
+            meters = _thread_meters.active = []
+        meters.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _thread_meters.active.remove(self)
+        return False
+
+
+def quota_meter() -> QuotaMeter:
+    """
+    Measure the quota used by one job.
+
+    Only requests made on the calling thread are counted, so jobs running
+    side by side on a worker pool each see their own usage.
+
+    Usage:
+        with quota_meter() as meter:
+            service.collect_channel_data(channel_id, options)
+        meter.units
+    """
+    return QuotaMeter()
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Turn keyword labels into a hashable, ordered key."""
+    return tuple(sorted((str(name), str(value)) for name, value in labels.items()))
+
+
+def _series_key(series: Dict[LabelKey, Any], key: LabelKey) -> LabelKey:
+    """Keep the number of label sets of a metric bounded."""
+    if key in series or len(series) < METRICS_MAX_SERIES:
+        return key
+    return OVERFLOW_KEY
+
+
+def current_quota_day() -> str:
+    """Current quota day; the YouTube API quota resets at midnight Pacific time."""
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.now(ZoneInfo('America/Los_Angeles')).date().isoformat()
+    except Exception:
+        return datetime.now(timezone.utc).date().isoformat()
+
+
+class Histogram:
+    """Latency distribution with running totals and a window of recent samples."""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'last_observed_at', 'samples')
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.last_observed_at = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.last_observed_at = time.time()
+        self.samples.append(value)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Summarize the distribution.
+
+        Returns:
+            Dict with count, sum, min, max, mean and the p50/p95/p99 of recent samples
+        """
+        summary = {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else 0.0,
+            'last_observed_at': self.last_observed_at,
+        }
+        percentiles = np.percentile(np.fromiter(self.samples, dtype=float), [q * 100 for q in QUANTILES]) \
+            if self.samples else [0.0] * len(QUANTILES)
+        for quantile, value in zip(QUANTILES, percentiles):
+            summary[f'p{int(quantile * 100)}'] = float(value)
+        return summary
+
+
+class _Timer:
+    """Times a block or every call of a decorated function into a histogram."""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, labels: Dict[str, Any]):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self._start, **self.labels)
+        if exc_type is not None:
+            self.registry.inc(f'{self.name}_errors_total', **self.labels)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(self.registry, self.name, self.labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters, gauges and histograms.
+
+    Metrics are identified by a name and keyword labels. Collectors
+    registered with register_collector report gauges that are read at
+    export time, such as cache statistics.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, float, Dict[str, Any]]]]] = []
+        self._quota_day = None
+        self._quota_used = 0
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Increase a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _series_key(series, key)
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[_series_key(series, _label_key(labels))] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a sample, usually a duration in seconds, into a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = _series_key(series, key)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.window)
+            histogram.observe(value)
+
+    def timer(self, name: str, **labels) -> _Timer:
+        """Context manager and decorator that observes elapsed seconds into a histogram."""
+        return _Timer(self, name, labels)
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, float, Dict[str, Any]]]]) -> None:
+        """
+        Register a callable reporting gauges at export time.
+
+        Args:
+            collector: Callable returning (name, value, labels) tuples
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def record_api_request(self, method_id: str, seconds: float, error: bool = False) -> None:
+        """
+        Record one YouTube API request and the quota it used.
+
+        Args:
+            method_id: Discovery method ID, e.g. 'youtube.channels.list'
+            seconds: Request latency
+            error: Whether the request raised
+        """
+        cost = QUOTA_COSTS.get(method_id, 1)
+        self.inc('youtube_api_requests_total', method=method_id)
+        self.observe('youtube_api_request_seconds', seconds, method=method_id)
+        self.inc('youtube_api_quota_units_total', cost, method=method_id)
+        if error:
+            self.inc('youtube_api_errors_total', method=method_id)
+        for meter in getattr(_thread_meters, 'active', None) or ():
+            meter.units += cost
+            meter.requests += 1
+
+        with self._lock:
+            day = current_quota_day()
+            if day != self._quota_day:
+                self._quota_day = day
+                self._quota_used = 0
+            self._quota_used += cost
+            used = self._quota_used
+        self.set_gauge('youtube_api_quota_used_today', used)
+        self.set_gauge('youtube_api_quota_remaining', max(YOUTUBE_DAILY_QUOTA - used, 0))
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Copy every metric into plain data.
+
+        Returns:
+            Dict with 'counters', 'gauges' and 'histograms' lists; each entry has
+            'name', 'labels' and either 'value' or the histogram summary fields
+        """
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(key), 'value': value}
+                        for name, series in self._counters.items() for key, value in series.items()]
+            gauges = [{'name': name, 'labels': dict(key), 'value': value}
+                      for name, series in self._gauges.items() for key, value in series.items()]
+            histograms = [{'name': name, 'labels': dict(key), **histogram.snapshot()}
+                          for name, series in self._histograms.items() for key, histogram in series.items()]
+            collectors = list(self._collectors)
+
+        for collector in collectors:
+            try:
+                for name, value, labels in collector():
+                    gauges.append({'name': name, 'labels': dict(labels), 'value': value})
+            except Exception as e:
+                logging.warning(f"Metrics collector {collector} failed: {e}")
+        return {'counters': counters, 'gauges': gauges, 'histograms': histograms}
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Histograms are exported as summaries with 0.5/0.95/0.99 quantiles.
+
+        Returns:
+            str: Exposition text
+        """
+        snapshot = self.snapshot()
+        lines = []
+        typed = set()
+
+        def header(name, metric_type):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {name} {metric_type}')
+
+        for entry in sorted(snapshot['counters'], key=lambda e: e['name']):
+            header(entry['name'], 'counter')
+            lines.append(f"{entry['name']}{_format_labels(entry['labels'])} {entry['value']}")
+        for entry in sorted(snapshot['gauges'], key=lambda e: e['name']):
+            header(entry['name'], 'gauge')
+            lines.append(f"{entry['name']}{_format_labels(entry['labels'])} {entry['value']}")
+        for entry in sorted(snapshot['histograms'], key=lambda e: e['name']):
+            name = entry['name']
+            header(name, 'summary')
+            for quantile in QUANTILES:
+                labels = dict(entry['labels'], quantile=str(quantile))
+                lines.append(f"{name}{_format_labels(labels)} {entry[f'p{int(quantile * 100)}']}")
+            lines.append(f"{name}_sum{_format_labels(entry['labels'])} {entry['sum']}")
+            lines.append(f"{name}_count{_format_labels(entry['labels'])} {entry['count']}")
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self) -> str:
+        """Render all metrics as a JSON document."""
+        return json.dumps({'generated_at': datetime.now(timezone.utc).isoformat(), **self.snapshot()}, indent=2)
+
+    def write_json(self, path: str) -> str:
+        """
+        Write the JSON export to a file.
+
+        Args:
+            path: Output file path
+
+        Returns:
+            str: The path written
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+        return path
+
+    def reset(self) -> None:
+        """Drop all recorded metrics; collectors stay registered."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._quota_day = None
+            self._quota_used = 0
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format labels as a Prometheus label set."""
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in sorted(labels.items()):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _registry
+
+
+def timed(name: str, **labels) -> _Timer:
+    """
+    Time a block or function into a histogram of the process-wide registry.
+
+    Args:
+        name: Histogram name, e.g. 'db_operation_seconds'
+        **labels: Labels identifying the operation
+
+    Returns:
+        A context manager that also works as a decorator
+    """
+    return _registry.timer(name, **labels)
+
+
+def counted(name: str, **labels) -> Callable:
+    """
+    Decorator counting calls of a function in the process-wide registry.
+
+    Args:
+        name: Counter name
+        **labels: Labels identifying the operation
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _registry.inc(name, **labels)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves /metrics as Prometheus text and /metrics.json as JSON."""
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body, content_type = _registry.to_json(), 'application/json'
+        elif self.path.startswith('/metrics'):
+            body, content_type = _registry.to_prometheus(), 'text/plain; version=0.0.4'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_exporters_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Serve the registry over HTTP from a daemon thread.
+
+    Args:
+        port: Port to listen on; 0 picks a free port
+        host: Interface to bind
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    global _server
+    with _exporters_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
+
+
+def start_metrics_exporters() -> None:
+    """
+    Start the exporters configured in the environment.
+
+    YTDATAHUB_METRICS_PORT serves Prometheus text on that port and
+    YTDATAHUB_METRICS_FILE writes the JSON export there when the process exits.
+    Safe to call on every rerun.
+    """
+    port = os.getenv(METRICS_PORT_ENV)
+    if port:
+        try:
+            start_metrics_server(int(port))
+        except OSError as e:
+            logging.warning(f"Could not start metrics server on port {port}: {e}")
+
+    path = os.getenv(METRICS_FILE_ENV)
+    if path and not getattr(start_metrics_exporters, '_file_registered', False):
+        atexit.register(_registry.write_json, path)
+        start_metrics_exporters._file_registered = True
@@ -1,16 +1,17 @@
 """
 Performance tracking utilities for the application.
 This module contains functions for tracking and logging performance metrics.
+Start times are kept per session; durations go to the process-wide metrics registry.
 """
 import time
 import sys
 import logging
-try:
-    import streamlit as st
-    STREAMLIT_AVAILABLE = True
-except ImportError:
-    STREAMLIT_AVAILABLE = False
+from src.utils.headless import STREAMLIT_AVAILABLE, st
 from typing import Any, Dict, Optional, List, Union
+from src.utils.metrics import get_metrics_registry
+
+# Histogram that start_timer/end_timer and performance_tag timings record into
+OPERATION_HISTOGRAM = 'operation_duration_seconds'
 
 def initialize_performance_tracking():
     """Initialize performance tracking system."""
@@ -48,9 +49,9 @@ def end_timer(tag: str, message: str = None) -> float:
         float: The elapsed time in seconds
     """
     if STREAMLIT_AVAILABLE:
-        start = st.session_state.get(f"timer_{tag}", None)
+        start = st.session_state.pop(f"timer_{tag}", None)
     else:
-        start = globals().get(f"timer_{tag}", None)
+        start = globals().pop(f"timer_{tag}", None)
     
     if start is None:
         # Only show timer warnings if performance monitoring is enabled or debug mode is on
@@ -61,30 +62,11 @@ def end_timer(tag: str, message: str = None) -> float:
             logging.warning(f"Timer {tag} ended but no timers have been initialized")
         return 0.0
     
-    # Check if performance timers tracking is enabled before checking the timers dict
-    if STREAMLIT_AVAILABLE and 'performance_timers' in st.session_state:
-        if tag not in st.session_state.performance_timers:
-            # Only show timer warnings if performance monitoring is enabled or debug mode is on
-            perf_enabled = st.session_state.get('show_performance_metrics', False)
-            debug_enabled = st.session_state.get('debug_mode', False)
-            
-            if perf_enabled or debug_enabled:
-                logging.warning(f"Timer {tag} ended but was never started")
-            return 0.0
-    
     # Calculate elapsed time
     elapsed = time.time() - start
     
-    # Store metrics
-    if 'performance_metrics' not in st.session_state:
-        st.session_state.performance_metrics = {}
-    
-    # Store metrics with timestamp to allow multiple measurements of the same tag
-    st.session_state.performance_metrics[f"{tag}_{time.time()}"] = {
-        'tag': tag,
-        'duration': elapsed,
-        'timestamp': time.time()
-    }
+    # Record into the process-wide registry so timings aggregate across sessions
+    get_metrics_registry().observe(OPERATION_HISTOGRAM, elapsed, operation=tag)
     
     # Log if in debug mode
     if message and st.session_state.get('debug_mode', False):
@@ -99,26 +81,19 @@ def get_performance_report():
     Returns:
         dict: A dictionary containing performance statistics by tag
     """
-    if 'performance_metrics' not in st.session_state or not st.session_state.performance_metrics:
-        return {}
-    
-    # Group metrics by tag
-    metrics_by_tag = {}
-    for key, metric in st.session_state.performance_metrics.items():
-        tag = metric['tag']
-        if tag not in metrics_by_tag:
-            metrics_by_tag[tag] = []
-        metrics_by_tag[tag].append(metric['duration'])
-    
-    # Calculate statistics for each tag
     report = {}
-    for tag, durations in metrics_by_tag.items():
-        report[tag] = {
-            'count': len(durations),
-            'total': sum(durations),
-            'average': sum(durations) / len(durations),
-            'min': min(durations),
-            'max': max(durations)
+    for entry in get_metrics_registry().snapshot()['histograms']:
+        if entry['name'] != OPERATION_HISTOGRAM:
+            continue
+        report[entry['labels'].get('operation', 'unknown')] = {
+            'count': entry['count'],
+            'total': entry['sum'],
+            'average': entry['mean'],
+            'min': entry['min'],
+            'max': entry['max'],
+            'p50': entry['p50'],
+            'p95': entry['p95'],
+            'p99': entry['p99']
         }
     
     return report
@@ -0,0 +1,214 @@
+"""
+Progress sinks for long-running operations.
+
+The services report progress (a status line with an optional completed
+fraction) and user-facing messages (info, success, warning, error) without
+knowing where they end up: in the Streamlit app they are shown with
+placeholders and alerts, in the ytdatahub CLI they are written to the console
+or the log. get_progress_sink returns the sink of the current thread, falling
+back to the process default set with set_progress_sink.
+"""
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, TextIO
+
+logger = logging.getLogger('ytdatahub.progress')
+
+MESSAGE_LEVELS = {
+    'info': logging.INFO,
+    'success': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+_local = threading.local()
+_default_sink = None
+
+
+class ProgressSink:
+    """Receives the progress and messages of long-running operations; ignores them by default."""
+
+    def status(self, message: str, progress: Optional[float] = None) -> None:
+        """
+        Report what the operation is doing.
+
+        Args:
+            message: Status line; replaces the previous one
+            progress: Completed fraction between 0.0 and 1.0, if known
+        """
+
+    def notify(self, level: str, message: str) -> None:
+        """
+        Report a message for the user.
+
+        Args:
+            level: 'info', 'success', 'warning' or 'error'
+            message: Message text
+        """
+
+    def clear(self) -> None:
+        """Remove the status line once the operation has finished."""
+
+
+class NullProgressSink(ProgressSink):
+    """Sink that discards everything, e.g. for benchmarks."""
+
+
+class LoggingProgressSink(ProgressSink):
+    """Sink that writes to the ytdatahub.progress logger, for cron and batch jobs."""
+
+    def __init__(self, min_interval: float = 5.0):
+        """
+        Initialize the sink.
+
+        Args:
+            min_interval: Minimum seconds between two logged status lines
+        """
+        self.min_interval = min_interval
+        self._last_status = 0.0
+        self._last_message = None
+
+    def status(self, message: str, progress: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if progress is not None and progress < 1 and now - self._last_status < self.min_interval:
+            return
+        if progress is not None:
+            message = f"{message} ({progress:.0%})"
+        # Placeholders report the same line several times
+        if message == self._last_message:
+            return
+        self._last_status = now
+        self._last_message = message
+        logger.info(message)
+
+    def notify(self, level: str, message: str) -> None:
+        logger.log(MESSAGE_LEVELS.get(level, logging.INFO), message)
+
+
+class ConsoleProgressSink(ProgressSink):
+    """Sink that writes to a terminal, redrawing the status line in place."""
+
+    def __init__(self, stream: Optional[TextIO] = None, min_interval: float = 0.2):
+        """
+        Initialize the sink.
+
+        Args:
+            stream: Output stream; sys.stderr by default
+            min_interval: Minimum seconds between two redraws of the status line
+        """
+        self.stream = stream or sys.stderr
+        self.min_interval = min_interval
+        self._last_status = 0.0
+        self._status_width = 0
+        self._lock = threading.Lock()
+
+    def status(self, message: str, progress: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if progress is not None and progress < 1 and now - self._last_status < self.min_interval:
+            return
+        self._last_status = now
+        if progress is not None:
+            message = f"{message} [{progress:.0%}]"
+        with self._lock:
+            self.stream.write('\r' + message.ljust(self._status_width))
+            self.stream.flush()
+            self._status_width = len(message)
+
+    def notify(self, level: str, message: str) -> None:
+        prefix = '' if level in ('info', 'success') else f"{level.upper()}: "
+        with self._lock:
+            self._clear_line()
+            self.stream.write(f"{prefix}{message}\n")
+            self.stream.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_line()
+            self.stream.flush()
+
+    def _clear_line(self) -> None:
+        if self._status_width:
+            self.stream.write('\r' + ' ' * self._status_width + '\r')
+            self._status_width = 0
+
+
+class StreamlitProgressSink(ProgressSink):
+    """Sink that shows the status in placeholders and messages as alerts of the running page."""
+
+    def __init__(self):
+        """Initialize the sink; the placeholders are created on first use."""
+        self._status_placeholder = None
+        self._progress_placeholder = None
+
+    def status(self, message: str, progress: Optional[float] = None) -> None:
+        import streamlit as st
+        # Placeholders cannot be updated from worker threads without a script context
+        try:
+            if self._status_placeholder is None:
+                self._status_placeholder = st.empty()
+            self._status_placeholder.info(f"🔄 {message}")
+            if progress is not None:
+                if self._progress_placeholder is None:
+                    self._progress_placeholder = st.empty()
+                self._progress_placeholder.progress(min(max(progress, 0.0), 1.0))
+        except Exception as e:
+            logger.debug(f"Status update from thread context (expected): {e}")
+
+    def notify(self, level: str, message: str) -> None:
+        import streamlit as st
+        try:
+            getattr(st, level if level in MESSAGE_LEVELS else 'info')(message)
+        except Exception as e:
+            logger.debug(f"Message from thread context (expected): {e}")
+
+    def clear(self) -> None:
+        for placeholder in (self._status_placeholder, self._progress_placeholder):
+            if placeholder is not None:
+                try:
+                    placeholder.empty()
+                except Exception:
+                    pass
+        self._status_placeholder = None
+        self._progress_placeholder = None
+
+
+def set_progress_sink(sink: Optional[ProgressSink]) -> None:
+    """
+    Set the process-wide default sink.
+
+    Args:
+        sink: The sink, or None to go back to the Streamlit sink
+    """
+    global _default_sink
+    _default_sink = sink
+
+
+def get_progress_sink() -> ProgressSink:
+    """Get the sink of the current thread, else the process default, else the Streamlit sink."""
+    sink = getattr(_local, 'sink', None)
+    if sink is not None:
+        return sink
+    if _default_sink is not None:
+        return _default_sink
+    return StreamlitProgressSink()
+
+
+@contextmanager
+def use_progress_sink(sink: ProgressSink):
+    """
+    Report the progress of the current thread to a sink within a block.
+
+    Usage:
+        with use_progress_sink(NullProgressSink()):
+            service.collect_channel_data(channel_id, options)
+    """
+    previous = getattr(_local, 'sink', None)
+    _local.sink = sink
+    try:
+        yield sink
+    finally:
+        _local.sink = previous
+        sink.clear()
@@ -0,0 +1,373 @@
+"""
+Per-session memory budget for large session-state payloads.
+
+The collection workflows keep whole channel payloads (raw API responses,
+videos with their comments, delta reports) in st.session_state, and every
+open browser session holds its own copy. Payloads stored with set_payload are
+measured, and once a session's payloads exceed the budget the least recently
+used ones are written to a per-session directory under data/session_cache and
+replaced by a small marker. get_payload loads a spilled payload back on access,
+so callers see the same value as before.
+
+Enforcement that may spill values still referenced by the running script only
+considers payloads not touched in the current run; the end-of-run check in
+youtube.py, when no references remain, may spill any of them.
+"""
+import os
+import pickle
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.config import DATA_DIR
+from src.utils.cache_utils import estimate_size
+from src.utils.debug_utils import debug_log
+from src.utils.metrics import get_metrics_registry
+
+# Budget of the payloads of one session (override with YTDATAHUB_SESSION_BUDGET_MB)
+SESSION_BUDGET_MB = int(os.getenv('YTDATAHUB_SESSION_BUDGET_MB', '128'))
+
+# Payloads smaller than this stay in memory; spilling them saves too little
+MIN_SPILL_BYTES = 256 * 1024
+
+# Spill directories untouched for this long belong to sessions that have ended
+STALE_SESSION_SECONDS = 24 * 3600
+
+SESSION_CACHE_DIR = DATA_DIR / 'session_cache'
+
+# Session-state keys holding the manager's bookkeeping
+_META_KEY = '_session_budget'
+_SESSION_KEY = '_session_budget_id'
+
+_spill_stats = {'spills': 0, 'loads': 0, 'spilled_bytes': 0}
+_last_cleanup = 0.0
+
+
+class SpilledPayload:
+    """Marker left in session state for a payload written to disk."""
+    __slots__ = ('path', 'size', 'format')
+
+    def __init__(self, path: str, size: int, format: str):
+        self.path = path
+        self.size = size
+        self.format = format
+
+    def __repr__(self):
+        return f"SpilledPayload({self.path!r}, {self.size} bytes)"
+
+
+def _default_session_id() -> str:
+    """Streamlit's id for the current session, if there is one."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def _is_dataframe(value: Any) -> bool:
+    return hasattr(value, 'columns') and hasattr(value, 'memory_usage') and hasattr(value, 'to_dict')
+
+
+class SessionStateBudget:
+    """
+    Memory budget over the payloads of one session state.
+
+    The bookkeeping (estimated size and last access of each payload) lives in
+    the session state itself, so a manager is cheap to create per call and
+    several managers over the same state agree with each other.
+    """
+
+    def __init__(self, state=None, budget_bytes: Optional[int] = None,
+                 cache_dir: Optional[os.PathLike] = None, min_spill_bytes: int = MIN_SPILL_BYTES):
+        """
+        Initialize the manager.
+
+        Args:
+            state: Mapping holding the payloads; st.session_state by default
+            budget_bytes: In-memory budget; SESSION_BUDGET_MB by default
+            cache_dir: Root of the spill directories; data/session_cache by default
+            min_spill_bytes: Payloads below this size are never spilled
+        """
+        if state is None:
+            import streamlit as st
+            state = st.session_state
+        self.state = state
+        self.budget_bytes = SESSION_BUDGET_MB * 1024 * 1024 if budget_bytes is None else budget_bytes
+        self.cache_dir = Path(cache_dir or SESSION_CACHE_DIR)
+        self.min_spill_bytes = min_spill_bytes
+
+    @property
+    def _meta(self) -> Dict[str, Any]:
+        if _META_KEY not in self.state:
+            self.state[_META_KEY] = {'run': 0, 'clock': 0, 'entries': {}}
+        return self.state[_META_KEY]
+
+    @property
+    def session_dir(self) -> Path:
+        """Spill directory of this session."""
+        if _SESSION_KEY not in self.state:
+            self.state[_SESSION_KEY] = _default_session_id() or uuid.uuid4().hex
+        return self.cache_dir / self.state[_SESSION_KEY]
+
+    def _touch(self, key: str, size: Optional[int] = None) -> None:
+        meta = self._meta
+        meta['clock'] += 1
+        entry = meta['entries'].setdefault(key, {'size': 0})
+        entry['last_access'] = meta['clock']
+        entry['run'] = meta['run']
+        if size is not None:
+            entry['size'] = size
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a payload and spill cold payloads if the budget is exceeded.
+
+        Args:
+            key: Session-state key
+            value: Payload
+        """
+        self._remove_file(self.state.get(key))
+        self.state[key] = value
+        self._touch(key, estimate_size(value))
+        self.enforce(end_of_run=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a payload, loading it from disk if it was spilled.
+
+        Args:
+            key: Session-state key
+            default: Returned when the key is not set
+
+        Returns:
+            The payload or default
+        """
+        if key not in self.state:
+            return default
+        value = self.state[key]
+        if isinstance(value, SpilledPayload):
+            value = self._load(key, value)
+            if value is None:
+                return default
+        if key in self._meta['entries']:
+            self._touch(key)
+        return value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        """Remove a payload (and its spill file) and return it."""
+        value = self.get(key, default)
+        if key in self.state:
+            del self.state[key]
+        self._meta['entries'].pop(key, None)
+        return value
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Remove payloads without loading the spilled ones."""
+        for key in keys:
+            self._remove_file(self.state.get(key))
+            if key in self.state:
+                del self.state[key]
+            self._meta['entries'].pop(key, None)
+
+    def in_memory_bytes(self) -> int:
+        """Estimated size of the payloads currently held in memory."""
+        return sum(
+            entry['size'] for key, entry in self._meta['entries'].items()
+            if key in self.state and not isinstance(self.state[key], SpilledPayload)
+        )
+
+    def enforce(self, end_of_run: bool = True) -> int:
+        """
+        Spill least recently used payloads until the session is within budget.
+
+        Args:
+            end_of_run: Whether the script run has finished. Payloads are
+                re-measured (callers mutate them in place) and any of them may
+                be spilled; otherwise payloads used in the current run are kept.
+
+        Returns:
+            int: Number of payloads spilled
+        """
+        meta = self._meta
+        entries = meta['entries']
+        for key in [key for key in entries if key not in self.state]:
+            del entries[key]
+        if end_of_run:
+            for key, entry in entries.items():
+                if not isinstance(self.state[key], SpilledPayload):
+                    entry['size'] = estimate_size(self.state[key])
+
+        spilled = 0
+        used = self.in_memory_bytes()
+        if used > self.budget_bytes:
+            candidates = sorted(
+                (entry['last_access'], key) for key, entry in entries.items()
+                if entry['size'] >= self.min_spill_bytes
+                and not isinstance(self.state[key], SpilledPayload)
+                and (end_of_run or entry['run'] < meta['run'])
+            )
+            for _, key in candidates:
+                if used <= self.budget_bytes:
+                    break
+                if self._spill(key):
+                    used -= entries[key]['size']
+                    spilled += 1
+        if end_of_run:
+            meta['run'] += 1
+        return spilled
+
+    def usage(self) -> Dict[str, Any]:
+        """Report the payloads of this session, e.g. for the debug panel."""
+        entries = self._meta['entries']
+        spilled = [key for key in entries if isinstance(self.state.get(key), SpilledPayload)]
+        return {
+            'payloads': len(entries),
+            'in_memory_bytes': self.in_memory_bytes(),
+            'budget_bytes': self.budget_bytes,
+            'spilled': sorted(spilled),
+            'spilled_bytes': sum(entries[key]['size'] for key in spilled),
+        }
+
+    def _spill(self, key: str) -> bool:
+        value = self.state[key]
+        size = self._meta['entries'][key]['size']
+        directory = self.session_dir
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path, format = self._write(directory, key, value)
+        except Exception as e:
+            # Unpicklable payloads simply stay in memory
+            debug_log(f"Could not spill session payload {key}: {str(e)}")
+            return False
+        self.state[key] = SpilledPayload(str(path), size, format)
+        _spill_stats['spills'] += 1
+        _spill_stats['spilled_bytes'] += size
+        debug_log(f"Spilled session payload {key} ({size / 2 ** 20:.1f} MiB) to {path}")
+        return True
+
+    @staticmethod
+    def _write(directory: Path, key: str, value: Any):
+        stem = f"{key}.{uuid.uuid4().hex[:8]}"
+        if _is_dataframe(value):
+            try:
+                import pyarrow as pa
+                table = pa.Table.from_pandas(value)
+                path = directory / f"{stem}.arrow"
+                with pa.OSFile(str(path) + '.tmp', 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(str(path) + '.tmp', path)
+                return path, 'arrow'
+            except ImportError:
+                pass
+        path = directory / f"{stem}.pkl"
+        with open(str(path) + '.tmp', 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(str(path) + '.tmp', path)
+        return path, 'pickle'
+
+    def _load(self, key: str, marker: SpilledPayload) -> Any:
+        try:
+            if marker.format == 'arrow':
+                import pyarrow as pa
+                with pa.memory_map(marker.path) as source:
+                    value = pa.ipc.open_file(source).read_all().to_pandas()
+            else:
+                with open(marker.path, 'rb') as f:
+                    value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            debug_log(f"Spilled session payload {key} could not be read: {str(e)}")
+            del self.state[key]
+            self._meta['entries'].pop(key, None)
+            return None
+        self._remove_file(marker)
+        self.state[key] = value
+        self._touch(key, marker.size)
+        _spill_stats['loads'] += 1
+        # Make room for it without spilling what this run is using
+        self.enforce(end_of_run=False)
+        return value
+
+    @staticmethod
+    def _remove_file(value: Any) -> None:
+        if isinstance(value, SpilledPayload):
+            try:
+                os.remove(value.path)
+            except OSError:
+                pass
+
+
+def get_session_budget(state=None) -> SessionStateBudget:
+    """Get a budget manager over the current session state."""
+    return SessionStateBudget(state)
+
+
+def set_payload(key: str, value: Any, state=None) -> None:
+    """Store a large value in session state under the session budget."""
+    SessionStateBudget(state).put(key, value)
+
+
+def get_payload(key: str, default: Any = None, state=None) -> Any:
+    """Get a value stored with set_payload, loading it from disk if it was spilled."""
+    return SessionStateBudget(state).get(key, default)
+
+
+def pop_payload(key: str, default: Any = None, state=None) -> Any:
+    """Remove a value stored with set_payload and return it."""
+    return SessionStateBudget(state).pop(key, default)
+
+
+def enforce_session_budget(state=None) -> int:
+    """
+    Spill the session's cold payloads; called once at the end of each script run.
+
+    Also removes the spill directories of ended sessions, at most once an hour per process.
+
+    Returns:
+        int: Number of payloads spilled
+    """
+    global _last_cleanup
+    if time.time() - _last_cleanup > 3600:
+        _last_cleanup = time.time()
+        cleanup_stale_sessions()
+    return SessionStateBudget(state).enforce(end_of_run=True)
+
+
+def cleanup_stale_sessions(cache_dir: Optional[os.PathLike] = None,
+                           max_age_seconds: int = STALE_SESSION_SECONDS) -> int:
+    """
+    Remove the spill directories of sessions that have ended.
+
+    Streamlit does not report closed sessions, so a directory is stale once no
+    payload in it was written for max_age_seconds.
+
+    Returns:
+        int: Number of directories removed
+    """
+    root = Path(cache_dir or SESSION_CACHE_DIR)
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for directory in root.iterdir():
+        if not directory.is_dir():
+            continue
+        mtimes = [path.stat().st_mtime for path in directory.iterdir()] or [directory.stat().st_mtime]
+        if max(mtimes) < cutoff:
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+    if removed:
+        debug_log(f"Removed {removed} stale session spill directories")
+    return removed
+
+
+def _session_budget_metrics():
+    """Report the spill counters as gauges of the metrics registry."""
+    return [(f'session_payload_{name}', value, {}) for name, value in _spill_stats.items()]
+
+
+get_metrics_registry().register_collector(_session_budget_metrics)
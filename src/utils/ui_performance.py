@@ -9,6 +9,11 @@ try:
 except ImportError:
     STREAMLIT_AVAILABLE = False
 from datetime import datetime
+from src.utils.metrics import get_metrics_registry
+from src.utils.performance_tracking import OPERATION_HISTOGRAM
+
+# Histogram that report_ui_timing records into
+UI_OPERATION_HISTOGRAM = 'ui_operation_seconds'
 
 def report_ui_timing(operation_name: str, start_time: float, show_spinner: bool = False):
     """
@@ -48,18 +53,8 @@ def report_ui_timing(operation_name: str, start_time: float, show_spinner: bool
     else:
         logging.debug(f"🟢 UI Operation: {operation_name} took {elapsed:.2f}s")
     
-    # Store the timing data
-    if 'ui_timing_metrics' not in st.session_state:
-        st.session_state.ui_timing_metrics = []
-    
-    st.session_state.ui_timing_metrics.append({
-        'operation': operation_name,
-        'duration': elapsed,
-        'timestamp': time.time(),
-        'severity': 'critical' if elapsed >= critical_threshold else 
-                   'warning' if elapsed >= warning_threshold else 
-                   'moderate' if elapsed >= ui_blocking else 'good'
-    })
+    # Record into the process-wide registry so timings aggregate across sessions
+    get_metrics_registry().observe(UI_OPERATION_HISTOGRAM, elapsed, operation=operation_name)
     
     # Show a spinner if the operation is taking too long
     if show_spinner and elapsed >= ui_blocking:
@@ -74,30 +69,33 @@ def get_performance_summary():
     Get a summary of tracked performance metrics.
     
     Returns:
-        A DataFrame with performance statistics
+        A DataFrame with latency statistics per operation, across all sessions
     """
-    if 'performance_metrics' not in st.session_state or not st.session_state.performance_metrics:
+    histograms = [
+        entry for entry in get_metrics_registry().snapshot()['histograms']
+        if entry['name'] in (OPERATION_HISTOGRAM, UI_OPERATION_HISTOGRAM)
+    ]
+    if not histograms:
         return None
     
     import pandas as pd
     
     # Extract data for the dataframe
     metrics = []
-    for key, data in st.session_state.performance_metrics.items():
+    for entry in histograms:
         metrics.append({
-            'Tag': data['tag'],
-            'Duration (s)': data['duration'],
-            'Timestamp': datetime.fromtimestamp(data['timestamp']).strftime('%H:%M:%S'),
-            'Message': data['message'] if 'message' in data else '',
-            'UI Impact': "Yes" if data.get('ui_impact', False) else "No",
-            'Severity': data.get('severity', 'unknown')
+            'Tag': entry['labels'].get('operation', 'unknown'),
+            'Count': entry['count'],
+            'p50 (s)': entry['p50'],
+            'p95 (s)': entry['p95'],
+            'p99 (s)': entry['p99'],
+            'Max (s)': entry['max'],
+            'Last Seen': datetime.fromtimestamp(entry['last_observed_at']).strftime('%H:%M:%S'),
+            'UI Impact': "Yes" if entry['name'] == UI_OPERATION_HISTOGRAM else "No"
         })
     
-    if not metrics:
-        return None
-    
-    # Create dataframe and sort by duration (longest first)
+    # Create dataframe and sort by tail latency (slowest first)
     df = pd.DataFrame(metrics)
-    df = df.sort_values('Duration (s)', ascending=False)
+    df = df.sort_values('p95 (s)', ascending=False)
     
     return df
@@ -24,15 +24,15 @@ def ensure_views_data(video_data):
             
         # Debug log all keys for first video
         video_id = video.get('video_id', 'unknown')
-        debug_log(f"Video {video_id} keys: {list(video.keys())}")
-        debug_log(f"Video {video_id} raw data: {str(video)[:200]}...")
+        debug_log(lambda: f"Video {video_id} keys: {list(video.keys())}")
+        debug_log(lambda: f"Video {video_id} raw data: {str(video)[:200]}...")
         
         # Log current view value 
-        debug_log(f"Video {video_id} current views value: '{video.get('views', 'Not present')}'")
+        debug_log(lambda: f"Video {video_id} current views value: '{video.get('views', 'Not present')}'")
         
         # Special handling for videos with string "0" views (likely placeholder)
         if 'views' in video and video['views'] == "0":
-            debug_log(f"Video {video_id} has placeholder '0' string value, will try to find real view count")
+            debug_log(lambda: f"Video {video_id} has placeholder '0' string value, will try to find real view count")
             # Force it to try other paths by temporarily removing the "0" value
             video['original_views'] = video['views']  # Keep the original 
             video.pop('views', None)
@@ -41,35 +41,35 @@ def ensure_views_data(video_data):
         if 'views' not in video or not video['views']:
             # Try to extract from statistics if available
             if 'statistics' in video and isinstance(video['statistics'], dict) and 'viewCount' in video['statistics']:
-                debug_log(f"Setting views from statistics.viewCount: {video['statistics']['viewCount']}")
+                debug_log(lambda: f"Setting views from statistics.viewCount: {video['statistics']['viewCount']}")
                 video['views'] = video['statistics']['viewCount']
             elif 'contentDetails' in video and 'statistics' in video['contentDetails'] and 'viewCount' in video['contentDetails']['statistics']:
-                debug_log(f"Setting views from contentDetails.statistics.viewCount: {video['contentDetails']['statistics']['viewCount']}")
+                debug_log(lambda: f"Setting views from contentDetails.statistics.viewCount: {video['contentDetails']['statistics']['viewCount']}")
                 video['views'] = video['contentDetails']['statistics']['viewCount']
             else:
                 # Try to recover view count from other possible locations
                 if 'original_views' in video and video['original_views'] != "0":
                     video['views'] = video['original_views']
-                    debug_log(f"Restored original views value: {video['views']}")
+                    debug_log(lambda: f"Restored original views value: {video['views']}")
                 else:
                     # Default to zero if no views data can be found
-                    debug_log(f"No views data found for video {video_id}, setting to 0")
+                    debug_log(lambda: f"No views data found for video {video_id}, setting to 0")
                     video['views'] = '0'
         # PATCH: Always set likes and comment_count to '0' if missing or malformed
         if 'likes' not in video or not video['likes']:
             if 'statistics' in video and isinstance(video['statistics'], dict) and 'likeCount' in video['statistics']:
                 video['likes'] = video['statistics']['likeCount']
-                debug_log(f"Setting likes from statistics.likeCount: {video['statistics']['likeCount']}")
+                debug_log(lambda: f"Setting likes from statistics.likeCount: {video['statistics']['likeCount']}")
             else:
                 video['likes'] = '0'
-                debug_log(f"No likes data found for video {video_id}, setting to 0")
+                debug_log(lambda: f"No likes data found for video {video_id}, setting to 0")
         if 'comment_count' not in video or not video['comment_count']:
             if 'statistics' in video and isinstance(video['statistics'], dict) and 'commentCount' in video['statistics']:
                 video['comment_count'] = video['statistics']['commentCount']
-                debug_log(f"Setting comment_count from statistics.commentCount: {video['statistics']['commentCount']}")
+                debug_log(lambda: f"Setting comment_count from statistics.commentCount: {video['statistics']['commentCount']}")
             else:
                 video['comment_count'] = '0'
-                debug_log(f"No comment_count data found for video {video_id}, setting to 0")
+                debug_log(lambda: f"No comment_count data found for video {video_id}, setting to 0")
         
         # Clean up temporary field
         if 'original_views' in video:
@@ -171,7 +171,7 @@ def extract_video_views(video, format_func=None):
                 if 'view' in key.lower() and video[key] and str(video[key]) != '0':
                     views = str(video[key]).strip()
                     video['views'] = views
-                    debug_log(f"Found view data in field '{key}' for {video_id}: {views}")
+                    debug_log(lambda: f"Found view data in field '{key}' for {video_id}: {views}")
                     break
         
         # Default to 0 if no valid data found
@@ -302,13 +302,13 @@ def fix_missing_views(videos):
             video.get('snippet', {}).get('title') or
             'unknown'
         )
-        debug_log(f"Processing video {video_id} in fix_missing_views")
-        debug_log(f"Initial state: views={video.get('views')}, statistics={video.get('statistics')}")
+        debug_log(lambda: f"Processing video {video_id} in fix_missing_views")
+        debug_log(lambda: f"Initial state: views={video.get('views')}, statistics={video.get('statistics')}")
         
         # Only set default if missing
         if 'views' not in video:
             video['views'] = '0'
-            debug_log(f"Set default views=0 for {video_id}")
+            debug_log(lambda: f"Set default views=0 for {video_id}")
         if 'likes' not in video:
             video['likes'] = '0'
         if 'comment_count' not in video:
@@ -318,11 +318,11 @@ def fix_missing_views(videos):
         stats = None
         if isinstance(video.get('statistics'), dict):
             stats = video['statistics']
-            debug_log(f"Found statistics dict for {video_id}: {stats}")
+            debug_log(lambda: f"Found statistics dict for {video_id}: {stats}")
         elif isinstance(video.get('statistics'), str):
             try:
                 stats = json.loads(video['statistics'])
-                debug_log(f"Parsed statistics string for {video_id}: {stats}")
+                debug_log(lambda: f"Parsed statistics string for {video_id}: {stats}")
             except:
                 pass
         elif isinstance(video.get('contentDetails', {}).get('statistics'), dict):
@@ -334,7 +334,7 @@ def fix_missing_views(videos):
             # Only set if not already present or is '0', and only if the value is different
             if ('views' not in video or video['views'] == '0') and 'viewCount' in stats:
                 video['views'] = str(stats.get('viewCount', '0'))
-                debug_log(f"Updated views from statistics for {video_id}: {video['views']}")
+                debug_log(lambda: f"Updated views from statistics for {video_id}: {video['views']}")
             # If views is present and not '0', do not overwrite
             # If views is present and matches statistics, do nothing
             # If views is present and does not match statistics, do nothing (preserve original)
@@ -343,6 +343,6 @@ def fix_missing_views(videos):
             if ('comment_count' not in video or video['comment_count'] == '0') and 'commentCount' in stats:
                 video['comment_count'] = str(stats.get('commentCount', '0'))
                 
-        debug_log(f"Final state for {video_id}: views={video.get('views')}")
+        debug_log(lambda: f"Final state for {video_id}: views={video.get('views')}")
         
     return videos
@@ -43,9 +43,9 @@ def process_video_data(videos_data):
             video['video_id'] = video_id
         elif not video.get('video_id'):
             video['video_id'] = f"video_{i}"
-            debug_log(f"WARNING: No valid video ID found, using fallback: video_{i}")
+            debug_log(lambda: f"WARNING: No valid video ID found, using fallback: video_{i}")
         
-        debug_log(f"Processing video {video_id}")
+        debug_log(lambda: f"Processing video {video_id}")
         
         # Extract kind and etag from top level if available
         if 'kind' not in video:
@@ -76,18 +76,18 @@ def process_video_data(videos_data):
             if 'viewCount' in video['statistics']:
                 if 'views' not in video or not video['views'] or video['views'] == '0' or str(video['views']).strip() == '':
                     video['views'] = video['statistics']['viewCount']
-                    debug_log(f"Set views from statistics.viewCount: {video['statistics']['viewCount']} for {video_id}")
+                    debug_log(lambda: f"Set views from statistics.viewCount: {video['statistics']['viewCount']} for {video_id}")
                     
             # Extract comment count - ALWAYS do this regardless of existing comment_count
             if 'commentCount' in video['statistics']:
                 video['comment_count'] = video['statistics']['commentCount']
-                debug_log(f"Set comment_count from statistics.commentCount: {video['statistics']['commentCount']} for {video_id}")
+                debug_log(lambda: f"Set comment_count from statistics.commentCount: {video['statistics']['commentCount']} for {video_id}")
                 
             # Extract likes count
             if 'likeCount' in video['statistics']:
                 if 'likes' not in video or not video['likes'] or video['likes'] == '0':
                     video['likes'] = video['statistics']['likeCount']
-                    debug_log(f"Set likes from statistics.likeCount: {video['statistics']['likeCount']} for {video_id}")
+                    debug_log(lambda: f"Set likes from statistics.likeCount: {video['statistics']['likeCount']} for {video_id}")
                     
         # Second pass - handle other video data locations and edge cases
         if 'views' not in video or not video['views'] or str(video['views']) == '0' or str(video['views']).strip() == '':
@@ -96,12 +96,12 @@ def process_video_data(videos_data):
             if 'contentDetails' in video and isinstance(video['contentDetails'], dict) and 'statistics' in video['contentDetails']:
                 if isinstance(video['contentDetails']['statistics'], dict) and 'viewCount' in video['contentDetails']['statistics']:
                     video['views'] = video['contentDetails']['statistics']['viewCount'] 
-                    debug_log(f"Set views from contentDetails.statistics.viewCount: {video['views']} for {video_id}")
+                    debug_log(lambda: f"Set views from contentDetails.statistics.viewCount: {video['views']} for {video_id}")
             
             # If still not found, set default
             if 'views' not in video or not video['views'] or str(video['views']).strip() == '':
                 video['views'] = '0'
-                debug_log(f"No view data found, set default '0' for {video_id}")
+                debug_log(lambda: f"No view data found, set default '0' for {video_id}")
                 
         # Ensure these fields are present even if empty
         if 'views' not in video:
@@ -117,9 +117,9 @@ def process_video_data(videos_data):
             
         # Log changes
         if orig_views != video.get('views'):
-            debug_log(f"Updated views for {video_id}: {orig_views} -> {video['views']}")
+            debug_log(lambda: f"Updated views for {video_id}: {orig_views} -> {video['views']}")
         if orig_comment_count != video.get('comment_count'):
-            debug_log(f"Updated comment_count for {video_id}: {orig_comment_count} -> {video['comment_count']}")
+            debug_log(lambda: f"Updated comment_count for {video_id}: {orig_comment_count} -> {video['comment_count']}")
         
         # Ensure comment_count is always set
         if 'comment_count' not in video or not video['comment_count']:
@@ -127,7 +127,7 @@ def process_video_data(videos_data):
             if 'contentDetails' in video and isinstance(video['contentDetails'], dict) and 'statistics' in video['contentDetails']:
                 if isinstance(video['contentDetails']['statistics'], dict) and 'commentCount' in video['contentDetails']['statistics']:
                     video['comment_count'] = video['contentDetails']['statistics']['commentCount'] 
-                    debug_log(f"Set comment_count from contentDetails.statistics.commentCount: {video['comment_count']} for {video_id}")
+                    debug_log(lambda: f"Set comment_count from contentDetails.statistics.commentCount: {video['comment_count']} for {video_id}")
             
             # Try regex extraction as last resort
             if ('comment_count' not in video or not video['comment_count']) and 'statistics' in video:
@@ -137,7 +137,7 @@ def process_video_data(videos_data):
                 match = re.search(commentcount_pattern, raw_str)
                 if match:
                     video['comment_count'] = match.group(1)
-                    debug_log(f"Set comment_count via regex extraction: {video['comment_count']} for {video_id}")
+                    debug_log(lambda: f"Set comment_count via regex extraction: {video['comment_count']} for {video_id}")
     
     # Count processed videos
     view_count = sum(1 for v in videos_data if isinstance(v, dict) and 'views' in v and v['views'] and v['views'] != '0')
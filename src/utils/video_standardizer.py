@@ -4,10 +4,287 @@ Video Data Standardization Utility
 This module provides functions to ensure consistent video data structure
 across the application regardless of where the data came from.
 """
-from src.utils.debug_utils import debug_log
-from src.utils.video_processor import process_video_data
-from src.utils.video_formatter import fix_missing_views
 import json
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from src.utils.debug_utils import debug_log
+
+# Value meaning "no candidate path produced a usable value"
+_MISSING = object()
+
+Path = Tuple[str, ...]
+
+
+class FieldSpec:
+    """
+    How one output field is extracted from the possible input shapes.
+
+    Candidate paths are tried in order; the first value that is not None,
+    not in skip and of an accepted type wins.
+    """
+    __slots__ = ('name', 'paths', 'default', 'skip', 'accept', 'convert', 'required')
+
+    def __init__(self, name: str, paths: Sequence[Path], default: Any = _MISSING, skip: Tuple = ('',),
+                 accept: Optional[Tuple[type, ...]] = None, convert: Optional[Callable[[Any], Any]] = None,
+                 required: bool = False):
+        """
+        Args:
+            name: Output key
+            paths: Candidate key paths into the input dict
+            default: Value when no path matches, a callable taking the
+                output dict built so far, or _MISSING to leave the key unset
+            skip: Values treated as absent
+            accept: Accepted value types, any when None
+            convert: Applied to the extracted value (not to defaults)
+            required: Whether videos without the field are dropped
+        """
+        self.name = name
+        self.paths = tuple(paths)
+        self.default = default
+        self.skip = skip
+        self.accept = accept
+        self.convert = convert
+        self.required = required
+
+
+def _thumbnail_paths(*containers: Path) -> List[Path]:
+    return [container + (size, 'url') for container in containers for size in ('medium', 'default', 'high')]
+
+
+VIDEO_ID_PATHS = (
+    ('video_id',), ('youtube_id',), ('id',), ('id', 'videoId'),
+    ('contentDetails', 'videoId'), ('snippet', 'resourceId', 'videoId')
+)
+
+# Fields of a standardized video: flattened keys first, then the nested API
+# parts, then the flat database column names
+STANDARD_VIDEO_FIELDS = (
+    FieldSpec('video_id', VIDEO_ID_PATHS, accept=(str,), required=True),
+    FieldSpec('title', [('title',), ('snippet', 'title'), ('snippet_title',)], 'Untitled'),
+    FieldSpec('description', [('description',), ('snippet', 'description'), ('video_description',),
+                              ('snippet_description',)], ''),
+    FieldSpec('duration', [('duration',), ('contentDetails', 'duration'), ('content_details_duration',)],
+              'Unknown duration', skip=('', 'Unknown duration')),
+    FieldSpec('published_at', [('published_at',), ('snippet', 'publishedAt'), ('snippet_published_at',)], ''),
+    FieldSpec('views', [('views',), ('statistics', 'viewCount'), ('contentDetails', 'statistics', 'viewCount'),
+                        ('statistics_view_count',), ('view_count',)], '0', skip=('', '0', 0), convert=str),
+    FieldSpec('likes', [('likes',), ('statistics', 'likeCount'), ('statistics_like_count',), ('like_count',)],
+              '0', skip=('', '0', 0), convert=str),
+    # The API statistics are the most recent source of the comment count
+    FieldSpec('comment_count', [('statistics', 'commentCount'), ('comment_count',),
+                                ('contentDetails', 'statistics', 'commentCount'), ('statistics_comment_count',)],
+              '0', skip=('', '0', 0), convert=str),
+    FieldSpec('thumbnail_url', [('thumbnail_url',)] + _thumbnail_paths(('snippet', 'thumbnails'), ('thumbnails',))
+              + [('thumbnail',), ('thumbnails',), ('snippet_thumbnails_high',)],
+              lambda video: f"https://img.youtube.com/vi/{video['video_id']}/mqdefault.jpg", accept=(str,)),
+    FieldSpec('snippet', [('snippet',)], lambda video: {}),
+    FieldSpec('statistics', [('statistics',)], lambda video: {}),
+    FieldSpec('contentDetails', [('contentDetails',)], lambda video: {}),
+    FieldSpec('kind', [('kind',)], None),
+    FieldSpec('etag', [('etag',)], None),
+)
+
+_VIDEO_ID_FIELDS = STANDARD_VIDEO_FIELDS[:1]
+
+# Keys every standardized video has; videos holding all of them pass through
+STANDARD_VIDEO_KEYS = frozenset(spec.name for spec in STANDARD_VIDEO_FIELDS)
+
+
+def _published_date(video: Dict[str, Any]) -> Any:
+    published_at = video.get('published_at')
+    return published_at.split('T')[0] if isinstance(published_at, str) and published_at else _MISSING
+
+
+# API-shaped video (a videos.list item or a database video as returned by
+# VideoRepository) to the collection format; the counts fall back to the
+# flattened keys and '0', other keys without a value are left out
+COLLECTION_VIDEO_FIELDS = (
+    FieldSpec('video_id', [('id',), ('video_id',), ('youtube_id',)], accept=(str,)),
+    FieldSpec('title', [('snippet', 'title')]),
+    FieldSpec('video_description', [('snippet', 'description')]),
+    FieldSpec('published_at', [('snippet', 'publishedAt')]),
+    FieldSpec('published_date', [], _published_date),
+    FieldSpec('views', [('statistics', 'viewCount'), ('views',)], '0', convert=str),
+    FieldSpec('likes', [('statistics', 'likeCount'), ('likes',)], '0', convert=str),
+    FieldSpec('comment_count', [('statistics', 'commentCount'), ('comment_count',)], '0', convert=str),
+    FieldSpec('duration', [('contentDetails', 'duration')]),
+    FieldSpec('thumbnails', [('snippet', 'thumbnails', size, 'url') for size in ('maxres', 'high', 'medium', 'default')]),
+)
+
+
+class NormalizedVideos(list):
+    """
+    List of standardized videos.
+
+    normalize_videos returns it and passes the list itself through unchanged
+    as long as it holds the same video dicts, in the same order, each still
+    with every standard key.
+    """
+
+    def __init__(self, videos=()):
+        super().__init__(videos)
+        self._normalized = tuple(self)
+
+    def is_intact(self) -> bool:
+        """Whether no video was added, removed, replaced or lost a standard key since normalization."""
+        return (len(self) == len(self._normalized)
+                and all(video is normalized and STANDARD_VIDEO_KEYS <= video.keys()
+                        for video, normalized in zip(self, self._normalized)))
+
+
+def _compile_getter(spec: FieldSpec, signature: FrozenSet[str]) -> Callable[[Dict[str, Any]], Any]:
+    """Build the extraction function of one field for videos with the given top-level keys."""
+    paths = [path for path in spec.paths if path[0] in signature]
+    skip, accept, convert = spec.skip, spec.accept, spec.convert
+
+    def get(video):
+        for path in paths:
+            value = video
+            for key in path:
+                if isinstance(value, str) and value[:1] == '{':
+                    # Statistics stored as a JSON string
+                    try:
+                        value = json.loads(value)
+                    except ValueError:
+                        value = None
+                        break
+                if not isinstance(value, dict):
+                    value = None
+                    break
+                value = value.get(key)
+                if value is None:
+                    break
+            if value is None or (accept and not isinstance(value, accept)):
+                continue
+            if not isinstance(value, (dict, list)) and value in skip:
+                continue
+            return convert(value) if convert else value
+        return _MISSING
+
+    return get
+
+
+# Compiled plans by (field specs, input signature); the number of distinct
+# input shapes is small, the bound only guards against pathological input
+_PLAN_CACHE_SIZE = 256
+_plan_cache: Dict[Tuple[Tuple[FieldSpec, ...], FrozenSet[str]], Optional[List[Tuple[FieldSpec, Callable]]]] = {}
+
+
+def compile_plan(fields: Sequence[FieldSpec], signature: FrozenSet[str],
+                 passthrough_keys: Optional[FrozenSet[str]] = None) -> Optional[List[Tuple[FieldSpec, Callable]]]:
+    """
+    Get the extraction plan for videos with a given set of top-level keys.
+
+    Plans are compiled once per input shape and cached.
+
+    Args:
+        fields: Output field specs
+        signature: Top-level keys of the input videos
+        passthrough_keys: Keys marking an input as already normalized
+
+    Returns:
+        List of (spec, getter) pairs, or None when videos of this shape are
+        already normalized
+    """
+    cache_key = (tuple(fields), signature)
+    if cache_key not in _plan_cache:
+        if len(_plan_cache) >= _PLAN_CACHE_SIZE:
+            _plan_cache.clear()
+        if passthrough_keys is not None and passthrough_keys <= signature:
+            _plan_cache[cache_key] = None
+        else:
+            _plan_cache[cache_key] = [(spec, _compile_getter(spec, signature)) for spec in fields]
+    return _plan_cache[cache_key]
+
+
+def _apply_plan(plan: List[Tuple[FieldSpec, Callable]], video: Dict[str, Any],
+                output: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    for spec, get in plan:
+        value = get(video)
+        if value is _MISSING:
+            if spec.required:
+                return None
+            value = spec.default
+            if callable(value):
+                value = value(output)
+            if value is _MISSING:
+                continue
+        output[spec.name] = value
+    return output
+
+
+def normalize_videos(videos: Sequence[Any], fields: Sequence[FieldSpec] = STANDARD_VIDEO_FIELDS,
+                     keep_other_keys: bool = True) -> List[Dict[str, Any]]:
+    """
+    Normalize a batch of videos from any source shape in a single pass.
+
+    The shape of each video (raw API response, database row, flattened
+    collection dict, or already normalized) is identified by its set of
+    top-level keys, and a precompiled extraction plan for that shape is
+    applied. Every video is returned as a new dict (already normalized ones
+    as a shallow copy), so inputs are never modified through the result.
+    An intact NormalizedVideos batch is the exception: it is returned as is.
+    Videos without an ID are dropped.
+
+    Args:
+        videos: Video dicts; non-dict items are skipped
+        fields: Output field specs, standardized videos by default
+        keep_other_keys: Whether to copy keys not covered by the specs
+
+    Returns:
+        List of normalized video dicts; a NormalizedVideos list for the
+        standard fields, which later calls pass through unchanged
+    """
+    standard = fields is STANDARD_VIDEO_FIELDS
+    if standard and isinstance(videos, NormalizedVideos) and videos.is_intact():
+        return videos
+
+    normalized = []
+    skipped = 0
+    for video in videos:
+        output = normalize_video(video, fields, keep_other_keys) if isinstance(video, dict) else None
+        if output is None:
+            skipped += 1
+        else:
+            normalized.append(output)
+
+    debug_log(lambda: f"normalize_videos: {len(normalized)} videos normalized, {skipped} skipped")
+    return NormalizedVideos(normalized) if standard else normalized
+
+
+def normalize_video(video: Dict[str, Any], fields: Sequence[FieldSpec] = STANDARD_VIDEO_FIELDS,
+                    keep_other_keys: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a single video dict with the plan compiled for its shape.
+
+    Args:
+        video: Video dict
+        fields: Output field specs, standardized videos by default
+        keep_other_keys: Whether to copy keys not covered by the specs
+
+    Returns:
+        The normalized video as a new dict, or None if it has no ID
+    """
+    passthrough_keys = STANDARD_VIDEO_KEYS if fields is STANDARD_VIDEO_FIELDS else None
+    plan = compile_plan(fields, frozenset(video), passthrough_keys)
+    if plan is None:
+        return dict(video)
+    return _apply_plan(plan, video, dict(video) if keep_other_keys else {})
+
+
+def extract_video_id(video: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the YouTube ID of a video in any of the supported shapes.
+
+    Args:
+        video: Video dict
+
+    Returns:
+        The video ID, or None
+    """
+    value = compile_plan(_VIDEO_ID_FIELDS, frozenset(video))[0][1](video)
+    return None if value is _MISSING else value
+
 
 def standardize_video_data(videos_data):
     """
@@ -21,145 +298,17 @@ def standardize_video_data(videos_data):
         list: List with standardized video data
     """
     if not videos_data:
-        debug_log("standardize_video_data: No videos provided")
         return []
     
-    debug_log(f"standardize_video_data: Standardizing {len(videos_data) if isinstance(videos_data, list) else '1 non-list item'} videos")
-    debug_log(f"standardize_video_data: Input data type: {type(videos_data)}")
-    
-    # Log initial sample for diagnostic purposes
-    if isinstance(videos_data, list) and len(videos_data) > 0:
-        first_video = videos_data[0]
-        debug_log(f"standardize_video_data: First video data BEFORE processing: {str(first_video)[:500]}...")
-        if isinstance(first_video, dict):
-            debug_log(f"standardize_video_data: First video keys: {list(first_video.keys())}")
-    
     # Handle non-list input (single video)
     if not isinstance(videos_data, list):
-        debug_log(f"standardize_video_data: Input is not a list, converting from type {type(videos_data)}")
         if isinstance(videos_data, dict):
             videos_data = [videos_data]
         else:
             debug_log(f"standardize_video_data: Cannot standardize non-dict/non-list input: {type(videos_data)}")
             return []
     
-    # First apply the process_video_data function to extract all fields to top level
-    processed_videos = process_video_data(videos_data)
-    
-    # Then fix any missing views
-    fixed_videos = fix_missing_views(processed_videos)
-    
-    debug_log(f"standardize_video_data: After processing and fixing views - have {len(fixed_videos) if isinstance(fixed_videos, list) else 'non-list'} videos")
-    if isinstance(fixed_videos, list) and len(fixed_videos) > 0:
-        first_fixed = fixed_videos[0]
-        debug_log(f"standardize_video_data: First video AFTER fixing views - type: {type(first_fixed)}")
-        if isinstance(first_fixed, dict):
-            debug_log(f"standardize_video_data: First video keys AFTER fixing views: {list(first_fixed.keys())}")
-            debug_log(f"standardize_video_data: First video data sample AFTER fixing views: {str(first_fixed)[:300]}...")
-    
-    # Additional normalization to ensure all required fields exist with proper types
-    standardized_videos = []
-    expected_fields = {
-        'video_id': '',
-        'title': '',
-        'description': '',
-        'duration': 'Unknown duration',
-        'published_at': '',
-        'likes': '0',
-        'views': '0',
-        'comment_count': '0',
-        'thumbnail_url': '',
-        'snippet': {},
-        'statistics': {},
-        'contentDetails': {},
-    }
-    for video in fixed_videos:
-        if not isinstance(video, dict):
-            debug_log(f"standardize_video_data: Skipping non-dict video item of type {type(video)}")
-            continue
-        # Robustly extract video_id from all possible locations
-        video_id = (
-            video.get('video_id') or
-            video.get('youtube_id') or
-            video.get('id') if isinstance(video.get('id'), str) else None or
-            (video.get('id', {}).get('videoId') if isinstance(video.get('id'), dict) else None) or
-            (video.get('contentDetails', {}).get('videoId') if isinstance(video.get('contentDetails'), dict) else None) or
-            (video.get('snippet', {}).get('resourceId', {}).get('videoId') if isinstance(video.get('snippet', {}).get('resourceId'), dict) else None)
-        )
-        if not video_id:
-            debug_log(f"standardize_video_data: WARNING - Skipping video with no valid ID. Video keys: {list(video.keys())}, sample data: {str(video)[:200]}...")
-            continue
-        std_video = video.copy()
-        std_video['video_id'] = video_id  # Always set video_id
-        # Ensure all expected fields exist with sensible defaults
-        for field, default in expected_fields.items():
-            if field not in std_video or std_video[field] is None:
-                std_video[field] = default
-                debug_log(f"standardize_video_data: Field '{field}' missing in video {video_id}, defaulting to {repr(default)}")
-        # Title
-        std_video['title'] = video.get('title', video.get('snippet', {}).get('title', 'Untitled'))
-        # Description
-        std_video['description'] = video.get('description', video.get('snippet', {}).get('description', ''))
-        # Duration
-        if 'duration' not in std_video or not std_video['duration'] or std_video['duration'] == 'Unknown duration':
-            if 'contentDetails' in std_video and isinstance(std_video['contentDetails'], dict):
-                std_video['duration'] = std_video['contentDetails'].get('duration', 'Unknown duration')
-            else:
-                std_video['duration'] = 'Unknown duration'
-        # Published at
-        std_video['published_at'] = video.get('published_at', video.get('snippet', {}).get('publishedAt', ''))
-        # Likes
-        if 'likes' not in std_video or not std_video['likes']:
-            if 'statistics' in std_video and isinstance(std_video['statistics'], dict):
-                std_video['likes'] = str(std_video['statistics'].get('likeCount', '0'))
-            else:
-                std_video['likes'] = '0'
-        # Views
-        if 'views' not in std_video or not std_video['views']:
-            if 'statistics' in std_video and isinstance(std_video['statistics'], dict):
-                std_video['views'] = str(std_video['statistics'].get('viewCount', '0'))
-            else:
-                std_video['views'] = '0'
-        # Comment count
-        if 'comment_count' not in std_video or not std_video['comment_count']:
-            if 'statistics' in std_video and isinstance(std_video['statistics'], dict):
-                std_video['comment_count'] = str(std_video['statistics'].get('commentCount', '0'))
-            else:
-                std_video['comment_count'] = '0'
-        # Thumbnail URL
-        if not std_video['thumbnail_url']:
-            # Try all possible thumbnail paths
-            thumb_url = ''
-            if 'snippet' in std_video and 'thumbnails' in std_video['snippet']:
-                thumbnails = std_video['snippet']['thumbnails']
-                for size in ['medium', 'default', 'high']:
-                    if size in thumbnails and 'url' in thumbnails[size]:
-                        thumb_url = thumbnails[size]['url']
-                        break
-            elif 'thumbnails' in std_video and isinstance(std_video['thumbnails'], dict):
-                thumbnails = std_video['thumbnails']
-                for size in ['medium', 'default', 'high']:
-                    if size in thumbnails and 'url' in thumbnails[size]:
-                        thumb_url = thumbnails[size]['url']
-                        break
-            elif 'thumbnail' in std_video and isinstance(std_video['thumbnail'], str):
-                thumb_url = std_video['thumbnail']
-            if not thumb_url and video_id:
-                thumb_url = f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg"
-                debug_log(f"Generated thumbnail URL for video {video_id}")
-            std_video['thumbnail_url'] = thumb_url
-        # Nested fields: ensure dicts/arrays are not None
-        for nested in ['snippet', 'statistics', 'contentDetails']:
-            if std_video[nested] is None:
-                std_video[nested] = {} if nested != 'tags' else []
-        standardized_videos.append(std_video)
-    debug_log(f"standardize_video_data: Returning {len(standardized_videos)} standardized videos")
-    # Diagnostic: print first 3 video dicts and their video_id fields
-    for i, v in enumerate(standardized_videos[:3]):
-        debug_log(f"standardize_video_data: Video {i+1} video_id: {v.get('video_id')}, keys: {list(v.keys())}")
-        if i < 2:
-            debug_log(f"standardize_video_data: Video {i+1} full dict: {json.dumps(v, default=str)[:1000]}")
-    return standardized_videos
+    return normalize_videos(videos_data)
 
 
 def extract_standardized_videos(response_data):
@@ -175,7 +324,6 @@ def extract_standardized_videos(response_data):
     videos = []
     
     debug_log(f"extract_standardized_videos: Processing response data of type {type(response_data)}")
-    debug_log(f"extract_standardized_videos: Raw response data structure: {str(response_data)[:500]}...")
     
     # Handle different response data types/shapes
     if not response_data:
@@ -1,7 +1,7 @@
 """
 WebSocket keepalive utilities for maintaining Streamlit connections during long operations.
 """
-import streamlit as st
+from src.utils.headless import is_headless, st
 import time
 import threading
 from typing import Optional, Callable, Any
@@ -43,6 +43,10 @@ class WebSocketKeepAlive:
         self._status_placeholder = st.empty()
         self._progress_placeholder = st.empty()
         
+        # Headless runs have no browser connection to keep alive
+        if is_headless():
+            return
+        
         # Reset the stop event
         self._stop_keepalive.clear()
         
@@ -186,6 +190,8 @@ class ChunkedOperationManager:
         """
         results = []
         total_items = len(items)
+        # Pausing to let the browser repaint only slows headless runs down
+        ui_pause = 0 if is_headless() else 0.1
         
         # Create progress tracking
         progress_bar = st.progress(0)
@@ -221,13 +227,13 @@ class ChunkedOperationManager:
                         self.last_update = current_time
                         
                         # Allow UI to update
-                        time.sleep(0.1)
+                        time.sleep(ui_pause)
                 
                 results.extend(chunk_results)
                 
                 # Force UI update after each chunk
                 progress_bar.progress((i + len(chunk)) / total_items)
-                time.sleep(0.1)
+                time.sleep(ui_pause)
                 
         finally:
             # Clean up UI elements
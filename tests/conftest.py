@@ -0,0 +1,21 @@
+"""
+Pytest fixtures shared by every test suite of the YouTube Data Hub application.
+"""
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_sqlite_db(tmp_path, monkeypatch):
+    """Point the configured SQLite database at a per-test file instead of data/youtube_data.db."""
+    import src.config
+
+    db_path = tmp_path / 'youtube_data.db'
+    default_path = src.config.SQLITE_DB_PATH
+    monkeypatch.setattr(src.config, 'SQLITE_DB_PATH', db_path)
+    # Modules that imported the setting hold their own reference to it
+    for name, module in list(sys.modules.items()):
+        if name.startswith('src.') and getattr(module, 'SQLITE_DB_PATH', None) == default_path:
+            monkeypatch.setattr(module, 'SQLITE_DB_PATH', db_path)
+    yield db_path
@@ -173,4 +173,31 @@ def test_temporal_analysis(analyzer):
     assert set(temporal['daily'].columns) == {'Date', 'Count'}
     assert set(temporal['monthly'].columns) >= {'Year', 'Month', 'Month_Name', 'Count', 'YearMonth'}
     assert set(temporal['hourly'].columns) == {'Hour', 'Count'}
-    assert set(temporal['day_of_week'].columns) >= {'Day', 'Count'} 
\ No newline at end of file
+    assert set(temporal['day_of_week'].columns) >= {'Day', 'Count'} 
+
+
+def test_thread_index_groups_replies_under_roots(analyzer):
+    channel_data = {
+        'comments': {
+            'video6': [
+                {'comment_id': 'a', 'comment_author': 'A', 'comment_text': 'Root A', 'like_count': 1},
+                {'comment_id': 'b', 'comment_author': 'B', 'comment_text': 'Root B', 'like_count': 2},
+                {'comment_id': 'a.1', 'comment_author': 'C', 'comment_text': 'Reply one', 'parent_id': 'a'},
+                {'comment_id': 'b.1', 'comment_author': 'D', 'comment_text': 'Needle here', 'parent_id': 'b'},
+                {'comment_id': 'a.2', 'comment_author': 'E', 'comment_text': 'Reply two', 'parent_id': 'a'},
+            ]
+        }
+    }
+    result = analyzer.get_comment_analysis(channel_data)
+    df = result['df']
+    threads = result['thread_data']['thread_index']
+    assert len(threads) == 2
+    assert list(threads.reply_counts) == [2, 1]
+    assert list(df.iloc[threads.replies(0)]['Comment ID']) == ['a.1', 'a.2']
+    assert list(df.iloc[threads.replies(1)]['Comment ID']) == ['b.1']
+    # A reply match selects its whole thread
+    matched = threads.match(df['Search Text'].str.contains('needle', regex=False).to_numpy())
+    assert list(matched) == [False, True]
+    # Same snapshot reuses the memoized index
+    again = analyzer.get_comment_analysis(channel_data)
+    assert again['thread_data']['thread_index'] is threads
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+from src.analysis.video_analyzer import VideoAnalyzer, videos_fingerprint
+from src.models.youtube import VideoBatch
+
+
+@pytest.fixture
+def analyzer():
+    return VideoAnalyzer()
+
+
+@pytest.fixture
+def channel_data():
+    return {
+        'channel_info': {'title': 'Test Channel'},
+        'videos': [
+            {
+                'id': 'v1',
+                'snippet': {'title': 'First', 'publishedAt': '2023-01-15T10:00:00Z'},
+                'statistics': {'viewCount': '1000', 'likeCount': '50', 'commentCount': '5'},
+                'contentDetails': {'duration': 'PT1H2M3S'}
+            },
+            {
+                'id': 'v2',
+                'snippet': {'title': 'Second', 'publishedAt': '2023-03-01T10:00:00Z'},
+                'statistics': {'viewCount': '300', 'likeCount': 'n/a', 'commentCount': '1'},
+                'contentDetails': {'duration': 'PT45S'}
+            },
+            {
+                'id': 'v3',
+                'title': 'Third',
+                'published_at': '2024-02-01T10:00:00Z',
+                'views': '5000',
+                'likes': '10',
+                'comment_count': '0',
+                'duration': 'PT12M'
+            }
+        ]
+    }
+
+
+def test_video_frame_is_typed(analyzer, channel_data):
+    df = analyzer.get_video_frame(channel_data)
+    assert list(df['Video ID']) == ['v1', 'v2', 'v3']
+    assert str(df['Published'].dtype) == 'datetime64[ns]'
+    assert df['Views'].dtype == 'int64'
+    assert list(df['Likes']) == [50, 0, 10]
+    assert list(df['Duration_Seconds']) == [3723, 45, 720]
+    assert list(df['Duration']) == ['1:02:03', '0:45', '12:00']
+
+
+def test_video_frame_is_memoized_by_content(analyzer, channel_data):
+    fingerprint = videos_fingerprint(channel_data['videos'])
+    first = analyzer.get_video_frame(channel_data)
+    assert videos_fingerprint(channel_data['videos']) == fingerprint
+    assert VideoAnalyzer().get_video_frame(channel_data) is first
+
+    channel_data['videos'][0]['statistics']['viewCount'] = '2000'
+    changed = analyzer.get_video_frame(channel_data)
+    assert changed is not first
+    assert changed.loc[0, 'Views'] == 2000
+
+
+def test_video_frame_from_a_video_batch(analyzer, channel_data):
+    batch = VideoBatch.from_videos(channel_data['videos'], raw='none')
+    frame = analyzer.get_video_frame({'videos': batch})
+    pd.testing.assert_frame_equal(frame, analyzer.get_video_frame(channel_data))
+    assert videos_fingerprint(batch) != videos_fingerprint(VideoBatch.from_videos(channel_data['videos'][:2]))
+
+
+def test_statistics_returns_private_copy(analyzer, channel_data):
+    stats = analyzer.get_video_statistics(channel_data)
+    assert stats['total_videos'] == 3
+    assert stats['total_views'] == 6300
+    stats['df']['Views'] = 0
+    assert analyzer.get_video_frame(channel_data)['Views'].sum() == 6300
+
+
+def test_derived_analyses(analyzer, channel_data):
+    top = analyzer.get_top_videos(channel_data, n=2, by='Views')['df']
+    assert list(top['Video ID']) == ['v3', 'v1']
+
+    timeline = analyzer.get_publication_timeline(channel_data)
+    assert list(timeline['monthly_df']['Month-Year']) == ['Jan 2023', 'Mar 2023', 'Feb 2024']
+    assert list(timeline['yearly_df']['Videos']) == [2, 1]
+
+    durations = analyzer.get_duration_analysis(channel_data)
+    counts = dict(zip(durations['category_df']['Duration Category'], durations['category_df']['Count']))
+    assert counts['Under 1 min'] == 1
+    assert counts['10-20 mins'] == 1
+    assert counts['Over 60 mins'] == 1
+    assert durations['stats']['max_duration_seconds'] == 3723
+
+
+def test_no_videos(analyzer):
+    assert analyzer.get_video_statistics({'videos': []})['df'] is None
+    assert analyzer.get_publication_timeline({})['monthly_df'] is None
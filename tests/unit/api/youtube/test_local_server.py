@@ -0,0 +1,98 @@
+"""
+Tests for the local YouTube API stand-in and the record/replay transport.
+"""
+import pytest
+import googleapiclient.errors
+
+from src.api.youtube.base import YouTubeBaseClient
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.replay import ReplayMissError, configure_api_transport, load_cassette
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNEL_ID = 'UCstandin000000000000000'
+UPLOADS_ID = 'UUstandin000000000000000'
+
+
+@pytest.fixture
+def live_transport():
+    yield
+    configure_api_transport('live')
+
+
+@pytest.fixture
+def dataset():
+    return LocalYouTubeDataset.synthetic(videos_per_channel=12, comments_per_video=3, replies_per_comment=2)
+
+
+def test_list_endpoints_paginate(dataset):
+    """Test that list responses page through all items and honour maxResults"""
+    server = LocalYouTubeServer(dataset)
+    video_ids = []
+    page_token = None
+    while True:
+        params = {'key': API_KEY, 'part': 'contentDetails', 'playlistId': UPLOADS_ID, 'maxResults': '5'}
+        if page_token:
+            params['pageToken'] = page_token
+        status, body = server.handle('GET', '/youtube/v3/playlistItems', params)
+        assert status == 200
+        assert len(body['items']) <= 5
+        assert 'snippet' not in body['items'][0]
+        video_ids.extend(item['contentDetails']['videoId'] for item in body['items'])
+        page_token = body.get('nextPageToken')
+        if not page_token:
+            break
+
+    assert video_ids == list(dataset.videos)
+    assert server.stats()['requests']['playlistItems'] == 3
+
+    status, body = server.handle('GET', '/youtube/v3/comments',
+                                 {'key': API_KEY, 'part': 'snippet', 'parentId': f"Ug{video_ids[0]}000000"})
+    assert status == 200 and len(body['items']) == 2
+
+
+def test_quota_and_rate_limit_errors(dataset):
+    """Test that the daily quota and the per-second rate limit produce API errors"""
+    server = LocalYouTubeServer(dataset, daily_quota=101)
+    search = {'key': API_KEY, 'part': 'snippet', 'q': 'stand-in', 'type': 'channel'}
+    status, body = server.handle('GET', '/youtube/v3/search', search)
+    assert status == 200 and body['items'][0]['id']['channelId'] == CHANNEL_ID
+
+    status, body = server.handle('GET', '/youtube/v3/search', search)
+    assert status == 403
+    assert body['error']['errors'][0]['reason'] == 'quotaExceeded'
+    assert server.stats()['quota_used'] == 100
+
+    limited = LocalYouTubeServer(dataset, requests_per_second=2)
+    channels = {'key': API_KEY, 'part': 'snippet', 'id': CHANNEL_ID}
+    statuses = [limited.handle('GET', '/youtube/v3/channels', channels)[0] for _ in range(3)]
+    assert statuses == [200, 200, 403]
+    assert limited.stats()['errors'] == {'rateLimitExceeded': 1}
+
+
+def test_record_then_replay_without_server(dataset, tmp_path, live_transport):
+    """Test that a client recorded against the stand-in can replay with no server running"""
+    cassette = str(tmp_path / 'cassette.jsonl')
+    with LocalYouTubeServer(dataset, daily_quota=2) as server:
+        configure_api_transport('record', cassette, endpoint=server.url)
+        client = YouTubeBaseClient(API_KEY)
+        recorded = client.youtube.channels().list(part='snippet,statistics', id=CHANNEL_ID).execute()
+        client.youtube.videos().list(part='statistics', id='000v0000000').execute()
+        with pytest.raises(googleapiclient.errors.HttpError) as error:
+            client.youtube.videos().list(part='statistics', id='000v0000001').execute()
+        assert error.value.resp.status == 403
+
+    entries = load_cassette(cassette)
+    assert len(entries) == 3
+    assert all(API_KEY not in entry['key'] for entry in entries)
+
+    configure_api_transport('replay', cassette)
+    client = YouTubeBaseClient(API_KEY)
+    assert client.youtube.channels().list(part='snippet,statistics', id=CHANNEL_ID).execute() == recorded
+    with pytest.raises(googleapiclient.errors.HttpError):
+        client.youtube.videos().list(part='statistics', id='000v0000001').execute()
+    with pytest.raises(ReplayMissError):
+        client.youtube.videos().list(part='statistics', id='000v0000005').execute()
+
+    replayed = LocalYouTubeDataset.from_cassette(cassette)
+    assert list(replayed.channels) == [CHANNEL_ID]
+    assert list(replayed.videos) == ['000v0000000']
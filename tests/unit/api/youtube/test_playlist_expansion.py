@@ -0,0 +1,100 @@
+"""
+Tests for concurrent multi-playlist expansion and the shared rate limit.
+"""
+import pytest
+
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.rate_limit import RateLimiter
+from src.api.youtube.replay import configure_api_transport
+from src.api.youtube.video import VideoClient
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNEL_0 = 'UCstandin000000000000000'
+PLAYLISTS = 200
+
+
+def _add_playlist(dataset, playlist_id, video_ids):
+    dataset.add_response({'items': [{
+        'kind': 'youtube#playlistItem',
+        'id': f"{playlist_id}.{video_id}",
+        'snippet': {
+            'playlistId': playlist_id,
+            'position': position,
+            'publishedAt': f"2024-01-{position % 28 + 1:02d}T00:00:00Z",
+            'title': video_id,
+            'resourceId': {'kind': 'youtube#video', 'videoId': video_id}
+        },
+        'contentDetails': {'videoId': video_id}
+    } for position, video_id in enumerate(video_ids)]})
+
+
+@pytest.fixture
+def server():
+    dataset = LocalYouTubeDataset.synthetic(channels=1, videos_per_channel=120, comments_per_video=0)
+    video_ids = sorted(dataset.videos)
+    # Overlapping playlists: every video is in several of them
+    for p in range(PLAYLISTS):
+        start = (p * 7) % len(video_ids)
+        _add_playlist(dataset, f"PLstandin{p:04d}", (video_ids + video_ids)[start:start + 12])
+    # A deleted video leaves an item without a video ID
+    _add_playlist(dataset, 'PLdeleted', video_ids[:2] + [None] + video_ids[-2:])
+    with LocalYouTubeServer(dataset) as server:
+        configure_api_transport('live', endpoint=server.url)
+        yield server
+    configure_api_transport('live')
+
+
+def test_expand_playlists_fetches_each_unseen_video_once(server):
+    """Test that 200 overlapping playlists expand in one pass without duplicate detail fetches"""
+    playlist_ids = [f"PLstandin{p:04d}" for p in range(PLAYLISTS)] + ['UU' + CHANNEL_0[2:], 'PLmissing']
+    known = {f"000v{v:07d}" for v in range(20)}
+    client = VideoClient(API_KEY)
+
+    result = client.expand_playlists(playlist_ids, known_video_ids=known, max_workers=8)
+
+    assert result['failed_playlists'] == ['PLmissing']
+    assert len(result['playlist_items']) == PLAYLISTS + 1
+    first = result['playlist_items']['PLstandin0000']
+    assert [item['position'] for item in first] == list(range(12))
+    assert first[0] == {'video_id': '000v0000000', 'position': 0, 'added_at': '2024-01-01T00:00:00Z'}
+
+    fetched = [video['id'] for video in result['videos']]
+    assert len(fetched) == len(set(fetched)) == 100
+    assert not known & set(fetched)
+    # One call per playlist plus two more uploads pages, and 100 unseen IDs in two videos.list calls
+    assert server.stats()['requests'] == {'playlistItems': PLAYLISTS + 4, 'videos': 2}
+
+
+def test_expand_playlists_with_every_video_known(server):
+    """Test that nothing is sent to videos.list when every video is already stored"""
+    client = VideoClient(API_KEY)
+    known = {f"000v{v:07d}" for v in range(120)}
+    result = client.expand_playlists(['PLstandin0001', 'PLstandin0002'], known_video_ids=known)
+    assert result['videos'] == []
+    assert server.stats()['requests'] == {'playlistItems': 2}
+
+
+def test_expand_playlists_looks_up_only_the_walked_videos(server):
+    """Test that a known_video_ids callable gets the walked IDs, without items lacking one"""
+    client = VideoClient(API_KEY)
+    lookups = []
+
+    def stored(video_ids):
+        lookups.append(list(video_ids))
+        return {video_ids[0]}
+
+    result = client.expand_playlists(['PLdeleted'], known_video_ids=stored)
+    walked = ['000v0000000', '000v0000001', '000v0000118', '000v0000119']
+    assert lookups == [walked]
+    assert [item['video_id'] for item in result['playlist_items']['PLdeleted']] == walked
+    assert [video['id'] for video in result['videos']] == walked[1:]
+    assert result['failed_playlists'] == []
+
+
+def test_rate_limiter_spaces_requests():
+    """Test that the limiter hands out evenly spaced slots and is off by default"""
+    assert RateLimiter().acquire() == 0.0
+    limiter = RateLimiter(requests_per_second=50)
+    waits = [limiter.acquire() for _ in range(3)]
+    assert waits[0] == 0.0
+    assert sum(waits) == pytest.approx(0.04, abs=0.015)
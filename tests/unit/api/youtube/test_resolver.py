@@ -0,0 +1,82 @@
+"""
+Tests for channel handle resolution and the persistent handle cache.
+"""
+import pytest
+
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.replay import configure_api_transport
+from src.api.youtube.resolver import ChannelResolver, parse_channel_reference
+from src.database.handle_repository import HANDLE_CACHE_TTL_SECONDS, HandleRepository
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNEL_0 = 'UCstandin000000000000000'
+CHANNEL_1 = 'UCstandin000000000000001'
+
+
+@pytest.fixture
+def server():
+    with LocalYouTubeServer(LocalYouTubeDataset.synthetic(channels=2, videos_per_channel=1,
+                                                          comments_per_video=0)) as server:
+        configure_api_transport('live', endpoint=server.url)
+        yield server
+    configure_api_transport('live')
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'handles.db')
+
+
+def test_parse_channel_reference():
+    """Test that handles, URLs and IDs are classified"""
+    assert parse_channel_reference('@Name') == ('handle', 'Name')
+    assert parse_channel_reference('resolve:@Name') == ('handle', 'Name')
+    assert parse_channel_reference('https://www.youtube.com/@Name/videos?x=1') == ('handle', 'Name')
+    assert parse_channel_reference('youtube.com/user/OldName') == ('username', 'OldName')
+    assert parse_channel_reference('https://youtube.com/c/Custom') == ('custom', 'Custom')
+    assert parse_channel_reference('https://youtube.com/channel/' + CHANNEL_0) == ('id', CHANNEL_0)
+    assert parse_channel_reference('Custom') == ('custom', 'Custom')
+    assert parse_channel_reference('  ') is None
+
+
+def test_resolve_many_uses_cheap_lookups_and_caches(server, db_path):
+    """Test that handles resolve with forHandle, duplicates are looked up once and answers persist"""
+    references = ['@standin0', 'https://www.youtube.com/@standin1', '@STANDIN0', '@nobody', CHANNEL_1]
+    resolver = ChannelResolver(API_KEY, db_path=db_path)
+
+    assert resolver.resolve_many(references) == {
+        '@standin0': CHANNEL_0, 'https://www.youtube.com/@standin1': CHANNEL_1,
+        '@STANDIN0': CHANNEL_0, '@nobody': None, CHANNEL_1: CHANNEL_1
+    }
+    stats = server.stats()
+    assert stats['requests'] == {'channels': 3, 'search': 1}
+    assert stats['quota_used'] == 103
+
+    # A new resolver, e.g. after a restart, answers everything from the cache
+    server.reset_stats()
+    again = ChannelResolver(API_KEY, db_path=db_path)
+    assert again.resolve_custom_channel_url('@standin1') == CHANNEL_1
+    assert again.resolve_custom_channel_url('@nobody') is None
+    assert server.stats()['requests'] == {}
+    assert HandleRepository(db_path).get_by_id('handle:standin0')['source'] == 'forHandle'
+
+
+def test_search_is_last_resort_with_one_channels_call(server, db_path):
+    """Test that search.list only runs when allowed and checks its hits with one channels.list"""
+    resolver = ChannelResolver(API_KEY, db_path=db_path)
+    assert resolver.resolve_many(['@standin'], allow_search=False) == {'@standin': None}
+    assert HandleRepository(db_path).get_by_id('handle:standin') is None
+
+    server.reset_stats()
+    assert resolver.resolve_custom_channel_url('@standin') == CHANNEL_0
+    assert server.stats()['requests'] == {'channels': 2, 'search': 1}
+    assert HandleRepository(db_path).get_by_id('handle:standin')['source'] == 'search'
+
+
+def test_cached_entries_expire(db_path):
+    """Test that positive and negative entries expire after their TTL"""
+    cache = HandleRepository(db_path)
+    cache.store_resolutions([('handle:a', CHANNEL_0, 'forHandle'), ('handle:b', None, 'search')], now=0)
+    assert cache.get_cached(['handle:a', 'handle:b', 'handle:c'], now=1) == {'handle:a': CHANNEL_0, 'handle:b': None}
+    assert cache.get_cached(['handle:a', 'handle:b'], now=HANDLE_CACHE_TTL_SECONDS - 1) == {'handle:a': CHANNEL_0}
+    assert cache.get_cached(['handle:a'], now=HANDLE_CACHE_TTL_SECONDS + 1) == {}
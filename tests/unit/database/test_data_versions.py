@@ -0,0 +1,86 @@
+import copy
+import sqlite3
+
+import pytest
+from src.database.sqlite import SQLiteDatabase
+from src.database.version_repository import content_hash
+
+CHANNEL = {
+    'channel_id': 'UC_versioned',
+    'channel_name': 'Versioned Channel',
+    'subscribers': 1000,
+    'views': 50000,
+    'total_videos': 2,
+    'fetched_at': '2025-04-29T15:00:00Z',
+    'video_id': [
+        {
+            'video_id': 'ver_video_1',
+            'title': 'Video 1',
+            'views': 1000,
+            'comments': [
+                {'comment_id': 'ver_comment_1', 'comment_text': 'Great video!', 'comment_author': 'A'},
+                {'comment_id': 'ver_comment_2', 'comment_text': 'Nice', 'comment_author': 'B'}
+            ]
+        },
+        {'video_id': 'ver_video_2', 'title': 'Video 2', 'views': 2000, 'comments': []}
+    ]
+}
+
+@pytest.fixture
+def db(tmp_path):
+    return SQLiteDatabase(str(tmp_path / 'versions.db'))
+
+def test_content_hash_ignores_fetch_metadata():
+    """Test that refetching unchanged data hashes the same"""
+    video = {'id': 'v1', 'statistics': {'viewCount': '5'}, 'fetched_at': 'a', 'comments': [1]}
+    refetched = dict(video, fetched_at='b', comments=[1, 2], _delta_options={})
+    assert content_hash(video) == content_hash(refetched)
+    assert content_hash(video) != content_hash(dict(video, statistics={'viewCount': '6'}))
+
+def test_data_version_only_grows_when_content_changes(db):
+    """Test that identical saves keep the version and each kind of change bumps it"""
+    assert db.get_data_version('UC_versioned') == 0
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    first = db.get_channel_fingerprints('UC_versioned')
+    assert first['data_version'] > 0
+    assert db.get_channel_data('UC_versioned')['data_version'] == first['data_version']
+
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    assert db.get_channel_fingerprints('UC_versioned') == dict(first, updated_at=first['updated_at'])
+
+    changed = copy.deepcopy(CHANNEL)
+    changed['video_id'][0]['comments'][1]['comment_text'] = 'Nice, edited'
+    db.store_channel_data(changed)
+    after_comment = db.get_channel_fingerprints('UC_versioned')
+    assert after_comment['data_version'] > first['data_version']
+    assert after_comment['comments_fingerprint'] != first['comments_fingerprint']
+    assert after_comment['videos_fingerprint'] == first['videos_fingerprint']
+    assert after_comment['channel_fingerprint'] == first['channel_fingerprint']
+
+    changed['video_id'][1]['views'] = 2500
+    changed['subscribers'] = 1001
+    db.store_channel_data(changed)
+    after_video = db.get_channel_fingerprints('UC_versioned')
+    assert after_video['data_version'] > after_comment['data_version']
+    assert after_video['videos_fingerprint'] != after_comment['videos_fingerprint']
+    assert after_video['channel_fingerprint'] != after_comment['channel_fingerprint']
+    assert db.get_data_versions(['UC_versioned', 'UC_unknown']) == {'UC_versioned': after_video['data_version']}
+
+def test_versions_survive_clearing_data(db):
+    """Test that a channel stored again after a clear never reuses an old version"""
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    version = db.get_data_version('UC_versioned')
+    db.clear_all_data()
+    db.initialize_db()
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    assert db.get_data_version('UC_versioned') > version
+
+def test_content_hash_columns_added_to_existing_database(tmp_path):
+    """Test that databases created before versioning gain the content_hash columns"""
+    db_path = str(tmp_path / 'legacy.db')
+    SQLiteDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('ALTER TABLE comments DROP COLUMN content_hash')
+    SQLiteDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert 'content_hash' in {row[1] for row in conn.execute('PRAGMA table_info(comments)')}
@@ -0,0 +1,57 @@
+import copy
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from src.database.parquet_export import export_parquet_snapshot, load_snapshot
+from src.database.sqlite import SQLiteDatabase
+
+CHANNEL = {
+    'channel_id': 'UC_export',
+    'channel_name': 'Export Channel',
+    'subscribers': 10,
+    'views': 100,
+    'total_videos': 2,
+    'video_id': [
+        {'video_id': 'exp_video_1', 'title': 'Video 1', 'views': 10,
+         'comments': [{'comment_id': 'exp_comment_1', 'comment_text': 'First', 'comment_author': 'A'}]},
+        {'video_id': 'exp_video_2', 'title': 'Video 2', 'views': 20, 'comments': []}
+    ]
+}
+
+@pytest.fixture
+def db(tmp_path):
+    return SQLiteDatabase(str(tmp_path / 'export.db'))
+
+def test_incremental_export_is_partitioned(db, tmp_path):
+    """Test that rows land in channel/date partitions and an unchanged store exports nothing"""
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    out = tmp_path / 'parquet'
+    exported = db.export_parquet(str(out))
+    assert exported['channels'] == 1 and exported['videos'] == 2 and exported['comments'] == 1
+    assert list((out / 'videos').glob('channel=UC_export/fetch_date=*/part-000001-*.parquet'))
+
+    assert not any(db.export_parquet(str(out)).values())
+
+    comments = load_snapshot(str(out), 'comments', channel_ids=['UC_export'])
+    assert comments.column('video_youtube_id').to_pylist() == ['exp_video_1']
+    assert load_snapshot(str(out), 'comments', channel_ids=['UC_other']).num_rows == 0
+
+def test_changed_rows_are_exported_again_and_latest_kept(db, tmp_path):
+    """Test that updated rows go to a new part and load_snapshot keeps the newest copy"""
+    db.store_channel_data(copy.deepcopy(CHANNEL))
+    out = str(tmp_path / 'parquet')
+    export_parquet_snapshot(db.db_path, out, tables=['videos', 'videos_history'])
+
+    changed = copy.deepcopy(CHANNEL)
+    changed['video_id'] = changed['video_id'][:1]
+    db.store_channel_data(changed)
+    assert export_parquet_snapshot(db.db_path, out, tables=['videos', 'videos_history']) == {'videos': 1, 'videos_history': 1}
+
+    videos = load_snapshot(out, 'videos', columns=['youtube_id', 'export_run'])
+    assert sorted(videos.to_pylist(), key=lambda row: row['youtube_id']) == [
+        {'youtube_id': 'exp_video_1', 'export_run': 2}, {'youtube_id': 'exp_video_2', 'export_run': 1}
+    ]
+    assert load_snapshot(out, 'videos', latest=False).num_rows == 3
+    assert load_snapshot(out, 'videos_history').num_rows == 3
@@ -0,0 +1,27 @@
+import pytest
+from src.database.sqlite import SQLiteDatabase
+
+@pytest.fixture
+def db(tmp_path):
+    return SQLiteDatabase(str(tmp_path / 'playlists.db'))
+
+def test_store_playlist_items_upserts_and_prunes(db):
+    """Test that items are upserted in bulk and removed videos are pruned"""
+    assert db.store_playlist_items({
+        'PL1': [{'video_id': 'a', 'position': 0, 'added_at': '2024-01-01T00:00:00Z'},
+                {'video_id': 'b', 'position': 1, 'added_at': '2024-01-02T00:00:00Z'}],
+        'PL2': [{'video_id': 'a', 'position': 0}]
+    })
+    assert db.playlist_item_repository.get_playlists_for_video('a') == ['PL1', 'PL2']
+
+    # PL1 was reordered and lost b; PL2 is untouched
+    assert db.store_playlist_items({'PL1': [{'video_id': 'c', 'position': 0}, {'video_id': 'a', 'position': 1}]})
+    assert [(row['video_id'], row['position']) for row in db.get_playlist_items('PL1')] == [('c', 0), ('a', 1)]
+    assert [row['video_id'] for row in db.get_playlist_items('PL2')] == ['a']
+
+def test_get_stored_video_ids(db):
+    """Test that only videos with a stored row are reported, in chunks past the variable limit"""
+    db.video_repository.store_video_data({'id': 'stored_video', 'snippet': {'title': 'Stored'}})
+    candidates = [f"missing_{i}" for i in range(2000)] + ['stored_video']
+    assert db.get_stored_video_ids(candidates) == {'stored_video'}
+    assert db.get_stored_video_ids() == {'stored_video'}
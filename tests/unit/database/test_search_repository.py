@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+from src.database.search_repository import SearchRepository, build_match_query, create_search_schema
+from src.database.sqlite import SQLiteDatabase
+
+def _has_fts5():
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE t USING fts5(x)')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+pytestmark = pytest.mark.skipif(not _has_fts5(), reason='SQLite built without FTS5')
+
+def _insert_video(conn, youtube_id, channel_id, title, description=''):
+    cursor = conn.execute(
+        'INSERT INTO videos (youtube_id, snippet_channel_id, snippet_title, snippet_description) VALUES (?, ?, ?, ?)',
+        (youtube_id, channel_id, title, description))
+    return cursor.lastrowid
+
+def _insert_comment(conn, comment_id, video_db_id, text, author='Viewer', likes=0):
+    conn.execute(
+        'INSERT INTO comments (comment_id, video_id, text, author_display_name, like_count) VALUES (?, ?, ?, ?, ?)',
+        (comment_id, video_db_id, text, author, likes))
+
+@pytest.fixture
+def search_db(tmp_path):
+    db_path = str(tmp_path / 'search.db')
+    db = SQLiteDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        v1 = _insert_video(conn, 'vid1', 'chan_a', 'Sourdough baking basics', 'How to bake bread at home')
+        v2 = _insert_video(conn, 'vid2', 'chan_b', 'Café tour', 'Coffee shops of Paris')
+        _insert_comment(conn, 'c1', v1, 'Just subscribed, great baking tips!', likes=5)
+        _insert_comment(conn, 'c2', v1, 'The crust looks perfect')
+        _insert_comment(conn, 'c3', v2, 'I loved that cafe, bread was amazing too')
+    return db_path, db
+
+def test_build_match_query():
+    """Test that user input becomes prefix terms and exact phrases"""
+    assert build_match_query('subscrib great') == '"subscrib"* "great"*'
+    assert build_match_query('"great baking" tips') == '"great baking" "tips"*'
+    assert build_match_query('a OR b*', column='text') == 'text : "a"* text : "OR"* text : "b"*'
+    assert build_match_query(' "" ') is None
+    assert build_match_query(None) is None
+
+def test_search_comments_ranked_with_snippets(search_db):
+    """Test prefix matching, snippets, channel filter and counts"""
+    db_path, db = search_db
+    repo = SearchRepository(db_path)
+
+    hits = repo.search_comments('subscrib')
+    assert [hit['comment_id'] for hit in hits] == ['c1']
+    assert '**subscribed**' in hits[0]['snippet']
+    assert hits[0]['video_id'] == 'vid1' and hits[0]['channel_id'] == 'chan_a'
+
+    assert {hit['comment_id'] for hit in repo.search_comments('bread')} == {'c3'}
+    assert repo.search_comments('bread', channel_ids=['chan_a']) == []
+    assert repo.count_comment_matches('caf') == 1
+    assert repo.matching_comment_ids('crust', ['chan_a']) == {'c2'}
+    assert db.search_comments('great baking')[0]['comment_id'] == 'c1'
+
+def test_search_videos_is_accent_insensitive(search_db):
+    """Test that video titles and descriptions are searchable without accents"""
+    db_path, db = search_db
+    hits = db.search_videos('cafe')
+    assert [hit['video_id'] for hit in hits] == ['vid2']
+    assert [hit['video_id'] for hit in db.search_videos('bread', channel_ids=['chan_a'])] == ['vid1']
+
+def test_triggers_keep_index_in_sync(search_db):
+    """Test that updates and deletes of source rows reach the index"""
+    db_path, _ = search_db
+    repo = SearchRepository(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE comments SET text = 'Edited: no longer relevant' WHERE comment_id = 'c1'")
+        conn.execute("DELETE FROM comments WHERE comment_id = 'c2'")
+    assert repo.search_comments('subscribed') == []
+    assert repo.matching_comment_ids('edited') == {'c1'}
+    assert repo.matching_comment_ids('crust') == set()
+
+def test_existing_rows_indexed_when_schema_created(tmp_path):
+    """Test that rows stored before the search tables existed are indexed"""
+    db_path = str(tmp_path / 'legacy.db')
+    SQLiteDatabase(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('DROP TABLE comments_fts')
+        for suffix in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER comments_fts_{suffix}')
+        v1 = _insert_video(conn, 'vid1', 'chan_a', 'Title')
+        _insert_comment(conn, 'old1', v1, 'Stored before search existed')
+    repo = SearchRepository(db_path)
+    assert repo.matching_comment_ids('stored') is None
+
+    with sqlite3.connect(db_path) as conn:
+        assert create_search_schema(conn.cursor())
+    assert repo.matching_comment_ids('stored') == {'old1'}
@@ -203,7 +203,79 @@ class TestSQLiteDatabase:
         
         # Close connection
         conn.close()
-    
+
+    def test_store_channel_data_refreshes_coverage_summary(self, sqlite_db, sample_channel_data):
+        """Test that saving a channel maintains its channel_coverage row"""
+        sqlite_db.store_channel_data(sample_channel_data)
+
+        by_id = sqlite_db.get_channel_coverage(['UC_test_channel'])
+        by_title = sqlite_db.get_channel_coverage(channel_titles=['Test Channel'])
+        assert by_id == by_title
+        assert len(by_id) == 1
+
+        summary = by_id[0]
+        assert summary['videos_reported'] == 25
+        assert summary['videos_collected'] == 2
+        assert summary['videos_with_comments'] == 2
+        assert summary['comments_collected'] == 3
+        assert summary['oldest_video_date'] == '2020-01-15T12:00:00Z'
+        assert summary['latest_video_date'] == '2020-02-15T12:00:00Z'
+        assert summary['channel_fetched_at'] is not None
+
+        # Saving again updates the row in place instead of double counting
+        sample_channel_data['video_id'] = sample_channel_data['video_id'][:1]
+        sample_channel_data['total_videos'] = 26
+        sqlite_db.store_channel_data(sample_channel_data)
+        summaries = sqlite_db.get_channel_coverage()
+        assert len(summaries) == 1
+        assert summaries[0]['videos_reported'] == 26
+        assert summaries[0]['videos_collected'] == 2
+
+    def test_coverage_follows_writes_outside_store_channel_data(self, sqlite_db, sample_channel_data):
+        """Test that video and comment writes of any path keep channel_coverage equal to a full recount"""
+        from src.database.coverage_repository import CoverageRepository
+        from src.database.video_repository import VideoRepository
+        sqlite_db.store_channel_data(sample_channel_data)
+        videos = VideoRepository(sqlite_db.db_path)
+
+        # A video written directly, as the sharded writer and playlist expansion do
+        videos.store_video_data({'video_id': 'vid_extra', 'snippet': {'channelId': 'UC_test_channel',
+                                 'publishedAt': '2021-03-01T00:00:00Z'}, 'statistics': {'viewCount': '5'}})
+        videos.store_comments([{'comment_id': 'c_extra', 'comment_text': 'hi'}],
+                              videos.get_video_db_id('vid_extra'), None)
+        summary = sqlite_db.get_channel_coverage(['UC_test_channel'])[0]
+        assert summary['videos_collected'] == 3
+        assert summary['videos_with_comments'] == 3
+        assert summary['comments_collected'] == 4
+        assert summary['latest_video_date'] == '2021-03-01T00:00:00Z'
+
+        # Moving and deleting rows recounts the channel
+        with sqlite3.connect(sqlite_db.db_path) as conn:
+            conn.execute("UPDATE videos SET snippet_channel_id = 'UC_other' WHERE youtube_id = 'vid_extra'")
+            conn.execute("DELETE FROM comments WHERE comment_id = ?",
+                         (conn.execute('SELECT comment_id FROM comments ORDER BY id LIMIT 1').fetchone()[0],))
+        maintained = sqlite_db.get_channel_coverage(['UC_test_channel', 'UC_other'])
+        assert {row['channel_id']: row['videos_collected'] for row in maintained} == {'UC_test_channel': 2, 'UC_other': 1}
+
+        CoverageRepository(sqlite_db.db_path).refresh_channel('UC_test_channel')
+        recounted = sqlite_db.get_channel_coverage(['UC_test_channel'])[0]
+        maintained = [row for row in maintained if row['channel_id'] == 'UC_test_channel'][0]
+        assert {key: value for key, value in recounted.items() if key != 'updated_at'} == \
+            {key: value for key, value in maintained.items() if key != 'updated_at'}
+
+    def test_coverage_table_is_backfilled_once(self, sqlite_db, sample_channel_data):
+        """Test that a database saved before the coverage table existed gets its summaries on upgrade"""
+        sqlite_db.store_channel_data(sample_channel_data)
+        with sqlite3.connect(sqlite_db.db_path) as conn:
+            conn.execute('DROP TABLE channel_coverage')
+
+        sqlite_db.initialize_db()
+        summary = sqlite_db.get_channel_coverage(['UC_test_channel'])[0]
+        assert summary['channel_title'] == 'Test Channel'
+        assert summary['videos_collected'] == 2
+        assert summary['comments_collected'] == 3
+        assert summary['channel_fetched_at'] is not None
+
     def test_get_channels_list(self, sqlite_db, sample_channel_data):
         """Test retrieving the list of channel names"""
         # First store some data
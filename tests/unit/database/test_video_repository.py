@@ -193,4 +193,54 @@ def test_store_full_video_json(temp_db):
     assert json.loads(row_dict['localizations']) == video_json['localizations']
     # Check that fetched_at and updated_at are not null
     assert row_dict['fetched_at'] is not None, 'fetched_at should not be null after insert'
-    assert row_dict['updated_at'] is not None, 'updated_at should not be null after insert' 
\ No newline at end of file
+    assert row_dict['updated_at'] is not None, 'updated_at should not be null after insert' 
+
+
+def test_duration_seconds_stored_and_backfilled(temp_db):
+    repo = temp_db
+    video_json = full_video_api_response()
+    assert repo.store_video_data(video_json) is True
+    conn = sqlite3.connect(repo.db_path)
+    cursor = conn.cursor()
+    cursor.execute('SELECT duration_seconds FROM videos WHERE youtube_id = ?', (video_json['id'],))
+    assert cursor.fetchone()[0] == 600
+
+    # Databases created before the column existed get it backfilled on initialization
+    conn.execute('DROP INDEX idx_videos_channel_duration')
+    conn.execute('ALTER TABLE videos DROP COLUMN duration_seconds')
+    conn.commit()
+    SQLiteDatabase(repo.db_path).initialize_db()
+    cursor.execute('SELECT duration_seconds FROM videos WHERE youtube_id = ?', (video_json['id'],))
+    assert cursor.fetchone()[0] == 600
+    conn.close()
+
+
+def test_get_videos_page_sorts_and_filters_in_sqlite(temp_db):
+    repo = temp_db
+    for index, (title, views, duration) in enumerate([('Alpha', '30', 'PT1M'), ('Beta 100%', '10', 'PT1H'),
+                                                      ('alpha two', '20', 'PT5S')]):
+        video = full_video_api_response()
+        video['id'] = f'page{index}'
+        video['snippet']['title'] = title
+        video['snippet']['publishedAt'] = f'2024-0{index + 1}-01T00:00:00Z'
+        video['statistics']['viewCount'] = views
+        video['contentDetails']['duration'] = duration
+        assert repo.store_video_data(video) is True
+
+    page, total = repo.get_videos_page('chan_001', sort_by='views', limit=2)
+    assert total == 3
+    assert page['Video ID'].tolist() == ['page0', 'page2']
+    assert page['Views'].tolist() == [30, 20]
+    assert page['Duration'].tolist() == ['1:00', '0:05']
+    assert page['Thumbnail'].tolist() == ['url3', 'url3']
+
+    page, total = repo.get_videos_page('chan_001', sort_by='duration', ascending=True, limit=2, offset=2)
+    assert total == 3 and page['Video ID'].tolist() == ['page1']
+
+    page, total = repo.get_videos_page('chan_001', search='ALPHA', published_after='2024-02-01')
+    assert total == 1 and page['Title'].tolist() == ['alpha two']
+    assert repo.get_videos_page('chan_001', search='100%')[1] == 1
+
+    assert repo.get_video_summary('chan_001') == {'total_videos': 3, 'total_views': 60, 'average_views': 20}
+    with pytest.raises(ValueError):
+        repo.get_videos_page('chan_001', sort_by='random()')
@@ -1,5 +1,6 @@
 import pytest
 from src.models.youtube import VideoLocation, VideoComment, YouTubeVideo, YouTubeChannel
+from src.models.youtube import VideoRecord, CommentRecord, VideoBatch, CommentBatch
 
 # VideoLocation tests
 def test_videolocation_from_dict():
@@ -194,4 +195,61 @@ def test_youtubechannel_to_dict_roundtrip():
     assert d['channel_name'] == 'Test Channel'
     assert isinstance(d['video_id'], list)
     assert d['video_id'][0]['comments'][0]['comment_id'] == 'c1'
-    assert d['video_id'][0]['locations'][0]['location_name'] == 'London' 
\ No newline at end of file
+    assert d['video_id'][0]['locations'][0]['location_name'] == 'London'
+
+# Compact record and batch tests
+def _api_video(video_id, views):
+    api = {
+        'id': video_id,
+        'snippet': {'title': f'Video {video_id}', 'channelId': 'ch1', 'publishedAt': '2023-01-01T00:00:00Z'},
+        'statistics': {'viewCount': str(views), 'likeCount': '5', 'commentCount': '2'},
+        'contentDetails': {'duration': 'PT1M'}
+    }
+    return {**api, 'video_id': video_id, 'raw_api_response': api,
+            'comments': [{'comment_id': f'{video_id}-c{i}', 'comment_text': 'Hi',
+                          'comment_author': 'Bob', 'like_count': i} for i in range(2)]}
+
+def test_videorecord_keeps_the_whole_dict_as_lazy_bytes():
+    video = {**_api_video('v1', 42), 'custom_key': ('kept', 1)}
+    record = VideoRecord.from_dict(video)
+    assert record.channel_id == 'ch1'
+    assert record.views == 42 and record.comment_count == 2
+    assert isinstance(record.raw_payload, bytes)
+    assert record.raw == video
+    assert record.to_dict() == video and record.to_dict() is not video
+    assert not hasattr(record, '__dict__')
+
+def test_videorecord_prefers_api_statistics():
+    record = VideoRecord.from_dict({**_api_video('v1', 42), 'views': '7'}, raw='none')
+    assert record.views == 42
+    assert record.raw is None
+    assert record.to_dict()['views'] == '42'
+    assert VideoRecord.from_dict({'title': 'No ID'}) is None
+
+def test_videorecord_takes_thumbnail_urls_not_dicts():
+    thumbnails = {'default': {'url': 'https://example.com/d.jpg'}, 'high': {'url': 'https://example.com/h.jpg'}}
+    assert VideoRecord.from_dict({'video_id': 'v1', 'thumbnails': thumbnails}).thumbnail_url == 'https://example.com/h.jpg'
+    assert VideoRecord.from_dict({'video_id': 'v1', 'thumbnails': 'https://example.com/t.jpg'}).thumbnail_url == 'https://example.com/t.jpg'
+    assert VideoRecord.from_dict({'video_id': 'v1', 'thumbnails': {'high': {}}}).thumbnail_url == ''
+
+def test_videobatch_bulk_operations():
+    videos = [_api_video(f'v{i}', i * 10) for i in range(5)]
+    batch = VideoBatch.from_videos(videos + [None, {'title': 'No ID'}])
+    assert len(batch) == 5
+    assert batch.total('views') == 100
+    assert batch.column('views').typecode == 'q'
+    top = batch.sort_by('views', descending=True)
+    assert [record.video_id for record in top][:2] == ['v4', 'v3']
+    assert len(batch.where('views', lambda views: views >= 30)) == 2
+    assert batch[batch.index_of('v2')] == VideoRecord.from_dict(_api_video('v2', 20))
+    assert batch.to_dataframe()['views'].tolist() == [0, 10, 20, 30, 40]
+    assert 'raw_payload' not in batch.to_dataframe()
+    assert batch.to_dicts() == videos
+
+def test_commentbatch_from_videos():
+    batch = CommentBatch.from_videos([_api_video('v1', 1), _api_video('v2', 2)])
+    assert len(batch) == 4
+    assert batch.counts_by_video() == {'v1': 2, 'v2': 2}
+    assert batch.total('like_count') == 2
+    assert batch[0] == CommentRecord('v1-c0', video_id='v1', text='Hi', author='Bob')
+    assert batch.to_dicts()[1] == _api_video('v1', 1)['comments'][1]
@@ -0,0 +1,90 @@
+"""
+Tests for the background refresh scheduler.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.replay import configure_api_transport
+from src.database.sqlite import SQLiteDatabase
+from src.services.refresh_scheduler import (
+    RefreshPolicy, RefreshScheduler, estimate_quota_cost, growth_per_day, score_candidate
+)
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNEL_0 = 'UCstandin000000000000000'
+CHANNEL_1 = 'UCstandin000000000000001'
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def _candidate(hours_ago=None, latest_views=None, previous_views=None):
+    candidate = {'last_refreshed_at': None, 'latest_fetched_at': None, 'previous_fetched_at': None}
+    if hours_ago is not None:
+        candidate['last_refreshed_at'] = (NOW - timedelta(hours=hours_ago)).isoformat()
+    if latest_views is not None:
+        candidate.update({
+            'latest_fetched_at': (NOW - timedelta(days=1)).isoformat(), 'latest_views': latest_views,
+            'previous_fetched_at': (NOW - timedelta(days=2)).isoformat(), 'previous_views': previous_views,
+        })
+    return candidate
+
+
+def test_estimate_quota_cost():
+    """Test that the estimate counts one page per 50 videos and comment pages per video"""
+    assert estimate_quota_cost(RefreshPolicy(max_videos=50)) == 3
+    assert estimate_quota_cost(RefreshPolicy(max_videos=120)) == 7
+    assert estimate_quota_cost(RefreshPolicy(max_videos=500), video_count=40) == 3
+    assert estimate_quota_cost(RefreshPolicy(max_videos=10, max_comments_per_video=150)) == 3 + 20
+
+
+def test_score_ranks_overdue_priority_and_growth():
+    """Test that channels are scored by how overdue they are, their priority and their growth"""
+    policy = RefreshPolicy(interval_hours=24)
+    assert score_candidate(_candidate(hours_ago=12), policy, NOW) == 0
+    assert score_candidate(_candidate(hours_ago=48), policy, NOW) == pytest.approx(2)
+    assert score_candidate(_candidate(hours_ago=48), policy._replace(priority=3), NOW) == pytest.approx(6)
+    # Never refreshed channels are as overdue as the cap allows
+    assert score_candidate(_candidate(), policy, NOW) == pytest.approx(10)
+
+    growing = _candidate(hours_ago=48, latest_views=1010, previous_views=1000)
+    assert growth_per_day(growing) == pytest.approx(0.01)
+    assert score_candidate(growing, policy, NOW) == pytest.approx(4)
+    assert growth_per_day(_candidate(hours_ago=48, latest_views=900, previous_views=1000)) == 0
+
+
+@pytest.fixture
+def server():
+    dataset = LocalYouTubeDataset.synthetic(channels=3, videos_per_channel=5, comments_per_video=2)
+    with LocalYouTubeServer(dataset) as server:
+        configure_api_transport('live', endpoint=server.url)
+        yield server
+    configure_api_transport('live')
+
+
+def test_run_once_refreshes_due_channels_within_quota(server, tmp_path):
+    """Test that a tick refreshes the highest scored channels it can afford and records the jobs"""
+    db_path = str(tmp_path / 'scheduler.db')
+    db = SQLiteDatabase(db_path)
+    db.set_refresh_policy(CHANNEL_1, priority=2, max_videos=5, max_comments_per_video=2)
+    db.set_refresh_policy(CHANNEL_0, max_videos=5)
+
+    # The budget covers only the higher priority channel
+    budget = estimate_quota_cost(RefreshPolicy(max_videos=5, max_comments_per_video=2))
+    scheduler = RefreshScheduler(API_KEY, db_path, max_workers=2, quota_budget=budget)
+    results = scheduler.run_once()
+    assert [result['channel_id'] for result in results] == [CHANNEL_1]
+    assert results[0]['succeeded'] and results[0]['videos'] == 5
+    assert results[0]['quota_used'] > 0
+
+    scheduler = RefreshScheduler(API_KEY, db_path, max_workers=2, quota_budget=1000)
+    results = scheduler.run_once()
+    assert [result['channel_id'] for result in results] == [CHANNEL_0]
+    assert server.stats()['quota_used'] == sum(job['quota_used'] for job in db.get_refresh_jobs())
+    # Alerts were evaluated for the refreshed channel; one snapshot has no growth to alert on
+    assert scheduler.last_alerts is not None and scheduler.last_alerts.empty
+
+    # Both channels were just refreshed, so nothing is due
+    assert scheduler.plan() == []
+    assert {job['status'] for job in db.get_refresh_jobs()} == {'succeeded'}
+    assert {row['channel_id'] for row in db.get_channels_list()} == {CHANNEL_0, CHANNEL_1}
@@ -0,0 +1,135 @@
+"""
+Tests for multi-process collection and the quota coordinator its workers share.
+"""
+import sqlite3
+
+import pytest
+
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.replay import API_ENDPOINT_ENV
+from src.services.quota_coordinator import QuotaCoordinator, WorkerQuota
+from src.services.refresh_scheduler import RefreshPolicy, estimate_quota_cost
+from src.services.sharded_collection import collect_sharded
+from src.utils.progress import NullProgressSink
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNELS = [f'UCstandin{i:015d}' for i in range(6)]
+
+
+def test_coordinator_leases_within_the_budget(tmp_path):
+    """Test that leases are granted up to the daily budget and unused units are given back"""
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=250)
+    assert coordinator.lease(100, 'a') == 100
+    assert coordinator.lease(100, 'b') == 100
+    assert coordinator.lease(100, 'a') == 50
+    assert coordinator.lease(10, 'b') == 0
+    coordinator.release(30, 'a')
+    assert coordinator.used() == 220
+    assert coordinator.lease(100, 'b') == 30
+
+
+def test_worker_quota_settles_what_it_used(tmp_path):
+    """Test that a worker gives back its unused lease and records overruns"""
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=20)
+    quota = WorkerQuota(coordinator, 'a', block_units=8)
+    assert quota.reserve(3)
+    quota.spend(5)
+    assert quota.reserve(3)
+    quota.spend(2)
+    assert coordinator.used() == 8
+    quota.settle()
+    assert coordinator.used() == 7
+
+    quota.reserve(3)
+    quota.spend(25)
+    quota.settle()
+    assert coordinator.used() == 32
+    assert not quota.reserve(3)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    dataset = LocalYouTubeDataset.synthetic(channels=len(CHANNELS), videos_per_channel=4, comments_per_video=0)
+    with LocalYouTubeServer(dataset) as server:
+        # Spawned workers take the endpoint from the environment
+        monkeypatch.setenv(API_ENDPOINT_ENV, server.url)
+        yield server
+
+
+def test_collect_sharded_saves_every_channel_once(server, tmp_path):
+    """Test that the workers collect every channel and the writer saves them all"""
+    db_path = str(tmp_path / 'sharded.db')
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=10000, requests_per_second=200)
+    results = collect_sharded(API_KEY, CHANNELS + CHANNELS[:2], db_path, processes=2,
+                              policy=RefreshPolicy(max_videos=4), coordinator=coordinator, sink=NullProgressSink())
+
+    assert sorted(result['channel_id'] for result in results) == CHANNELS
+    assert all(result['succeeded'] and result['videos'] == 4 for result in results), results
+    assert {result['worker'] for result in results} <= {'worker-0', 'worker-1'}
+    # The ledger holds exactly what the workers used once their leases are settled
+    assert coordinator.used() == sum(result['quota_used'] for result in results) == server.stats()['quota_used']
+    with sqlite3.connect(db_path) as conn:
+        assert {row[0] for row in conn.execute('SELECT channel_id FROM channels')} == set(CHANNELS)
+        assert conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0] == 4 * len(CHANNELS)
+
+
+def test_collect_sharded_reports_deltas_against_the_stored_videos(server, tmp_path):
+    """Test that the workers compare a collection with the counts of the videos already stored"""
+    db_path = str(tmp_path / 'sharded.db')
+    policy = RefreshPolicy(max_videos=4)
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=10000)
+    first = collect_sharded(API_KEY, CHANNELS[:2], db_path, processes=2, policy=policy,
+                            coordinator=coordinator, sink=NullProgressSink())
+    assert all(result['succeeded'] and result['updated_videos'] == 0 for result in first), first
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("UPDATE videos SET statistics_view_count = 0 WHERE snippet_channel_id = ?", (CHANNELS[0],))
+    second = collect_sharded(API_KEY, CHANNELS[:2], db_path, processes=2, policy=policy,
+                             coordinator=coordinator, sink=NullProgressSink())
+
+    assert {result['channel_id']: result['updated_videos'] for result in second} == {CHANNELS[0]: 4, CHANNELS[1]: 0}
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM videos WHERE statistics_view_count = 0").fetchone()[0] == 0
+
+
+def test_collect_sharded_skips_channels_beyond_the_budget(server, tmp_path):
+    """Test that channels the shared budget cannot cover are skipped rather than collected"""
+    policy = RefreshPolicy(max_videos=4)
+    budget = 2 * estimate_quota_cost(policy)
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=budget)
+    results = collect_sharded(API_KEY, CHANNELS, str(tmp_path / 'sharded.db'), processes=2, policy=policy,
+                              coordinator=coordinator, sink=NullProgressSink())
+
+    skipped = [result for result in results if result['error'] == 'Quota budget exhausted']
+    assert len(skipped) >= len(CHANNELS) - 2
+    assert sum(result['succeeded'] for result in results) == len(CHANNELS) - len(skipped)
+    assert server.stats()['quota_used'] <= budget
+
+
+def test_collect_sharded_reports_channels_when_the_writer_dies(server, tmp_path, monkeypatch):
+    """Test that a dead writer fails the unsaved channels instead of leaving workers blocked on its queue"""
+    import multiprocessing
+    import threading
+    import time
+    import src.services.sharded_collection as sharded_collection
+
+    monkeypatch.setattr(sharded_collection, 'WRITER_QUEUE_SIZE', 1)
+
+    def kill_writer():
+        while True:
+            writers = [process for process in multiprocessing.active_children() if process.name == 'ytdatahub-writer']
+            if writers:
+                writers[0].terminate()
+                return
+            time.sleep(0.01)
+
+    killer = threading.Thread(target=kill_writer, daemon=True)
+    killer.start()
+    coordinator = QuotaCoordinator(str(tmp_path / 'quota.db'), daily_budget=10000)
+    results = collect_sharded(API_KEY, CHANNELS, str(tmp_path / 'sharded.db'), processes=2,
+                              policy=RefreshPolicy(max_videos=4), coordinator=coordinator, sink=NullProgressSink())
+    killer.join()
+
+    assert sorted(result['channel_id'] for result in results) == CHANNELS
+    assert not any(result['succeeded'] for result in results)
+    assert {result['error'] for result in results} == {'Writer process exited'}
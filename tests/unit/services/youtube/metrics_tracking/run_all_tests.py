@@ -8,6 +8,7 @@ from tests.unit.services.youtube.metrics_tracking.test_alert_threshold_config im
 from tests.unit.services.youtube.metrics_tracking.test_trend_analyzer import TestTrendAnalyzer
 from tests.unit.services.youtube.metrics_tracking.test_metrics_tracking_service import TestMetricsTrackingService
 from tests.unit.services.youtube.metrics_tracking.test_metrics_delta_integration import TestMetricsDeltaIntegration
+from tests.unit.services.youtube.metrics_tracking.test_alert_evaluation import TestAlertEvaluation
 
 if __name__ == '__main__':
     pytest.main(['-v'])
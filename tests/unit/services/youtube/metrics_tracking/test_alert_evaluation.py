@@ -0,0 +1,127 @@
+"""
+Unit tests for the batch alert evaluation of MetricsTrackingService.
+Tests the metric history range reads and the vectorized threshold checks against a SQLite database.
+"""
+import json
+import sqlite3
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.database.sqlite import SQLiteDatabase
+from src.services.youtube.metrics_tracking.metrics_tracking_service import ALERT_COLUMNS, MetricsTrackingService
+from src.services.youtube.metrics_tracking.trend_analysis import TrendAnalyzer
+
+NOW = datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _video(views, likes):
+    return json.dumps({'kind': 'youtube#video', 'statistics': {'viewCount': str(views), 'likeCount': str(likes)}})
+
+
+class TestAlertEvaluation:
+    """Tests for MetricsTrackingService.evaluate_alerts and the metric history it reads."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Create a database with a few days of channel and video snapshots."""
+        db = SQLiteDatabase(str(tmp_path / 'alerts.db'))
+        history = {
+            # video: (channel, [(days ago, views, likes)])
+            'va1': ('UCa', [(5, 1000, 100), (3, 1000, 100), (0, 1600, 100)]),  # views +60%
+            'va2': ('UCa', [(5, 1000, 100), (3, 1000, 100), (0, 1100, 130)]),  # likes +30%
+            'vb1': ('UCb', [(5, 1000, 100), (3, 1000, 100), (0, 1300, 100)]),  # views +30%
+        }
+        with sqlite3.connect(db.db_path) as conn:
+            for video_id, (channel_id, snapshots) in history.items():
+                conn.execute('INSERT INTO videos (youtube_id, snippet_channel_id) VALUES (?, ?)', (video_id, channel_id))
+                for days_ago, views, likes in snapshots:
+                    conn.execute('INSERT INTO videos_history (video_id, fetched_at, raw_video_info) VALUES (?, ?, ?)',
+                                 (video_id, (NOW - timedelta(days=days_ago)).isoformat(), _video(views, likes)))
+            conn.execute('INSERT INTO videos_history (video_id, fetched_at, raw_video_info) VALUES (?, ?, ?)',
+                         ('va1', NOW.isoformat(), 'not json'))
+
+            # Raw API and workflow-wrapped snapshots of the same channel
+            channel_snapshots = [
+                (10, {'statistics': {'subscriberCount': '1000', 'viewCount': '10000'}}),
+                (0, {'api_data': {'raw_channel_info': {'statistics': {'subscriberCount': '1050', 'viewCount': '20000'}}}}),
+            ]
+            for days_ago, snapshot in channel_snapshots:
+                conn.execute('INSERT INTO channel_history (channel_id, fetched_at, raw_channel_info) VALUES (?, ?, ?)',
+                             ('UCa', (NOW - timedelta(days=days_ago)).isoformat(), json.dumps(snapshot)))
+        return db
+
+    @pytest.fixture
+    def service(self, db):
+        """Create a service with the default thresholds."""
+        return MetricsTrackingService(db=db)
+
+    def test_get_metric_series_reads_all_entities_in_one_query(self, db):
+        """Test that the history of several metrics is read for the entities of the given channels."""
+        series = db.get_metric_series('video', ['views', 'likes'])
+        assert set(series['entity_id']) == {'va1', 'va2', 'vb1'}
+        assert len(series) == 3 * 3 * 2
+        assert series[series['entity_id'] == 'vb1']['channel_id'].unique().tolist() == ['UCb']
+
+        series = db.get_metric_series('video', ['views'], channel_ids=['UCb'])
+        assert series['value'].tolist() == [1000, 1000, 1300]
+
+        channel = db.get_metric_series('channel', ['subscribers'])
+        assert channel['value'].tolist() == [1000, 1050]
+
+    def test_analyze_trends_batch_reads_the_entities_in_one_query(self, service, db):
+        """Test that the batch trend analysis reads only the requested entities from the history."""
+        series = db.get_metric_series('video', ['views'], entity_ids=['vb1', 'va2'])
+        assert set(series['entity_id']) == {'va2', 'vb1'}
+
+        results = service.analyze_trends_batch(['vb1', 'va1'], 'views')
+        assert results['entities'] == 2 and results['data_points'] == 6
+        assert list(results['linear_trend'].index) == ['vb1', 'va1']
+        assert (results['linear_trend']['direction'] == 'increasing').all()
+
+    def test_evaluate_alerts_applies_every_rule(self, service):
+        """Test that every video rule is applied over its comparison window, critical alerts first."""
+        alerts = service.evaluate_alerts('video')
+        assert list(alerts.columns) == ALERT_COLUMNS
+        assert list(zip(alerts['entity_id'], alerts['metric_name'], alerts['threshold_level'])) == [
+            ('va1', 'views', 'critical'),
+            ('va1', 'views', 'warning'),
+            ('vb1', 'views', 'warning'),
+            ('va2', 'likes', 'warning'),
+        ]
+        first = alerts.iloc[0]
+        assert first['current_value'] == pytest.approx(60)
+        assert first['window_days'] == 2 and first['channel_id'] == 'UCa'
+        assert first['message'].startswith('[CRITICAL] views for video va1 has increased by 60.00%')
+
+    def test_evaluate_alerts_matches_single_growth_rates(self, service, db):
+        """Test that the batch growth equals calculate_growth_rates on the same series."""
+        history = db.get_metric_series('video', ['views'], channel_ids=['UCa'])
+        va1 = history[history['entity_id'] == 'va1'][['timestamp', 'value']].reset_index(drop=True)
+        expected = TrendAnalyzer().calculate_growth_rates(va1, periods=[2])['2day']['percentage']
+
+        alerts = service.evaluate_alerts('video', channel_ids=['UCa'], metrics=['views'])
+        assert set(alerts['entity_id']) == {'va1'}
+        assert alerts['current_value'].iloc[0] == pytest.approx(expected)
+
+    def test_evaluate_alerts_for_channels(self, service):
+        """Test that channel rules read both snapshot shapes and honor rule directions."""
+        alerts = service.evaluate_alerts('channel')
+        assert set(zip(alerts['metric_name'], alerts['threshold_level'])) == {('views', 'critical'), ('views', 'warning')}
+
+        service.alert_config.set_threshold('channel', 'subscribers', {
+            'warning': {'type': 'absolute', 'value': 40}, 'comparison_window': 7, 'direction': 'increase'
+        })
+        alerts = service.evaluate_alerts('channel', metrics=['subscribers'])
+        assert alerts['current_value'].tolist() == [50]
+        assert alerts['message'].iloc[0].endswith('exceeding the warning threshold of 40')
+
+        service.alert_config.set_threshold('channel', 'subscribers', {
+            'warning': {'type': 'absolute', 'value': 40}, 'comparison_window': 7, 'direction': 'decrease'
+        })
+        assert service.evaluate_alerts('channel', metrics=['subscribers']).empty
+
+    def test_evaluate_alerts_without_history(self, tmp_path):
+        """Test that a database without history or a service without one yields no alerts."""
+        service = MetricsTrackingService(db=SQLiteDatabase(str(tmp_path / 'empty.db')))
+        assert service.evaluate_alerts('video').empty
+        assert list(MetricsTrackingService().evaluate_alerts().columns) == ALERT_COLUMNS
@@ -362,6 +362,36 @@ class TestMetricsTrackingService:
         # Verify analyze_historical_trends was called for each metric and window
         assert service.analyze_historical_trends.call_count == 4  # 2 metrics * 2 windows
         
+    def test_analyze_trends_batch(self, mock_db):
+        """Test analyzing one metric for many entities in a single batch."""
+        history = pd.DataFrame(mock_db.get_metric_history.return_value)
+        mock_db.get_metric_series.return_value = pd.concat(
+            [history.assign(entity_id=entity_id, channel_id='UC_test_channel', metric='views')
+             for entity_id in ('video_2', 'video_1')], ignore_index=True)
+        service = MetricsTrackingService(db=mock_db)
+        
+        results = service.analyze_trends_batch(['video_1', 'video_2'], 'views')
+        
+        assert results['entities'] == 2
+        assert results['data_points'] == 20
+        mock_db.get_metric_series.assert_called_once()
+        assert mock_db.get_metric_series.call_args[1]['entity_ids'] == ['video_1', 'video_2']
+        mock_db.get_metric_history.assert_not_called()
+        assert list(results['linear_trend'].index) == ['video_1', 'video_2']
+        assert (results['linear_trend']['direction'] == 'increasing').all()
+        assert results['linear_trend'].loc['video_1', 'slope'] == pytest.approx(10.0, rel=1e-3)
+        assert set(results['growth_rate']['key']) == {'video_1', 'video_2'}
+        
+    def test_analyze_trends_batch_without_series_reads(self, mock_db):
+        """Test that a database without get_metric_series is read entity by entity."""
+        del mock_db.get_metric_series
+        service = MetricsTrackingService(db=mock_db)
+        
+        results = service.analyze_trends_batch(['video_1', 'video_2'], 'views')
+        
+        assert results['entities'] == 2
+        assert mock_db.get_metric_history.call_count == 2
+        
     def test_generate_trend_report_default_metrics(self, mock_db, mock_trend_analyzer):
         """Test generating a trend report with default metrics."""
         service = MetricsTrackingService(db=mock_db)
@@ -9,7 +9,7 @@ import sys
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
-from src.services.youtube.metrics_tracking.trend_analysis import TrendAnalyzer
+from src.services.youtube.metrics_tracking.trend_analysis import TrendAnalyzer, SeriesBatch
 
 
 class TestTrendAnalyzer:
@@ -291,6 +291,67 @@ class TestTrendAnalyzer:
         assert result['anomalies_detected'] == 0
         assert 'points' not in result
         
+    def test_series_batch_packs_ragged_series(self, sample_data, flat_data):
+        """Test packing several series into ragged arrays sorted by timestamp."""
+        shuffled = sample_data.sample(frac=1, random_state=0)
+        batch = SeriesBatch.from_series({'up': shuffled, 'flat': flat_data, 'none': flat_data.iloc[:0]})
+        
+        assert batch.keys == ['up', 'flat', 'none']
+        assert list(batch.lengths) == [10, 10, 0]
+        assert list(batch.values[:10]) == list(sample_data['value'])
+        assert (np.diff(batch.timestamps[:10]) > 0).all()
+        
+    def test_batch_analyses_match_single_series(self, sample_data, decreasing_data, volatile_data):
+        """Test that the batch API agrees with the per-series methods."""
+        analyzer = TrendAnalyzer()
+        series = {'up': sample_data, 'down': decreasing_data, 'volatile': volatile_data}
+        batch = SeriesBatch.from_series(series)
+        
+        trends = analyzer.calculate_linear_trends(batch)
+        assert trends.loc['up', 'direction'] == 'increasing'
+        assert trends.loc['down', 'direction'] == 'decreasing'
+        with patch.dict(sys.modules, {'statsmodels.api': None}):
+            expected = analyzer.calculate_linear_trend(sample_data.copy())
+        assert trends.loc['up', 'slope'] == pytest.approx(expected['slope'])
+        assert trends.loc['up', 'r_squared'] == pytest.approx(expected['r_squared'])
+        
+        averages = analyzer.calculate_moving_averages_batch(batch)
+        expected = analyzer.calculate_moving_averages(sample_data.copy())
+        assert averages.loc['up', 'short'] == pytest.approx(expected['short']['average'])
+        assert averages.loc['up', 'medium'] == pytest.approx(expected['medium']['average'])
+        assert np.isnan(averages.loc['up', 'long'])
+        
+        growth = analyzer.calculate_growth_rates_batch(batch, periods=[7])
+        expected = analyzer.calculate_growth_rates(decreasing_data.copy(), periods=[7])['7day']
+        row = growth[growth['key'] == 'down'].iloc[0]
+        assert row['from_value'] == expected['from_value']
+        assert row['percentage'] == pytest.approx(expected['percentage'])
+        assert row['direction'] == 'decreasing'
+        
+        anomalies = analyzer.detect_anomalies_batch(batch, threshold=1.0, window_size=3)
+        assert set(anomalies['key']) <= set(series)
+        assert (anomalies['z_score'].abs() > 1.0).all()
+
+    def test_batch_skips_missing_values(self):
+        """Test that a missing value in one series does not leak into the series packed after it."""
+        analyzer = TrendAnalyzer()
+        dates = pd.date_range('2024-01-01', periods=3, freq='D')
+        data = pd.DataFrame({
+            'entity_id': ['a', 'a', 'a', 'b', 'b', 'b', 'c'],
+            'timestamp': list(dates) * 2 + [dates[0]],
+            'value': [1, None, 3, 10, 20, 30, 'n/a']
+        })
+        batch = SeriesBatch.from_frame(data)
+
+        assert batch.keys == ['a', 'b', 'c']
+        assert list(batch.lengths) == [2, 3, 0]
+        assert list(analyzer.rolling_means(batch, 2)) == [1, 2, 10, 15, 25]
+        assert analyzer.calculate_moving_averages_batch(batch, {'ma2': 2})['ma2'].tolist()[:2] == [2, 25]
+
+        trends = analyzer.calculate_linear_trends(batch)
+        assert trends.loc['b', 'direction'] == 'increasing'
+        assert list(trends['direction']) == ['stable', 'increasing', 'stable']
+
 
 if __name__ == '__main__':
     pytest.main()
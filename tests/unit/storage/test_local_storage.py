@@ -0,0 +1,64 @@
+"""
+Tests for the sharded, append-only local JSON storage.
+"""
+import json
+
+from src.storage import local_storage
+from src.storage.local_storage import LocalStorage
+
+def _channel(channel_id, name, views=(100, 200)):
+    return {
+        'channel_id': channel_id,
+        'channel_name': name,
+        'subscribers': 10,
+        'views': sum(views),
+        'total_videos': len(views),
+        'video_id': [{'video_id': f"{channel_id}_v{i}", 'views': v, 'comments': []} for i, v in enumerate(views)]
+    }
+
+def test_round_trip_and_index_listing(tmp_path):
+    """Test that channels read back unchanged and listing uses only the index"""
+    storage = LocalStorage(tmp_path)
+    for i in range(3):
+        assert storage.store_channel_data(_channel(f"UC{i}", f"Channel {i}"))
+    assert storage.get_channel_data('UC1') == _channel('UC1', 'Channel 1')
+    assert storage.get_channel_data('UCmissing') is None
+
+    # A second instance sees the same data; listing does not need the segments
+    for segment in (tmp_path / 'shards').glob('*/*.jsonl.gz'):
+        segment.unlink()
+    listed = LocalStorage(tmp_path).list_channels(limit=2, offset=1)
+    assert [(c['channel_id'], c['fetched_videos'], c['fetched_video_views']) for c in listed] == [('UC1', 2, 300), ('UC2', 2, 300)]
+    assert json.loads((tmp_path / 'manifest.json').read_text())['shard_count'] == 64
+
+def test_saves_append_and_compaction_drops_superseded_segments(tmp_path):
+    """Test that each save adds a segment and compaction keeps only the current ones"""
+    storage = LocalStorage(tmp_path)
+    for views in ((1,), (1, 2), (1, 2, 3)):
+        storage.store_channel_data(_channel('UCa', 'A', views))
+    storage.store_channel_data(_channel('UCb', 'B'))
+    assert storage.delete_channel_data('UCb')
+    assert len(list((tmp_path / 'shards').glob('*/*.jsonl.gz'))) == 4
+
+    assert storage.compact() == 3
+    assert len((tmp_path / 'index.jsonl').read_text().splitlines()) == 1
+    assert storage.get_channels_list() == {'UCa': 'A'}
+    assert [v['views'] for _, v in storage.iter_videos()] == [1, 2, 3]
+
+def test_legacy_layout_is_imported_and_torn_index_line_skipped(tmp_path):
+    """Test that channels.json plus per-channel files are imported and a cut-off index line is ignored"""
+    (tmp_path / 'channels.json').write_text(json.dumps({'UCold': 'Old'}))
+    (tmp_path / 'UCold.json').write_text(json.dumps(_channel('UCold', 'Old')))
+    assert LocalStorage(tmp_path).get_channel_data('UCold') == _channel('UCold', 'Old')
+
+    other = tmp_path / 'other'
+    LocalStorage(other).store_channel_data(_channel('UCx', 'X'))
+    with open(other / 'index.jsonl', 'a') as f:
+        f.write('{"channel_id": "UCy", "segm')
+    # A fresh process reloads the index from disk
+    local_storage._states.clear()
+    storage = LocalStorage(other)
+    assert storage.get_channels_list() == {'UCx': 'X'}
+    storage.store_channel_data(_channel('UCz', 'Z'))
+    local_storage._states.clear()
+    assert LocalStorage(other).get_channels_list() == {'UCx': 'X', 'UCz': 'Z'}
@@ -0,0 +1,74 @@
+"""
+Smoke tests for the benchmark suite on the tiny fixture scale.
+"""
+import json
+
+import pytest
+
+from benchmarks.fixtures import build_channel, build_updated_channel
+from benchmarks.harness import BENCHMARKS, compare_results, run_benchmarks, write_results
+from benchmarks.importtime import parse_importtime, profile_import
+from benchmarks.suite import BenchmarkData
+
+
+@pytest.fixture
+def tiny_data():
+    data = BenchmarkData('tiny')
+    yield data
+    data.cleanup()
+
+
+def test_fixtures_are_deterministic():
+    """Test that the same scale and seed build identical channels"""
+    first = build_channel('tiny', seed=7)
+    second = build_channel('tiny', seed=7)
+    assert first == second
+    assert len(first['video_id']) == 5
+    assert sum(len(video['comments']) for video in first['video_id']) == 20
+
+    updated = build_updated_channel(first, seed=7)
+    assert len(updated['video_id']) == 6
+    assert int(updated['subscribers']) > int(first['subscribers'])
+
+
+def test_run_writes_comparable_json(tiny_data, tmp_path):
+    """Test that every benchmark runs and its results round-trip through JSON"""
+    results = run_benchmarks(tiny_data, repeat=1, meta={'scale': 'tiny'})
+
+    assert set(results['results']) == set(BENCHMARKS)
+    for result in results['results'].values():
+        assert result['repeat'] == 1
+        assert result['median_s'] >= 0
+        assert result['peak_memory_bytes'] is not None
+    assert results['meta']['scale'] == 'tiny'
+
+    path = write_results(results, str(tmp_path / 'results.json'))
+    with open(path) as f:
+        loaded = json.load(f)
+
+    slower = json.loads(json.dumps(loaded))
+    slower['results']['standardize_video_data']['median_s'] = loaded['results']['standardize_video_data']['median_s'] * 2 + 1
+    rows = {row['name']: row for row in compare_results(loaded, slower)}
+    assert rows['standardize_video_data']['regression'] is True
+    assert rows['delta_service.calculate_deltas']['regression'] is False
+
+
+def test_importtime_report():
+    """Test that -X importtime output is parsed and light modules stay light"""
+    entries = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     pandas._libs\n"
+        "import time:       300 |        420 |   pandas\n"
+        "import time:        10 |        430 | src.utils.duration_utils\n"
+    )
+    assert [(entry['module'], entry['depth']) for entry in entries] == [
+        ('pandas._libs', 2), ('pandas', 1), ('src.utils.duration_utils', 0)
+    ]
+    assert entries[1]['self_us'] == 300 and entries[2]['cumulative_us'] == 430
+
+    report = profile_import('src.config', top=1000)
+    assert report['error'] is None
+    assert report['modules_imported'] == len(report['top'])
+    # src.config is imported by every entry point and must not load the UI or analytics stack
+    imported = {row['package'] for row in report['packages']}
+    assert not imported & {'streamlit', 'pandas', 'plotly', 'googleapiclient'}
@@ -0,0 +1,108 @@
+"""
+Tests for the headless ytdatahub CLI and the progress sinks it runs the services with.
+"""
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from src.api.youtube.local_server import LocalYouTubeDataset, LocalYouTubeServer
+from src.api.youtube.replay import API_ENDPOINT_ENV
+from src.services.bulk_import import read_channel_references
+from src.utils.headless import HeadlessSessionState, set_headless, st
+from src.utils.progress import ProgressSink
+
+API_KEY = 'AIzaSyA' + 'x' * 32
+CHANNEL_0 = 'UCstandin000000000000000'
+CHANNEL_1 = 'UCstandin000000000000001'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Runs the CLI and reports on stderr whether streamlit was imported
+RUN_CLI = ("import sys; from src.cli import main; rc = main(sys.argv[1:]); "
+           "print('streamlit imported:', 'streamlit' in sys.modules, file=sys.stderr); sys.exit(rc)")
+
+
+class RecordingSink(ProgressSink):
+    def __init__(self):
+        self.events = []
+
+    def status(self, message, progress=None):
+        self.events.append(('status', message, progress))
+
+    def notify(self, level, message):
+        self.events.append((level, message))
+
+
+@pytest.fixture
+def headless():
+    sink = RecordingSink()
+    set_headless(sink=sink)
+    yield sink
+    set_headless(False)
+
+
+def test_headless_streamlit_reports_to_the_sink(headless):
+    """Test that st calls of the services reach the progress sink in headless mode"""
+    st.session_state.api_call_status = 'running'
+    assert isinstance(st.session_state, HeadlessSessionState)
+    assert st.session_state['api_call_status'] == 'running'
+
+    st.warning("quota low")
+    status = st.empty()
+    status.info("🔄 Processing item 1 of 2")
+    st.progress(0).progress(0.5)
+
+    assert headless.events == [
+        ('warning', 'quota low'),
+        ('status', 'Processing item 1 of 2', None),
+        ('status', 'Processing item 1 of 2', 0),
+        ('status', 'Processing item 1 of 2', 0.5),
+    ]
+
+
+def test_read_channel_references(tmp_path):
+    """Test that import files with a channel_id column, Takeout exports and plain lists are read"""
+    plain = tmp_path / 'plain.txt'
+    plain.write_text(f"{CHANNEL_0}\n\n@handle\n")
+    takeout = tmp_path / 'takeout.csv'
+    takeout.write_text(f"Channel Id,Channel Url,Channel Title\n{CHANNEL_0},http://x,A\n{CHANNEL_1},http://y,B\n")
+    assert read_channel_references(str(plain)) == [CHANNEL_0, '@handle']
+    assert read_channel_references(str(takeout)) == [CHANNEL_0, CHANNEL_1]
+
+
+@pytest.fixture
+def server():
+    dataset = LocalYouTubeDataset.synthetic(channels=3, videos_per_channel=3, comments_per_video=0)
+    with LocalYouTubeServer(dataset) as server:
+        yield server
+
+
+def _run_cli(server, *args):
+    env = dict(os.environ, **{API_ENDPOINT_ENV: server.url, 'YOUTUBE_API_KEY': API_KEY})
+    return subprocess.run([sys.executable, '-c', RUN_CLI, *args], capture_output=True, text=True,
+                          cwd=PROJECT_ROOT, env=env, timeout=120)
+
+
+def test_collect_and_bulk_import_without_streamlit(server, tmp_path):
+    """Test that the CLI collects and imports channels without importing streamlit"""
+    db_path = str(tmp_path / 'cli.db')
+    completed = _run_cli(server, '--db', db_path, '--progress', 'none', 'collect', CHANNEL_0, '--max-videos', '3')
+    assert completed.returncode == 0, completed.stderr
+    result = json.loads(completed.stdout)
+    assert result['channel_id'] == CHANNEL_0 and result['succeeded'] and result['videos'] == 3
+    assert result['quota_used'] > 0
+    assert 'streamlit imported: False' in completed.stderr
+
+    import_file = tmp_path / 'channels.csv'
+    import_file.write_text(f"channel_id\n{CHANNEL_1}\nUCmissing000000000000000\n")
+    completed = _run_cli(server, '--db', db_path, 'bulk-import', str(import_file))
+    assert completed.returncode == 1
+    assert json.loads(completed.stdout) == {'successful': [CHANNEL_1], 'failed': ['UCmissing000000000000000']}
+    assert 'streamlit imported: False' in completed.stderr
+
+    with sqlite3.connect(db_path) as conn:
+        assert {row[0] for row in conn.execute('SELECT channel_id FROM channels')} == {CHANNEL_0, CHANNEL_1}
+        assert conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0] == 3
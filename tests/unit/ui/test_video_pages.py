@@ -0,0 +1,52 @@
+"""
+Tests for the server-side paging of the video explorer.
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.database.video_repository import VideoRepository
+from src.ui.data_analysis.utils import video_pages
+from src.utils.cache_utils import get_analysis_cache, invalidate_channel_cache
+
+
+@pytest.fixture
+def db_path():
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    get_analysis_cache().clear()
+    yield path
+    get_analysis_cache().clear()
+    os.remove(path)
+
+
+def fake_page(channel_id, sort_by='published_at', ascending=False, limit=10, offset=0, search=None,
+              published_after=None):
+    ids = [f'v{i}' for i in range(25)][offset:offset + limit]
+    return pd.DataFrame({'Video ID': ids}), 25
+
+
+def test_load_video_page_prefetches_next_page(db_path):
+    """Test that the next page is fetched in the background and served from the cache"""
+    with patch.object(VideoRepository, 'get_videos_page', side_effect=fake_page) as get_page:
+        frame, total, page = video_pages.load_video_page(db_path, 'UC1', 0, 10)
+        assert frame['Video ID'].tolist()[0] == 'v0' and total == 25 and page == 0
+        video_pages._prefetch_executor.submit(lambda: None).result()
+        assert get_page.call_count == 2
+
+        frame, _, page = video_pages.load_video_page(db_path, 'UC1', 1, 10, prefetch=False)
+        assert frame['Video ID'].tolist()[0] == 'v10' and page == 1
+        assert get_page.call_count == 2
+
+        # Pages past the end are clamped to the last page
+        frame, _, page = video_pages.load_video_page(db_path, 'UC1', 9, 10, prefetch=False)
+        assert page == 2 and frame['Video ID'].tolist() == [f'v{i}' for i in range(20, 25)]
+
+        # Saving the channel drops its cached pages
+        invalidate_channel_cache('UC1')
+        video_pages.load_video_page(db_path, 'UC1', 1, 10, prefetch=False)
+        assert get_page.call_args.kwargs['offset'] == 10
+        assert get_page.call_count == 5
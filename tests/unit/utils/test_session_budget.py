@@ -0,0 +1,69 @@
+"""
+Tests for the per-session payload budget and its spill-to-disk cache.
+"""
+import os
+
+import pandas as pd
+
+from src.utils.session_budget import (
+    SessionStateBudget, SpilledPayload, cleanup_stale_sessions, get_payload, set_payload
+)
+
+KB = 1024
+
+
+def _payload(n_videos):
+    return {'channel_id': 'UC1', 'video_id': [{'video_id': f'v{i}', 'title': 'x' * 200} for i in range(n_videos)]}
+
+
+def test_cold_payloads_spill_and_load_back(tmp_path):
+    """Test that the least recently used payload spills once over budget and reloads on access"""
+    state = {}
+    budget = SessionStateBudget(state, budget_bytes=300 * KB, cache_dir=tmp_path, min_spill_bytes=KB)
+    budget.put('api_data', _payload(500))
+    budget.put('db_data', _payload(500))
+    # Payloads used in the running script are not spilled before the run ends
+    assert not any(isinstance(value, SpilledPayload) for value in state.values())
+
+    budget.get('db_data')
+    assert budget.enforce() == 1
+    assert isinstance(state['api_data'], SpilledPayload)
+    assert os.path.exists(state['api_data'].path)
+    assert budget.usage()['spilled'] == ['api_data']
+    assert budget.in_memory_bytes() <= 300 * KB
+
+    # Helpers over the same state see the payload as it was
+    loaded = get_payload('api_data', state=state)
+    assert loaded == _payload(500)
+    assert state['api_data'] is loaded
+    assert not list(tmp_path.rglob('*.pkl'))
+
+
+def test_in_place_changes_are_measured_at_end_of_run(tmp_path):
+    """Test that payloads mutated after set_payload are re-measured and small ones stay in memory"""
+    state = {}
+    budget = SessionStateBudget(state, budget_bytes=200 * KB, cache_dir=tmp_path, min_spill_bytes=100 * KB)
+    set_payload('channel_info_temp', {'video_id': []}, state=state)
+    set_payload('delta', {'changed': True}, state=state)
+    get_payload('channel_info_temp', state=state)['video_id'] = _payload(1000)['video_id']
+
+    assert budget.enforce() == 1
+    assert isinstance(state['channel_info_temp'], SpilledPayload)
+    assert state['delta'] == {'changed': True}
+
+
+def test_dataframes_spill_as_arrow(tmp_path):
+    """Test that analysis frames round-trip through the Arrow spill format"""
+    frame = pd.DataFrame({'views': range(50000), 'title': ['t'] * 50000}, index=range(100, 50100))
+    state = {}
+    budget = SessionStateBudget(state, budget_bytes=KB, cache_dir=tmp_path, min_spill_bytes=KB)
+    budget.put('frame', frame)
+    budget.enforce()
+
+    assert state['frame'].format in ('arrow', 'pickle')
+    pd.testing.assert_frame_equal(budget.get('frame'), frame)
+
+    budget.discard(['frame'])
+    assert 'frame' not in state
+    assert cleanup_stale_sessions(tmp_path, max_age_seconds=-1) == 1
+    assert not list(tmp_path.iterdir())
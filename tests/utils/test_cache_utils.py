@@ -0,0 +1,93 @@
+import threading
+
+import pandas as pd
+
+from src.utils.cache_utils import AnalysisCache
+
+
+def test_get_or_compute_computes_once():
+    """Test that a cached key is computed only once"""
+    cache = AnalysisCache()
+    calls = []
+    key = cache.make_key('UC123', 'v1', 'video_statistics')
+
+    def compute():
+        calls.append(1)
+        return {'total_videos': 3}
+
+    assert cache.get_or_compute(key, compute) == {'total_videos': 3}
+    assert cache.get_or_compute(key, compute) == {'total_videos': 3}
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+
+    # A different data version is a different entry
+    cache.get_or_compute(cache.make_key('UC123', 'v2', 'video_statistics'), compute)
+    assert len(calls) == 2
+
+
+def test_concurrent_callers_share_one_computation():
+    """Test that concurrent misses on the same key wait for the first computation"""
+    cache = AnalysisCache()
+    key = cache.make_key('UC123', 'v1', 'comment_analysis')
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute)))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results == ['result', 'result']
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_used_entries_over_budget():
+    """Test that the memory budget evicts the least recently used entries"""
+    frame = pd.DataFrame({'Views': range(1000)})
+    entry_size = int(frame.memory_usage(deep=True).sum())
+    cache = AnalysisCache(max_bytes=entry_size * 2 + entry_size // 2)
+
+    keys = [cache.make_key(f'UC{i}', 'v1', 'video_frame') for i in range(3)]
+    cache.put(keys[0], frame)
+    cache.put(keys[1], frame.copy())
+    cache.get(keys[0])
+    cache.put(keys[2], frame.copy())
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_invalidate_channel_drops_entries_and_in_flight_results():
+    """Test that invalidating a channel drops its entries and discards stale computations"""
+    cache = AnalysisCache()
+    stale_key = cache.make_key('UC123', 'v1', 'top_videos', (10, 'Views'))
+    other_key = cache.make_key('UC456', 'v1', 'top_videos', (10, 'Views'))
+    cache.put(stale_key, 'old')
+    cache.put(other_key, 'other')
+
+    assert cache.invalidate_channel('UC123') == 1
+    assert cache.get(stale_key) is None
+    assert cache.get(other_key) == 'other'
+
+    # A computation that started before the save must not repopulate the cache
+    def compute_during_save():
+        cache.invalidate_channel('UC123')
+        return 'computed from old data'
+
+    assert cache.get_or_compute(stale_key, compute_during_save) == 'computed from old data'
+    assert cache.get(stale_key) is None
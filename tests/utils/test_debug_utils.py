@@ -131,4 +131,53 @@ def test_get_ui_freeze_report_severity_levels(mock_session_state):
     # Check sorting (should be sorted by duration, descending)
     assert report[0]["duration"] == 3.5
     assert report[1]["duration"] == 2.5
-    assert report[2]["duration"] == 1.5 
\ No newline at end of file
+    assert report[2]["duration"] == 1.5 
+def test_debug_log_keeps_bounded_ui_buffer(monkeypatch, caplog):
+    """Test that UI debug logs are kept in a fixed-size ring buffer"""
+    caplog.set_level(logging.DEBUG)
+    class DictSessionState(dict):
+        __getattr__ = dict.get
+
+    state = DictSessionState(debug_mode=True, log_level=logging.DEBUG, ui_debug_logs=['old entry'])
+    st.session_state = state
+    monkeypatch.setattr('src.utils.log_core.LOG_BUFFER_SIZE', 3)
+
+    for i in range(5):
+        debug_log(f"Message {i}")
+
+    logs = list(state['ui_debug_logs'])
+    assert len(logs) == 3
+    assert logs[-1].endswith("Message 4")
+    assert not any('old entry' in log for log in logs)
+
+def test_debug_log_checks_module_level_before_formatting(mock_session_state, caplog):
+    """Test that per-module levels suppress messages without formatting them"""
+    mock_session_state.debug_mode = True
+    mock_session_state.log_level = logging.DEBUG
+    module_logger = logging.getLogger(__name__)
+    previous_level = module_logger.level
+    calls = []
+
+    def build_message():
+        calls.append(1)
+        return "Expensive message"
+
+    try:
+        module_logger.setLevel(logging.WARNING)
+        debug_log(build_message)
+        assert calls == []
+        assert "Expensive message" not in caplog.text
+
+        module_logger.setLevel(logging.DEBUG)
+        debug_log(build_message)
+        assert calls == [1]
+        assert "Expensive message" in caplog.text
+    finally:
+        module_logger.setLevel(previous_level)
+
+def test_debug_log_error_messages_bypass_debug_mode(mock_session_state, caplog):
+    """Test that error messages are logged even when debug mode is off"""
+    debug_log("[DB ERROR] Failed to store video")
+    debug_log("Regular progress message")
+    assert "[DB ERROR] Failed to store video" in caplog.text
+    assert "Regular progress message" not in caplog.text
@@ -1,5 +1,11 @@
+import numpy as np
+import pandas as pd
 import pytest
 from src.utils.duration_utils import (
+    DURATION_CACHE_SIZE,
+    clear_duration_cache,
+    duration_cache_info,
+    durations_to_seconds,
     parse_duration_with_regex,
     duration_to_seconds,
     format_duration,
@@ -84,4 +90,39 @@ def test_format_duration_human_friendly():
     # Test edge cases
     assert format_duration_human_friendly(0) == "0 seconds"
     assert format_duration_human_friendly(None) == "0 seconds"
-    assert format_duration_human_friendly(-1) == "0 seconds" 
\ No newline at end of file
+    assert format_duration_human_friendly(-1) == "0 seconds" 
+
+
+def test_parse_days_weeks_and_fractional_seconds():
+    """Test the full ISO 8601 forms the API can return"""
+    assert parse_duration_with_regex("P1DT2H") == 93600
+    assert parse_duration_with_regex("P1W") == 604800
+    assert parse_duration_with_regex("P0D") == 0
+    assert parse_duration_with_regex("PT1M30.6S") == 91
+    assert parse_duration_with_regex(None) == 0
+    assert parse_duration_with_regex(125) == 125
+
+
+def test_durations_to_seconds_vectorized():
+    """Test that Series, arrays and lists convert like the scalar parser"""
+    values = ["PT1H2M3S", None, "P1DT1S", "PT45S", "PT45S", 120, "invalid", "PT0.5S"]
+    expected = [parse_duration_with_regex(value) for value in values]
+
+    series = pd.Series(values, index=list("abcdefgh"))
+    result = durations_to_seconds(series)
+    assert result.tolist() == expected
+    assert list(result.index) == list("abcdefgh")
+    assert result.dtype == "int64"
+
+    assert durations_to_seconds(np.array(values, dtype=object)).tolist() == expected
+    assert durations_to_seconds([]).tolist() == []
+
+
+def test_parse_duration_cache():
+    """Test that repeated strings are served from the bounded memo"""
+    clear_duration_cache()
+    for _ in range(3):
+        parse_duration_with_regex("PT4M13S")
+    info = duration_cache_info()
+    assert info.misses == 1 and info.hits == 2
+    assert info.maxsize == DURATION_CACHE_SIZE
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from src.utils import metrics
+from src.utils.metrics import MetricsRegistry, YOUTUBE_DAILY_QUOTA
+
+
+def test_histogram_percentiles():
+    """Test that histograms summarize count, sum and tail percentiles"""
+    registry = MetricsRegistry()
+    for value in range(1, 101):
+        registry.observe('db_operation_seconds', value / 100, operation='store_channel_data')
+
+    entry = registry.snapshot()['histograms'][0]
+    assert entry['labels'] == {'operation': 'store_channel_data'}
+    assert entry['count'] == 100
+    assert entry['sum'] == pytest.approx(50.5)
+    assert entry['p50'] == pytest.approx(0.505)
+    assert entry['p95'] == pytest.approx(0.9505)
+    assert entry['p99'] == pytest.approx(0.9901)
+    assert entry['max'] == 1.0
+
+
+def test_timer_works_as_decorator_and_context_manager():
+    """Test that timers observe every call and count failures"""
+    registry = MetricsRegistry()
+
+    @registry.timer('analysis_seconds', function='video_statistics')
+    def analyze(fail=False):
+        if fail:
+            raise ValueError("bad data")
+        return 'done'
+
+    assert analyze() == 'done'
+    with pytest.raises(ValueError):
+        analyze(fail=True)
+    with registry.timer('analysis_seconds', function='video_statistics'):
+        pass
+
+    snapshot = registry.snapshot()
+    assert snapshot['histograms'][0]['count'] == 3
+    assert snapshot['counters'] == [{
+        'name': 'analysis_seconds_errors_total',
+        'labels': {'function': 'video_statistics'},
+        'value': 1
+    }]
+
+
+def test_api_requests_update_quota_gauges():
+    """Test that API requests are counted with their quota cost"""
+    registry = MetricsRegistry()
+    registry.record_api_request('youtube.channels.list', 0.2)
+    registry.record_api_request('youtube.search.list', 0.4, error=True)
+
+    gauges = {entry['name']: entry['value'] for entry in registry.snapshot()['gauges']}
+    assert gauges['youtube_api_quota_used_today'] == 101
+    assert gauges['youtube_api_quota_remaining'] == YOUTUBE_DAILY_QUOTA - 101
+
+    counters = {(entry['name'], entry['labels']['method']): entry['value'] for entry in registry.snapshot()['counters']}
+    assert counters[('youtube_api_quota_units_total', 'youtube.search.list')] == 100
+    assert counters[('youtube_api_errors_total', 'youtube.search.list')] == 1
+
+
+def test_prometheus_and_json_export(tmp_path):
+    """Test the Prometheus text and JSON exports, including collector gauges"""
+    registry = MetricsRegistry()
+    registry.inc('youtube_api_requests_total', method='youtube.videos.list')
+    registry.observe('ui_operation_seconds', 0.25, operation='render "dashboard"')
+    registry.register_collector(lambda: [('analysis_cache_entries', 3, {})])
+
+    text = registry.to_prometheus()
+    assert '# TYPE youtube_api_requests_total counter' in text
+    assert 'youtube_api_requests_total{method="youtube.videos.list"} 1' in text
+    assert '# TYPE analysis_cache_entries gauge' in text
+    assert 'ui_operation_seconds{operation="render \\"dashboard\\"",quantile="0.95"} 0.25' in text
+    assert 'ui_operation_seconds_count{operation="render \\"dashboard\\""} 1' in text
+
+    path = registry.write_json(str(tmp_path / 'metrics.json'))
+    with open(path) as f:
+        exported = json.load(f)
+    assert exported['histograms'][0]['p50'] == 0.25
+    assert exported['gauges'] == [{'name': 'analysis_cache_entries', 'labels': {}, 'value': 3}]
+
+
+def test_label_sets_per_metric_are_bounded(monkeypatch):
+    """Test that label sets beyond the limit are folded into one overflow series"""
+    monkeypatch.setattr(metrics, 'METRICS_MAX_SERIES', 2)
+    registry = MetricsRegistry()
+    for operation in ('a', 'b', 'c', 'd', 'a'):
+        registry.observe('operation_seconds', 0.1, operation=operation)
+        registry.inc('operations_total', operation=operation)
+
+    histograms = {tuple(entry['labels'].items()): entry['count'] for entry in registry.snapshot()['histograms']}
+    assert histograms == {(('operation', 'a'),): 2, (('operation', 'b'),): 1, (('overflow', 'true'),): 2}
+    assert len(registry.snapshot()['counters']) == 3
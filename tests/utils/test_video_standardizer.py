@@ -0,0 +1,95 @@
+import copy
+import json
+
+import pytest
+from src.utils.video_standardizer import (
+    COLLECTION_VIDEO_FIELDS, NormalizedVideos, extract_video_id, normalize_videos, standardize_video_data
+)
+
+FLATTENED = {'video_id': 'flat1', 'title': 'Flat', 'views': '10', 'likes': '2', 'comment_count': '1'}
+API = {
+    'id': 'api1',
+    'snippet': {'title': 'Api', 'publishedAt': '2024-01-01T00:00:00Z',
+                'thumbnails': {'high': {'url': 'https://example.com/high.jpg'}}},
+    'statistics': {'viewCount': '5', 'likeCount': '1', 'commentCount': '3'},
+    'contentDetails': {'duration': 'PT1M'}
+}
+
+def test_standardize_keeps_videos_with_only_video_id():
+    """Test that videos identified only by video_id are not dropped"""
+    result = standardize_video_data([FLATTENED])
+    assert len(result) == 1
+    assert result[0]['video_id'] == 'flat1'
+    assert result[0]['views'] == '10'
+    assert result[0]['duration'] == 'Unknown duration'
+    assert result[0]['thumbnail_url'] == 'https://img.youtube.com/vi/flat1/mqdefault.jpg'
+
+def test_standardize_mixed_shapes_without_modifying_input():
+    """Test that API, flattened, playlist and string-statistics videos normalize in one batch"""
+    playlist_item = {'snippet': {'resourceId': {'videoId': 'pl1'}, 'title': 'Playlist'}}
+    string_stats = {'id': 'str1', 'statistics': json.dumps({'viewCount': '9'})}
+    videos = [FLATTENED, API, playlist_item, string_stats, {'title': 'No id'}, 'not a video']
+    original = copy.deepcopy(videos)
+
+    result = standardize_video_data(videos)
+
+    assert videos == original
+    assert [video['video_id'] for video in result] == ['flat1', 'api1', 'pl1', 'str1']
+    assert result[1]['views'] == '5' and result[1]['comment_count'] == '3'
+    assert result[1]['thumbnail_url'] == 'https://example.com/high.jpg'
+    assert result[1]['published_at'] == '2024-01-01T00:00:00Z'
+    assert result[3]['views'] == '9'
+
+def test_statistics_comment_count_wins_over_flattened():
+    """Test that the API comment count replaces a stale flattened one"""
+    video = dict(API, video_id='api1', comment_count='1', views='0')
+    result = standardize_video_data([video])[0]
+    assert result['comment_count'] == '3'
+    assert result['views'] == '5'
+
+def test_normalized_batches_pass_through():
+    """Test that normalization is idempotent and free for normalized batches"""
+    result = standardize_video_data([FLATTENED, API])
+    assert isinstance(result, NormalizedVideos)
+    assert standardize_video_data(result) is result
+
+    copied = normalize_videos(list(result))
+    assert copied == result
+    # Already normalized videos are copied, so changing the output leaves the input alone
+    assert not any(a is b for a, b in zip(copied, result))
+    copied[0]['views'] = '99'
+    assert result[0]['views'] == '10'
+
+    result.append(dict(FLATTENED, video_id='flat2'))
+    assert standardize_video_data(result) is not result
+
+def test_changed_normalized_batches_are_normalized_again():
+    """Test that replacing a video or removing a standard key is noticed, not only length changes"""
+    result = standardize_video_data([FLATTENED, API])
+    result[1] = {'id': 'api2', 'statistics': {'viewCount': '7'}}
+    assert not result.is_intact()
+    assert standardize_video_data(result)[1]['views'] == '7'
+
+    result = standardize_video_data([FLATTENED, API])
+    del result[0]['views']
+    assert not result.is_intact()
+    assert standardize_video_data(result)[0]['views'] == '0'
+
+def test_collection_fields_and_video_id_extraction():
+    """Test the database to collection format plan and ID extraction"""
+    converted = normalize_videos([API, {'id': 'db2', 'snippet': {'title': 'Db'}}],
+                                 COLLECTION_VIDEO_FIELDS, keep_other_keys=False)
+    assert converted[0] == {
+        'video_id': 'api1', 'title': 'Api', 'published_at': '2024-01-01T00:00:00Z',
+        'published_date': '2024-01-01', 'views': '5', 'likes': '1', 'comment_count': '3',
+        'duration': 'PT1M', 'thumbnails': 'https://example.com/high.jpg'
+    }
+    assert converted[1] == {'video_id': 'db2', 'title': 'Db', 'views': '0', 'likes': '0', 'comment_count': '0'}
+
+    # Collected videos keep their other keys; flattened counts fill in for missing statistics
+    collected = normalize_videos([API, dict(FLATTENED, statistics={})], COLLECTION_VIDEO_FIELDS)
+    assert collected[0]['snippet'] is API['snippet'] and collected[0]['views'] == '5'
+    assert collected[1]['video_id'] == 'flat1' and collected[1]['views'] == '10'
+
+    assert extract_video_id({'id': {'videoId': 'search1'}}) == 'search1'
+    assert extract_video_id({'title': 'No id'}) is None
@@ -29,15 +29,12 @@ st.set_page_config(
 
 # These imports must come after st.set_page_config
 from src.config import init_session_state, Settings
-from src.database.sqlite import SQLiteDatabase
 from src.storage.factory import StorageFactory
-
-# Import directly from the modern implementations instead of legacy wrappers
-from src.ui.data_collection.main import render_data_collection_tab
-from src.ui.data_analysis.main import render_data_analysis_tab
-from src.ui.utilities import render_utilities_tab
-from src.ui.bulk_import.render import render_bulk_import_tab
 from src.ui.components.ui_utils import load_css_file, apply_security_headers
+from src.utils.session_budget import enforce_session_budget
+
+# The tab modules (and the analytics libraries behind them) are imported inside
+# their tabs in main(), after the header has been sent to the browser
 
 def init_application():
     """Initialize application environment and state."""
@@ -156,16 +153,23 @@ def main():
                 - 📈 **Data Coverage**: Visualize the completeness of your data collection
                 """)
             else:
+                from src.ui.data_analysis.main import render_data_analysis_tab
                 render_data_analysis_tab()
             
         with tab2:
+            from src.ui.data_collection.main import render_data_collection_tab
             render_data_collection_tab()
             
         with tab3:
+            from src.ui.bulk_import.render import render_bulk_import_tab
             render_bulk_import_tab()
             
         with tab4:
+            from src.ui.utilities import render_utilities_tab
             render_utilities_tab()
+        
+        # The tabs no longer hold references to this session's payloads, so cold ones can go to disk
+        enforce_session_budget()
             
     except Exception as e:
         st.error(f"Application Error: {e}")